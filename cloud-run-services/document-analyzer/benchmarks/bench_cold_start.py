@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de cold start do document-analyzer
+
+Para cada modo de inicialização (STARTUP_MODE=lazy e preload), sobe um
+processo novo que importa o `main` e mede:
+- import do app (no modo preload, inclui o preload que roda no master)
+- primeiro uso de cada componente (o que o primeiro request pagaria)
+- gc.collect() completo com o heap carregado (congelado no preload)
+
+O Firestore fica de fora por padrão: sem credenciais, a criação do
+cliente pode esperar pelo servidor de metadados.
+
+Uso:
+    python benchmarks/bench_cold_start.py --runs 5
+    python benchmarks/bench_cold_start.py --with-firestore
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import gc, json, sys, time
+start = time.perf_counter()
+import main
+import_seconds = time.perf_counter() - start
+
+first_use = {}
+for name, component in main.startup._components.items():
+    if name == 'firestore' and not WITH_FIRESTORE:
+        continue
+    start = time.perf_counter()
+    main.startup._try_get(component)
+    first_use[name] = time.perf_counter() - start
+
+start = time.perf_counter()
+gc.collect()
+gc_seconds = time.perf_counter() - start
+
+print(json.dumps({
+    'import': import_seconds,
+    'first_use': first_use,
+    'gc': gc_seconds,
+    'frozen': gc.get_freeze_count(),
+    'failed': [name for name, status in main.startup.report()['components'].items() if status['status'] == 'failed']
+}))
+"""
+
+
+def measure(mode: str, with_firestore: bool) -> dict:
+    """Executa um cold start num processo novo e retorna as medições."""
+    result = subprocess.run(
+        [sys.executable, '-c', f"WITH_FIRESTORE = {with_firestore}\n{CHILD}"],
+        cwd=SERVICE_DIR,
+        env={**os.environ, 'STARTUP_MODE': mode},
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int, with_firestore: bool) -> None:
+    rows = []
+    failed = set()
+    for mode in ('lazy', 'preload'):
+        samples = [measure(mode, with_firestore) for _ in range(runs)]
+        failed.update(name for sample in samples for name in sample['failed'])
+
+        first_use = statistics.median(sum(s['first_use'].values()) for s in samples)
+        slowest = max(samples[0]['first_use'], key=samples[0]['first_use'].get)
+        rows.append((
+            mode,
+            statistics.median(s['import'] for s in samples) * 1000,
+            first_use * 1000,
+            slowest,
+            statistics.median(s['gc'] for s in samples) * 1000,
+            samples[0]['frozen']
+        ))
+
+    print(f"{runs} execuções por modo (mediana), firestore {'incluído' if with_firestore else 'excluído'}")
+    print(f"{'modo':<9} {'import ms':>10} {'1º uso ms':>10} {'mais lento':<18} {'gc ms':>8} {'congelados':>11}")
+    for mode, import_ms, first_use_ms, slowest, gc_ms, frozen in rows:
+        print(f"{mode:<9} {import_ms:>10.1f} {first_use_ms:>10.1f} {slowest:<18} {gc_ms:>8.1f} {frozen:>11}")
+    if failed:
+        print(f"componentes com falha: {', '.join(sorted(failed))}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--with-firestore', action='store_true')
+    args = parser.parse_args()
+
+    run(args.runs, args.with_firestore)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Configuração do Gunicorn
+
+Com STARTUP_MODE=preload o app é importado no master (`preload_app`):
+módulos pesados e estado somente leitura são carregados uma vez e
+compartilhados com os workers via copy-on-write. Clientes gRPC
+(Firestore, Vision) são criados em cada worker após o fork.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+# Threads por worker: requests concorrentes no mesmo processo (inclusive
+# durante uma coleta do /admin/profile, que ocupa a thread que a atende)
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = os.getenv('STARTUP_MODE', 'lazy') == 'preload'
+
+
+def post_worker_init(worker):
+    """Constrói no worker os componentes que não sobrevivem a fork."""
+    if preload_app:
+        from startup import get_component_registry
+        get_component_registry().warm()
@@ -13,6 +13,11 @@ from .metrics import (
     get_metrics_service
 )
 
+from .sketches import DDSketch, SlicedSketch
+from .exposition import OpenMetricsRenderer
+from .stage_timer import StageTimer, current_stage_timer, timed_stage
+from .profiler import SamplingProfiler, ProfileResult, get_profiler
+
 from .tracing import (
     Tracer,
     Span,
@@ -20,6 +25,8 @@ from .tracing import (
     SpanStatus,
     SpanKind,
     TracingExporter,
+    BatchExportProcessor,
+    FileTraceExporter,
     get_tracer,
     trace_operation
 )
@@ -27,6 +34,7 @@ from .tracing import (
 from .alerting import (
     AlertManager,
     AlertRule,
+    WindowEvaluator,
     Alert,
     AlertSeverity,
     AlertStatus,
@@ -45,6 +53,15 @@ __all__ = [
     'MetricUnit',
     'get_metrics_collector',
     'get_metrics_service',
+    'DDSketch',
+    'SlicedSketch',
+    'OpenMetricsRenderer',
+    'StageTimer',
+    'current_stage_timer',
+    'timed_stage',
+    'SamplingProfiler',
+    'ProfileResult',
+    'get_profiler',
     
     # Tracing
     'Tracer',
@@ -53,12 +70,15 @@ __all__ = [
     'SpanStatus',
     'SpanKind',
     'TracingExporter',
+    'BatchExportProcessor',
+    'FileTraceExporter',
     'get_tracer',
     'trace_operation',
     
     # Alerting
     'AlertManager',
     'AlertRule',
+    'WindowEvaluator',
     'Alert',
     'AlertSeverity',
     'AlertStatus',
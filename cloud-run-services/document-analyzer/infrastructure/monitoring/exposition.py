@@ -0,0 +1,130 @@
+"""
+OpenMetrics Exposition
+
+Renderização das métricas do MetricsCollector no formato de texto
+OpenMetrics (compatível com o scrape do Prometheus):
+- Counters, gauges e histogramas com buckets cumulativos por conjunto de labels
+- Gerado a partir do estado pré-agregado de cada métrica (sem varrer pontos)
+- Texto de cada métrica em cache até a próxima observação
+"""
+
+import math
+import re
+from typing import Any, Dict, Iterable, Tuple
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+_INVALID_NAME_CHARS = re.compile(r'[^a-zA-Z0-9_:]')
+_INVALID_LABEL_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+_INF_BUCKET = 'le="+Inf"'
+
+
+def sanitize_name(name: str, pattern: re.Pattern = _INVALID_NAME_CHARS) -> str:
+    """Converte nome arbitrário em nome válido de métrica/label."""
+    name = pattern.sub('_', name)
+    return f"_{name}" if not name or name[0].isdigit() else name
+
+
+def _escape_label_value(value: Any) -> str:
+    """Escapa barra invertida, aspas e quebra de linha."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _escape_help(text: str) -> str:
+    """Escapa o texto de HELP."""
+    return text.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, str], extra: str = "") -> str:
+    """Renderiza `{a="1",b="2"}` (vazio se não houver labels)."""
+    parts = [
+        f'{sanitize_name(key, _INVALID_LABEL_CHARS)}="{_escape_label_value(value)}"'
+        for key, value in sorted(labels.items())
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def format_value(value: float) -> str:
+    """Formata número no padrão OpenMetrics (+Inf, -Inf, NaN)."""
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class OpenMetricsRenderer:
+    """
+    Renderizador incremental de métricas em OpenMetrics.
+
+    Guarda o texto de cada métrica junto com a versão (contador de
+    observações) com que foi gerado; no scrape seguinte só as métricas
+    com versão nova são re-renderizadas.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, Tuple[int, str]] = {}
+
+    def render(self, metrics: Iterable[Any]) -> str:
+        """Renderiza as métricas e o terminador `# EOF`."""
+        blocks = []
+        for metric in metrics:
+            cached = self._cache.get(metric.name)
+            if cached is None or cached[0] != metric.version:
+                cached = (metric.version, self.render_metric(metric))
+                self._cache[metric.name] = cached
+            if cached[1]:
+                blocks.append(cached[1])
+        blocks.append("# EOF\n")
+        return "".join(blocks)
+
+    def render_metric(self, metric: Any) -> str:
+        """Renderiza uma família de métricas (vazio se não houver observações)."""
+        if not metric.label_state:
+            return ""
+
+        name = sanitize_name(metric.name)
+        metric_type = metric.metric_type.value
+
+        if metric_type == "counter":
+            family = name[:-len("_total")] if name.endswith("_total") else name
+            lines = self._header(family, "counter", metric.description)
+            for labels, total in metric.iter_label_state():
+                lines.append(f"{family}_total{format_labels(labels)} {format_value(total)}")
+        elif metric_type in ("histogram", "summary"):
+            # Summaries também são expostos como histogramas (buckets fixos)
+            lines = self._header(name, "histogram", metric.description)
+            for labels, state in metric.iter_label_state():
+                lines.extend(self._histogram_lines(name, labels, state))
+        else:
+            lines = self._header(name, "gauge", metric.description)
+            for labels, value in metric.iter_label_state():
+                lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+
+        lines.append("")
+        return "\n".join(lines)
+
+    def _header(self, family: str, metric_type: str, description: str) -> list:
+        """Linhas TYPE e HELP da família."""
+        lines = [f"# TYPE {family} {metric_type}"]
+        if description:
+            lines.append(f"# HELP {family} {_escape_help(description)}")
+        return lines
+
+    def _histogram_lines(self, name: str, labels: Dict[str, str], state: Any) -> list:
+        """Buckets cumulativos, _count e _sum de um conjunto de labels."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(state.bounds, state.counts):
+            cumulative += count
+            le = f'le="{format_value(float(bound))}"'
+            lines.append(f"{name}_bucket{format_labels(labels, le)} {cumulative}")
+        lines.append(f"{name}_bucket{format_labels(labels, _INF_BUCKET)} {state.count}")
+        label_text = format_labels(labels)
+        lines.append(f"{name}_count{label_text} {state.count}")
+        lines.append(f"{name}_sum{label_text} {format_value(state.sum)}")
+        return lines
@@ -6,15 +6,24 @@ Sistema avançado de métricas para monitoramento da aplicação.
 
 import time
 import asyncio
-from typing import Dict, Any, Optional, List, Callable
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable, Iterator, Tuple
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import deque
+from array import array
+from bisect import bisect_left, bisect_right
+import gc
+import os
 import threading
 from contextlib import asynccontextmanager
 
-from ...domain.interfaces.services import IMetricsService
+try:
+    from ...domain.interfaces.services import IMetricsService
+except ImportError:
+    # document-analyzer importa `infrastructure` como pacote de topo
+    from domain.interfaces.services import IMetricsService
+from .sketches import DDSketch, SlicedSketch
+from .exposition import OpenMetricsRenderer
 
 
 class MetricType(str, Enum):
@@ -35,6 +44,36 @@ class MetricUnit(str, Enum):
     REQUESTS_PER_SECOND = "requests_per_second"
 
 
+# Limites dos buckets de histogramas (exposição OpenMetrics) por unidade
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNIT_BUCKETS: Dict[MetricUnit, Tuple[float, ...]] = {
+    MetricUnit.SECONDS: DEFAULT_BUCKETS,
+    MetricUnit.MILLISECONDS: tuple(b * 1000 for b in DEFAULT_BUCKETS),
+    MetricUnit.BYTES: (1024.0, 16384.0, 131072.0, 1048576.0, 8388608.0, 67108864.0, 536870912.0),
+    MetricUnit.PERCENTAGE: (10.0, 25.0, 50.0, 75.0, 90.0, 95.0, 99.0, 100.0),
+    MetricUnit.COUNT: (1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0),
+}
+
+
+@dataclass
+class HistogramBuckets:
+    """Contagens por bucket (não cumulativas), soma e total de um conjunto de labels."""
+    bounds: Tuple[float, ...]
+    counts: List[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+    
+    def __post_init__(self) -> None:
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+    
+    def observe(self, value: float) -> None:
+        """Conta o valor no primeiro bucket com limite >= valor (último = +Inf)."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
 @dataclass
 class MetricPoint:
     """Ponto de métrica."""
@@ -51,6 +90,152 @@ class MetricPoint:
         }
 
 
+class PointSeries:
+    """
+    Ring buffer colunar de pontos de uma métrica.
+
+    Armazena timestamps (epoch) e valores em `array('d')` paralelos e os
+    labels como ids de conjuntos internados (~20 bytes por ponto, contra
+    centenas de bytes de um MetricPoint com datetime e dict). Os timestamps
+    são mantidos não-decrescentes, então consultas por janela usam bisect
+    em cada um dos (no máximo dois) segmentos contíguos do anel:
+    O(log n + k).
+    """
+
+    def __init__(self, capacity: int = 1000, base_labels: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            capacity: Máximo de pontos retidos (os mais antigos são sobrescritos)
+            base_labels: Labels comuns a todos os pontos (da métrica)
+        """
+        self.capacity = capacity
+        self.base_labels = base_labels or {}
+        self._timestamps = array('d', [0.0]) * capacity
+        self._values = array('d', [0.0]) * capacity
+        self._label_ids = array('I', [0]) * capacity
+        self._start = 0
+        self._size = 0
+        # Labels extras internados: id -> labels e chave -> id (0 = sem extras)
+        self._label_sets: List[Dict[str, str]] = [{}]
+        self._label_index: Dict[Tuple[Tuple[str, str], ...], int] = {(): 0}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[MetricPoint]:
+        return iter(self.points())
+
+    def __getitem__(self, index: int) -> MetricPoint:
+        """Ponto por posição lógica (0 = mais antigo, -1 = mais recente)."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("índice fora da série")
+        return self._point((self._start + index) % self.capacity)
+
+    def labels_for(self, label_id: int) -> Dict[str, str]:
+        """Labels completos (base + extras) de um id internado."""
+        return {**self.base_labels, **self._label_sets[label_id]}
+    
+    def intern_labels(self, labels: Optional[Dict[str, str]]) -> int:
+        """Obtém o id do conjunto de labels extras, criando se necessário."""
+        if not labels:
+            return 0
+        key = tuple(sorted(labels.items()))
+        label_id = self._label_index.get(key)
+        if label_id is None:
+            label_id = len(self._label_sets)
+            self._label_sets.append(dict(labels))
+            self._label_index[key] = label_id
+        return label_id
+
+    def append(self, value: float, timestamp: Optional[float] = None, label_id: int = 0) -> None:
+        """Adiciona ponto (timestamp default: agora), sobrescrevendo o mais antigo se cheio."""
+        timestamp = time.time() if timestamp is None else timestamp
+        if self._size:
+            # Relógio que volta (ajuste de NTP) não pode quebrar a ordenação
+            timestamp = max(timestamp, self._timestamps[self._physical(self._size - 1)])
+
+        if self._size < self.capacity:
+            pos = self._physical(self._size)
+            self._size += 1
+        else:
+            pos = self._start
+            self._start = (self._start + 1) % self.capacity
+
+        self._timestamps[pos] = timestamp
+        self._values[pos] = value
+        self._label_ids[pos] = label_id
+
+    def last_value(self) -> Optional[float]:
+        """Valor mais recente."""
+        return self._values[self._physical(self._size - 1)] if self._size else None
+
+    def aggregate(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> Tuple[int, float, Optional[float]]:
+        """
+        Agrega os pontos com timestamp em [start, end].
+
+        Returns:
+            (quantidade, soma, último valor)
+        """
+        count, total, last = 0, 0.0, None
+        for lo, hi in self._window(start, end):
+            if hi > lo:
+                count += hi - lo
+                total += sum(self._values[lo:hi])
+                last = self._values[hi - 1]
+        return count, total, last
+
+    def values(self, start: Optional[float] = None, end: Optional[float] = None) -> List[float]:
+        """Valores com timestamp em [start, end], do mais antigo ao mais recente."""
+        result: List[float] = []
+        for lo, hi in self._window(start, end):
+            result.extend(self._values[lo:hi])
+        return result
+
+    def points(self, start: Optional[float] = None, end: Optional[float] = None) -> List[MetricPoint]:
+        """Materializa MetricPoints com timestamp em [start, end]."""
+        return [
+            self._point(pos)
+            for lo, hi in self._window(start, end)
+            for pos in range(lo, hi)
+        ]
+
+    def _physical(self, index: int) -> int:
+        """Posição física de um índice lógico."""
+        return (self._start + index) % self.capacity
+
+    def _segments(self) -> List[Tuple[int, int]]:
+        """Faixas físicas contíguas em ordem cronológica."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return [(self._start, end)]
+        return [(self._start, self.capacity), (0, end - self.capacity)]
+
+    def _window(self, start: Optional[float], end: Optional[float]) -> List[Tuple[int, int]]:
+        """Faixas físicas com timestamp em [start, end] (bisect por segmento)."""
+        if not self._size:
+            return []
+        ranges = []
+        for seg_lo, seg_hi in self._segments():
+            lo = seg_lo if start is None else bisect_left(self._timestamps, start, seg_lo, seg_hi)
+            hi = seg_hi if end is None else bisect_right(self._timestamps, end, seg_lo, seg_hi)
+            ranges.append((lo, hi))
+        return ranges
+
+    def _point(self, pos: int) -> MetricPoint:
+        """Materializa o ponto de uma posição física."""
+        return MetricPoint(
+            timestamp=datetime.utcfromtimestamp(self._timestamps[pos]),
+            value=self._values[pos],
+            labels={**self.base_labels, **self._label_sets[self._label_ids[pos]]}
+        )
+
+
 @dataclass
 class Metric:
     """Métrica com histórico de pontos."""
@@ -58,45 +243,190 @@ class Metric:
     metric_type: MetricType
     unit: MetricUnit
     description: str
-    points: deque = field(default_factory=lambda: deque(maxlen=1000))
+    points: PointSeries = field(default_factory=PointSeries)
     labels: Dict[str, str] = field(default_factory=dict)
+    sketch: Optional[SlicedSketch] = None
+    buckets: Optional[Tuple[float, ...]] = None
+    # Estado pré-agregado por conjunto de labels (id internado), para exposição:
+    # total (counter), último valor (gauge) ou HistogramBuckets (histograma)
+    label_state: Dict[int, Any] = field(default_factory=dict)
+    version: int = 0
     
-    def add_point(self, value: float, labels: Optional[Dict[str, str]] = None) -> None:
-        """Adiciona ponto à métrica."""
-        point_labels = {**self.labels}
-        if labels:
-            point_labels.update(labels)
+    def __post_init__(self) -> None:
+        """Compartilha os labels com a série; histogramas mantêm sketches e buckets."""
+        self.points.base_labels = self.labels
+        if self.metric_type in (MetricType.HISTOGRAM, MetricType.SUMMARY):
+            if self.sketch is None:
+                self.sketch = SlicedSketch()
+            if self.buckets is None:
+                self.buckets = UNIT_BUCKETS.get(self.unit, DEFAULT_BUCKETS)
+    
+    def add_point(
+        self,
+        value: float,
+        labels: Optional[Dict[str, str]] = None,
+        increment: Optional[float] = None
+    ) -> None:
+        """
+        Adiciona ponto à métrica.
         
-        point = MetricPoint(
-            timestamp=datetime.utcnow(),
-            value=value,
-            labels=point_labels
-        )
-        self.points.append(point)
+        Args:
+            value: Valor do ponto
+            labels: Labels extras do ponto
+            increment: Para counters, quanto somar ao total dos labels
+                (default: value)
+        """
+        now = time.time()
+        label_id = self.points.intern_labels(labels)
+        self.points.append(value, now, label_id)
+        if self.sketch is not None:
+            self.sketch.add(value, now)
+        
+        if self.metric_type == MetricType.COUNTER:
+            delta = value if increment is None else increment
+            self.label_state[label_id] = self.label_state.get(label_id, 0.0) + delta
+        elif self.buckets is not None:
+            state = self.label_state.get(label_id)
+            if state is None:
+                state = self.label_state[label_id] = HistogramBuckets(self.buckets)
+            state.observe(value)
+        else:
+            self.label_state[label_id] = value
+        self.version += 1
+    
+    def iter_label_state(self) -> Iterator[Tuple[Dict[str, str], Any]]:
+        """Itera (labels, estado agregado) de cada conjunto de labels."""
+        for label_id, state in self.label_state.items():
+            yield self.points.labels_for(label_id), state
+    
+    def get_sketch(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> Optional[DDSketch]:
+        """Obtém sketch mesclado das fatias no período (apenas histogramas)."""
+        if self.sketch is None:
+            return None
+        return self.sketch.query(_to_epoch(start_time), _to_epoch(end_time))
     
     def get_latest_value(self) -> Optional[float]:
         """Obtém último valor da métrica."""
-        return self.points[-1].value if self.points else None
+        return self.points.last_value()
     
     def get_average(self, minutes: int = 5) -> Optional[float]:
         """Obtém média dos últimos N minutos."""
-        cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-        recent_points = [p for p in self.points if p.timestamp >= cutoff]
+        count, total, _ = self.points.aggregate(start=time.time() - minutes * 60)
         
-        if not recent_points:
+        if not count:
             return None
         
-        return sum(p.value for p in recent_points) / len(recent_points)
+        return total / count
     
     def get_rate(self, minutes: int = 1) -> float:
         """Obtém taxa por minuto."""
-        cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-        recent_points = [p for p in self.points if p.timestamp >= cutoff]
-        
-        if not recent_points:
-            return 0.0
-        
-        return len(recent_points) / minutes
+        count, _, _ = self.points.aggregate(start=time.time() - minutes * 60)
+        return count / minutes
+
+
+def _to_epoch(moment: Optional[datetime]) -> Optional[float]:
+    """Converte datetime (naive em UTC, como datetime.utcnow()) para epoch."""
+    if moment is None:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class SystemSampler:
+    """
+    Amostragem de métricas de sistema e de processo sem bloqueio.
+
+    CPU é calculada por delta entre amostras (nada de `interval=1`), então
+    `sample()` retorna imediatamente e pode rodar em uma thread. Usa psutil
+    quando disponível; caso contrário recorre à biblioteca padrão (/proc no
+    Linux) e às métricas do próprio processo.
+    """
+
+    def __init__(self):
+        try:
+            import psutil
+            self._psutil = psutil
+            self._process = psutil.Process()
+            # Primeira chamada sem intervalo apenas inicializa o delta
+            psutil.cpu_percent(interval=None)
+        except ImportError:
+            self._psutil = None
+            self._process = None
+
+        self._cpu_count = os.cpu_count() or 1
+        self._last_wall = time.monotonic()
+        self._last_cpu = time.process_time()
+        self._last_gc = [(0, 0)] * len(gc.get_stats())
+
+    def sample(self) -> List[Tuple[str, float, Optional[Dict[str, str]]]]:
+        """
+        Coleta uma amostra.
+
+        Returns:
+            Lista de (métrica, valor, labels); para counters o valor é o
+            incremento desde a amostra anterior
+        """
+        samples: List[Tuple[str, float, Optional[Dict[str, str]]]] = []
+
+        # CPU do processo por delta de process_time / tempo de parede
+        now, cpu = time.monotonic(), time.process_time()
+        elapsed = now - self._last_wall
+        process_cpu = 100.0 * (cpu - self._last_cpu) / elapsed if elapsed > 0 else 0.0
+        self._last_wall, self._last_cpu = now, cpu
+        samples.append(("process_cpu_percentage", process_cpu, None))
+
+        rss = self._resident_memory()
+        if rss is not None:
+            samples.append(("process_resident_memory_bytes", float(rss), None))
+
+        fds = self._open_fds()
+        if fds is not None:
+            samples.append(("process_open_fds", float(fds), None))
+
+        samples.append(("process_threads", float(threading.active_count()), None))
+
+        if self._psutil is not None:
+            samples.append(("memory_usage_bytes", float(self._psutil.virtual_memory().used), None))
+            samples.append(("cpu_usage_percentage", self._psutil.cpu_percent(interval=None), None))
+        else:
+            # Sem psutil: uso do próprio processo (CPU normalizada pelos núcleos)
+            if rss is not None:
+                samples.append(("memory_usage_bytes", float(rss), None))
+            samples.append(("cpu_usage_percentage", process_cpu / self._cpu_count, None))
+
+        # Contadores do GC: emite o delta desde a amostra anterior
+        for generation, stats in enumerate(gc.get_stats()):
+            labels = {"generation": str(generation)}
+            collections, collected = self._last_gc[generation]
+            samples.append(("gc_collections_total", float(stats['collections'] - collections), labels))
+            samples.append(("gc_collected_objects_total", float(stats['collected'] - collected), labels))
+            self._last_gc[generation] = (stats['collections'], stats['collected'])
+
+        return samples
+
+    def _resident_memory(self) -> Optional[int]:
+        """Memória residente (RSS) do processo em bytes."""
+        if self._process is not None:
+            return self._process.memory_info().rss
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+
+    def _open_fds(self) -> Optional[int]:
+        """Descritores de arquivo abertos pelo processo."""
+        if self._process is not None and hasattr(self._process, 'num_fds'):
+            return self._process.num_fds()
+        try:
+            return len(os.listdir('/proc/self/fd'))
+        except OSError:
+            return None
 
 
 class MetricsCollector:
@@ -107,12 +437,23 @@ class MetricsCollector:
     agregações e alertas.
     """
     
-    def __init__(self, max_metrics: int = 10000):
+    def __init__(
+        self,
+        max_metrics: int = 10000,
+        collection_interval: float = 30.0,
+        lag_probe_interval: float = 1.0
+    ):
         self._metrics: Dict[str, Metric] = {}
         self._max_metrics = max_metrics
         self._lock = threading.RLock()
         self._alert_handlers: List[Callable] = []
+        self._listeners: Dict[str, List[Callable]] = {}
         self._background_task: Optional[asyncio.Task] = None
+        self._lag_task: Optional[asyncio.Task] = None
+        self._collection_interval = collection_interval
+        self._lag_probe_interval = lag_probe_interval
+        self._sampler: Optional[SystemSampler] = None
+        self._openmetrics = OpenMetricsRenderer()
         
         # Métricas predefinidas do sistema
         self._register_system_metrics()
@@ -134,6 +475,13 @@ class MetricsCollector:
             "Duração das análises em segundos"
         )
         
+        self.register_metric(
+            "analysis_stage_duration_seconds",
+            MetricType.HISTOGRAM,
+            MetricUnit.SECONDS,
+            "Duração de cada etapa do pipeline de análise em segundos"
+        )
+        
         self.register_metric(
             "analysis_errors_total",
             MetricType.COUNTER,
@@ -162,6 +510,35 @@ class MetricsCollector:
             "Total de misses do cache"
         )
         
+        # Métricas de controle de admissão
+        self.register_metric(
+            "admission_queue_depth",
+            MetricType.GAUGE,
+            MetricUnit.COUNT,
+            "Análises aguardando admissão na fila"
+        )
+        
+        self.register_metric(
+            "admission_in_flight_units",
+            MetricType.GAUGE,
+            MetricUnit.COUNT,
+            "Unidades de custo de análises em andamento"
+        )
+        
+        self.register_metric(
+            "admission_wait_seconds",
+            MetricType.HISTOGRAM,
+            MetricUnit.SECONDS,
+            "Espera na fila de admissão em segundos"
+        )
+        
+        self.register_metric(
+            "admission_rejected_total",
+            MetricType.COUNTER,
+            MetricUnit.COUNT,
+            "Análises rejeitadas pelo controle de admissão"
+        )
+        
         # Métricas de performance
         self.register_metric(
             "memory_usage_bytes",
@@ -177,6 +554,63 @@ class MetricsCollector:
             "Uso de CPU em porcentagem"
         )
         
+        # Métricas do processo e do event loop
+        self.register_metric(
+            "process_cpu_percentage",
+            MetricType.GAUGE,
+            MetricUnit.PERCENTAGE,
+            "Uso de CPU do processo (100% = um núcleo)"
+        )
+        
+        self.register_metric(
+            "process_resident_memory_bytes",
+            MetricType.GAUGE,
+            MetricUnit.BYTES,
+            "Memória residente do processo em bytes"
+        )
+        
+        self.register_metric(
+            "process_open_fds",
+            MetricType.GAUGE,
+            MetricUnit.COUNT,
+            "Descritores de arquivo abertos"
+        )
+        
+        self.register_metric(
+            "process_threads",
+            MetricType.GAUGE,
+            MetricUnit.COUNT,
+            "Threads ativas no processo"
+        )
+        
+        self.register_metric(
+            "gc_collections_total",
+            MetricType.COUNTER,
+            MetricUnit.COUNT,
+            "Coletas do GC por geração"
+        )
+        
+        self.register_metric(
+            "gc_collected_objects_total",
+            MetricType.COUNTER,
+            MetricUnit.COUNT,
+            "Objetos coletados pelo GC por geração"
+        )
+        
+        self.register_metric(
+            "asyncio_tasks",
+            MetricType.GAUGE,
+            MetricUnit.COUNT,
+            "Tasks asyncio pendentes no event loop"
+        )
+        
+        self.register_metric(
+            "event_loop_lag_seconds",
+            MetricType.HISTOGRAM,
+            MetricUnit.SECONDS,
+            "Atraso do event loop em relação ao agendado"
+        )
+        
         # Métricas de negócio
         self.register_metric(
             "findings_detected_total",
@@ -229,7 +663,10 @@ class MetricsCollector:
             
             metric = self._metrics[name]
             current_value = metric.get_latest_value() or 0.0
-            metric.add_point(current_value + value, labels)
+            metric.add_point(current_value + value, labels, increment=value)
+        
+        # Counters notificam o incremento (não o total acumulado)
+        self._notify(name, value, labels)
     
     def set_gauge(
         self,
@@ -243,6 +680,8 @@ class MetricsCollector:
                 self.register_metric(name, MetricType.GAUGE, MetricUnit.COUNT, f"Auto-created gauge: {name}")
             
             self._metrics[name].add_point(value, labels)
+        
+        self._notify(name, value, labels)
     
     def observe_histogram(
         self,
@@ -256,6 +695,45 @@ class MetricsCollector:
                 self.register_metric(name, MetricType.HISTOGRAM, MetricUnit.SECONDS, f"Auto-created histogram: {name}")
             
             self._metrics[name].add_point(value, labels)
+        
+        self._notify(name, value, labels)
+    
+    def subscribe(self, name: str, listener: Callable[[str, float, Dict[str, str], float], None]) -> None:
+        """
+        Assina as atualizações de uma métrica.
+        
+        O listener é chamado de forma síncrona, fora do lock do coletor,
+        com (nome, valor, labels, timestamp) a cada observação; para
+        counters o valor é o incremento. Deve ser O(1) e não bloquear.
+        
+        Args:
+            name: Nome da métrica
+            listener: Função chamada a cada atualização
+        """
+        with self._lock:
+            self._listeners.setdefault(name, []).append(listener)
+    
+    def unsubscribe(self, name: str, listener: Callable) -> None:
+        """Remove assinatura de uma métrica."""
+        with self._lock:
+            listeners = self._listeners.get(name)
+            if listeners and listener in listeners:
+                listeners.remove(listener)
+                if not listeners:
+                    del self._listeners[name]
+    
+    def _notify(self, name: str, value: float, labels: Optional[Dict[str, str]]) -> None:
+        """Notifica os assinantes da métrica."""
+        listeners = self._listeners.get(name)
+        if not listeners:
+            return
+        
+        timestamp = time.time()
+        for listener in tuple(listeners):
+            try:
+                listener(name, value, labels or {}, timestamp)
+            except Exception as e:
+                print(f"Erro ao notificar assinante da métrica {name}: {e}")
     
     def get_metric(self, name: str) -> Optional[Metric]:
         """Obtém métrica por nome."""
@@ -286,56 +764,89 @@ class MetricsCollector:
         
         with self._lock:
             for name, metric in self._metrics.items():
-                # Filtra pontos pelo período
-                period_points = [
-                    p for p in metric.points
-                    if start_time <= p.timestamp <= end_time
-                ]
-                
-                if not period_points:
+                if metric.sketch is not None:
+                    metric_summary = self._summarize_histogram(metric, start_time, end_time)
+                    if metric_summary:
+                        summary['metrics'][name] = metric_summary
                     continue
                 
-                values = [p.value for p in period_points]
+                # Agrega os pontos do período (bisect na série, sem cópia)
+                count, total, latest = metric.points.aggregate(
+                    _to_epoch(start_time), _to_epoch(end_time)
+                )
+                
+                if not count:
+                    continue
                 
                 metric_summary = {
                     'type': metric.metric_type.value,
                     'unit': metric.unit.value,
                     'description': metric.description,
-                    'points_count': len(period_points),
-                    'latest_value': values[-1] if values else None
+                    'points_count': count,
+                    'latest_value': latest
                 }
                 
-                if metric.metric_type in [MetricType.HISTOGRAM, MetricType.SUMMARY]:
-                    metric_summary.update({
-                        'min': min(values),
-                        'max': max(values),
-                        'avg': sum(values) / len(values),
-                        'p50': self._percentile(values, 50),
-                        'p95': self._percentile(values, 95),
-                        'p99': self._percentile(values, 99)
-                    })
-                elif metric.metric_type == MetricType.COUNTER:
-                    metric_summary['total'] = sum(values)
+                if metric.metric_type == MetricType.COUNTER:
+                    metric_summary['total'] = total
                     metric_summary['rate_per_minute'] = metric.get_rate()
                 
                 summary['metrics'][name] = metric_summary
         
         return summary
     
-    def _percentile(self, values: List[float], percentile: int) -> float:
-        """Calcula percentil."""
-        if not values:
-            return 0.0
+    def _summarize_histogram(
+        self,
+        metric: Metric,
+        start_time: datetime,
+        end_time: datetime
+    ) -> Optional[Dict[str, Any]]:
+        """Resumo de histograma a partir do sketch (O(fatias × bins), sem ordenar)."""
+        sketch = metric.get_sketch(start_time, end_time)
+        if not sketch.count:
+            return None
         
-        sorted_values = sorted(values)
-        k = (len(sorted_values) - 1) * percentile / 100
-        f = int(k)
-        c = k - f
+        return {
+            'type': metric.metric_type.value,
+            'unit': metric.unit.value,
+            'description': metric.description,
+            'points_count': sketch.count,
+            'latest_value': metric.get_latest_value(),
+            'min': sketch.min,
+            'max': sketch.max,
+            'avg': sketch.avg,
+            'p50': sketch.quantile(0.50),
+            'p95': sketch.quantile(0.95),
+            'p99': sketch.quantile(0.99)
+        }
+    
+    def to_openmetrics(self) -> str:
+        """
+        Renderiza todas as métricas no formato de texto OpenMetrics.
         
-        if f + 1 < len(sorted_values):
-            return sorted_values[f] * (1 - c) + sorted_values[f + 1] * c
-        else:
-            return sorted_values[f]
+        Usa o estado pré-agregado por labels; métricas sem novas observações
+        desde o último scrape reaproveitam o texto já renderizado.
+        """
+        with self._lock:
+            return self._openmetrics.render(self._metrics.values())
+    
+    def export_sketches(self) -> Dict[str, Dict[str, Any]]:
+        """Exporta os sketches de histogramas (para mesclagem entre workers)."""
+        with self._lock:
+            return {
+                name: metric.sketch.to_dict()
+                for name, metric in self._metrics.items()
+                if metric.sketch is not None
+            }
+    
+    def merge_sketches(self, sketches: Dict[str, Dict[str, Any]]) -> None:
+        """Mescla sketches exportados por outro worker (`export_sketches`)."""
+        with self._lock:
+            for name, data in sketches.items():
+                if name not in self._metrics:
+                    self.register_metric(name, MetricType.HISTOGRAM, MetricUnit.SECONDS, f"Auto-created histogram: {name}")
+                metric = self._metrics[name]
+                if metric.sketch is not None:
+                    metric.sketch.merge(SlicedSketch.from_dict(data))
     
     @asynccontextmanager
     async def timer(self, metric_name: str, labels: Optional[Dict[str, str]] = None):
@@ -357,15 +868,17 @@ class MetricsCollector:
             return
         
         self._background_task = asyncio.create_task(self._monitoring_loop())
+        self._lag_task = asyncio.create_task(self._lag_probe_loop())
     
     async def stop_monitoring(self) -> None:
         """Para monitoramento em background."""
-        if self._background_task:
-            self._background_task.cancel()
-            try:
-                await self._background_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._background_task, self._lag_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
     
     async def _monitoring_loop(self) -> None:
         """Loop de monitoramento."""
@@ -373,32 +886,44 @@ class MetricsCollector:
             try:
                 await self._collect_system_metrics()
                 await self._check_alerts()
-                await asyncio.sleep(30)  # Coleta a cada 30 segundos
+                await asyncio.sleep(self._collection_interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Erro no loop de monitoramento: {e}")
                 await asyncio.sleep(5)
     
+    async def _lag_probe_loop(self) -> None:
+        """Mede o atraso do event loop: quanto um sleep acorda depois do agendado."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                scheduled = loop.time() + self._lag_probe_interval
+                await asyncio.sleep(self._lag_probe_interval)
+                self.observe_histogram("event_loop_lag_seconds", max(0.0, loop.time() - scheduled))
+            except asyncio.CancelledError:
+                break
+    
     async def _collect_system_metrics(self) -> None:
-        """Coleta métricas do sistema."""
-        try:
-            import psutil
-            
-            # Métricas de sistema
-            memory = psutil.virtual_memory()
-            cpu_percent = psutil.cpu_percent(interval=1)
-            
-            self.set_gauge("memory_usage_bytes", memory.used)
-            self.set_gauge("cpu_usage_percentage", cpu_percent)
-            
-        except ImportError:
-            # psutil não disponível, usar valores mock
-            self.set_gauge("memory_usage_bytes", 1024 * 1024 * 100)  # 100MB
-            self.set_gauge("cpu_usage_percentage", 25.0)
+        """Coleta métricas do sistema sem bloquear o event loop."""
+        if self._sampler is None:
+            self._sampler = SystemSampler()
+        
+        # A amostragem (psutil, /proc) roda em thread; só as tasks são lidas no loop
+        samples = await asyncio.to_thread(self._sampler.sample)
+        samples.append(("asyncio_tasks", float(len(asyncio.all_tasks())), None))
+        
+        for name, value, labels in samples:
+            metric = self._metrics.get(name)
+            if metric is not None and metric.metric_type == MetricType.COUNTER:
+                self.increment(name, value, labels)
+            else:
+                self.set_gauge(name, value, labels)
     
     async def _check_alerts(self) -> None:
         """Verifica condições de alerta."""
+        # Avalia sob o lock e dispara fora dele: handlers podem aguardar I/O
+        triggered: List[Tuple[str, Metric, float]] = []
         with self._lock:
             for name, metric in self._metrics.items():
                 latest_value = metric.get_latest_value()
@@ -407,13 +932,16 @@ class MetricsCollector:
                 
                 # Alertas predefinidos
                 if name == "cpu_usage_percentage" and latest_value > 80:
-                    await self._trigger_alert("high_cpu_usage", metric, latest_value)
+                    triggered.append(("high_cpu_usage", metric, latest_value))
                 elif name == "memory_usage_bytes" and latest_value > 1024 * 1024 * 1024:  # 1GB
-                    await self._trigger_alert("high_memory_usage", metric, latest_value)
+                    triggered.append(("high_memory_usage", metric, latest_value))
                 elif name == "analysis_errors_total":
                     error_rate = metric.get_rate()
                     if error_rate > 10:  # Mais de 10 erros por minuto
-                        await self._trigger_alert("high_error_rate", metric, error_rate)
+                        triggered.append(("high_error_rate", metric, error_rate))
+        
+        for alert_type, metric, value in triggered:
+            await self._trigger_alert(alert_type, metric, value)
     
     async def _trigger_alert(self, alert_type: str, metric: Metric, value: float) -> None:
         """Dispara alerta."""
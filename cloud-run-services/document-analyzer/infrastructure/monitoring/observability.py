@@ -4,6 +4,7 @@ Observability Integration
 Integração completa de observabilidade combinando métricas, tracing e alertas.
 """
 
+import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from contextlib import asynccontextmanager
@@ -80,6 +81,10 @@ class ObservabilityManager:
         if self.metrics_service:
             await self.metrics_service.cleanup()
         
+        if self.tracer:
+            # Exporta traces pendentes sem bloquear o event loop
+            await asyncio.to_thread(self.tracer.force_flush)
+        
         self._is_initialized = False
         print("Observabilidade finalizada")
     
@@ -98,9 +103,7 @@ class ObservabilityManager:
         span = None
         if self.tracer:
             span = self.tracer.start_span(operation_name, tags=tags)
-            context = self.tracer._get_context()
-            previous_span = context.current_span
-            context.current_span = span
+            span_token = self.tracer.activate(span)
         
         start_time = datetime.utcnow()
         
@@ -157,7 +160,7 @@ class ObservabilityManager:
         finally:
             # Restaura contexto do span
             if self.tracer and span:
-                self.tracer._get_context().current_span = previous_span
+                self.tracer.deactivate(span_token)
     
     def record_business_metric(
         self,
@@ -395,9 +398,7 @@ def observe_sync(operation_name: str, tags: Optional[Dict[str, Any]] = None):
         def wrapper(*args, **kwargs):
             # Para funções síncronas, usa apenas o tracer
             tracer = get_tracer()
-            span = tracer.start_span(operation_name, tags=tags)
-            
-            try:
+            with tracer.sync_span(operation_name, tags=tags) as span:
                 # Adiciona argumentos como tags
                 if tags is None:
                     for i, arg in enumerate(args):
@@ -408,13 +409,7 @@ def observe_sync(operation_name: str, tags: Optional[Dict[str, Any]] = None):
                         if isinstance(value, (str, int, float, bool)):
                             span.add_tag(f"param_{key}", value)
                 
-                result = func(*args, **kwargs)
-                tracer.finish_span(span)
-                return result
-            except Exception as e:
-                span.set_error(e)
-                tracer.finish_span(span)
-                raise
+                return func(*args, **kwargs)
         
         return wrapper
     return decorator
\ No newline at end of file
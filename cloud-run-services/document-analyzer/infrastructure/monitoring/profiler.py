@@ -0,0 +1,221 @@
+"""
+Sampling Profiler
+
+Profiler por amostragem de pilhas para diagnóstico em produção:
+- Thread de amostragem lê `sys._current_frames()` a cada intervalo
+- Execução limitada no tempo, uma por vez por processo
+- Pilhas agregadas no formato "folded" (pronto para flamegraph.pl,
+  speedscope ou inferno)
+- Sem nenhum custo quando inativo (a thread só existe durante a coleta)
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+MAX_DURATION_SECONDS = 60.0
+MIN_INTERVAL_SECONDS = 0.001
+
+
+class ProfilerBusyError(RuntimeError):
+    """Já existe uma coleta em andamento no processo."""
+
+
+@dataclass
+class ProfileResult:
+    """Resultado de uma coleta: pilhas folded e contagem de amostras."""
+    stacks: Counter
+    samples: int
+    duration_seconds: float
+    interval_seconds: float
+    threads: Set[str] = field(default_factory=set)
+
+    def to_folded(self) -> str:
+        """Uma linha `raiz;...;folha contagem` por pilha, mais frequentes primeiro."""
+        lines = [f"{';'.join(stack)} {count}" for stack, count in self.stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Funções mais quentes por amostras próprias (self) e totais.
+
+        Args:
+            limit: Número máximo de funções
+
+        Returns:
+            Lista ordenada por amostras próprias
+        """
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            # A raiz é o nome da thread; não conta como função
+            frames = stack[1:]
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+
+        total = max(1, self.samples)
+        return [
+            {
+                'function': frame,
+                'self_samples': count,
+                'total_samples': total_counts[frame],
+                'self_percentage': round(count / total * 100, 2)
+            }
+            for frame, count in self_counts.most_common(limit)
+        ]
+
+    def to_dict(self, limit: int = 20) -> Dict[str, Any]:
+        """Resumo serializável (sem as pilhas completas)."""
+        return {
+            'samples': self.samples,
+            'duration_seconds': round(self.duration_seconds, 3),
+            'interval_seconds': self.interval_seconds,
+            'threads': sorted(self.threads),
+            'unique_stacks': len(self.stacks),
+            'top_functions': self.top_functions(limit)
+        }
+
+
+class SamplingProfiler:
+    """
+    Profiler de amostragem de pilhas de todas as threads do processo.
+
+    A coleta roda numa thread própria, excluída das amostras; a thread
+    que chamou profile() também é excluída, a menos que `exclude_caller`
+    seja False.
+    """
+
+    def __init__(self, max_stack_depth: int = 128):
+        """
+        Inicializa o profiler.
+
+        Args:
+            max_stack_depth: Profundidade máxima registrada por pilha
+                (frames mais próximos da raiz são descartados)
+        """
+        self.max_stack_depth = max_stack_depth
+        self._running = threading.Lock()
+        self._labels: Dict[Any, str] = {}
+
+    @property
+    def is_running(self) -> bool:
+        """Indica se há uma coleta em andamento."""
+        return self._running.locked()
+
+    def profile(
+        self,
+        duration: float = 10.0,
+        interval: float = 0.005,
+        exclude_caller: bool = True
+    ) -> ProfileResult:
+        """
+        Coleta amostras durante `duration` segundos (bloqueia a thread chamadora).
+
+        Args:
+            duration: Duração da coleta (limitada a MAX_DURATION_SECONDS)
+            interval: Intervalo entre amostras (mínimo MIN_INTERVAL_SECONDS)
+            exclude_caller: Exclui a thread chamadora das amostras
+
+        Returns:
+            ProfileResult com as pilhas agregadas
+
+        Raises:
+            ProfilerBusyError: Se outra coleta estiver em andamento
+        """
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusyError("Profiling already in progress")
+
+        try:
+            duration = min(max(duration, 0.0), MAX_DURATION_SECONDS)
+            interval = max(interval, MIN_INTERVAL_SECONDS)
+            result = ProfileResult(Counter(), 0, 0.0, interval)
+            stop = threading.Event()
+            ignored = {threading.get_ident()} if exclude_caller else set()
+
+            sampler = threading.Thread(
+                target=self._sample_loop,
+                args=(result, stop, interval, ignored),
+                name="sampling-profiler",
+                daemon=True
+            )
+            started = time.perf_counter()
+            sampler.start()
+            stop.wait(duration)
+            stop.set()
+            sampler.join()
+            result.duration_seconds = time.perf_counter() - started
+            return result
+        finally:
+            # Não mantém code objects vivos entre coletas
+            self._labels.clear()
+            self._running.release()
+
+    def _sample_loop(
+        self,
+        result: ProfileResult,
+        stop: threading.Event,
+        interval: float,
+        ignored: Set[int]
+    ) -> None:
+        """Loop da thread de amostragem."""
+        ignored = ignored | {threading.get_ident()}
+        next_sample = time.perf_counter()
+
+        while not stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident in ignored:
+                    continue
+                thread_name = names.get(ident, f"thread-{ident}")
+                result.stacks[self._fold(thread_name, frame)] += 1
+                result.threads.add(thread_name)
+            result.samples += 1
+
+            # Intervalo fixo a partir do início de cada amostra (sem acumular atraso)
+            next_sample += interval
+            delay = next_sample - time.perf_counter()
+            if delay < 0:
+                next_sample = time.perf_counter()
+                delay = 0
+            stop.wait(delay)
+
+    def _fold(self, thread_name: str, frame: Any) -> Tuple[str, ...]:
+        """Converte a pilha de um frame em tupla raiz → folha."""
+        labels = []
+        depth = 0
+        while frame is not None and depth < self.max_stack_depth:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+            depth += 1
+        labels.append(thread_name)
+        labels.reverse()
+        return tuple(labels)
+
+    def _label(self, code: Any) -> str:
+        """Rótulo `função (arquivo:linha)` por code object, em cache."""
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            # `;` separa frames no formato folded (a contagem vem após o último espaço)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+            self._labels[code] = label
+        return label
+
+
+# Instância global
+_global_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Obtém instância global do profiler."""
+    global _global_profiler
+    if _global_profiler is None:
+        _global_profiler = SamplingProfiler()
+    return _global_profiler
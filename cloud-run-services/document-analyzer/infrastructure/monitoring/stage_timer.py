@@ -0,0 +1,126 @@
+"""
+Stage Timer
+
+Medição leve de latência por etapa do pipeline de análise:
+- Context manager e decorator baseados em perf_counter_ns
+- Cada etapa alimenta o histograma `analysis_stage_duration_seconds`
+  (labels `pipeline` e `stage`) do MetricsCollector
+- Breakdown em milissegundos disponível para o bloco `timings` da resposta
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+STAGE_METRIC = "analysis_stage_duration_seconds"
+
+_current_timer: ContextVar[Optional["StageTimer"]] = ContextVar("stage_timer", default=None)
+
+
+class StageTimer:
+    """
+    Cronômetro de etapas de uma execução do pipeline.
+
+    Etapas com o mesmo nome (ex.: uma por regra) são somadas no breakdown
+    e observadas individualmente no histograma.
+    """
+
+    def __init__(self, pipeline: str, collector: Optional[Any] = None, metric_name: str = STAGE_METRIC):
+        """
+        Inicializa o cronômetro.
+
+        Args:
+            pipeline: Nome do pipeline (label `pipeline` do histograma)
+            collector: MetricsCollector de destino (default: coletor global)
+            metric_name: Nome do histograma
+        """
+        if collector is None:
+            from .metrics import get_metrics_collector
+            collector = get_metrics_collector()
+        self.pipeline = pipeline
+        self.metric_name = metric_name
+        self._collector = collector
+        self._stages_ns: Dict[str, int] = {}
+        self._started_ns = time.perf_counter_ns()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mede o bloco como a etapa `name` (também em caso de exceção)."""
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - started)
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        """Registra uma duração já medida para a etapa."""
+        self._stages_ns[name] = self._stages_ns.get(name, 0) + elapsed_ns
+        self._collector.observe_histogram(
+            self.metric_name,
+            elapsed_ns / 1e9,
+            {'pipeline': self.pipeline, 'stage': name}
+        )
+
+    @contextmanager
+    def activate(self) -> Iterator["StageTimer"]:
+        """Torna este cronômetro o atual para funções decoradas com timed_stage."""
+        token = _current_timer.set(self)
+        try:
+            yield self
+        finally:
+            _current_timer.reset(token)
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Tempo desde a criação do cronômetro em milissegundos."""
+        return (time.perf_counter_ns() - self._started_ns) / 1e6
+
+    def timings(self) -> Dict[str, Any]:
+        """
+        Breakdown por etapa em milissegundos.
+
+        Returns:
+            Dict com `stages` (ms por etapa, na ordem de execução) e `total_ms`
+        """
+        return {
+            'stages': {name: round(ns / 1e6, 3) for name, ns in self._stages_ns.items()},
+            'total_ms': round(self.elapsed_ms, 3)
+        }
+
+
+def current_stage_timer() -> Optional[StageTimer]:
+    """Obtém o cronômetro ativo no contexto atual (se houver)."""
+    return _current_timer.get()
+
+
+def timed_stage(name: str) -> Callable:
+    """
+    Decorator que mede a função como etapa do cronômetro ativo.
+
+    Sem cronômetro ativo a função é chamada sem custo adicional
+    além da consulta ao ContextVar. Suporta funções síncronas e assíncronas.
+    """
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timer = _current_timer.get()
+                if timer is None:
+                    return await func(*args, **kwargs)
+                with timer.stage(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            timer = _current_timer.get()
+            if timer is None:
+                return func(*args, **kwargs)
+            with timer.stage(name):
+                return func(*args, **kwargs)
+        return sync_wrapper
+
+    return decorator
@@ -0,0 +1,151 @@
+"""
+MinHash LSH Index
+
+Índice de quase-duplicatas para o repositório de documentos:
+- Assinatura MinHash do conjunto de palavras, calculada uma vez por documento
+- LSH por bandas: documentos que coincidem em alguma banda viram candidatos
+- Similaridade de Jaccard exata verificada apenas nos candidatos
+
+Com 64 permutações em 16 bandas de 4 linhas, um par com Jaccard >= 0.7
+vira candidato com probabilidade >= 98,7% (>= 99,99% com Jaccard 0.9).
+"""
+
+import zlib
+from typing import AbstractSet, Any, Dict, List, Set
+
+import numpy as np
+
+# Maior primo de 32 bits: a * h + b cabe em uint64 para a, b, h < 2^32
+_PRIME = np.uint64(4294967291)
+
+
+def jaccard_similarity(words1: AbstractSet[str], words2: AbstractSet[str]) -> float:
+    """
+    Similaridade de Jaccard entre dois conjuntos de palavras.
+
+    Args:
+        words1: Primeiro conjunto
+        words2: Segundo conjunto
+
+    Returns:
+        |interseção| / |união|, 0.0 se algum conjunto estiver vazio
+    """
+    if not words1 or not words2:
+        return 0.0
+    intersection = len(words1 & words2)
+    return intersection / (len(words1) + len(words2) - intersection)
+
+
+class MinHashLSHIndex:
+    """
+    Índice LSH sobre assinaturas MinHash.
+
+    Cada documento guarda só as chaves das suas bandas (bytes), usadas
+    para removê-lo do índice; buckets com um único documento guardam o ID
+    diretamente em vez de um conjunto.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm deve ser múltiplo de bands")
+
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._a = rng.integers(1, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=(num_perm, 1), dtype=np.uint64)
+        # Combina as linhas de uma banda numa chave de 64 bits
+        self._row_mix = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self._buckets: List[Dict[int, Any]] = [{} for _ in range(bands)]
+        self._band_keys: Dict[str, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._band_keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._band_keys
+
+    def signature(self, words: AbstractSet[str]) -> np.ndarray:
+        """
+        Calcula assinatura MinHash de um conjunto de palavras.
+
+        Args:
+            words: Conjunto de palavras (não vazio)
+
+        Returns:
+            Array uint64 com `num_perm` mínimos
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(word.encode()) for word in words),
+            dtype=np.uint64,
+            count=len(words)
+        )
+        return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+    def add(self, key: str, words: AbstractSet[str]) -> None:
+        """
+        Indexa documento (substitui a entrada anterior da mesma chave).
+
+        Args:
+            key: ID do documento
+            words: Conjunto de palavras do documento
+        """
+        self.remove(key)
+        if not words:
+            return
+
+        band_keys = self._bands(self.signature(words))
+        for buckets, band_key in zip(self._buckets, band_keys.tolist()):
+            current = buckets.get(band_key)
+            if current is None:
+                buckets[band_key] = key
+            elif isinstance(current, str):
+                buckets[band_key] = {current, key}
+            else:
+                current.add(key)
+        self._band_keys[key] = band_keys.tobytes()
+
+    def remove(self, key: str) -> None:
+        """Remove documento do índice, se presente."""
+        stored = self._band_keys.pop(key, None)
+        if stored is None:
+            return
+
+        for buckets, band_key in zip(self._buckets, np.frombuffer(stored, dtype=np.uint64).tolist()):
+            current = buckets[band_key]
+            if isinstance(current, str):
+                del buckets[band_key]
+            else:
+                current.discard(key)
+                if len(current) == 1:
+                    buckets[band_key] = current.pop()
+
+    def candidates(self, words: AbstractSet[str]) -> Set[str]:
+        """
+        Busca documentos que compartilham ao menos uma banda.
+
+        Args:
+            words: Conjunto de palavras da consulta
+
+        Returns:
+            IDs candidatos (a similaridade deve ser verificada)
+        """
+        if not words:
+            return set()
+
+        found: Set[str] = set()
+        for buckets, band_key in zip(self._buckets, self._bands(self.signature(words)).tolist()):
+            current = buckets.get(band_key)
+            if current is None:
+                continue
+            if isinstance(current, str):
+                found.add(current)
+            else:
+                found.update(current)
+        return found
+
+    def _bands(self, signature: np.ndarray) -> np.ndarray:
+        """Chave de 64 bits por banda (soma com overflow das linhas misturadas)."""
+        return (signature.reshape(self.bands, self.rows) * self._row_mix).sum(axis=1, dtype=np.uint64)
@@ -0,0 +1,17 @@
+"""
+Serialization Infrastructure
+
+Serialização JSON rápida (orjson quando disponível) para respostas
+de análise. Os adapters de framework ficam em módulos próprios
+(`fastapi_response`, `flask_provider`) para não importar o framework
+do outro serviço.
+"""
+
+from .json_codec import HAS_ORJSON, dumps, loads, to_builtins
+
+__all__ = [
+    'HAS_ORJSON',
+    'dumps',
+    'loads',
+    'to_builtins'
+]
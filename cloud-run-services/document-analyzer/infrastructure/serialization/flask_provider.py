@@ -0,0 +1,26 @@
+"""
+Flask JSON Provider
+
+Provider de JSON do Flask (`app.json`) serializado pelo json_codec:
+`jsonify` passa a gerar os bytes direto, sem texto intermediário.
+"""
+
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from .json_codec import dumps, loads
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider com orjson (ou stdlib como fallback); chaves na ordem de inserção."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps(obj).decode()
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
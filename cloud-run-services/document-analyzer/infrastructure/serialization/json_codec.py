@@ -0,0 +1,134 @@
+"""
+JSON Codec
+
+Serialização JSON para respostas de análise:
+- orjson quando instalado (dataclasses, enums, datetimes, UUIDs e numpy
+  serializados direto dos objetos, sem cópia intermediária em dict)
+- Fallback para o json da stdlib com o mesmo resultado
+- `to_builtins` converte objetos em tipos nativos com conversores
+  pré-computados por tipo (campos de dataclass resolvidos uma vez),
+  substituindo `dataclasses.asdict` e recursões genéricas
+"""
+
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if HAS_ORJSON else 0
+
+_NATIVE = (str, int, float, bool, type(None))
+
+# Conversor por tipo exato; None = tipo desconhecido (mantido como está)
+_converters: Dict[type, Optional[Callable[[Any], Any]]] = {}
+
+
+def to_builtins(obj: Any) -> Any:
+    """
+    Converte objeto em estrutura de tipos nativos (dict, list, str, números).
+
+    Sempre cria novos dicts/lists, então o resultado pode ser alterado sem
+    afetar o objeto original. Tipos desconhecidos são mantidos como estão.
+
+    Args:
+        obj: Objeto a converter (dataclass, enum, datetime, modelo Pydantic...)
+
+    Returns:
+        Versão JSON-safe do objeto
+    """
+    cls = type(obj)
+    if cls in _NATIVE:
+        return obj
+    try:
+        converter = _converters[cls]
+    except KeyError:
+        converter = _converters[cls] = _converter_for(cls)
+    return obj if converter is None else converter(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serializa objeto em JSON (UTF-8, compacto).
+
+    Args:
+        obj: Objeto a serializar
+
+    Returns:
+        Bytes do JSON
+
+    Raises:
+        TypeError: Se algum valor não for serializável
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def loads(data: Any) -> Any:
+    """Desserializa JSON (bytes ou str)."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(obj: Any) -> Any:
+    """Hook de tipos não suportados nativamente pelo serializador."""
+    converter = _converters.get(type(obj))
+    if converter is None:
+        converter = _converter_for(type(obj))
+        if converter is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        _converters[type(obj)] = converter
+    return converter(obj)
+
+
+def _converter_for(cls: type) -> Optional[Callable[[Any], Any]]:
+    """Resolve o conversor de um tipo (executado uma vez por tipo)."""
+    # Enum antes de str/int: enums como `class X(str, Enum)` viram o valor
+    if issubclass(cls, Enum):
+        return lambda obj: to_builtins(obj.value)
+    if dataclasses.is_dataclass(cls):
+        return _dataclass_converter(cls)
+    if cls.__module__ == 'numpy':
+        # Escalares numpy (subclasses de float/int) e arrays
+        return lambda obj: obj.tolist()
+    if issubclass(cls, _NATIVE):
+        return None
+    if issubclass(cls, dict):
+        return lambda obj: {
+            (key if type(key) is str else str(to_builtins(key))): to_builtins(value)
+            for key, value in obj.items()
+        }
+    if issubclass(cls, (list, tuple, set, frozenset)):
+        return lambda obj: [to_builtins(item) for item in obj]
+    if issubclass(cls, (datetime, date, time)):
+        return lambda obj: obj.isoformat()
+    if issubclass(cls, UUID):
+        return str
+    if issubclass(cls, Decimal):
+        return float
+    if hasattr(cls, 'model_dump'):
+        return lambda obj: obj.model_dump(mode='json')
+    if callable(getattr(cls, 'to_dict', None)):
+        return lambda obj: to_builtins(obj.to_dict())
+    return None
+
+
+def _dataclass_converter(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    """Conversor com a lista de campos da dataclass pré-computada."""
+    names: Tuple[str, ...] = tuple(f.name for f in dataclasses.fields(cls))
+
+    def convert(obj: Any) -> Dict[str, Any]:
+        return {name: to_builtins(getattr(obj, name)) for name in names}
+
+    return convert
@@ -8,27 +8,30 @@ Implementa endpoints para análise e classificação de documentos.
 """
 
 import os
+import hmac
 import logging
+import time
 import traceback
 from datetime import datetime
 from typing import Dict, Any
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, Response
 from flask_cors import CORS
 from werkzeug.exceptions import BadRequest, InternalServerError
 
-# Google Cloud imports
-from google.cloud import firestore
-
-# Imports dos serviços locais
-from services.analysis_engine import AnalysisEngine
-from services.classification_service import classify_document_type
-from services.conformity_checker import check_conformity
-from services.ocr_service import OCRService
-from services.continuous_learning_service import (
-    collect_classification_feedback,
-    trigger_model_retraining,
-    get_ml_statistics
+# Serviços e backends pesados (sklearn, Vision, Firestore) são carregados
+# sob demanda pelo registro de componentes (ou no preload do gunicorn)
+from startup import get_component_registry
+from infrastructure.monitoring.metrics import get_metrics_collector
+from infrastructure.monitoring.exposition import CONTENT_TYPE as OPENMETRICS_CONTENT_TYPE
+from infrastructure.monitoring.stage_timer import StageTimer
+from infrastructure.monitoring.profiler import (
+    MAX_DURATION_SECONDS,
+    ProfilerBusyError,
+    get_profiler
 )
+from infrastructure.serialization.flask_provider import FastJSONProvider
+
+_INIT_STARTED = time.perf_counter()
 
 # Configurar logging estruturado
 logging.basicConfig(
@@ -39,50 +42,114 @@ logger = logging.getLogger(__name__)
 
 # Inicializar Flask app
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 CORS(app)  # Habilitar CORS para frontend
 
-# Inicializar Firestore
-try:
-    db = firestore.Client()
-    logger.info("✅ Firestore client inicializado com sucesso")
-except Exception as e:
-    logger.error(f"❌ Erro ao inicializar Firestore: {e}")
-    db = None
 
-# Inicializar serviços
-analysis_engine = AnalysisEngine()
-ocr_service = OCRService()
-ocr_service.initialize()
+def _create_firestore_client():
+    from google.cloud import firestore
+    return firestore.Client()
+
+def _create_analysis_engine():
+    from services.analysis_engine import AnalysisEngine
+    return AnalysisEngine()
+
+def _load_classifier():
+    from services.classification_service import classify_document_type
+    return classify_document_type
+
+def _load_conformity_checker():
+    from services.conformity_checker import check_conformity
+    return check_conformity
+
+def _create_ocr_service():
+    from services.ocr_service import OCRService
+    service = OCRService()
+    service.initialize()
+    return service
+
+def _load_ml_service():
+    import services.continuous_learning_service as continuous_learning_service
+    return continuous_learning_service
+
+def _server_timestamp():
+    from google.cloud import firestore
+    return firestore.SERVER_TIMESTAMP
+
+# Registrar componentes (clientes gRPC não são fork-safe: criados por worker)
+startup = get_component_registry()
+firestore_client = startup.register(
+    'firestore', _create_firestore_client,
+    modules=('google.cloud.firestore',), fork_safe=False, required=False
+)
+analysis_engine = startup.register('analysis_engine', _create_analysis_engine)
+classifier = startup.register('classifier', _load_classifier)
+conformity_checker = startup.register('conformity_checker', _load_conformity_checker)
+ocr_service = startup.register(
+    'ocr', _create_ocr_service,
+    modules=('services.ocr_service',), fork_safe=False
+)
+ml_service = startup.register('ml', _load_ml_service)
 
 # Métricas
 REQUEST_COUNT = 0
 SUCCESS_COUNT = 0
 ERROR_COUNT = 0
 
+@app.before_request
+def start_request_timer():
+    """Marca o início da requisição para o histograma de latência."""
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Registra contagem e latência por rota no MetricsCollector."""
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Regra da rota (não o path cru) para manter a cardinalidade baixa
+        labels = {
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else 'unmatched',
+            'status': str(response.status_code)
+        }
+        collector = get_metrics_collector()
+        collector.increment('http_requests_total', labels=labels)
+        collector.observe_histogram('http_request_duration_seconds', time.perf_counter() - started, labels)
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métricas no formato OpenMetrics (scrape do Prometheus)."""
+    return Response(get_metrics_collector().to_openmetrics(), content_type=OPENMETRICS_CONTENT_TYPE)
+
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint com verificação de Firestore."""
+    """Health check endpoint com verificação de Firestore e dos componentes obrigatórios."""
     global REQUEST_COUNT
     REQUEST_COUNT += 1
 
-    firestore_healthy = db is not None
+    firestore_healthy = firestore_client.get() is not None
+    failed = startup.failed_required()
+    healthy = firestore_healthy and not failed
 
     return jsonify({
-        'status': 'healthy' if firestore_healthy else 'degraded',
+        'status': 'healthy' if healthy else 'degraded',
         'service': 'document-analyzer',
         'version': '2.0.0',
         'services': {
-            'ocr': True,
-            'classification': True,
-            'analysis': True,
+            'ocr': 'ocr' not in failed,
+            'classification': 'classifier' not in failed,
+            'analysis': 'analysis_engine' not in failed and 'conformity_checker' not in failed,
             'firestore': firestore_healthy
         },
+        'failed_components': failed,
         'metrics': {
             'requests': REQUEST_COUNT,
             'success': SUCCESS_COUNT,
             'errors': ERROR_COUNT
-        }
-    }), 200 if firestore_healthy else 503
+        },
+        'startup': startup.report()
+    }), 200 if healthy else 503
 
 @app.route('/analyze', methods=['POST'])
 def analyze_document():
@@ -111,21 +178,24 @@ def analyze_document():
         document_id = metadata.get('document_id', f'doc_{int(start_time.timestamp())}')
 
         logger.info(f"🔍 Analisando documento {document_id}")
+        timer = StageTimer('analyze')
 
         # 1. Análise real com AnalysisEngine
-        analysis_result = analysis_engine.analyze_with_custom_params(
+        analysis_result = analysis_engine.get().analyze_with_custom_params(
             content=document_content,
             document_type=document_type,
             org_config=org_config,
-            custom_params=analysis_options.get('weights', {})
+            custom_params=analysis_options.get('weights', {}),
+            timer=timer
         )
 
         # 2. Verificação de conformidade
-        conformity_result = check_conformity(
-            document_content=document_content,
-            document_type=document_type,
-            custom_rules=analysis_options.get('custom_rules', [])
-        )
+        with timer.stage('conformity'):
+            conformity_result = conformity_checker.get()(
+                document_content=document_content,
+                document_type=document_type,
+                custom_rules=analysis_options.get('custom_rules', [])
+            )
 
         # 3. Preparar resultado final
         analysis_id = f"analysis_{document_id}_{int(start_time.timestamp())}"
@@ -143,7 +213,8 @@ def analyze_document():
                 'recommendations': conformity_result.get('recommendations', []),
                 'metrics': {
                     'processing_time': processing_time,
-                    'content_length': len(document_content)
+                    'content_length': len(document_content),
+                    'base_analysis_cache': analysis_result['metadata'].get('base_cache')
                 },
                 'categories': analysis_result.get('categories', {}),
                 'ai_used': analysis_options.get('include_ai', False)
@@ -152,16 +223,22 @@ def analyze_document():
         }
 
         # 4. ✅ PERSISTIR no Firestore
+        db = firestore_client.get()
         if db:
             try:
-                db.collection('analysis_results').document(analysis_id).set({
-                    **final_result,
-                    'persisted_at': firestore.SERVER_TIMESTAMP
-                })
+                with timer.stage('persistence'):
+                    db.collection('analysis_results').document(analysis_id).set({
+                        **final_result,
+                        'persisted_at': _server_timestamp()
+                    })
                 logger.info(f"✅ Análise {analysis_id} persistida no Firestore")
             except Exception as e:
                 logger.error(f"❌ Erro ao persistir: {e}")
 
+        # Breakdown por etapa (opt-in: analysis_options.include_timings)
+        if analysis_options.get('include_timings'):
+            final_result['timings'] = timer.timings()
+
         SUCCESS_COUNT += 1
         return jsonify(final_result), 200
 
@@ -198,7 +275,7 @@ def classify_document():
         logger.info(f"🏷️  Classificando documento {document_id}")
 
         # Classificação REAL
-        classification = classify_document_type(document_content)
+        classification = classifier.get()(document_content)
 
         result = {
             'document_id': document_id,
@@ -211,11 +288,12 @@ def classify_document():
         }
 
         # Persistir classificação
+        db = firestore_client.get()
         if db:
             try:
                 db.collection('document_classifications').document(document_id).set({
                     **result,
-                    'persisted_at': firestore.SERVER_TIMESTAMP
+                    'persisted_at': _server_timestamp()
                 })
             except Exception as e:
                 logger.warning(f"⚠️  Erro ao persistir classificação: {e}")
@@ -273,7 +351,7 @@ def ocr_extract():
         logger.info(f"🔍 OCR extraction for: {filename}")
 
         # Executar OCR avançado
-        ocr_result = ocr_service.extract_full(
+        ocr_result = ocr_service.get().extract_full(
             file_content=file_content,
             filename=filename,
             extract_tables=extract_tables,
@@ -359,7 +437,7 @@ def ocr_extract():
 @app.route('/ocr/stats', methods=['GET'])
 def ocr_stats():
     """Retorna estatísticas do serviço OCR."""
-    stats = ocr_service.get_stats()
+    stats = ocr_service.get().get_stats()
     return jsonify(stats), 200
 
 # ========================================
@@ -390,6 +468,7 @@ def ml_feedback():
             ERROR_COUNT += 1
             raise BadRequest(f"Missing required fields: {', '.join(missing_fields)}")
 
+        db = firestore_client.get()
         if not db:
             ERROR_COUNT += 1
             raise InternalServerError('Firestore not available')
@@ -397,7 +476,7 @@ def ml_feedback():
         logger.info(f"📝 Coletando feedback ML para documento {data['document_id']}")
 
         # Coletar feedback
-        example_id = collect_classification_feedback(
+        example_id = ml_service.get().collect_classification_feedback(
             db=db,
             document_id=data['document_id'],
             content=data['content'],
@@ -435,6 +514,7 @@ def ml_retrain():
     REQUEST_COUNT += 1
 
     try:
+        db = firestore_client.get()
         if not db:
             ERROR_COUNT += 1
             raise InternalServerError('Firestore not available')
@@ -442,7 +522,7 @@ def ml_retrain():
         logger.info("🔄 Iniciando re-treinamento do modelo ML...")
 
         # Disparar re-treinamento
-        result = trigger_model_retraining(db)
+        result = ml_service.get().trigger_model_retraining(db)
 
         if result:
             SUCCESS_COUNT += 1
@@ -478,13 +558,14 @@ def ml_stats():
     REQUEST_COUNT += 1
 
     try:
+        db = firestore_client.get()
         if not db:
             raise InternalServerError('Firestore not available')
 
         logger.info("📊 Obtendo estatísticas ML...")
 
         # Obter estatísticas
-        stats = get_ml_statistics(db)
+        stats = ml_service.get().get_ml_statistics(db)
 
         SUCCESS_COUNT += 1
         return jsonify(stats), 200
@@ -495,6 +576,48 @@ def ml_stats():
         logger.error(traceback.format_exc())
         return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
 
+def _is_admin_request() -> bool:
+    """Confere o header X-Admin-Key com ADMIN_API_KEY (sem a variável, admin desabilitado)."""
+    admin_key = os.getenv('ADMIN_API_KEY')
+    provided = request.headers.get('X-Admin-Key')
+    if not admin_key or not provided:
+        return False
+    return hmac.compare_digest(provided.encode(), admin_key.encode())
+
+@app.route('/admin/profile', methods=['POST'])
+def profile_process():
+    """
+    🔥 Perfil por amostragem do worker atual durante `duration` segundos.
+
+    Retorna pilhas folded (flamegraph.pl/speedscope) ou, com format=json,
+    um resumo das funções mais quentes. Com vários workers do gunicorn,
+    apenas o worker que atendeu este request é amostrado; com workers
+    gthread (gunicorn.conf.py), os requests atendidos pelas outras threads
+    do worker durante a coleta entram nas amostras.
+    """
+    if not _is_admin_request():
+        logger.warning("⚠️ Requisição administrativa não autorizada")
+        return jsonify({'error': 'Acesso administrativo negado'}), 403
+
+    try:
+        duration = float(request.args.get('duration', 10.0))
+        interval = float(request.args.get('interval', 0.005))
+    except ValueError:
+        return jsonify({'error': 'duration e interval devem ser numéricos'}), 400
+    if not 0 < duration <= MAX_DURATION_SECONDS or not 0.001 <= interval <= 1.0:
+        return jsonify({'error': f'duration deve estar em (0, {MAX_DURATION_SECONDS:g}] e interval em [0.001, 1]'}), 400
+
+    try:
+        result = get_profiler().profile(duration, interval, exclude_caller=False)
+    except ProfilerBusyError:
+        return jsonify({'error': 'Profiling already in progress'}), 409
+
+    logger.info(f"🔥 Perfil coletado: {result.samples} amostras, {len(result.stacks)} pilhas")
+
+    if request.args.get('format') == 'json':
+        return jsonify(result.to_dict())
+    return Response(result.to_folded(), content_type='text/plain; charset=utf-8')
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -505,6 +628,11 @@ def internal_error(error):
 
 # Registrar tempo de início
 app.config['START_TIME'] = datetime.now()
+startup.record_phase('app_init', time.perf_counter() - _INIT_STARTED)
+
+# Com `preload_app` do gunicorn, roda no master antes do fork dos workers
+if startup.mode == 'preload':
+    startup.preload()
 
 if __name__ == '__main__':
     # Configuração para Cloud Run
@@ -516,9 +644,8 @@ if __name__ == '__main__':
     logger.info("="*80)
     logger.info(f"📍 Porta: {port}")
     logger.info(f"🔧 Debug: {debug}")
-    logger.info(f"💾 Firestore: {'✅ Conectado' if db else '❌ Desconectado'}")
-    logger.info(f"⚙️  Analysis Engine: ✅ Inicializado")
-    logger.info(f"🔍 Services: ✅ Disponíveis")
+    logger.info(f"🧊 Startup: {startup.mode}")
+    logger.info(f"🔍 Services: {', '.join(startup.report()['components'])}")
     logger.info("="*80)
 
     app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
@@ -8,13 +8,13 @@ serialização avançada e validação cruzada.
 import json
 from datetime import datetime
 from typing import Dict, List, Any, Type, TypeVar
-from uuid import UUID
 
 from pydantic import BaseModel
 
 from .document_models import Document
 from .analysis_models import AnalysisResult
 from .config_models import OrganizationConfig, AnalysisWeights
+from infrastructure.serialization import to_builtins
 
 # Type variable para funções genéricas
 T = TypeVar('T', bound=BaseModel)
@@ -39,18 +39,7 @@ class ModelConverter:
         Returns:
             Versão JSON-safe do objeto
         """
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, UUID):
-            return str(obj)
-        elif isinstance(obj, BaseModel):
-            return obj.dict()
-        elif isinstance(obj, (list, tuple)):
-            return [ModelConverter.to_json_safe(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {key: ModelConverter.to_json_safe(value) for key, value in obj.items()}
-        else:
-            return obj
+        return to_builtins(obj)
     
     @staticmethod
     def serialize_model(model: BaseModel, include_metadata: bool = True) -> Dict[str, Any]:
@@ -11,14 +11,17 @@ Implementa análise personalizada baseada em parâmetros organizacionais:
 
 import os
 import logging
-import json
 import hashlib
+import threading
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import re
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+
+from infrastructure.monitoring.stage_timer import StageTimer
+from infrastructure.serialization import to_builtins
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +51,20 @@ class CategoryAnalysis:
     details: Dict[str, Any]
     confidence: float
 
+@dataclass
+class BaseAnalysis:
+    """
+    Parte da análise independente da organização.
+    
+    Depende apenas do conteúdo e do tipo do documento, então é
+    compartilhada entre organizações que analisam o mesmo edital.
+    """
+    categories: Dict[str, CategoryAnalysis]
+    category_scores: Dict[str, float]
+    overall_score: float
+    content_length: int
+    word_count: int
+
 @dataclass
 class AnalysisResult:
     """Resultado completo da análise."""
@@ -60,11 +77,42 @@ class AnalysisResult:
     processing_time: float
 
 class AnalysisEngine:
-    """Motor de análise adaptativo para documentos licitatórios."""
+    """
+    Motor de análise adaptativo para documentos licitatórios.
+    
+    O pipeline tem duas etapas:
+    - Base (cara): análises por categoria, em cache por hash do conteúdo
+      e tipo do documento, compartilhada entre organizações
+    - Organizacional (barata): pesos, score ponderado e resumo, sempre
+      recalculada a partir da base
+    """
     
-    def __init__(self):
-        """Inicializar motor de análise."""
-        self.cache = {}  # Cache de resultados
+    # Seções obrigatórias por tipo de documento
+    REQUIRED_SECTIONS = {
+        'edital_licitacao': [
+            'objeto', 'condições de participação', 'documentação',
+            'proposta', 'julgamento', 'recursos', 'adjudicação'
+        ],
+        'termo_referencia': [
+            'objeto', 'justificativa', 'especificações técnicas',
+            'cronograma', 'orçamento estimado'
+        ],
+        'projeto_basico': [
+            'objeto', 'justificativa', 'especificações',
+            'cronograma', 'orçamento', 'responsável técnico'
+        ]
+    }
+    
+    def __init__(self, max_cache_entries: int = 500):
+        """
+        Inicializar motor de análise.
+        
+        Args:
+            max_cache_entries: Máximo de análises base em cache (LRU)
+        """
+        self.cache: "OrderedDict[str, BaseAnalysis]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.max_cache_entries = max_cache_entries
         self.default_weights = AnalysisWeights()
         
         # Regras de análise por categoria
@@ -74,7 +122,8 @@ class AnalysisEngine:
     
     def analyze_with_custom_params(self, content: str, document_type: str,
                                  org_config: Dict[str, Any],
-                                 custom_params: Dict[str, Any]) -> Dict[str, Any]:
+                                 custom_params: Dict[str, Any],
+                                 timer: Optional[StageTimer] = None) -> Dict[str, Any]:
         """
         Executar análise com parâmetros personalizados.
         
@@ -83,91 +132,127 @@ class AnalysisEngine:
             document_type: Tipo do documento
             org_config: Configurações da organização
             custom_params: Parâmetros personalizados
+            timer: Cronômetro de etapas (breakdown de latência por etapa)
             
         Returns:
             Resultado completo da análise
         """
         import time
         start_time = time.time()
+        timer = timer or StageTimer("analysis_engine")
         
         try:
-            # Verificar cache
-            cache_key = self._generate_cache_key(content, document_type, org_config, custom_params)
-            if cache_key in self.cache:
-                logger.info("Resultado obtido do cache")
-                return self.cache[cache_key]
-            
-            # Extrair pesos personalizados
-            weights = self._extract_weights(custom_params)
-            
-            # Executar análise por categoria
-            structural_analysis = self._analyze_structural(content, document_type, custom_params)
-            legal_analysis = self._analyze_legal(content, document_type, custom_params)
-            clarity_analysis = self._analyze_clarity(content, document_type, custom_params)
-            abnt_analysis = self._analyze_abnt(content, document_type, custom_params)
-            
-            # Calcular scores ponderados
-            category_scores = {
-                'structural': structural_analysis.score,
-                'legal': legal_analysis.score,
-                'clarity': clarity_analysis.score,
-                'abnt': abnt_analysis.score
-            }
+            # Etapa base: independente da organização
+            with timer.stage("cache_lookup"):
+                cache_key = self._generate_cache_key(content, document_type)
+                base = self._get_cached_base(cache_key)
+            cache_status = 'hit' if base is not None else 'miss'
+            if base is None:
+                base = self._analyze_base(content, document_type, timer)
+                self._cache_base(cache_key, base)
+            else:
+                logger.info("Análise base obtida do cache")
             
-            overall_score = np.mean(list(category_scores.values()))
-            weighted_score = (
-                structural_analysis.score * weights.structural +
-                legal_analysis.score * weights.legal +
-                clarity_analysis.score * weights.clarity +
-                abnt_analysis.score * weights.abnt
-            )
+            # Etapa organizacional: re-ponderação sobre a base
+            with timer.stage("reweighting"):
+                weights = self._extract_weights(custom_params)
+                weighted_score = (
+                    base.category_scores['structural'] * weights.structural +
+                    base.category_scores['legal'] * weights.legal +
+                    base.category_scores['clarity'] * weights.clarity +
+                    base.category_scores['abnt'] * weights.abnt
+                )
             
             # Criar resultado
+            with timer.stage("summary"):
+                summary = self._generate_summary(base.category_scores, weights)
             result = AnalysisResult(
-                overall_score=overall_score,
+                overall_score=base.overall_score,
                 weighted_score=weighted_score,
-                categories={
-                    'structural': structural_analysis,
-                    'legal': legal_analysis,
-                    'clarity': clarity_analysis,
-                    'abnt': abnt_analysis
-                },
-                summary=self._generate_summary(category_scores, weights),
+                categories=base.categories,
+                summary=summary,
                 metadata={
                     'document_type': document_type,
-                    'content_length': len(content),
-                    'word_count': len(content.split()),
+                    'content_length': base.content_length,
+                    'word_count': base.word_count,
                     'weights_used': asdict(weights),
                     'custom_params': custom_params,
-                    'org_config': org_config
+                    'org_config': org_config,
+                    'base_cache': cache_status
                 },
                 timestamp=datetime.now().isoformat(),
                 processing_time=time.time() - start_time
             )
             
-            # Converter para dict para serialização
-            result_dict = asdict(result)
+            logger.info(f"Análise concluída: score geral {base.overall_score:.2f}, ponderado {weighted_score:.2f}")
             
-            # Armazenar no cache
-            self.cache[cache_key] = result_dict
-            
-            logger.info(f"Análise concluída: score geral {overall_score:.2f}, ponderado {weighted_score:.2f}")
-            
-            return result_dict
+            # Converter para tipos nativos (cópia: a base em cache não é exposta)
+            return to_builtins(result)
             
         except Exception as e:
             logger.error(f"Erro na análise: {str(e)}")
             raise
     
-    def _analyze_structural(self, content: str, document_type: str, 
-                          custom_params: Dict[str, Any]) -> CategoryAnalysis:
+    def _analyze_base(self, content: str, document_type: str, timer: StageTimer) -> BaseAnalysis:
+        """
+        Executar as análises por categoria (independentes da organização).
+        
+        Args:
+            content: Conteúdo do documento
+            document_type: Tipo do documento
+            timer: Cronômetro de etapas
+            
+        Returns:
+            BaseAnalysis com categorias e scores
+        """
+        with timer.stage("category.structural"):
+            structural_analysis = self._analyze_structural(content, document_type)
+        with timer.stage("category.legal"):
+            legal_analysis = self._analyze_legal(content, document_type)
+        with timer.stage("category.clarity"):
+            clarity_analysis = self._analyze_clarity(content, document_type)
+        with timer.stage("category.abnt"):
+            abnt_analysis = self._analyze_abnt(content, document_type)
+        
+        categories = {
+            'structural': structural_analysis,
+            'legal': legal_analysis,
+            'clarity': clarity_analysis,
+            'abnt': abnt_analysis
+        }
+        category_scores = {name: analysis.score for name, analysis in categories.items()}
+        
+        return BaseAnalysis(
+            categories=categories,
+            category_scores=category_scores,
+            overall_score=float(np.mean(list(category_scores.values()))),
+            content_length=len(content),
+            word_count=len(content.split())
+        )
+    
+    def _get_cached_base(self, cache_key: str) -> Optional[BaseAnalysis]:
+        """Buscar análise base no cache (atualiza a ordem LRU)."""
+        with self._cache_lock:
+            base = self.cache.get(cache_key)
+            if base is not None:
+                self.cache.move_to_end(cache_key)
+            return base
+    
+    def _cache_base(self, cache_key: str, base: BaseAnalysis):
+        """Armazenar análise base, removendo a menos usada acima do limite."""
+        with self._cache_lock:
+            self.cache[cache_key] = base
+            self.cache.move_to_end(cache_key)
+            while len(self.cache) > self.max_cache_entries:
+                self.cache.popitem(last=False)
+    
+    def _analyze_structural(self, content: str, document_type: str) -> CategoryAnalysis:
         """
         Analisar aspectos estruturais do documento.
         
         Args:
             content: Conteúdo do documento
             document_type: Tipo do documento
-            custom_params: Parâmetros personalizados
             
         Returns:
             CategoryAnalysis com resultado da análise estrutural
@@ -261,15 +346,13 @@ class AnalysisEngine:
             confidence=confidence
         )
     
-    def _analyze_legal(self, content: str, document_type: str,
-                      custom_params: Dict[str, Any]) -> CategoryAnalysis:
+    def _analyze_legal(self, content: str, document_type: str) -> CategoryAnalysis:
         """
         Analisar conformidade legal do documento.
         
         Args:
             content: Conteúdo do documento
             document_type: Tipo do documento
-            custom_params: Parâmetros personalizados
             
         Returns:
             CategoryAnalysis com resultado da análise legal
@@ -356,15 +439,13 @@ class AnalysisEngine:
             confidence=confidence
         )
     
-    def _analyze_clarity(self, content: str, document_type: str,
-                        custom_params: Dict[str, Any]) -> CategoryAnalysis:
+    def _analyze_clarity(self, content: str, document_type: str) -> CategoryAnalysis:
         """
         Analisar clareza e legibilidade do documento.
         
         Args:
             content: Conteúdo do documento
             document_type: Tipo do documento
-            custom_params: Parâmetros personalizados
             
         Returns:
             CategoryAnalysis com resultado da análise de clareza
@@ -448,15 +529,13 @@ class AnalysisEngine:
             confidence=confidence
         )
     
-    def _analyze_abnt(self, content: str, document_type: str,
-                     custom_params: Dict[str, Any]) -> CategoryAnalysis:
+    def _analyze_abnt(self, content: str, document_type: str) -> CategoryAnalysis:
         """
         Analisar conformidade com normas ABNT.
         
         Args:
             content: Conteúdo do documento
             document_type: Tipo do documento
-            custom_params: Parâmetros personalizados
             
         Returns:
             CategoryAnalysis com resultado da análise ABNT
@@ -621,31 +700,22 @@ class AnalysisEngine:
         else:
             return 'Inadequado'
     
-    def _generate_cache_key(self, content: str, document_type: str,
-                           org_config: Dict[str, Any], 
-                           custom_params: Dict[str, Any]) -> str:
+    def _generate_cache_key(self, content: str, document_type: str) -> str:
         """
-        Gerar chave de cache para o resultado.
+        Gerar chave de cache da análise base.
+        
+        Usa o mesmo hash de Document.get_content_hash(); pesos e
+        configurações da organização não fazem parte da chave.
         
         Args:
             content: Conteúdo do documento
             document_type: Tipo do documento
-            org_config: Configurações da organização
-            custom_params: Parâmetros personalizados
             
         Returns:
             Chave de cache
         """
-        # Criar hash do conteúdo e parâmetros
-        content_hash = hashlib.md5(content.encode()).hexdigest()[:16]
-        params_str = json.dumps({
-            'type': document_type,
-            'org': org_config,
-            'custom': custom_params
-        }, sort_keys=True)
-        params_hash = hashlib.md5(params_str.encode()).hexdigest()[:16]
-        
-        return f"{content_hash}_{params_hash}"
+        content_hash = hashlib.sha256(content.encode()).hexdigest()
+        return f"{document_type}:{content_hash}"
     
     def _load_analysis_rules(self):
         """
@@ -658,21 +728,7 @@ class AnalysisEngine:
     # Métodos auxiliares para análises específicas
     def _get_required_sections(self, document_type: str) -> List[str]:
         """Obter seções obrigatórias por tipo de documento."""
-        sections_map = {
-            'edital_licitacao': [
-                'objeto', 'condições de participação', 'documentação',
-                'proposta', 'julgamento', 'recursos', 'adjudicação'
-            ],
-            'termo_referencia': [
-                'objeto', 'justificativa', 'especificações técnicas',
-                'cronograma', 'orçamento estimado'
-            ],
-            'projeto_basico': [
-                'objeto', 'justificativa', 'especificações',
-                'cronograma', 'orçamento', 'responsável técnico'
-            ]
-        }
-        return sections_map.get(document_type, [])
+        return self.REQUIRED_SECTIONS.get(document_type, [])
     
     def _find_section(self, content: str, section: str) -> bool:
         """Verificar se uma seção está presente no documento."""
@@ -995,5 +1051,6 @@ class AnalysisEngine:
         """Obter estatísticas do cache."""
         return {
             'cache_size': len(self.cache),
-            'supported_types': list(self._get_required_sections('').keys())
+            'max_cache_entries': self.max_cache_entries,
+            'supported_types': list(self.REQUIRED_SECTIONS)
         }
\ No newline at end of file
@@ -24,8 +24,35 @@ from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 import joblib
 
+from services.metadata_scanner import MetadataScanner, PatternSpec
+
 logger = logging.getLogger(__name__)
 
+# Features booleanas extraídas pela tabela pré-compilada do MetadataScanner.
+# Padrões escritos para o texto em minúsculas (convertido uma única vez).
+FEATURE_SPECS = (
+    PatternSpec('has_numbered_sections', r'\d+\.\d+', True),
+    PatternSpec('has_bullet_points', r'[•\-\*]\s', True),
+    PatternSpec('has_tables', r'\|.*\|.*\||\t.*\t.*\t|\d+\s+\w+\s+\d+', True),
+    PatternSpec('has_signatures', r'assinatura|assinado|responsável', True),
+    PatternSpec('has_dates', r'\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}', True),
+    PatternSpec('has_values', r'r\$\s*\d+[.,]\d+', True),
+    PatternSpec('has_legal_references', r'lei\s+n[°º]?\s*\d+', True),
+    PatternSpec('has_article_references', r'art\.?\s*\d+', True),
+    PatternSpec('has_monetary_values', r'r\$|real|reais', True),
+    PatternSpec('has_technical_specs', r'especifica[çc][ãa]o|requisito|norma', True),
+)
+
+STRUCTURAL_FEATURES = (
+    'has_numbered_sections', 'has_bullet_points', 'has_tables',
+    'has_signatures', 'has_dates', 'has_values'
+)
+
+FORMAT_INDICATORS = (
+    'has_legal_references', 'has_article_references',
+    'has_monetary_values', 'has_technical_specs'
+)
+
 @dataclass
 class ClassificationResult:
     """Resultado da classificação de documento."""
@@ -121,6 +148,8 @@ class ClassificationService:
             ]
         }
         
+        self.feature_scanner = MetadataScanner(FEATURE_SPECS, head_size=None)
+        
         self._load_or_train_model()
         
         logger.info("Classification Service inicializado")
@@ -204,15 +233,9 @@ class ClassificationService:
             'uppercase_ratio': sum(1 for c in content if c.isupper()) / len(content) if content else 0
         }
         
-        # Features estruturais
-        structural_features = {
-            'has_numbered_sections': bool(re.search(r'\d+\.\d+', content)),
-            'has_bullet_points': bool(re.search(r'[•\-\*]\s', content)),
-            'has_tables': self._detect_table_structure(content),
-            'has_signatures': bool(re.search(r'assinatura|assinado|responsável', content_lower)),
-            'has_dates': bool(re.search(r'\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4}', content)),
-            'has_values': bool(re.search(r'R\$\s*\d+[.,]\d+', content))
-        }
+        # Features estruturais e indicadores de formato (varredura única)
+        detected = self.feature_scanner.scan(content).values()
+        structural_features = {name: detected.get(name, False) for name in STRUCTURAL_FEATURES}
         
         # Contagem de keywords por categoria
         keyword_matches = {}
@@ -220,13 +243,7 @@ class ClassificationService:
             matches = sum(1 for keyword in keywords if keyword in content_lower)
             keyword_matches[category] = matches
         
-        # Indicadores de formato
-        format_indicators = {
-            'has_legal_references': bool(re.search(r'lei\s+n[°º]?\s*\d+', content_lower)),
-            'has_article_references': bool(re.search(r'art\.?\s*\d+', content_lower)),
-            'has_monetary_values': bool(re.search(r'R\$|real|reais', content_lower)),
-            'has_technical_specs': bool(re.search(r'especifica[çc][ãa]o|requisito|norma', content_lower))
-        }
+        format_indicators = {name: detected.get(name, False) for name in FORMAT_INDICATORS}
         
         return DocumentFeatures(
             text_features=text_features,
@@ -426,18 +443,8 @@ class ClassificationService:
         Returns:
             True se tabelas detectadas
         """
-        # Procurar por padrões que indicam tabelas
-        table_indicators = [
-            r'\|.*\|.*\|',  # Pipes indicando colunas
-            r'\t.*\t.*\t',  # Tabs múltiplos
-            r'\d+\s+\w+\s+\d+',  # Padrão numérico-texto-numérico
-        ]
-        
-        for pattern in table_indicators:
-            if re.search(pattern, content):
-                return True
-        
-        return False
+        # Pipes indicando colunas, tabs múltiplos ou padrão numérico-texto-numérico
+        return self.feature_scanner.scan(content, fields=['has_tables']).get('has_tables', False)
     
     def _load_or_train_model(self):
         """
@@ -12,10 +12,12 @@ Implementa verificações específicas de conformidade:
 import logging
 import re
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
 
+from infrastructure.serialization import to_builtins
+
 logger = logging.getLogger(__name__)
 
 class ConformityLevel(Enum):
@@ -147,7 +149,7 @@ class ConformityChecker:
             
             logger.info(f"Conformidade verificada: {overall_level.value} (score: {compliance_score:.2f})")
             
-            return asdict(result)
+            return to_builtins(result)
             
         except Exception as e:
             logger.error(f"Erro na verificação de conformidade: {str(e)}")
@@ -0,0 +1,241 @@
+"""
+Startup
+
+Inicialização dos componentes do serviço com tempo por componente:
+- Backends pesados (sklearn, Vision, Firestore) importados sob demanda,
+  fora do caminho de import do `main`
+- `preload()` carrega, antes do fork dos workers do gunicorn, o estado
+  compartilhado somente leitura e os módulos pesados, e congela o heap
+  (`gc.freeze`) para que o GC dos workers não toque nessas páginas
+  (copy-on-write)
+- Clientes gRPC (Firestore, Vision) não sobrevivem a fork: são criados
+  em cada worker (`warm()` no post_worker_init ou no primeiro uso)
+"""
+
+import gc
+import importlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STARTUP_MODES = ('lazy', 'preload')
+
+
+class ComponentUnavailableError(RuntimeError):
+    """Componente obrigatório que falhou ao inicializar."""
+
+    def __init__(self, name: str, error: BaseException):
+        super().__init__(f"Componente '{name}' indisponível: {error}")
+        self.name = name
+        self.error = error
+
+
+class LazyComponent:
+    """
+    Componente construído no primeiro `get()` (uma única vez, thread-safe).
+
+    Falhas ficam registradas e não são refeitas a cada request: componentes
+    opcionais passam a retornar None, obrigatórios levantam
+    ComponentUnavailableError.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        modules: Tuple[str, ...] = (),
+        fork_safe: bool = True,
+        required: bool = True
+    ):
+        self.name = name
+        self.factory = factory
+        self.modules = modules
+        self.fork_safe = fork_safe
+        self.required = required
+
+        self.import_seconds: Optional[float] = None
+        self.init_seconds: Optional[float] = None
+        self.loaded_pid: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def import_modules(self) -> None:
+        """Importa os módulos pesados do componente (seguro antes do fork)."""
+        if self.import_seconds is not None or not self.modules:
+            return
+        start = time.perf_counter()
+        try:
+            for module in self.modules:
+                importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"⚠️ Módulos de '{self.name}' indisponíveis: {e}")
+        self.import_seconds = time.perf_counter() - start
+
+    def get(self) -> Any:
+        """
+        Retorna o componente, construindo-o na primeira chamada.
+
+        Returns:
+            Instância do componente (None se opcional e com falha)
+
+        Raises:
+            ComponentUnavailableError: Se obrigatório e com falha
+        """
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+
+        if self.error is not None and self.required:
+            raise ComponentUnavailableError(self.name, self.error)
+        return self._value
+
+    def status(self) -> Dict[str, Any]:
+        """Estado e tempos do componente para o /health."""
+        if not self._loaded:
+            state = 'pending'
+        else:
+            state = 'failed' if self.error is not None else 'ready'
+        return {
+            'status': state,
+            'import_ms': _ms(self.import_seconds),
+            'init_ms': _ms(self.init_seconds),
+            # Carregado no master do gunicorn (antes do fork) ou neste worker
+            'preloaded': self.loaded_pid is not None and self.loaded_pid != os.getpid(),
+            'error': str(self.error) if self.error is not None else None
+        }
+
+    def _load(self) -> None:
+        self.import_modules()
+        start = time.perf_counter()
+        try:
+            self._value = self.factory()
+            logger.info(f"✅ Componente '{self.name}' inicializado")
+        except Exception as e:
+            self.error = e
+            logger.error(f"❌ Erro ao inicializar componente '{self.name}': {e}")
+        self.init_seconds = time.perf_counter() - start
+        self.loaded_pid = os.getpid()
+        self._loaded = True
+
+
+class ComponentRegistry:
+    """Registro dos componentes do serviço e das fases de inicialização."""
+
+    def __init__(self, mode: Optional[str] = None):
+        self.mode = mode or os.getenv('STARTUP_MODE', 'lazy')
+        if self.mode not in STARTUP_MODES:
+            raise ValueError(f"STARTUP_MODE deve ser um de {STARTUP_MODES}")
+
+        self._components: Dict[str, LazyComponent] = {}
+        self._phases: Dict[str, float] = {}
+
+    def register(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        modules: Iterable[str] = (),
+        fork_safe: bool = True,
+        required: bool = True
+    ) -> LazyComponent:
+        """
+        Registra componente.
+
+        Args:
+            name: Nome exibido no /health
+            factory: Construtor do componente (importa seus backends)
+            modules: Módulos pesados que podem ser importados antes do fork
+            fork_safe: Se a instância pode ser criada no master e herdada
+            required: Se falhas devem levantar erro no uso (senão, None)
+
+        Returns:
+            LazyComponent registrado
+        """
+        component = LazyComponent(name, factory, tuple(modules), fork_safe, required)
+        self._components[name] = component
+        return component
+
+    def get(self, name: str) -> Any:
+        """Obtém componente pelo nome."""
+        return self._components[name].get()
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        """Registra duração de uma fase de inicialização (ex.: inicialização do app)."""
+        self._phases[name] = seconds
+
+    def preload(self) -> None:
+        """
+        Carrega o estado compartilhado antes do fork e congela o heap.
+
+        Componentes fork-safe são construídos; dos demais, só os módulos
+        são importados.
+        """
+        start = time.perf_counter()
+        for component in self._components.values():
+            if component.fork_safe:
+                self._try_get(component)
+            else:
+                component.import_modules()
+
+        # Objetos já existentes vão para a geração permanente: o GC dos
+        # workers não os percorre nem escreve nos seus cabeçalhos
+        gc.collect()
+        gc.freeze()
+        self.record_phase('preload', time.perf_counter() - start)
+        logger.info(f"🚀 Preload concluído em {self._phases['preload']:.2f}s ({gc.get_freeze_count()} objetos congelados)")
+
+    def warm(self) -> None:
+        """Constrói no worker os componentes que não sobrevivem a fork."""
+        start = time.perf_counter()
+        for component in self._components.values():
+            if not component.fork_safe:
+                self._try_get(component)
+        self.record_phase('warm', time.perf_counter() - start)
+
+    def failed_required(self) -> List[str]:
+        """Nomes dos componentes obrigatórios que falharam ao inicializar."""
+        return [
+            name for name, component in self._components.items()
+            if component.required and component.error is not None
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        """Relatório de inicialização para o /health."""
+        return {
+            'mode': self.mode,
+            'phases_ms': {name: _ms(seconds) for name, seconds in self._phases.items()},
+            'components': {name: component.status() for name, component in self._components.items()}
+        }
+
+    @staticmethod
+    def _try_get(component: LazyComponent) -> None:
+        """Carrega componente; a falha fica registrada no próprio componente."""
+        try:
+            component.get()
+        except ComponentUnavailableError:
+            pass
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+_registry: Optional[ComponentRegistry] = None
+
+
+def get_component_registry() -> ComponentRegistry:
+    """Obtém instância global do registro de componentes."""
+    global _registry
+    if _registry is None:
+        _registry = ComponentRegistry()
+    return _registry
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Testes do endpoint /admin/profile
+
+Testa que a coleta pela rota Flask amostra os requests atendidos por
+outras threads do mesmo worker (gthread) durante a coleta.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+ADMIN_KEY = 'chave-de-teste'
+
+
+def busy_classify(document_content):
+    """Classificador que ocupa a CPU da thread do request."""
+    deadline = time.perf_counter() + 0.6
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return {'type': 'edital'}
+
+
+class TestAdminProfile(unittest.TestCase):
+    """Testes para a rota de profiling."""
+
+    def setUp(self):
+        self.client = main.app.test_client()
+        env = patch.dict(os.environ, {'ADMIN_API_KEY': ADMIN_KEY})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_requires_admin_key(self):
+        response = self.client.post('/admin/profile?duration=0.01')
+        self.assertEqual(response.status_code, 403)
+
+    def test_samples_busy_request_thread(self):
+        profile_response = {}
+
+        def run_profile():
+            client = main.app.test_client()
+            profile_response['value'] = client.post(
+                '/admin/profile?duration=0.4&interval=0.002',
+                headers={'X-Admin-Key': ADMIN_KEY}
+            )
+
+        with patch.object(main.classifier, 'get', return_value=busy_classify), \
+                patch.object(main.firestore_client, 'get', return_value=None):
+            profiler_thread = threading.Thread(target=run_profile, name='profile-request')
+            profiler_thread.start()
+            response = self.client.post('/classify', json={'document_content': 'EDITAL'})
+            profiler_thread.join()
+
+        self.assertEqual(response.status_code, 200)
+        folded = profile_response['value'].get_data(as_text=True)
+        busy_stacks = [line for line in folded.splitlines() if 'busy_classify' in line]
+        self.assertTrue(busy_stacks)
+        self.assertTrue(all('classify_document' in line for line in busy_stacks))
+        # A thread que atende a coleta também é amostrada
+        self.assertIn('profile-request;', folded)
+
+
+if __name__ == '__main__':
+    unittest.main()
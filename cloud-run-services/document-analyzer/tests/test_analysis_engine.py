@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Testes Unitários para Analysis Engine
+
+Testa a separação do pipeline de análise:
+- Análise base em cache por hash do conteúdo (independente da organização)
+- Re-ponderação por organização sobre a mesma base
+- Limite LRU do cache
+"""
+
+import unittest
+import sys
+import os
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analysis_engine import AnalysisEngine
+
+EDITAL = (
+    "EDITAL DE PREGÃO ELETRÔNICO Nº 001/2024\n"
+    "1. DO OBJETO\nAquisição de equipamentos de informática.\n"
+    "2. DA HABILITAÇÃO\nConforme Lei 14.133/2021, prazo de 30 dias.\n"
+) * 20
+
+LEGAL_HEAVY = {'weights': {'structural': 0.1, 'legal': 0.7, 'clarity': 0.1, 'abnt': 0.1}}
+
+
+class TestBaseAnalysisCache(unittest.TestCase):
+    """Testes para o cache da análise base."""
+
+    def setUp(self):
+        """Configurar ambiente de teste."""
+        self.engine = AnalysisEngine()
+
+    def test_base_shared_across_organizations(self):
+        """Testar reuso da base por outra organização com outros pesos."""
+        calls = []
+        original = self.engine._analyze_base
+
+        def counting_base(*args, **kwargs):
+            calls.append(args)
+            return original(*args, **kwargs)
+
+        self.engine._analyze_base = counting_base
+
+        first = self.engine.analyze_with_custom_params(
+            EDITAL, 'EDITAL', {'organization_id': 'org_a'}, LEGAL_HEAVY
+        )
+        second = self.engine.analyze_with_custom_params(
+            EDITAL, 'EDITAL', {'organization_id': 'org_b'}, {}
+        )
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(first['metadata']['base_cache'], 'miss')
+        self.assertEqual(second['metadata']['base_cache'], 'hit')
+        self.assertEqual(first['categories'], second['categories'])
+        self.assertNotAlmostEqual(first['weighted_score'], second['weighted_score'])
+        self.assertEqual(second['metadata']['org_config'], {'organization_id': 'org_b'})
+
+    def test_reweighting_matches_fresh_analysis(self):
+        """Testar que o resultado via cache é igual ao de uma análise nova."""
+        self.engine.analyze_with_custom_params(EDITAL, 'EDITAL', {}, {})
+        cached = self.engine.analyze_with_custom_params(EDITAL, 'EDITAL', {}, LEGAL_HEAVY)
+        fresh = AnalysisEngine().analyze_with_custom_params(EDITAL, 'EDITAL', {}, LEGAL_HEAVY)
+
+        self.assertAlmostEqual(cached['weighted_score'], fresh['weighted_score'])
+        self.assertEqual(cached['summary'], fresh['summary'])
+
+    def test_key_depends_on_content_and_type(self):
+        """Testar que conteúdo ou tipo diferentes não compartilham a base."""
+        self.engine.analyze_with_custom_params(EDITAL, 'EDITAL', {}, {})
+        other_type = self.engine.analyze_with_custom_params(EDITAL, 'CONTRATO', {}, {})
+        other_content = self.engine.analyze_with_custom_params(EDITAL + "ANEXO I", 'EDITAL', {}, {})
+
+        self.assertEqual(other_type['metadata']['base_cache'], 'miss')
+        self.assertEqual(other_content['metadata']['base_cache'], 'miss')
+        self.assertEqual(self.engine.get_cache_stats()['cache_size'], 3)
+
+    def test_cached_base_not_mutated_by_callers(self):
+        """Testar que alterar o resultado retornado não afeta o cache."""
+        first = self.engine.analyze_with_custom_params(EDITAL, 'EDITAL', {}, {})
+        first['categories']['legal']['issues'].append({'type': 'injected'})
+
+        second = self.engine.analyze_with_custom_params(EDITAL, 'EDITAL', {}, {})
+
+        self.assertNotIn({'type': 'injected'}, second['categories']['legal']['issues'])
+
+    def test_cache_is_bounded(self):
+        """Testar remoção da base menos usada acima do limite."""
+        engine = AnalysisEngine(max_cache_entries=2)
+        for suffix in ("A", "B", "C"):
+            engine.analyze_with_custom_params(EDITAL + suffix, 'EDITAL', {}, {})
+
+        self.assertEqual(len(engine.cache), 2)
+        result = engine.analyze_with_custom_params(EDITAL + "A", 'EDITAL', {}, {})
+        self.assertEqual(result['metadata']['base_cache'], 'miss')
+
+
+if __name__ == '__main__':
+    unittest.main()
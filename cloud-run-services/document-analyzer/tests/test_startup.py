@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Testes Unitários para Startup
+
+Testa o registro de componentes:
+- Construção sob demanda, uma única vez
+- Política de falha de componentes opcionais e obrigatórios
+- Preload (só componentes fork-safe) com gc.freeze
+- Import do main sem carregar backends pesados
+- /health degradado com componente obrigatório em falha
+"""
+
+import gc
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup import ComponentRegistry, ComponentUnavailableError
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def failing_factory():
+    raise RuntimeError("backend indisponível")
+
+
+class TestLazyComponent(unittest.TestCase):
+    """Testes para construção sob demanda."""
+
+    def setUp(self):
+        self.registry = ComponentRegistry(mode='lazy')
+        self.calls = 0
+
+    def factory(self):
+        self.calls += 1
+        return object()
+
+    def test_builds_once_on_first_get(self):
+        component = self.registry.register('engine', self.factory)
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(component.status()['status'], 'pending')
+
+        first = component.get()
+        self.assertIs(component.get(), first)
+        self.assertIs(self.registry.get('engine'), first)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(component.status()['status'], 'ready')
+        self.assertFalse(component.status()['preloaded'])
+
+    def test_optional_failure_returns_none(self):
+        component = self.registry.register('firestore', failing_factory, required=False)
+        self.assertIsNone(component.get())
+        self.assertEqual(component.status()['status'], 'failed')
+        self.assertIn("backend indisponível", component.status()['error'])
+
+    def test_required_failure_raises_without_retrying(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            raise RuntimeError("backend indisponível")
+
+        component = self.registry.register('classifier', factory)
+        for _ in range(2):
+            with self.assertRaises(ComponentUnavailableError):
+                component.get()
+        self.assertEqual(len(calls), 1)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            ComponentRegistry(mode='eager')
+
+
+class TestPreload(unittest.TestCase):
+    """Testes para o preload antes do fork."""
+
+    def tearDown(self):
+        gc.unfreeze()
+
+    def test_preload_builds_only_fork_safe_components(self):
+        registry = ComponentRegistry(mode='preload')
+        shared = registry.register('engine', dict)
+        client = registry.register('firestore', dict, modules=('json',), fork_safe=False)
+        broken = registry.register('classifier', failing_factory)
+
+        registry.preload()
+
+        self.assertTrue(shared.loaded)
+        self.assertFalse(client.loaded)
+        self.assertIsNotNone(client.import_seconds)
+        self.assertEqual(broken.status()['status'], 'failed')
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        registry.warm()
+        self.assertTrue(client.loaded)
+
+        report = registry.report()
+        self.assertEqual(report['mode'], 'preload')
+        self.assertEqual(set(report['phases_ms']), {'preload', 'warm'})
+        self.assertEqual(set(report['components']), {'engine', 'firestore', 'classifier'})
+
+
+class TestHealth(unittest.TestCase):
+    """Testes do /health com o estado dos componentes."""
+
+    def setUp(self):
+        import main
+        self.main = main
+        self.client = main.app.test_client()
+
+    def health(self, registry):
+        with patch.object(self.main, 'startup', registry), \
+                patch.object(self.main.firestore_client, 'get', return_value=object()):
+            return self.client.get('/health')
+
+    def test_failed_required_component_degrades_health(self):
+        registry = ComponentRegistry(mode='lazy')
+        registry.register('analysis_engine', dict)
+        registry._try_get(registry.register('classifier', failing_factory))
+        registry._try_get(registry.register('firestore', failing_factory, required=False))
+
+        response = self.health(registry)
+
+        self.assertEqual(response.status_code, 503)
+        body = response.get_json()
+        self.assertEqual(body['status'], 'degraded')
+        self.assertEqual(body['failed_components'], ['classifier'])
+        self.assertFalse(body['services']['classification'])
+        self.assertTrue(body['services']['analysis'])
+
+    def test_healthy_when_required_components_ok(self):
+        registry = ComponentRegistry(mode='lazy')
+        registry._try_get(registry.register('classifier', dict))
+
+        response = self.health(registry)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'healthy')
+
+
+class TestMainImport(unittest.TestCase):
+    """Testa que o import do app não carrega backends pesados."""
+
+    def test_lazy_import_skips_heavy_backends(self):
+        code = (
+            "import sys, main; "
+            "print(','.join(m for m in ('sklearn', 'google.cloud.firestore', 'google.cloud.vision') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            cwd=SERVICE_DIR,
+            env={**os.environ, 'STARTUP_MODE': 'lazy'},
+            capture_output=True,
+            text=True,
+            timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memória dos findings do domínio
+
+Mede os bytes por finding de N findings (10.000 por padrão) em dois layouts:
+- legado:  dataclass comum (com `__dict__` por instância), sem normalização
+- slotted: Finding atual (frozen + slots, enums e referências compartilhados)
+
+Os findings são reidratados de JSON, como ao ler de cache ou repositório,
+então cada string chega como um objeto novo.
+
+Uso:
+    python benchmarks/bench_entity_memory.py --findings 10000
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+# Adiciona a raiz do serviço ao path para importar src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.domain.entities.analysis import Finding, FindingCategory, FindingSeverity
+
+# Mesmos campos e defaults do Finding, mas como dataclass comum
+LegacyFinding = dataclasses.make_dataclass(
+    'LegacyFinding',
+    [
+        (f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+        for f in dataclasses.fields(Finding)
+    ]
+)
+
+
+def build_payload(findings: int) -> str:
+    """JSON com `findings` findings variados."""
+    categories = [c.value for c in FindingCategory]
+    severities = [s.value for s in FindingSeverity]
+    return json.dumps([
+        {
+            'id': f"finding-{i:05d}",
+            'category': categories[i % len(categories)],
+            'severity': severities[i % len(severities)],
+            'title': f"Cláusula {i} sem referência normativa",
+            'description': "A cláusula não cita o dispositivo legal aplicável ao prazo de entrega.",
+            'suggestion': "Incluir referência ao art. 40 da Lei 14.133/2021.",
+            'location': f"seção {i // 20}.{i % 20}",
+            'rule_id': f"rule-{i % 50}",
+            'confidence': 0.5 + (i % 50) / 100,
+            'is_custom_rule': i % 7 == 0,
+            'regulatory_reference': "Lei 14.133/2021"
+        }
+        for i in range(findings)
+    ])
+
+
+def instance_bytes(obj) -> int:
+    """Tamanho do objeto mais o seu `__dict__`, se houver."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(cls, payload: str) -> tuple:
+    """Retorna (bytes retidos por finding, bytes da instância) ao reidratar o payload."""
+    gc.collect()
+    tracemalloc.start()
+    rows = json.loads(payload)
+    findings = [cls(**row) for row in rows]
+    # Sem as linhas do JSON, só o que os findings referenciam continua vivo
+    del rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained / len(findings), instance_bytes(findings[0])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--findings', type=int, default=10000)
+    args = parser.parse_args()
+
+    payload = build_payload(args.findings)
+    variants = (
+        ("legado (__dict__)", LegacyFinding),
+        ("slotted + frozen", Finding)
+    )
+
+    print(f"{args.findings} findings")
+    print(f"{'layout':<20} {'bytes/finding':>14} {'instância':>10}")
+    for name, cls in variants:
+        per_finding, size = measure(cls, payload)
+        print(f"{name:<20} {per_finding:>14.0f} {size:>10}")
+
+
+if __name__ == '__main__':
+    main()
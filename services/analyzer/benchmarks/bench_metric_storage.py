@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark do armazenamento de pontos de métricas
+
+Compara a série colunar (PointSeries) com o armazenamento anterior
+(deque de MetricPoint com datetime e dict de labels por ponto): memória
+por ponto e tempo de uma agregação por janela.
+
+Uso:
+    python benchmarks/bench_metric_storage.py --points 1000 --queries 10000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adiciona a raiz do serviço ao path para importar src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.infrastructure.monitoring.metrics import (
+    Metric,
+    MetricPoint,
+    MetricType,
+    MetricUnit,
+    PointSeries
+)
+
+LABELS = {'endpoint': '/analyze', 'method': 'POST'}
+BASE_LABELS = {'service': 'analyzer'}
+
+
+def fill_legacy(n: int) -> deque:
+    """Armazenamento anterior: um MetricPoint por amostra."""
+    points = deque(maxlen=n)
+    for i in range(n):
+        points.append(MetricPoint(
+            timestamp=datetime.utcnow(),
+            value=float(i),
+            labels={**BASE_LABELS, **LABELS}
+        ))
+    return points
+
+
+def fill_columnar(n: int) -> Metric:
+    """Série colunar com labels internados."""
+    metric = Metric(
+        "bench", MetricType.GAUGE, MetricUnit.COUNT, "",
+        points=PointSeries(capacity=n), labels=BASE_LABELS
+    )
+    for i in range(n):
+        metric.add_point(float(i), LABELS)
+    return metric
+
+
+def measure(fill, n: int):
+    """Retorna (objeto, bytes alocados por ponto)."""
+    tracemalloc.start()
+    obj = fill(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, current / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--points', type=int, default=1000)
+    parser.add_argument('--queries', type=int, default=10000)
+    args = parser.parse_args()
+
+    legacy, legacy_bytes = measure(fill_legacy, args.points)
+    columnar, columnar_bytes = measure(fill_columnar, args.points)
+
+    print(f"{'storage':<10} {'bytes/point':>12} {'avg query (us)':>15}")
+
+    cutoff = datetime.utcnow() - timedelta(minutes=5)
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        recent = [p for p in legacy if p.timestamp >= cutoff]
+        sum(p.value for p in recent) / len(recent)
+    legacy_us = (time.perf_counter() - start) / args.queries * 1e6
+    print(f"{'deque':<10} {legacy_bytes:>12.1f} {legacy_us:>15.2f}")
+
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        columnar.get_average(minutes=5)
+    columnar_us = (time.perf_counter() - start) / args.queries * 1e6
+    print(f"{'columnar':<10} {columnar_bytes:>12.1f} {columnar_us:>15.2f}")
+
+
+if __name__ == '__main__':
+    main()
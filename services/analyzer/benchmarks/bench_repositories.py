@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Teste de carga dos repositórios em memória
+
+Popula os repositórios com N documentos (1.000.000 por padrão), N/10
+análises em 1.000 organizações e N chaves de cache, e mede as buscas
+indexadas contra a varredura linear que elas substituem:
+- find_by_content_hash: índice hash -> ID vs SHA-256 de cada documento
+- find_recent_by_organization: índice ordenado vs filtrar + ordenar tudo
+- get_analytics: agregados diários vs recalcular sobre todas as análises
+- clear_pattern: trie de chaves vs regex em todas as chaves
+
+Uso:
+    python benchmarks/bench_repositories.py --documents 1000000 --lookups 1000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Adiciona a raiz do serviço ao path para importar src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.domain.entities.analysis import Analysis, ConformityScores
+from src.domain.entities.document import Document
+from src.domain.entities.organization import OrganizationId
+from src.infrastructure.repositories.in_memory_repositories import (
+    InMemoryAnalysisRepository,
+    InMemoryCacheRepository,
+    InMemoryDocumentRepository
+)
+
+ORGANIZATIONS = 1000
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def cache_segment(i: int) -> str:
+    """Segmento de hash da chave de cache do documento i."""
+    return hashlib.blake2b(str(i).encode(), digest_size=8).hexdigest()
+
+
+def elapsed_us(start: float, operations: int) -> float:
+    return (time.perf_counter() - start) / operations * 1e6
+
+
+async def load(documents: int) -> tuple:
+    """Popula os repositórios e retorna (repositórios, hashes, segundos de carga)."""
+    document_repository = InMemoryDocumentRepository()
+    analysis_repository = InMemoryAnalysisRepository()
+    cache_repository = InMemoryCacheRepository()
+    scores = ConformityScores(80.0, 70.0, 90.0, 60.0, 75.0)
+    hashes = []
+
+    start = time.perf_counter()
+    for i in range(documents):
+        document = Document.create(f"doc-{i:07d}", f"Edital {i}", f"Pregão eletrônico {i} - objeto {i % 977}")
+        await document_repository.save(document)
+        hashes.append(document_repository._hash_by_id[str(document.id)])
+
+        await cache_repository.set(f"analysis:{cache_segment(i)}:{i % ORGANIZATIONS:04d}", {'score': 75.0})
+
+        if i % 10 == 0:
+            analysis = Analysis.create(document.id.value, f"org-{i % ORGANIZATIONS:04d}", scores, 75.0)
+            analysis.created_at = BASE_TIME + timedelta(minutes=i)
+            await analysis_repository.save(analysis)
+
+    seconds = time.perf_counter() - start
+    return (document_repository, analysis_repository, cache_repository), hashes, seconds
+
+
+async def run(documents: int, lookups: int) -> None:
+    (documents_repo, analyses_repo, cache_repo), hashes, load_seconds = await load(documents)
+    rng = random.Random(42)
+    rows = []
+
+    sample = [rng.choice(hashes) for _ in range(lookups)]
+    start = time.perf_counter()
+    for content_hash in sample:
+        await documents_repo.find_by_content_hash(content_hash)
+    rows.append(("find_by_content_hash", "índice", elapsed_us(start, lookups)))
+
+    start = time.perf_counter()
+    next(d for d in documents_repo._documents.values() if d.get_content_hash() == sample[0])
+    rows.append(("find_by_content_hash", "varredura (1x)", elapsed_us(start, 1)))
+
+    organizations = [OrganizationId(f"org-{rng.randrange(ORGANIZATIONS):04d}") for _ in range(lookups)]
+    start = time.perf_counter()
+    for organization_id in organizations:
+        await analyses_repo.find_recent_by_organization(organization_id, limit=10)
+    rows.append(("find_recent_by_org", "índice", elapsed_us(start, lookups)))
+
+    start = time.perf_counter()
+    sorted(
+        (a for a in analyses_repo._analyses.values() if a.organization_id == organizations[0]),
+        key=lambda a: a.created_at, reverse=True
+    )[:10]
+    rows.append(("find_recent_by_org", "varredura (1x)", elapsed_us(start, 1)))
+
+    # Dashboard: 30 dias de uma organização (bordas no meio do dia)
+    ranges = []
+    for organization_id in organizations:
+        start_dt = BASE_TIME + timedelta(minutes=rng.randrange(documents), hours=5)
+        ranges.append((organization_id, start_dt, start_dt + timedelta(days=30)))
+    start = time.perf_counter()
+    for organization_id, start_dt, end_dt in ranges:
+        await analyses_repo.get_analytics(organization_id, start_dt.isoformat(), end_dt.isoformat())
+    rows.append(("get_analytics (org)", "agregados diários", elapsed_us(start, lookups)))
+
+    start = time.perf_counter()
+    await analyses_repo.get_analytics()
+    rows.append(("get_analytics (todas)", "agregados diários", elapsed_us(start, 1)))
+
+    start = time.perf_counter()
+    organization_id, start_dt, end_dt = ranges[0]
+    selected = [
+        a for a in analyses_repo._analyses.values()
+        if a.organization_id == organization_id and start_dt <= a.created_at <= end_dt
+    ]
+    sum(a.weighted_score for a in selected), [f.severity.value for a in selected for f in a.findings]
+    rows.append(("get_analytics (org)", "varredura (1x)", elapsed_us(start, 1)))
+
+    # Invalidação de um documento: segmentos completos até o '*'
+    start = time.perf_counter()
+    for _ in range(lookups):
+        await cache_repo.clear_pattern(f"analysis:{cache_segment(rng.randrange(documents))}:*")
+    rows.append(("clear_pattern", "trie (segmento)", elapsed_us(start, lookups)))
+
+    # Prefixo no meio de um segmento: percorre os filhos do nó 'analysis'
+    patterns = [f"analysis:{rng.randrange(16 ** 5):05x}*" for _ in range(10)]
+    start = time.perf_counter()
+    for pattern in patterns:
+        await cache_repo.clear_pattern(pattern)
+    rows.append(("clear_pattern", "trie (segmento parcial)", elapsed_us(start, len(patterns))))
+
+    regex = re.compile(patterns[0].replace('*', '.*'))
+    start = time.perf_counter()
+    [key for key in cache_repo._cache if regex.match(key)]
+    rows.append(("clear_pattern", "varredura (1x)", elapsed_us(start, 1)))
+
+    print(f"{documents} documentos, {len(analyses_repo._analyses)} análises, "
+          f"carga em {load_seconds:.1f}s ({documents / load_seconds:,.0f} docs/s)")
+    print(f"{'operação':<22} {'caminho':<24} {'µs/op':>12}")
+    for operation, path, us in rows:
+        print(f"{operation:<22} {path:<24} {us:>12.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.documents, args.lookups))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark do SemanticDeduplicator
+
+Mede o tempo da deduplicação exata (blocos NumPy) e aproximada (LSH)
+sobre embeddings sintéticos com uma fração conhecida de quase-duplicatas.
+
+Uso:
+    python benchmarks/bench_semantic_dedup.py --sizes 10000 100000 --dim 768
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Adiciona a raiz do serviço ao path para importar src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ml.rag_enhancements import SemanticDeduplicator
+
+
+def make_embeddings(n: int, dim: int, dup_ratio: float, seed: int = 0) -> np.ndarray:
+    """Gera n embeddings onde `dup_ratio` são perturbações de outros."""
+    rng = np.random.default_rng(seed)
+    n_dups = int(n * dup_ratio)
+    base = rng.standard_normal((n - n_dups, dim)).astype(np.float32)
+    sources = rng.integers(0, len(base), n_dups)
+    noise = 0.05 * rng.standard_normal((n_dups, dim)).astype(np.float32)
+    matrix = np.concatenate([base, base[sources] + noise])
+    return matrix[rng.permutation(n)]
+
+
+def run(n: int, dim: int, dup_ratio: float, exact_max: int) -> None:
+    embeddings = make_embeddings(n, dim, dup_ratio)
+    chunks = list(range(n))
+    dedup = SemanticDeduplicator(similarity_threshold=0.95)
+
+    print(f"\n📊 n={n:,} dim={dim} duplicatas≈{int(n * dup_ratio):,}")
+
+    exact_removed = None
+    if n <= exact_max:
+        start = time.perf_counter()
+        _, exact_removed = dedup.deduplicate(chunks, embeddings, approximate=False)
+        elapsed = time.perf_counter() - start
+        print(f"  exato : {elapsed:8.2f}s  removidos={len(exact_removed):,}")
+    else:
+        print(f"  exato : pulado (n > --exact-max={exact_max:,})")
+
+    start = time.perf_counter()
+    _, lsh_removed = dedup.deduplicate(chunks, embeddings, approximate=True)
+    elapsed = time.perf_counter() - start
+    line = f"  lsh   : {elapsed:8.2f}s  removidos={len(lsh_removed):,}"
+    if exact_removed:
+        recall = len(set(lsh_removed) & set(exact_removed)) / len(exact_removed)
+        line += f"  recall={recall:.3f}"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--dup-ratio', type=float, default=0.1)
+    parser.add_argument('--exact-max', type=int, default=20_000,
+                        help='Maior n para rodar o modo exato (O(n²))')
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run(n, args.dim, args.dup_ratio, args.exact_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark de serialização de uma análise grande
+
+Mede o custo de serializar em JSON uma Analysis do domínio com N findings
+(2.000 por padrão) por cada caminho:
+- asdict + json:      dataclasses.asdict (deepcopy) + json.dumps da stdlib
+- to_builtins + json: conversores pré-computados + json.dumps da stdlib
+- dumps (direto):     json_codec.dumps sobre a dataclass (orjson, se instalado)
+
+Uso:
+    python benchmarks/bench_serialization.py --findings 2000 --repeat 20
+"""
+
+import argparse
+import dataclasses
+import json
+import sys
+import time
+from pathlib import Path
+
+# Adiciona a raiz do serviço ao path para importar src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.domain.entities.analysis import (
+    Analysis,
+    AnalysisMetrics,
+    ConformityScores,
+    Finding,
+    FindingCategory,
+    FindingSeverity
+)
+from src.infrastructure.serialization import HAS_ORJSON, dumps, to_builtins
+
+
+def build_analysis(findings: int) -> Analysis:
+    """Análise com `findings` findings variados."""
+    categories = list(FindingCategory)
+    severities = list(FindingSeverity)
+    analysis = Analysis.create(
+        document_id="doc-bench",
+        organization_id="org-bench",
+        conformity_scores=ConformityScores(82.0, 75.5, 90.1, 68.3, 79.0),
+        weighted_score=78.4
+    )
+    analysis.findings = [
+        Finding(
+            id=f"finding-{i:05d}",
+            category=categories[i % len(categories)],
+            severity=severities[i % len(severities)],
+            title=f"Cláusula {i} sem referência normativa",
+            description="A cláusula não cita o dispositivo legal aplicável ao prazo de entrega.",
+            suggestion="Incluir referência ao art. 40 da Lei 14.133/2021.",
+            location=f"seção {i // 20}.{i % 20}",
+            rule_id=f"rule-{i % 50}",
+            confidence=0.5 + (i % 50) / 100,
+            is_custom_rule=i % 7 == 0,
+            regulatory_reference="Lei 14.133/2021"
+        )
+        for i in range(findings)
+    ]
+    analysis.recommendations = [f"Recomendação {i}" for i in range(50)]
+    analysis.metrics = AnalysisMetrics(execution_time_seconds=3.2, total_findings=findings)
+    return analysis
+
+
+def asdict_json(analysis: Analysis) -> bytes:
+    return json.dumps(dataclasses.asdict(analysis), default=str, ensure_ascii=False).encode()
+
+
+def builtins_json(analysis: Analysis) -> bytes:
+    return json.dumps(to_builtins(analysis), ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def measure(func, analysis: Analysis, repeat: int) -> tuple:
+    """Retorna (ms por serialização, tamanho em bytes)."""
+    payload = func(analysis)  # aquece caches de conversores
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(analysis)
+    return (time.perf_counter() - start) / repeat * 1000, len(payload)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--findings', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    analysis = build_analysis(args.findings)
+    paths = (
+        ("asdict + json", asdict_json),
+        ("to_builtins + json", builtins_json),
+        (f"dumps ({'orjson' if HAS_ORJSON else 'stdlib'})", dumps)
+    )
+
+    print(f"{args.findings} findings, {args.repeat} repetições")
+    print(f"{'path':<22} {'ms/op':>9} {'bytes':>10}")
+    for name, func in paths:
+        ms, size = measure(func, analysis, args.repeat)
+        print(f"{name:<22} {ms:>9.2f} {size:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de quase-duplicatas
+
+Popula o repositório de documentos com N editais (5.000 por padrão) de
+300 palavras, 10% deles reenvios com poucas palavras alteradas, e compara
+find_similar_documents (MinHash LSH + Jaccard nos candidatos) com a
+varredura anterior (is_content_similar_to contra cada documento).
+
+Uso:
+    python benchmarks/bench_similar_documents.py --documents 5000 --queries 100
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Adiciona a raiz do serviço ao path para importar src.*
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.domain.entities.document import Document
+from src.infrastructure.repositories.in_memory_repositories import InMemoryDocumentRepository
+
+VOCABULARY = [f"termo{i}" for i in range(20000)]
+
+
+def scan(documents, document: Document, threshold: float) -> list:
+    """Implementação anterior de find_similar_documents."""
+    return [
+        doc for doc in documents
+        if doc.id != document.id and document.is_content_similar_to(doc.content, threshold)
+    ]
+
+
+async def run(documents: int, queries: int, threshold: float) -> None:
+    rng = random.Random(42)
+    repository = InMemoryDocumentRepository()
+    corpus = []
+    for i in range(documents):
+        if i % 10 == 9:
+            # Reenvio: troca 3% das palavras de um edital anterior
+            words = rng.choice(corpus).content.split()
+            for position in rng.sample(range(len(words)), 9):
+                words[position] = rng.choice(VOCABULARY)
+            content = " ".join(words)
+        else:
+            content = " ".join(rng.sample(VOCABULARY, 300))
+        corpus.append(Document.create(f"doc-{i:06d}", f"Edital {i}", content))
+
+    start = time.perf_counter()
+    for document in corpus:
+        await repository.save(document)
+    save_us = (time.perf_counter() - start) / documents * 1e6
+
+    sample = rng.sample(corpus, queries)
+    start = time.perf_counter()
+    indexed = [await repository.find_similar_documents(doc, threshold) for doc in sample]
+    lsh_ms = (time.perf_counter() - start) / queries * 1000
+
+    scan_queries = sample[:max(1, queries // 10)]
+    start = time.perf_counter()
+    scanned = [scan(corpus, doc, threshold) for doc in scan_queries]
+    scan_ms = (time.perf_counter() - start) / len(scan_queries) * 1000
+
+    agree = sum(set(a) == set(b) for a, b in zip(indexed, scanned))
+    print(f"{documents} documentos, limiar {threshold}, save {save_us:.0f} µs/doc (hash + MinHash)")
+    print(f"{'caminho':<18} {'ms/consulta':>12}")
+    print(f"{'MinHash LSH':<18} {lsh_ms:>12.2f}")
+    print(f"{'varredura':<18} {scan_ms:>12.2f}")
+    print(f"mesmos resultados em {agree}/{len(scan_queries)} consultas comparadas")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--documents', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--threshold', type=float, default=0.9)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.documents, args.queries, args.threshold))
+
+
+if __name__ == '__main__':
+    main()
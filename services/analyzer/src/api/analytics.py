@@ -7,11 +7,14 @@ de performance de modelos AI/ML.
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
-from datetime import datetime, timedelta
-from collections import defaultdict
-import statistics
+from typing import List, Dict, Optional, Any, Deque, Iterator, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime
+from collections import defaultdict, deque
 import logging
+import time
+
+from ..infrastructure.monitoring.sketches import DDSketch
 
 logger = logging.getLogger(__name__)
 
@@ -22,23 +25,195 @@ router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 # In-Memory Metrics Storage
 # ============================================================================
 
+ERROR_EXAMPLES_PER_TYPE = 3
+
+
+@dataclass
+class LatencyStats:
+    """Contagem, erros, soma e sketch de latências de um bucket."""
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0
+    sketch: DDSketch = field(default_factory=DDSketch)
+
+    def add(self, value: float, error: bool = False) -> None:
+        self.count += 1
+        self.errors += int(error)
+        self.total += value
+        self.sketch.add(value)
+
+    def merge(self, other: 'LatencyStats') -> None:
+        self.count += other.count
+        self.errors += other.errors
+        self.total += other.total
+        self.sketch.merge(other.sketch)
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q) or 0.0
+
+
+@dataclass
+class AnalysisStats:
+    """Agregado de análises de um modelo em um bucket."""
+    successes: int = 0
+    failures: int = 0
+    tokens_count: int = 0
+    tokens_total: int = 0
+    duration: LatencyStats = field(default_factory=LatencyStats)
+
+    def add(self, duration_ms: float, tokens_used: int, success: bool) -> None:
+        self.duration.add(duration_ms, error=not success)
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+        if tokens_used:
+            self.tokens_count += 1
+            self.tokens_total += tokens_used
+
+    def merge(self, other: 'AnalysisStats') -> None:
+        self.successes += other.successes
+        self.failures += other.failures
+        self.tokens_count += other.tokens_count
+        self.tokens_total += other.tokens_total
+        self.duration.merge(other.duration)
+
+    @property
+    def avg_tokens(self) -> float:
+        return self.tokens_total / self.tokens_count if self.tokens_count else 0.0
+
+
+@dataclass
+class ErrorStats:
+    """Contagem e mensagens mais recentes de um tipo de erro."""
+    count: int = 0
+    examples: Deque[str] = field(default_factory=lambda: deque(maxlen=ERROR_EXAMPLES_PER_TYPE))
+
+    def add(self, message: str) -> None:
+        self.count += 1
+        self.examples.append(message)
+
+    def merge(self, other: 'ErrorStats') -> None:
+        self.count += other.count
+        self.examples.extend(other.examples)
+
+
+@dataclass
+class FeedbackStats:
+    """Feedbacks positivos e totais."""
+    positive: int = 0
+    total: int = 0
+
+    def add(self, is_positive: bool) -> None:
+        self.positive += int(is_positive)
+        self.total += 1
+
+    def merge(self, other: 'FeedbackStats') -> None:
+        self.positive += other.positive
+        self.total += other.total
+
+
+class AggregateBucket:
+    """Agregados de um intervalo de tempo, por endpoint/experimento/modelo."""
+
+    __slots__ = ('slot', 'requests', 'analyses', 'errors', 'feedback')
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.requests: Dict[Tuple[str, Optional[str]], LatencyStats] = {}
+        self.analyses: Dict[Tuple[str, Optional[str]], AnalysisStats] = {}
+        self.errors: Dict[str, ErrorStats] = {}
+        self.feedback: Dict[Optional[str], FeedbackStats] = {}
+
+
+class RollingWindow:
+    """
+    Anel de tamanho fixo de buckets de `resolution` segundos.
+
+    O bucket de um instante fica na posição `slot % size`; um bucket com
+    slot antigo naquela posição é descartado na próxima escrita, então a
+    retenção é automática e a ingestão é O(1).
+    """
+
+    def __init__(self, resolution: int, size: int):
+        self.resolution = resolution
+        self.size = size
+        self._ring: List[Optional[AggregateBucket]] = [None] * size
+
+    @property
+    def span_seconds(self) -> int:
+        return self.resolution * self.size
+
+    def bucket_for(self, timestamp: float) -> AggregateBucket:
+        """Bucket do instante (criado/reciclado se necessário)."""
+        slot = int(timestamp // self.resolution)
+        index = slot % self.size
+        bucket = self._ring[index]
+        if bucket is None or bucket.slot != slot:
+            bucket = self._ring[index] = AggregateBucket(slot)
+        return bucket
+
+    def buckets(self, start: float, end: float) -> Iterator[AggregateBucket]:
+        """Buckets vivos entre start e end, em ordem cronológica (O(buckets))."""
+        first = max(int(start // self.resolution), int(end // self.resolution) - self.size + 1)
+        for slot in range(first, int(end // self.resolution) + 1):
+            bucket = self._ring[slot % self.size]
+            if bucket is not None and bucket.slot == slot:
+                yield bucket
+
+    def drop_before(self, timestamp: float) -> None:
+        """Descarta buckets anteriores ao instante."""
+        cutoff = int(timestamp // self.resolution)
+        for index, bucket in enumerate(self._ring):
+            if bucket is not None and bucket.slot < cutoff:
+                self._ring[index] = None
+
+
+def _merge_into(target: Dict[Any, Any], source: Dict[Any, Any], factory) -> None:
+    """Mescla os agregados de `source` em `target`, chave a chave."""
+    for key, stats in source.items():
+        merged = target.get(key)
+        if merged is None:
+            merged = target[key] = factory()
+        merged.merge(stats)
+
+
 class MetricsStore:
     """
-    Armazenamento em memória de métricas.
+    Armazenamento em memória de métricas com agregados por janela.
+
+    Cada evento atualiza um bucket de minuto (últimas 24h) e um de hora
+    (últimos 30 dias); as consultas mesclam só os buckets da janela.
+    Os eventos brutos ficam numa cauda limitada, apenas para depuração.
 
     Em produção, isso seria substituído por Redis ou TimeSeries DB.
     """
 
-    def __init__(self):
-        # Métricas por timestamp
-        self.request_metrics: List[Dict[str, Any]] = []
-        self.analysis_metrics: List[Dict[str, Any]] = []
-        self.error_metrics: List[Dict[str, Any]] = []
-        self.feedback_metrics: List[Dict[str, Any]] = []
-
-        # Agregados em tempo real
-        self.hourly_aggregates: Dict[str, Dict[str, Any]] = defaultdict(dict)
-        self.daily_aggregates: Dict[str, Dict[str, Any]] = defaultdict(dict)
+    def __init__(
+        self,
+        minute_buckets: int = 1440,
+        hour_buckets: int = 720,
+        raw_tail_size: int = 1000
+    ):
+        """
+        Inicializa o armazenamento.
+
+        Args:
+            minute_buckets: Retenção em minutos com resolução de minuto
+            hour_buckets: Retenção em horas com resolução de hora
+            raw_tail_size: Eventos brutos mantidos por tipo
+        """
+        self.started_at = time.time()
+        self.minutes = RollingWindow(60, minute_buckets)
+        self.hours = RollingWindow(3600, hour_buckets)
+        self._raw: Dict[str, Deque[Tuple[float, Dict[str, Any]]]] = {
+            metric_type: deque(maxlen=raw_tail_size)
+            for metric_type in ('request', 'analysis', 'error', 'feedback')
+        }
 
     def record_request(
         self,
@@ -47,18 +222,24 @@ class MetricsStore:
         status_code: int,
         latency_ms: float,
         experiment_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
     ):
         """Registra métrica de request HTTP."""
-        metric = {
-            'timestamp': datetime.utcnow().isoformat(),
+        timestamp = time.time() if timestamp is None else timestamp
+        key = (endpoint, experiment_id)
+        for bucket in self._buckets_for(timestamp):
+            stats = bucket.requests.get(key)
+            if stats is None:
+                stats = bucket.requests[key] = LatencyStats()
+            stats.add(latency_ms, error=status_code >= 400)
+
+        self._append_raw('request', timestamp, {
             'endpoint': endpoint,
             'method': method,
             'status_code': status_code,
             'latency_ms': latency_ms,
             'experiment_id': experiment_id,
-        }
-        self.request_metrics.append(metric)
-        self._aggregate_metric(metric, 'request')
+        })
 
     def record_analysis(
         self,
@@ -69,10 +250,18 @@ class MetricsStore:
         model_variant: str,
         success: bool,
         experiment_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
     ):
         """Registra métrica de análise de documento."""
-        metric = {
-            'timestamp': datetime.utcnow().isoformat(),
+        timestamp = time.time() if timestamp is None else timestamp
+        key = (model_variant, experiment_id)
+        for bucket in self._buckets_for(timestamp):
+            stats = bucket.analyses.get(key)
+            if stats is None:
+                stats = bucket.analyses[key] = AnalysisStats()
+            stats.add(duration_ms, tokens_used, success)
+
+        self._append_raw('analysis', timestamp, {
             'document_id': document_id,
             'analysis_type': analysis_type,
             'duration_ms': duration_ms,
@@ -80,9 +269,7 @@ class MetricsStore:
             'model_variant': model_variant,
             'success': success,
             'experiment_id': experiment_id,
-        }
-        self.analysis_metrics.append(metric)
-        self._aggregate_metric(metric, 'analysis')
+        })
 
     def record_error(
         self,
@@ -90,16 +277,22 @@ class MetricsStore:
         error_message: str,
         endpoint: str,
         experiment_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
     ):
         """Registra erro."""
-        metric = {
-            'timestamp': datetime.utcnow().isoformat(),
+        timestamp = time.time() if timestamp is None else timestamp
+        for bucket in self._buckets_for(timestamp):
+            stats = bucket.errors.get(error_type)
+            if stats is None:
+                stats = bucket.errors[error_type] = ErrorStats()
+            stats.add(error_message)
+
+        self._append_raw('error', timestamp, {
             'error_type': error_type,
             'error_message': error_message,
             'endpoint': endpoint,
             'experiment_id': experiment_id,
-        }
-        self.error_metrics.append(metric)
+        })
 
     def record_feedback(
         self,
@@ -107,91 +300,133 @@ class MetricsStore:
         is_positive: bool,
         rating: Optional[float],
         experiment_id: Optional[str] = None,
+        timestamp: Optional[float] = None,
     ):
         """Registra feedback do usuário."""
-        metric = {
-            'timestamp': datetime.utcnow().isoformat(),
+        timestamp = time.time() if timestamp is None else timestamp
+        for bucket in self._buckets_for(timestamp):
+            stats = bucket.feedback.get(experiment_id)
+            if stats is None:
+                stats = bucket.feedback[experiment_id] = FeedbackStats()
+            stats.add(is_positive)
+
+        self._append_raw('feedback', timestamp, {
             'document_id': document_id,
             'is_positive': is_positive,
             'rating': rating,
             'experiment_id': experiment_id,
-        }
-        self.feedback_metrics.append(metric)
-
-    def _aggregate_metric(self, metric: Dict[str, Any], metric_type: str):
-        """Agrega métrica em buckets horários e diários."""
-        timestamp = datetime.fromisoformat(metric['timestamp'])
-        hour_key = timestamp.strftime('%Y-%m-%d-%H')
-        day_key = timestamp.strftime('%Y-%m-%d')
-
-        # Agregação horária
-        if hour_key not in self.hourly_aggregates:
-            self.hourly_aggregates[hour_key] = {
-                'total_requests': 0,
-                'total_errors': 0,
-                'latencies': [],
-                'tokens': [],
-            }
-
-        if metric_type == 'request':
-            self.hourly_aggregates[hour_key]['total_requests'] += 1
-            self.hourly_aggregates[hour_key]['latencies'].append(metric['latency_ms'])
-
-        elif metric_type == 'analysis':
-            if metric.get('tokens_used'):
-                self.hourly_aggregates[hour_key]['tokens'].append(metric['tokens_used'])
-
-        # Agregação diária
-        if day_key not in self.daily_aggregates:
-            self.daily_aggregates[day_key] = {
-                'total_requests': 0,
-                'total_errors': 0,
-                'latencies': [],
-                'tokens': [],
-            }
-
-        if metric_type == 'request':
-            self.daily_aggregates[day_key]['total_requests'] += 1
-            self.daily_aggregates[day_key]['latencies'].append(metric['latency_ms'])
+        })
+
+    def _buckets_for(self, timestamp: float) -> Tuple[AggregateBucket, AggregateBucket]:
+        """Buckets de minuto e de hora do instante."""
+        return self.minutes.bucket_for(timestamp), self.hours.bucket_for(timestamp)
+
+    def _append_raw(self, metric_type: str, timestamp: float, metric: Dict[str, Any]) -> None:
+        """Adiciona evento bruto à cauda de depuração."""
+        metric['timestamp'] = datetime.utcfromtimestamp(timestamp).isoformat()
+        self._raw[metric_type].append((timestamp, metric))
+
+    def window_for(self, minutes: int) -> RollingWindow:
+        """Janela de menor resolução que cobre o período."""
+        return self.minutes if minutes * 60 <= self.minutes.span_seconds else self.hours
+
+    def iter_buckets(
+        self,
+        minutes: int,
+        now: Optional[float] = None
+    ) -> Iterator[AggregateBucket]:
+        """Buckets dos últimos `minutes` minutos."""
+        now = time.time() if now is None else now
+        return self.window_for(minutes).buckets(now - minutes * 60, now)
+
+    def request_stats(
+        self,
+        minutes: int,
+        now: Optional[float] = None
+    ) -> Dict[Tuple[str, Optional[str]], LatencyStats]:
+        """Latências por (endpoint, experimento) no período."""
+        merged: Dict[Tuple[str, Optional[str]], LatencyStats] = {}
+        for bucket in self.iter_buckets(minutes, now):
+            _merge_into(merged, bucket.requests, LatencyStats)
+        return merged
+
+    def analysis_stats(
+        self,
+        minutes: int,
+        now: Optional[float] = None
+    ) -> Dict[Tuple[str, Optional[str]], AnalysisStats]:
+        """Análises por (modelo, experimento) no período."""
+        merged: Dict[Tuple[str, Optional[str]], AnalysisStats] = {}
+        for bucket in self.iter_buckets(minutes, now):
+            _merge_into(merged, bucket.analyses, AnalysisStats)
+        return merged
+
+    def error_stats(self, minutes: int, now: Optional[float] = None) -> Dict[str, ErrorStats]:
+        """Erros por tipo no período."""
+        merged: Dict[str, ErrorStats] = {}
+        for bucket in self.iter_buckets(minutes, now):
+            _merge_into(merged, bucket.errors, ErrorStats)
+        return merged
+
+    def feedback_stats(
+        self,
+        minutes: int,
+        now: Optional[float] = None
+    ) -> Dict[Optional[str], FeedbackStats]:
+        """Feedbacks por experimento no período."""
+        merged: Dict[Optional[str], FeedbackStats] = {}
+        for bucket in self.iter_buckets(minutes, now):
+            _merge_into(merged, bucket.feedback, FeedbackStats)
+        return merged
+
+    def request_series(
+        self,
+        minutes: int,
+        granularity_seconds: int,
+        now: Optional[float] = None
+    ) -> List[Tuple[float, LatencyStats]]:
+        """
+        Série temporal de latências agrupada por granularidade.
+
+        Args:
+            minutes: Período
+            granularity_seconds: Tamanho de cada ponto (arredondado para
+                múltiplo da resolução da janela usada)
+            now: Instante final (default: agora)
+
+        Returns:
+            Lista (início do ponto em epoch, agregado) em ordem cronológica
+        """
+        window = self.window_for(minutes)
+        step = max(1, granularity_seconds // window.resolution) * window.resolution
+        series: Dict[float, LatencyStats] = {}
+        for bucket in self.iter_buckets(minutes, now):
+            point = (bucket.slot * window.resolution) // step * step
+            stats = series.get(point)
+            if stats is None:
+                stats = series[point] = LatencyStats()
+            for request_stats in bucket.requests.values():
+                stats.merge(request_stats)
+        return sorted(series.items())
 
     def get_recent_metrics(
         self,
         metric_type: str,
         minutes: int = 60
     ) -> List[Dict[str, Any]]:
-        """Retorna métricas recentes."""
-        cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-
-        if metric_type == 'request':
-            metrics = self.request_metrics
-        elif metric_type == 'analysis':
-            metrics = self.analysis_metrics
-        elif metric_type == 'error':
-            metrics = self.error_metrics
-        elif metric_type == 'feedback':
-            metrics = self.feedback_metrics
-        else:
-            return []
-
-        return [
-            m for m in metrics
-            if datetime.fromisoformat(m['timestamp']) >= cutoff
-        ]
+        """Retorna eventos brutos recentes (limitados à cauda de depuração)."""
+        cutoff = time.time() - minutes * 60
+        events = self._raw.get(metric_type, ())
+        return [metric for timestamp, metric in events if timestamp >= cutoff]
 
     def cleanup_old_metrics(self, days: int = 7):
         """Remove métricas antigas (> N dias)."""
-        cutoff = datetime.utcnow() - timedelta(days=days)
-
-        def filter_metrics(metrics):
-            return [
-                m for m in metrics
-                if datetime.fromisoformat(m['timestamp']) >= cutoff
-            ]
-
-        self.request_metrics = filter_metrics(self.request_metrics)
-        self.analysis_metrics = filter_metrics(self.analysis_metrics)
-        self.error_metrics = filter_metrics(self.error_metrics)
-        self.feedback_metrics = filter_metrics(self.feedback_metrics)
+        cutoff = time.time() - days * 86400
+        self.minutes.drop_before(cutoff)
+        self.hours.drop_before(cutoff)
+        for metric_type, events in self._raw.items():
+            while events and events[0][0] < cutoff:
+                events.popleft()
 
 
 # Global metrics store
@@ -257,6 +492,28 @@ class ErrorSummaryResponse(BaseModel):
 # Endpoints
 # ============================================================================
 
+PERIOD_MINUTES = {
+    '1h': 60,
+    '24h': 1440,
+    '7d': 10080,
+    '30d': 43200,
+}
+
+GRANULARITY_SECONDS = {
+    '1m': 60,
+    '5m': 300,
+    '1h': 3600,
+}
+
+
+def _merged_requests(minutes: int) -> LatencyStats:
+    """Latências de todos os endpoints no período."""
+    total = LatencyStats()
+    for stats in metrics_store.request_stats(minutes).values():
+        total.merge(stats)
+    return total
+
+
 @router.get("/health", response_model=SystemHealthResponse)
 async def get_system_health():
     """
@@ -265,12 +522,13 @@ async def get_system_health():
     Returns:
         Métricas de saúde do sistema
     """
-    recent_requests = metrics_store.get_recent_metrics('request', minutes=60)
+    requests = _merged_requests(60)
+    uptime = time.time() - metrics_store.started_at
 
-    if not recent_requests:
+    if not requests.count:
         return SystemHealthResponse(
             status="healthy",
-            uptime_seconds=0,
+            uptime_seconds=uptime,
             total_requests=0,
             error_rate=0.0,
             avg_latency_ms=0.0,
@@ -278,21 +536,16 @@ async def get_system_health():
             p99_latency_ms=0.0,
         )
 
-    # Calcular métricas
-    total_requests = len(recent_requests)
-    error_count = sum(1 for r in recent_requests if r['status_code'] >= 400)
-    latencies = [r['latency_ms'] for r in recent_requests]
-
-    error_rate = (error_count / total_requests * 100) if total_requests > 0 else 0.0
+    error_rate = requests.errors / requests.count * 100
 
     return SystemHealthResponse(
         status="healthy" if error_rate < 5.0 else "degraded",
-        uptime_seconds=3600.0,  # Placeholder
-        total_requests=total_requests,
+        uptime_seconds=uptime,
+        total_requests=requests.count,
         error_rate=error_rate,
-        avg_latency_ms=statistics.mean(latencies) if latencies else 0.0,
-        p95_latency_ms=statistics.quantiles(latencies, n=20)[18] if len(latencies) >= 20 else 0.0,
-        p99_latency_ms=statistics.quantiles(latencies, n=100)[98] if len(latencies) >= 100 else 0.0,
+        avg_latency_ms=requests.avg,
+        p95_latency_ms=requests.quantile(0.95),
+        p99_latency_ms=requests.quantile(0.99),
     )
 
 
@@ -309,46 +562,30 @@ async def get_analytics_overview(
     Returns:
         Overview com métricas agregadas
     """
-    # Converter período para minutos
-    period_map = {
-        '1h': 60,
-        '24h': 1440,
-        '7d': 10080,
-        '30d': 43200,
-    }
-    minutes = period_map.get(period, 60)
-
-    # Obter métricas
-    requests = metrics_store.get_recent_metrics('request', minutes=minutes)
-    analyses = metrics_store.get_recent_metrics('analysis', minutes=minutes)
-    errors = metrics_store.get_recent_metrics('error', minutes=minutes)
-    feedbacks = metrics_store.get_recent_metrics('feedback', minutes=minutes)
+    minutes = PERIOD_MINUTES.get(period, 60)
 
-    # Calcular métricas
-    total_requests = len(requests)
-    total_errors = len(errors)
-    error_rate = (total_errors / total_requests * 100) if total_requests > 0 else 0.0
-
-    latencies = [r['latency_ms'] for r in requests]
-    avg_latency = statistics.mean(latencies) if latencies else 0.0
-    p95_latency = statistics.quantiles(latencies, n=20)[18] if len(latencies) >= 20 else 0.0
+    requests = _merged_requests(minutes)
+    analyses = AnalysisStats()
+    for stats in metrics_store.analysis_stats(minutes).values():
+        analyses.merge(stats)
+    total_errors = sum(stats.count for stats in metrics_store.error_stats(minutes).values())
+    feedback = FeedbackStats()
+    for stats in metrics_store.feedback_stats(minutes).values():
+        feedback.merge(stats)
 
-    tokens = [a['tokens_used'] for a in analyses if a.get('tokens_used')]
-    avg_tokens = statistics.mean(tokens) if tokens else 0.0
-
-    positive_feedback = sum(1 for f in feedbacks if f['is_positive'])
-    positive_rate = (positive_feedback / len(feedbacks) * 100) if feedbacks else 0.0
+    error_rate = (total_errors / requests.count * 100) if requests.count > 0 else 0.0
+    positive_rate = (feedback.positive / feedback.total * 100) if feedback.total else 0.0
 
     return AnalyticsOverviewResponse(
         period=period,
-        total_requests=total_requests,
-        total_analyses=len(analyses),
+        total_requests=requests.count,
+        total_analyses=analyses.successes + analyses.failures,
         total_errors=total_errors,
         error_rate=error_rate,
-        avg_latency_ms=avg_latency,
-        p95_latency_ms=p95_latency,
-        avg_tokens_per_analysis=avg_tokens,
-        total_feedback=len(feedbacks),
+        avg_latency_ms=requests.avg,
+        p95_latency_ms=requests.quantile(0.95),
+        avg_tokens_per_analysis=analyses.avg_tokens,
+        total_feedback=feedback.total,
         positive_feedback_rate=positive_rate,
     )
 
@@ -362,6 +599,9 @@ async def get_timeseries(
     """
     Retorna série temporal de uma métrica.
 
+    Períodos acima da retenção por minuto usam os buckets horários
+    (granularidade mínima de 1h).
+
     Args:
         metric_name: Nome da métrica (latency, requests, errors, tokens)
         period: Período de dados
@@ -370,43 +610,30 @@ async def get_timeseries(
     Returns:
         Lista de pontos de dados
     """
-    # Placeholder implementation
-    # Em produção, isso consultaria TimeSeries DB
+    minutes = PERIOD_MINUTES.get(period, 1440)
+    series = metrics_store.request_series(minutes, GRANULARITY_SECONDS.get(granularity, 3600))
 
-    period_map = {'1h': 60, '24h': 1440, '7d': 10080}
-    minutes = period_map.get(period, 1440)
+    def label_time(point: float) -> str:
+        return datetime.utcfromtimestamp(point).strftime('%Y-%m-%d %H:%M')
 
     if metric_name == 'latency':
-        requests = metrics_store.get_recent_metrics('request', minutes=minutes)
-        # Agrupar por hora
-        hourly_latencies = defaultdict(list)
-        for r in requests:
-            hour = datetime.fromisoformat(r['timestamp']).strftime('%Y-%m-%d %H:00')
-            hourly_latencies[hour].append(r['latency_ms'])
-
         return [
             TimeSeriesDataPoint(
-                timestamp=hour,
-                value=statistics.mean(latencies),
-                label=f"Avg: {statistics.mean(latencies):.1f}ms"
+                timestamp=label_time(point),
+                value=stats.avg,
+                label=f"Avg: {stats.avg:.1f}ms"
             )
-            for hour, latencies in sorted(hourly_latencies.items())
+            for point, stats in series
         ]
 
     elif metric_name == 'requests':
-        requests = metrics_store.get_recent_metrics('request', minutes=minutes)
-        hourly_counts = defaultdict(int)
-        for r in requests:
-            hour = datetime.fromisoformat(r['timestamp']).strftime('%Y-%m-%d %H:00')
-            hourly_counts[hour] += 1
-
         return [
             TimeSeriesDataPoint(
-                timestamp=hour,
-                value=float(count),
-                label=f"{count} requests"
+                timestamp=label_time(point),
+                value=float(stats.count),
+                label=f"{stats.count} requests"
             )
-            for hour, count in sorted(hourly_counts.items())
+            for point, stats in series
         ]
 
     else:
@@ -426,72 +653,36 @@ async def get_model_performance(
     Returns:
         Lista de performance por modelo
     """
-    period_map = {'1h': 60, '24h': 1440, '7d': 10080, '30d': 43200}
-    minutes = period_map.get(period, 1440)
-
-    analyses = metrics_store.get_recent_metrics('analysis', minutes=minutes)
-    feedbacks = metrics_store.get_recent_metrics('feedback', minutes=minutes)
-
-    # Agrupar por modelo
-    by_model = defaultdict(lambda: {
-        'requests': [],
-        'latencies': [],
-        'tokens': [],
-        'successes': 0,
-        'failures': 0,
-        'positive_feedback': 0,
-        'negative_feedback': 0,
-    })
-
-    for analysis in analyses:
-        model = analysis.get('model_variant', 'unknown')
-        by_model[model]['requests'].append(analysis)
-        by_model[model]['latencies'].append(analysis['duration_ms'])
-
-        if analysis.get('tokens_used'):
-            by_model[model]['tokens'].append(analysis['tokens_used'])
-
-        if analysis['success']:
-            by_model[model]['successes'] += 1
-        else:
-            by_model[model]['failures'] += 1
+    minutes = PERIOD_MINUTES.get(period, 1440)
+
+    # Agrupar por modelo (somando experimentos)
+    by_model: Dict[str, AnalysisStats] = defaultdict(AnalysisStats)
+    for (model, _), stats in metrics_store.analysis_stats(minutes).items():
+        by_model[model or 'unknown'].merge(stats)
 
     # Adicionar feedback
-    for feedback in feedbacks:
-        exp_id = feedback.get('experiment_id')
+    feedback_by_model: Dict[str, FeedbackStats] = defaultdict(FeedbackStats)
+    for exp_id, stats in metrics_store.feedback_stats(minutes).items():
         if exp_id:
             # Mapear experiment_id para modelo (simplificado)
-            model = exp_id.split('-')[0] if exp_id else 'unknown'
-            if feedback['is_positive']:
-                by_model[model]['positive_feedback'] += 1
-            else:
-                by_model[model]['negative_feedback'] += 1
+            feedback_by_model[exp_id.split('-')[0]].merge(stats)
 
     # Calcular métricas
     results = []
-    for model, data in by_model.items():
-        total = data['successes'] + data['failures']
-        success_rate = (data['successes'] / total * 100) if total > 0 else 0.0
-
-        total_feedback = data['positive_feedback'] + data['negative_feedback']
-        feedback_score = (
-            (data['positive_feedback'] / total_feedback * 100)
-            if total_feedback > 0 else 0.0
-        )
-
-        latencies = data['latencies']
-        tokens = data['tokens']
+    for model in set(by_model) | set(feedback_by_model):
+        data = by_model[model]
+        feedback = feedback_by_model[model]
+        total = data.successes + data.failures
+        success_rate = (data.successes / total * 100) if total > 0 else 0.0
+        feedback_score = (feedback.positive / feedback.total * 100) if feedback.total else 0.0
 
         results.append(ModelPerformanceResponse(
             model_variant=model,
-            total_requests=len(data['requests']),
-            avg_latency_ms=statistics.mean(latencies) if latencies else 0.0,
-            p95_latency_ms=(
-                statistics.quantiles(latencies, n=20)[18]
-                if len(latencies) >= 20 else 0.0
-            ),
+            total_requests=total,
+            avg_latency_ms=data.duration.avg,
+            p95_latency_ms=data.duration.quantile(0.95),
             success_rate=success_rate,
-            avg_tokens=statistics.mean(tokens) if tokens else 0.0,
+            avg_tokens=data.avg_tokens,
             feedback_score=feedback_score,
         ))
 
@@ -511,30 +702,22 @@ async def get_error_summary(
     Returns:
         Lista de erros agregados por tipo
     """
-    period_map = {'1h': 60, '24h': 1440, '7d': 10080}
-    minutes = period_map.get(period, 1440)
+    minutes = PERIOD_MINUTES.get(period, 1440)
 
-    errors = metrics_store.get_recent_metrics('error', minutes=minutes)
+    errors = metrics_store.error_stats(minutes)
+    total_errors = sum(stats.count for stats in errors.values())
 
-    if not errors:
+    if not total_errors:
         return []
 
-    # Agrupar por tipo
-    by_type = defaultdict(list)
-    for error in errors:
-        error_type = error.get('error_type', 'unknown')
-        by_type[error_type].append(error['error_message'])
-
-    total_errors = len(errors)
-
     return [
         ErrorSummaryResponse(
             error_type=error_type,
-            count=len(messages),
-            percentage=(len(messages) / total_errors * 100),
-            recent_examples=messages[:3],  # Primeiros 3 exemplos
+            count=stats.count,
+            percentage=(stats.count / total_errors * 100),
+            recent_examples=list(stats.examples),  # Exemplos mais recentes
         )
-        for error_type, messages in by_type.items()
+        for error_type, stats in errors.items()
     ]
 
 
@@ -36,6 +36,17 @@ class Settings(BaseSettings):
     DEFAULT_TIMEOUT: int = 300  # 5 minutes
     MAX_RETRY_ATTEMPTS: int = 3
     
+    # Admission Control (unidades de custo; 1.0 = análise standard simples)
+    ADMISSION_CAPACITY_UNITS: float = 16.0
+    ADMISSION_MAX_QUEUE: int = 50
+    ADMISSION_QUEUE_TIMEOUT: float = 30.0  # seconds
+    
+    # Result Cache (AnalyzerService)
+    RESULT_CACHE_MAX_ENTRIES: int = 1000
+    RESULT_CACHE_MAX_BYTES: int = 67108864  # 64MB
+    RESULT_CACHE_TTL_SECONDS: float = 3600.0  # 1 hour
+    RESULT_CACHE_STALE_SECONDS: float = 600.0  # served stale while revalidating
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
@@ -38,6 +38,10 @@ class RAGConfig(BaseSettings):
         default="rag-corpus",
         env="GCS_RAG_BASE_PATH"
     )
+    gcs_max_concurrent_uploads: int = 8  # Também dimensiona o pool HTTP
+    gcs_upload_max_retries: int = 3
+    gcs_upload_backoff_seconds: float = 0.5
+    gcs_gzip_uploads: bool = Field(default=False, env="GCS_RAG_GZIP_UPLOADS")
 
     # RAG Corpus Settings
     shared_corpus_prefix: str = "shared"
@@ -74,6 +78,13 @@ class RAGConfig(BaseSettings):
     import_timeout_seconds: int = 600  # 10 minutos
     query_timeout_seconds: int = 30
 
+    # Local Vector Index (retrieval offline / fallback)
+    local_index_enabled: bool = Field(default=False, env="RAG_LOCAL_INDEX_ENABLED")
+    local_index_path: Optional[str] = Field(default=None, env="RAG_LOCAL_INDEX_PATH")
+    local_index_type: str = "flat"  # flat, ivf
+    local_index_mode: str = "fallback"  # first_tier, fallback
+    local_index_min_results: int = 3  # Mínimo de hits para dispensar o Vertex (first_tier)
+
     # Feature Flags
     enable_grounding: bool = False  # $2.5/1K requests - desabilitado por padrão
     enable_reranking: bool = True
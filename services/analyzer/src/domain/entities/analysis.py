@@ -9,6 +9,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from enum import Enum
+import sys
 import uuid
 
 from .document import DocumentId
@@ -40,7 +41,16 @@ class FindingCategory(str, Enum):
     ABNT = "abnt"
 
 
-@dataclass(frozen=True)
+# Peso numérico por severidade, compartilhado por todos os findings
+SEVERITY_WEIGHTS: Dict[FindingSeverity, float] = {
+    FindingSeverity.BAIXA: 1.0,
+    FindingSeverity.MEDIA: 2.0,
+    FindingSeverity.ALTA: 3.0,
+    FindingSeverity.CRITICA: 4.0
+}
+
+
+@dataclass(frozen=True, slots=True)
 class AnalysisId:
     """Value Object para ID de análise."""
     value: str
@@ -53,7 +63,7 @@ class AnalysisId:
         return self.value
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ConformityScores:
     """Value Object para scores de conformidade."""
     structural: float
@@ -119,10 +129,16 @@ class ConformityScores:
         )
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Finding:
     """
     Representa um achado/problema específico identificado na análise.
+
+    Imutável e sem `__dict__` por instância: análises de editais grandes
+    mantêm milhares de findings em memória e em caches. Categoria e
+    severidade são normalizadas para os membros dos enums e rule_id /
+    regulatory_reference são internados, então valores repetidos são
+    compartilhados entre findings.
     """
     id: str
     category: FindingCategory
@@ -141,8 +157,20 @@ class Finding:
 
     def __post_init__(self):
         """Validações pós-inicialização."""
+        self._normalize()
         self._validate()
 
+    def _normalize(self) -> None:
+        """Troca valores repetidos por instâncias compartilhadas."""
+        # Aceita o valor em string (ex.: vindo de JSON) e guarda o membro do enum
+        object.__setattr__(self, 'category', FindingCategory(self.category))
+        object.__setattr__(self, 'severity', FindingSeverity(self.severity))
+
+        for name in ('rule_id', 'regulatory_reference'):
+            value = getattr(self, name)
+            if value is not None:
+                object.__setattr__(self, name, sys.intern(value))
+
     def _validate(self) -> None:
         """Valida invariantes do finding."""
         if not self.title.strip():
@@ -164,13 +192,7 @@ class Finding:
         Returns:
             Peso de 1-4 baseado na severidade
         """
-        weights = {
-            FindingSeverity.BAIXA: 1.0,
-            FindingSeverity.MEDIA: 2.0,
-            FindingSeverity.ALTA: 3.0,
-            FindingSeverity.CRITICA: 4.0
-        }
-        return weights[self.severity]
+        return SEVERITY_WEIGHTS[self.severity]
 
     def to_dict(self) -> Dict[str, Any]:
         """Converte finding para dicionário."""
@@ -193,7 +215,7 @@ class Finding:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisMetrics:
     """Métricas e estatísticas da análise."""
     execution_time_seconds: float
@@ -223,7 +245,7 @@ class AnalysisMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Analysis:
     """
     Entidade Analysis refatorada.
@@ -7,7 +7,7 @@ Contém regras de negócio puras, sem dependências externas.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, FrozenSet
 from enum import Enum
 import hashlib
 
@@ -216,7 +216,7 @@ class Document:
             return False
         
         # Algoritmo simples baseado em palavras comuns
-        words1 = set(self.content.lower().split())
+        words1 = self.get_word_set()
         words2 = set(other_content.lower().split())
         
         if not words1 or not words2:
@@ -228,6 +228,15 @@ class Document:
         similarity = len(intersection) / len(union) if union else 0
         return similarity >= threshold
 
+    def get_word_set(self) -> FrozenSet[str]:
+        """
+        Conjunto de palavras (minúsculas) usado na detecção de duplicatas.
+        
+        Returns:
+            Palavras distintas do conteúdo
+        """
+        return frozenset(self.content.lower().split())
+
     def get_readability_metrics(self) -> Dict[str, Any]:
         """
         Calcula métricas básicas de legibilidade.
@@ -23,6 +23,23 @@ from ..entities.analysis import (
 from ..interfaces.services import IAnalysisEngine, IMetricsService, ILoggingService
 
 
+def complexity_factors(content_length: int, custom_rules_count: int) -> Dict[str, float]:
+    """
+    Fatores de complexidade de uma análise.
+    
+    Args:
+        content_length: Tamanho do conteúdo em caracteres
+        custom_rules_count: Número de regras personalizadas ativas
+        
+    Returns:
+        Dict com content_complexity (máx. 5) e rules_complexity (máx. 3)
+    """
+    return {
+        'content_complexity': min(5, content_length / 10000),
+        'rules_complexity': min(3, custom_rules_count / 5)
+    }
+
+
 class AnalysisDomainService:
     """
     Serviço de domínio para coordenação de análises adaptativas.
@@ -230,8 +247,9 @@ class AnalysisDomainService:
         custom_rules_count = len(organization.get_active_rules())
         
         # Fatores de complexidade
-        content_complexity = min(5, content_length / 10000)  # Max 5
-        rules_complexity = min(3, custom_rules_count / 5)    # Max 3
+        factors = complexity_factors(content_length, custom_rules_count)
+        content_complexity = factors['content_complexity']
+        rules_complexity = factors['rules_complexity']
         
         total_complexity = content_complexity + rules_complexity
         
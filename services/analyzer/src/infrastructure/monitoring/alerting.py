@@ -2,11 +2,18 @@
 Advanced Alerting System
 
 Sistema avançado de alertas com múltiplos canais e regras configuráveis.
+Regras são compiladas em avaliadores incrementais que assinam as
+atualizações das métricas: agregados de janela deslizante são mantidos
+na ingestão e a avaliação não depende do tamanho do histórico.
 """
 
 import asyncio
 import json
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -45,28 +52,105 @@ class AlertRule:
     cooldown_minutes: int = 30
     enabled: bool = True
     tags: Dict[str, str] = field(default_factory=dict)
+    aggregation: str = "latest"  # "latest", "sum", "count", "rate", "avg", "max"
+    labels: Dict[str, str] = field(default_factory=dict)  # Filtro (ex.: organization_id)
     
     def evaluate(self, metric: Metric) -> bool:
-        """Avalia se a regra deve disparar."""
+        """Avalia se a regra deve disparar (pelo último valor da métrica)."""
         if not self.enabled:
             return False
         
-        latest_value = metric.get_latest_value()
-        if latest_value is None:
+        return self.check(metric.get_latest_value())
+    
+    def check(self, value: Optional[float]) -> bool:
+        """Aplica a condição ao valor agregado."""
+        if value is None:
             return False
         
         if self.condition == "greater_than":
-            return latest_value > self.threshold
+            return value > self.threshold
         elif self.condition == "less_than":
-            return latest_value < self.threshold
+            return value < self.threshold
         elif self.condition == "equals":
-            return latest_value == self.threshold
+            return value == self.threshold
         elif self.condition == "not_equals":
-            return latest_value != self.threshold
+            return value != self.threshold
         
         return False
 
 
+class WindowEvaluator:
+    """
+    Avaliador incremental de uma regra.
+    
+    Mantém a janela deslizante da regra em BUCKETS sub-intervalos com
+    contagem, soma e máximo; soma e contagem totais são atualizadas na
+    ingestão e na expiração, então cada observação é O(1) e cada
+    avaliação é no máximo O(BUCKETS), independente do histórico.
+    """
+    
+    BUCKETS = 60
+    
+    def __init__(self, rule: AlertRule):
+        self.rule = rule
+        self.window_seconds = max(1, rule.evaluation_window_minutes) * 60
+        self._width = self.window_seconds / self.BUCKETS
+        self._buckets: deque = deque()  # [slot, count, sum, max]
+        self._count = 0
+        self._sum = 0.0
+        self.latest: Optional[float] = None
+    
+    def observe(self, value: float, timestamp: float) -> None:
+        """Adiciona uma observação à janela."""
+        slot = int(timestamp // self._width)
+        if self._buckets and self._buckets[-1][0] >= slot:
+            # Mesmo sub-intervalo (ou relógio fora de ordem): soma no mais recente
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += value
+            bucket[3] = max(bucket[3], value)
+        else:
+            self._buckets.append([slot, 1, value, value])
+        self._count += 1
+        self._sum += value
+        self.latest = value
+        self._expire(timestamp)
+    
+    def value(self, now: Optional[float] = None) -> Optional[float]:
+        """Valor agregado da janela terminando em `now`."""
+        self._expire(time.time() if now is None else now)
+        aggregation = self.rule.aggregation
+        
+        if aggregation == "latest":
+            return self.latest
+        if aggregation == "sum":
+            return self._sum
+        if aggregation == "count":
+            return float(self._count)
+        if aggregation == "rate":
+            return self._sum / self.window_seconds
+        if not self._count:
+            return None
+        if aggregation == "avg":
+            return self._sum / self._count
+        if aggregation == "max":
+            return max(bucket[3] for bucket in self._buckets)
+        return None
+    
+    def _expire(self, now: float) -> None:
+        """Remove sub-intervalos fora da janela."""
+        oldest_slot = int((now - self.window_seconds) // self._width) + 1
+        buckets = self._buckets
+        while buckets and buckets[0][0] < oldest_slot:
+            _, count, total, _ = buckets.popleft()
+            self._count -= count
+            self._sum -= total
+        if not buckets:
+            # Zera resíduos de ponto flutuante
+            self._count = 0
+            self._sum = 0.0
+
+
 @dataclass
 class Alert:
     """Alerta disparado."""
@@ -355,20 +439,48 @@ class AlertManager:
     """
     Gerenciador de alertas para o sistema.
     
-    Monitora métricas, avalia regras e dispara alertas
-    através de múltiplos canais.
+    Cada regra é compilada em um WindowEvaluator inscrito nas
+    atualizações da sua métrica. A ingestão atualiza a janela e marca
+    a regra como pendente quando a condição passa a valer; o loop de
+    monitoramento acorda na hora e só avalia as regras pendentes, com
+    uma varredura periódica para condições que mudam com o passar do
+    tempo (ex.: janela que esvazia).
     """
     
-    def __init__(self, metrics_collector: MetricsCollector):
+    def __init__(
+        self,
+        metrics_collector: MetricsCollector,
+        sweep_interval: float = 30.0,
+        max_history: int = 10000
+    ):
+        """
+        Inicializa o gerenciador.
+        
+        Args:
+            metrics_collector: Coletor cujas métricas são monitoradas
+            sweep_interval: Intervalo da varredura periódica em segundos
+            max_history: Alertas mantidos no histórico
+        """
         self.metrics_collector = metrics_collector
         self.rules: Dict[str, AlertRule] = {}
         self.active_alerts: Dict[str, Alert] = {}
         self.alert_history: List[Alert] = []
         self.channels: List[AlertChannel] = []
+        self._history_times: List[float] = []
+        self._max_history = max_history
         self._last_evaluation: Dict[str, datetime] = {}
         self._cooldown_tracker: Dict[str, datetime] = {}
         self._background_task: Optional[asyncio.Task] = None
         self._is_running = False
+        self._sweep_interval = sweep_interval
+        
+        # Avaliadores: por regra e indexados por métrica → chaves do filtro → valores
+        self._lock = threading.Lock()
+        self._evaluators: Dict[str, WindowEvaluator] = {}
+        self._index: Dict[str, Dict[Tuple[str, ...], Dict[Tuple[str, ...], List[WindowEvaluator]]]] = {}
+        self._pending: Dict[str, None] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
         
         # Registra regras padrão
         self._register_default_rules()
@@ -418,7 +530,8 @@ class AlertManager:
                 threshold=10.0,
                 severity=AlertSeverity.ERROR,
                 evaluation_window_minutes=1,
-                cooldown_minutes=5
+                cooldown_minutes=5,
+                aggregation="sum"
             ),
             AlertRule(
                 id="analysis_timeout",
@@ -429,7 +542,8 @@ class AlertManager:
                 threshold=60.0,
                 severity=AlertSeverity.WARNING,
                 evaluation_window_minutes=3,
-                cooldown_minutes=10
+                cooldown_minutes=10,
+                aggregation="max"
             )
         ]
         
@@ -437,13 +551,49 @@ class AlertManager:
             self.add_rule(rule)
     
     def add_rule(self, rule: AlertRule) -> None:
-        """Adiciona regra de alerta."""
-        self.rules[rule.id] = rule
+        """Adiciona (ou substitui) regra de alerta e assina sua métrica."""
+        self.remove_rule(rule.id)
+        
+        evaluator = WindowEvaluator(rule)
+        label_keys = tuple(sorted(rule.labels))
+        label_values = tuple(rule.labels[key] for key in label_keys)
+        
+        with self._lock:
+            self.rules[rule.id] = rule
+            self._evaluators[rule.id] = evaluator
+            by_keys = self._index.get(rule.metric_name)
+            subscribe = by_keys is None
+            if subscribe:
+                by_keys = self._index[rule.metric_name] = {}
+            by_keys.setdefault(label_keys, {}).setdefault(label_values, []).append(evaluator)
+        
+        if subscribe:
+            self.metrics_collector.subscribe(rule.metric_name, self._on_metric_update)
     
     def remove_rule(self, rule_id: str) -> None:
         """Remove regra de alerta."""
-        if rule_id in self.rules:
-            del self.rules[rule_id]
+        with self._lock:
+            rule = self.rules.pop(rule_id, None)
+            evaluator = self._evaluators.pop(rule_id, None)
+            self._pending.pop(rule_id, None)
+            if rule is None or evaluator is None:
+                return
+            
+            by_keys = self._index[rule.metric_name]
+            label_keys = tuple(sorted(rule.labels))
+            label_values = tuple(rule.labels[key] for key in label_keys)
+            by_values = by_keys[label_keys]
+            by_values[label_values].remove(evaluator)
+            if not by_values[label_values]:
+                del by_values[label_values]
+            if not by_values:
+                del by_keys[label_keys]
+            unsubscribe = not by_keys
+            if unsubscribe:
+                del self._index[rule.metric_name]
+        
+        if unsubscribe:
+            self.metrics_collector.unsubscribe(rule.metric_name, self._on_metric_update)
     
     def add_channel(self, channel: AlertChannel) -> None:
         """Adiciona canal de alerta."""
@@ -455,9 +605,66 @@ class AlertManager:
                 if alert.status == AlertStatus.TRIGGERED and not alert.is_suppressed()]
     
     def get_alert_history(self, hours: int = 24) -> List[Alert]:
-        """Obtém histórico de alertas."""
-        cutoff = datetime.utcnow() - timedelta(hours=hours)
-        return [alert for alert in self.alert_history if alert.triggered_at >= cutoff]
+        """Obtém histórico de alertas (busca binária pelo início do período)."""
+        return self._alerts_since(datetime.utcnow() - timedelta(hours=hours))
+    
+    def _alerts_since(self, cutoff: datetime) -> List[Alert]:
+        """Alertas disparados a partir de `cutoff`, em ordem cronológica."""
+        start = bisect_left(self._history_times, cutoff.timestamp())
+        return self.alert_history[start:]
+    
+    def _record_history(self, alert: Alert) -> None:
+        """Adiciona ao histórico mantendo-o ordenado e limitado."""
+        self.alert_history.append(alert)
+        self._history_times.append(alert.triggered_at.timestamp())
+        
+        # Descarta a metade mais antiga de uma vez (custo amortizado O(1))
+        if len(self.alert_history) > self._max_history * 2:
+            del self.alert_history[:-self._max_history]
+            del self._history_times[:-self._max_history]
+    
+    def _on_metric_update(
+        self,
+        metric_name: str,
+        value: float,
+        labels: Dict[str, str],
+        timestamp: float
+    ) -> None:
+        """Atualiza os avaliadores da métrica (chamado na ingestão)."""
+        became_pending = False
+        
+        with self._lock:
+            by_keys = self._index.get(metric_name)
+            if not by_keys:
+                return
+            
+            # Uma consulta por conjunto distinto de chaves de filtro,
+            # independente do número de regras (ex.: uma por organização)
+            for label_keys, by_values in by_keys.items():
+                try:
+                    label_values = tuple(labels[key] for key in label_keys)
+                except KeyError:
+                    continue
+                
+                for evaluator in by_values.get(label_values, ()):
+                    evaluator.observe(value, timestamp)
+                    rule = evaluator.rule
+                    if rule.enabled and rule.id not in self._pending and rule.check(evaluator.value(timestamp)):
+                        self._pending[rule.id] = None
+                        became_pending = True
+        
+        if became_pending:
+            self._wake()
+    
+    def _wake(self) -> None:
+        """Acorda o loop de monitoramento (seguro a partir de outras threads)."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass  # Loop encerrado
     
     async def start_monitoring(self) -> None:
         """Inicia monitoramento de alertas."""
@@ -465,6 +672,8 @@ class AlertManager:
             return
         
         self._is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         self._background_task = asyncio.create_task(self._monitoring_loop())
     
     async def stop_monitoring(self) -> None:
@@ -476,39 +685,70 @@ class AlertManager:
                 await self._background_task
             except asyncio.CancelledError:
                 pass
+        self._loop = None
+        self._wakeup = None
     
     async def _monitoring_loop(self) -> None:
-        """Loop principal de monitoramento."""
+        """Loop principal: avalia pendentes ao acordar e varre periodicamente."""
+        next_sweep = time.monotonic() + self._sweep_interval
+        
         while self._is_running:
             try:
-                await self._evaluate_rules()
-                await asyncio.sleep(30)  # Avalia a cada 30 segundos
+                timeout = max(0.0, next_sweep - time.monotonic())
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                
+                if time.monotonic() >= next_sweep:
+                    await self._evaluate_rules()
+                    next_sweep = time.monotonic() + self._sweep_interval
+                else:
+                    await self._evaluate_pending()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 print(f"Erro no loop de monitoramento de alertas: {e}")
                 await asyncio.sleep(5)
     
+    async def _evaluate_pending(self) -> None:
+        """Avalia apenas as regras marcadas na ingestão."""
+        with self._lock:
+            rule_ids = list(self._pending)
+            self._pending.clear()
+        await self._evaluate(rule_ids)
+    
     async def _evaluate_rules(self) -> None:
-        """Avalia todas as regras de alerta."""
+        """Avalia todas as regras de alerta (varredura periódica)."""
+        with self._lock:
+            self._pending.clear()
+            rule_ids = list(self.rules)
+        await self._evaluate(rule_ids)
+    
+    async def _evaluate(self, rule_ids: List[str]) -> None:
+        """Dispara as regras cuja condição vale (cada uma em O(janela))."""
         now = datetime.utcnow()
+        epoch = time.time()
+        triggered = []
         
-        for rule in self.rules.values():
-            if not rule.enabled:
-                continue
-            
-            # Verifica cooldown
-            if self._is_in_cooldown(rule.id, now):
-                continue
-            
-            # Obtém métrica
-            metric = self.metrics_collector.get_metric(rule.metric_name)
-            if not metric:
-                continue
-            
-            # Avalia regra
-            if rule.evaluate(metric):
-                await self._trigger_alert(rule, metric)
+        with self._lock:
+            for rule_id in rule_ids:
+                rule = self.rules.get(rule_id)
+                evaluator = self._evaluators.get(rule_id)
+                if rule is None or evaluator is None or not rule.enabled:
+                    continue
+                
+                # Verifica cooldown
+                if self._is_in_cooldown(rule_id, now):
+                    continue
+                
+                value = evaluator.value(epoch)
+                if rule.check(value):
+                    triggered.append((rule, value))
+        
+        for rule, value in triggered:
+            await self._trigger_alert(rule, value)
     
     def _is_in_cooldown(self, rule_id: str, now: datetime) -> bool:
         """Verifica se a regra está em cooldown."""
@@ -521,13 +761,11 @@ class AlertManager:
         
         return now < cooldown_until
     
-    async def _trigger_alert(self, rule: AlertRule, metric: Metric) -> None:
+    async def _trigger_alert(self, rule: AlertRule, current_value: float) -> None:
         """Dispara um alerta."""
         import uuid
         
-        current_value = metric.get_latest_value()
-        if current_value is None:
-            return
+        metric = self.metrics_collector.get_metric(rule.metric_name)
         
         # Cria alerta
         alert = Alert(
@@ -542,15 +780,17 @@ class AlertManager:
             triggered_at=datetime.utcnow(),
             message=f"{rule.description}. Valor atual: {current_value}, Limite: {rule.threshold}",
             context={
-                "metric_unit": metric.unit.value,
+                "metric_unit": metric.unit.value if metric else None,
                 "evaluation_window": rule.evaluation_window_minutes,
+                "aggregation": rule.aggregation,
+                "labels": rule.labels,
                 "tags": rule.tags
             }
         )
         
         # Adiciona à lista ativa
         self.active_alerts[alert.id] = alert
-        self.alert_history.append(alert)
+        self._record_history(alert)
         
         # Atualiza cooldown
         self._cooldown_tracker[rule.id] = datetime.utcnow()
@@ -599,11 +839,11 @@ class AlertManager:
     def get_alert_statistics(self) -> Dict[str, Any]:
         """Obtém estatísticas de alertas."""
         now = datetime.utcnow()
-        last_24h = now - timedelta(hours=24)
-        last_7d = now - timedelta(days=7)
         
-        recent_alerts = [a for a in self.alert_history if a.triggered_at >= last_24h]
-        weekly_alerts = [a for a in self.alert_history if a.triggered_at >= last_7d]
+        recent_alerts = self._alerts_since(now - timedelta(hours=24))
+        weekly_alerts_count = len(self.alert_history) - bisect_left(
+            self._history_times, (now - timedelta(days=7)).timestamp()
+        )
         
         return {
             "active_alerts": len(self.get_active_alerts()),
@@ -611,7 +851,7 @@ class AlertManager:
             "enabled_rules": len([r for r in self.rules.values() if r.enabled]),
             "channels_configured": len(self.channels),
             "alerts_last_24h": len(recent_alerts),
-            "alerts_last_7d": len(weekly_alerts),
+            "alerts_last_7d": weekly_alerts_count,
             "alerts_by_severity_24h": {
                 severity.value: len([a for a in recent_alerts if a.severity == severity])
                 for severity in AlertSeverity
@@ -0,0 +1,305 @@
+"""
+Quantile Sketches
+
+Sketches de quantis para histogramas de métricas:
+- DDSketch com erro relativo garantido e número máximo de bins (memória constante)
+- Sketches mescláveis (entre fatias de tempo e entre workers)
+- Série de sketches por fatia de tempo para consultas por janela sem ordenação
+"""
+
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+# Valores com módulo abaixo deste limite são contados como zero
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """
+    Sketch de quantis com erro relativo limitado (DDSketch).
+
+    Cada valor cai em um bin logarítmico de índice ceil(log_gamma(|v|)),
+    então qualquer quantil é estimado com erro relativo <= relative_accuracy.
+    Quando o número de bins excede `max_bins`, os bins de menor módulo são
+    colapsados (a precisão se mantém nos quantis altos).
+    """
+
+    __slots__ = (
+        'relative_accuracy', 'max_bins', '_gamma', '_log_gamma',
+        '_positive', '_negative', 'zero_count', 'count', 'sum', 'min', 'max'
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """
+        Args:
+            relative_accuracy: Erro relativo máximo dos quantis (0 < a < 1)
+            max_bins: Máximo de bins por sinal
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy deve estar entre 0 e 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Adiciona um valor (com multiplicidade `count`)."""
+        if count <= 0:
+            return
+
+        if value > MIN_INDEXABLE_VALUE:
+            self._add_to(self._positive, self._key(value), count)
+        elif value < -MIN_INDEXABLE_VALUE:
+            self._add_to(self._negative, self._key(-value), count)
+        else:
+            self.zero_count += count
+
+        self.count += count
+        self.sum += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'DDSketch') -> None:
+        """Mescla outro sketch (mesma precisão) neste."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Sketches com precisões diferentes não podem ser mesclados")
+        if not other.count:
+            return
+
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+        self._collapse(self._positive)
+        self._collapse(self._negative)
+
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estima o quantil q (0 <= q <= 1).
+
+        Returns:
+            Valor estimado ou None se o sketch estiver vazio
+        """
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = 0
+
+        # Negativos: do maior módulo para o menor
+        for key in sorted(self._negative, reverse=True):
+            seen += self._negative[key]
+            if seen > rank:
+                return self._clamp(-self._value(key))
+
+        seen += self.zero_count
+        if seen > rank:
+            return self._clamp(0.0)
+
+        for key in sorted(self._positive):
+            seen += self._positive[key]
+            if seen > rank:
+                return self._clamp(self._value(key))
+
+        return self.max
+
+    @property
+    def avg(self) -> Optional[float]:
+        """Média exata dos valores adicionados."""
+        return self.sum / self.count if self.count else None
+
+    @property
+    def bins(self) -> int:
+        """Número de bins em uso."""
+        return len(self._positive) + len(self._negative)
+
+    def copy(self) -> 'DDSketch':
+        """Cópia independente do sketch."""
+        clone = DDSketch(self.relative_accuracy, self.max_bins)
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa para dicionário (JSON) para mesclagem entre workers."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'max_bins': self.max_bins,
+            'positive': {str(k): v for k, v in self._positive.items()},
+            'negative': {str(k): v for k, v in self._negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DDSketch':
+        """Reconstrói sketch a partir de `to_dict`."""
+        sketch = cls(data['relative_accuracy'], data.get('max_bins', 2048))
+        sketch._positive = {int(k): v for k, v in data['positive'].items()}
+        sketch._negative = {int(k): v for k, v in data['negative'].items()}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.sum = data['sum']
+        if sketch.count:
+            sketch.min = data['min']
+            sketch.max = data['max']
+        return sketch
+
+    def _key(self, magnitude: float) -> int:
+        """Índice do bin logarítmico de um valor positivo."""
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Valor representativo de um bin (erro relativo <= precisão)."""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _add_to(self, store: Dict[int, int], key: int, count: int) -> None:
+        """Incrementa um bin, colapsando se o limite for excedido."""
+        if key in store:
+            store[key] += count
+            return
+        store[key] = count
+        if len(store) > self.max_bins:
+            self._collapse(store)
+
+    def _collapse(self, store: Dict[int, int]) -> None:
+        """Funde os bins de menor módulo até respeitar `max_bins`."""
+        excess = len(store) - self.max_bins
+        if excess <= 0:
+            return
+        keys = sorted(store)
+        target = keys[excess]
+        for key in keys[:excess]:
+            store[target] += store.pop(key)
+
+    def _clamp(self, value: float) -> float:
+        """Limita a estimativa ao intervalo observado."""
+        return min(max(value, self.min), self.max)
+
+
+class SlicedSketch:
+    """
+    Série de DDSketches por fatia de tempo.
+
+    Cada observação cai na fatia do seu timestamp; consultas por janela
+    mesclam apenas as fatias que a intersectam (O(fatias × bins), sem
+    ordenar pontos). Fatias mais antigas que `max_slices` são descartadas,
+    então a memória por métrica é constante.
+    """
+
+    def __init__(
+        self,
+        slice_seconds: int = 60,
+        max_slices: int = 120,
+        relative_accuracy: float = 0.01,
+        max_bins: int = 512
+    ):
+        """
+        Args:
+            slice_seconds: Duração de cada fatia
+            max_slices: Fatias mantidas (retenção = slice_seconds × max_slices)
+            relative_accuracy: Precisão dos sketches
+            max_bins: Bins máximos por sketch de fatia
+        """
+        self.slice_seconds = slice_seconds
+        self.max_slices = max_slices
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._slices: 'OrderedDict[int, DDSketch]' = OrderedDict()
+
+    def add(self, value: float, timestamp: Optional[float] = None) -> None:
+        """Adiciona valor na fatia do timestamp (default: agora)."""
+        self._slice_for(time.time() if timestamp is None else timestamp).add(value)
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> DDSketch:
+        """
+        Mescla as fatias que intersectam [start, end] (epoch em segundos).
+
+        A granularidade é a fatia: uma fatia parcialmente dentro da janela
+        entra inteira.
+        """
+        merged = DDSketch(self.relative_accuracy, self.max_bins)
+        for slice_start, sketch in self._slices.items():
+            if end is not None and slice_start > end:
+                continue
+            if start is not None and slice_start + self.slice_seconds <= start:
+                continue
+            merged.merge(sketch)
+        return merged
+
+    def merge(self, other: 'SlicedSketch') -> None:
+        """Mescla outra série (por exemplo, de outro worker) fatia a fatia."""
+        for slice_start, sketch in other._slices.items():
+            self._slice_for(slice_start).merge(sketch)
+
+    def slices(self) -> Iterable[int]:
+        """Início (epoch) das fatias retidas."""
+        return list(self._slices)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa a série para mesclagem entre workers."""
+        return {
+            'slice_seconds': self.slice_seconds,
+            'max_slices': self.max_slices,
+            'relative_accuracy': self.relative_accuracy,
+            'max_bins': self.max_bins,
+            'slices': {str(k): s.to_dict() for k, s in self._slices.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SlicedSketch':
+        """Reconstrói a série a partir de `to_dict`."""
+        series = cls(
+            slice_seconds=data['slice_seconds'],
+            max_slices=data['max_slices'],
+            relative_accuracy=data['relative_accuracy'],
+            max_bins=data['max_bins']
+        )
+        for key in sorted(data['slices'], key=int):
+            series._slices[int(key)] = DDSketch.from_dict(data['slices'][key])
+        return series
+
+    def _slice_for(self, timestamp: float) -> DDSketch:
+        """Obtém (ou cria) o sketch da fatia que contém o timestamp."""
+        slice_start = int(timestamp // self.slice_seconds) * self.slice_seconds
+        sketch = self._slices.get(slice_start)
+        if sketch is not None:
+            return sketch
+
+        out_of_order = bool(self._slices) and slice_start < next(reversed(self._slices))
+        sketch = DDSketch(self.relative_accuracy, self.max_bins)
+        self._slices[slice_start] = sketch
+        if out_of_order:
+            # Fatia fora de ordem (merge de outro worker): reordena
+            self._slices = OrderedDict(sorted(self._slices.items()))
+        while len(self._slices) > self.max_slices:
+            self._slices.popitem(last=False)
+        return sketch
@@ -4,16 +4,21 @@ Advanced Tracing System
 Sistema avançado de tracing para rastreamento de operações.
 """
 
-import uuid
 import asyncio
+import atexit
+import contextvars
+import functools
+import random
+import time
 from typing import Dict, Any, Optional, List, Callable, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 import json
+import queue
 import threading
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 
 
 class SpanStatus(str, Enum):
@@ -49,12 +54,28 @@ class SpanEvent:
         }
 
 
+def format_trace_id(trace_id: int) -> str:
+    """Formata ID de trace (128 bits) em hex, como no W3C Trace Context."""
+    return f"{trace_id:032x}"
+
+
+def format_span_id(span_id: Optional[int]) -> Optional[str]:
+    """Formata ID de span (64 bits) em hex."""
+    return f"{span_id:016x}" if span_id is not None else None
+
+
 @dataclass
 class Span:
-    """Span de tracing representando uma operação."""
-    trace_id: str
-    span_id: str
-    parent_span_id: Optional[str]
+    """
+    Span de tracing representando uma operação.
+    
+    IDs são inteiros (128 bits para trace, 64 bits para span) e só são
+    formatados em hex na exportação. Spans com `sampled=False` apenas
+    propagam o contexto: não são registrados nem exportados.
+    """
+    trace_id: int
+    span_id: int
+    parent_span_id: Optional[int]
     operation_name: str
     start_time: datetime
     end_time: Optional[datetime] = None
@@ -64,6 +85,8 @@ class Span:
     tags: Dict[str, Any] = field(default_factory=dict)
     events: List[SpanEvent] = field(default_factory=list)
     error: Optional[str] = None
+    sampled: bool = True
+    start_ns: int = field(default_factory=time.perf_counter_ns, repr=False)
     
     def add_tag(self, key: str, value: Any) -> None:
         """Adiciona tag ao span."""
@@ -90,9 +113,9 @@ class Span:
             self.add_tag("error", True)
     
     def finish(self, status: Optional[SpanStatus] = None) -> None:
-        """Finaliza o span."""
-        self.end_time = datetime.utcnow()
-        self.duration_ms = (self.end_time - self.start_time).total_seconds() * 1000
+        """Finaliza o span (duração medida com relógio monotônico)."""
+        self.duration_ms = (time.perf_counter_ns() - self.start_ns) / 1e6
+        self.end_time = self.start_time + timedelta(milliseconds=self.duration_ms)
         
         if status:
             self.status = status
@@ -100,9 +123,9 @@ class Span:
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
         return {
-            'trace_id': self.trace_id,
-            'span_id': self.span_id,
-            'parent_span_id': self.parent_span_id,
+            'trace_id': format_trace_id(self.trace_id),
+            'span_id': format_span_id(self.span_id),
+            'parent_span_id': format_span_id(self.parent_span_id),
             'operation_name': self.operation_name,
             'start_time': self.start_time.isoformat(),
             'end_time': self.end_time.isoformat() if self.end_time else None,
@@ -118,16 +141,19 @@ class Span:
 @dataclass
 class Trace:
     """Trace completo com múltiplos spans."""
-    trace_id: str
+    trace_id: int
     spans: List[Span] = field(default_factory=list)
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     duration_ms: Optional[float] = None
     root_operation: Optional[str] = None
+    open_spans: int = 0
     
     def add_span(self, span: Span) -> None:
         """Adiciona span ao trace."""
         self.spans.append(span)
+        if span.end_time is None:
+            self.open_spans += 1
         
         # Atualiza timestamps do trace
         if self.start_time is None or span.start_time < self.start_time:
@@ -152,7 +178,15 @@ class Trace:
                 return span
         return None
     
-    def get_span_tree(self) -> Dict[str, List[Span]]:
+    def span_finished(self, span: Span) -> None:
+        """Atualiza contadores e timestamps quando um span do trace termina."""
+        self.open_spans -= 1
+        if self.end_time is None or span.end_time > self.end_time:
+            self.end_time = span.end_time
+        if self.start_time and self.end_time:
+            self.duration_ms = (self.end_time - self.start_time).total_seconds() * 1000
+    
+    def get_span_tree(self) -> Dict[Union[int, str], List[Span]]:
         """Obtém árvore de spans por parent."""
         tree = defaultdict(list)
         for span in self.spans:
@@ -163,7 +197,7 @@ class Trace:
     def to_dict(self) -> Dict[str, Any]:
         """Converte para dicionário."""
         return {
-            'trace_id': self.trace_id,
+            'trace_id': format_trace_id(self.trace_id),
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'duration_ms': self.duration_ms,
@@ -173,34 +207,158 @@ class Trace:
         }
 
 
-class TracingContext:
-    """Contexto de tracing para thread/async local."""
+class _FlushRequest:
+    """Item de controle da fila de exportação (flush ou parada)."""
     
-    def __init__(self):
-        self._current_span: Optional[Span] = None
-        self._trace_id: Optional[str] = None
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class BatchExportProcessor:
+    """
+    Pipeline de exportação de traces fora do caminho da requisição.
     
-    @property
-    def current_span(self) -> Optional[Span]:
-        """Span atual no contexto."""
-        return self._current_span
+    Traces finalizados entram em uma fila limitada; uma thread em background
+    agrupa em lotes (por tamanho ou tempo) e chama os exportadores. Com a
+    fila cheia, o trace é descartado e contado em `dropped` — o request
+    nunca espera pelo exportador.
     
-    @current_span.setter
-    def current_span(self, span: Optional[Span]) -> None:
-        """Define span atual."""
-        self._current_span = span
-        if span:
-            self._trace_id = span.trace_id
+    Exportadores com `export_batch(traces)` recebem o lote inteiro; os
+    demais (callables) são chamados trace a trace.
+    """
     
-    @property
-    def trace_id(self) -> Optional[str]:
-        """ID do trace atual."""
-        return self._trace_id
+    def __init__(
+        self,
+        exporters: List[Callable],
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        schedule_delay: float = 2.0
+    ):
+        """
+        Args:
+            exporters: Lista (compartilhada) de exportadores
+            max_queue_size: Traces aguardando exportação antes de descartar
+            max_batch_size: Traces por lote
+            schedule_delay: Segundos máximos até exportar um lote incompleto
+        """
+        self._exporters = exporters
+        self.max_batch_size = max_batch_size
+        self.schedule_delay = schedule_delay
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._is_shutdown = False
+        self.dropped = 0
+        self.exported = 0
+    
+    def submit(self, trace: Trace) -> bool:
+        """Enfileira trace sem bloquear; retorna False se descartado."""
+        if self._is_shutdown:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(trace)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+    
+    def force_flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Exporta tudo que está na fila; retorna False em timeout."""
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+    
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Exporta o restante da fila e encerra a thread."""
+        if self._is_shutdown:
+            return
+        self._is_shutdown = True
+        if self._thread is None:
+            return
+        request = _FlushRequest(stop=True)
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+    
+    def stats(self) -> Dict[str, int]:
+        """Contadores do pipeline."""
+        return {
+            'queued': self._queue.qsize(),
+            'exported': self.exported,
+            'dropped': self.dropped
+        }
     
-    def clear(self) -> None:
-        """Limpa contexto."""
-        self._current_span = None
-        self._trace_id = None
+    def _ensure_worker(self) -> None:
+        """Inicia a thread de exportação sob demanda."""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="trace-exporter", daemon=True
+                )
+                self._thread.start()
+    
+    def _worker(self) -> None:
+        """Loop da thread: acumula lotes por tamanho/tempo e exporta."""
+        while True:
+            batch: List[Trace] = []
+            control: Optional[_FlushRequest] = None
+            deadline = time.monotonic() + self.schedule_delay
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if batch and timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(timeout, 0.0) if batch else None)
+                except queue.Empty:
+                    break
+                if isinstance(item, _FlushRequest):
+                    control = item
+                    break
+                batch.append(item)
+            
+            if control is not None:
+                # Flush: esvazia o que ainda estiver na fila
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if not isinstance(item, _FlushRequest):
+                        batch.append(item)
+            
+            if batch:
+                self._export_batch(batch)
+            
+            if control is not None:
+                control.done.set()
+                if control.stop:
+                    return
+    
+    def _export_batch(self, batch: List[Trace]) -> None:
+        """Entrega o lote a cada exportador."""
+        for exporter in list(self._exporters):
+            export_batch = getattr(exporter, 'export_batch', None)
+            try:
+                if export_batch is not None:
+                    export_batch(batch)
+                else:
+                    for trace in batch:
+                        exporter(trace)
+            except Exception as e:
+                print(f"Erro ao exportar lote de {len(batch)} traces: {e}")
+        self.exported += len(batch)
 
 
 class Tracer:
@@ -209,34 +367,52 @@ class Tracer:
     
     Implementa tracing distribuído com suporte a contexto
     e sampling configurável.
+    
+    O span atual fica em uma `ContextVar`, então o contexto é correto entre
+    `await`, em tasks de `asyncio.gather` (cada uma herda uma cópia) e em
+    `asyncio.to_thread`; para executores use `bind`. O sampling é decidido
+    uma única vez, no span raiz, e herdado por todo o trace.
+    
+    Traces finalizados são exportados em lotes por um `BatchExportProcessor`
+    e mantidos em memória (para consulta) até `max_traces`, descartando os
+    concluídos mais antigos em O(1).
     """
     
     def __init__(
         self,
         service_name: str,
         sampling_rate: float = 1.0,
-        max_traces: int = 10000
+        max_traces: int = 10000,
+        export_queue_size: int = 2048,
+        export_batch_size: int = 256,
+        export_delay: float = 2.0
     ):
         self.service_name = service_name
         self.sampling_rate = sampling_rate
         self.max_traces = max_traces
         
-        self._traces: Dict[str, Trace] = {}
-        self._active_spans: Dict[str, Span] = {}
-        self._context = threading.local()
+        self._traces: Dict[int, Trace] = {}
+        # Traces concluídos em ordem de conclusão (evicção O(1) do mais antigo)
+        self._completed: 'OrderedDict[int, None]' = OrderedDict()
+        # Spans abertos em ordem de início (varredura de abandonados para no primeiro recente)
+        self._active_spans: Dict[int, Span] = {}
+        self._current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            f"tracing_current_span_{service_name}", default=None
+        )
         self._lock = threading.RLock()
         self._exporters: List[Callable] = []
+        self._export_processor = BatchExportProcessor(
+            self._exporters,
+            max_queue_size=export_queue_size,
+            max_batch_size=export_batch_size,
+            schedule_delay=export_delay
+        )
+        self._random = random.Random()
         
         # Configurações
         self._auto_finish_timeout = timedelta(minutes=5)
         self._cleanup_interval = timedelta(minutes=10)
-        self._last_cleanup = datetime.utcnow()
-    
-    def _get_context(self) -> TracingContext:
-        """Obtém contexto atual."""
-        if not hasattr(self._context, 'tracing'):
-            self._context.tracing = TracingContext()
-        return self._context.tracing
+        self._next_cleanup = time.monotonic() + self._cleanup_interval.total_seconds()
     
     def start_span(
         self,
@@ -246,43 +422,48 @@ class Tracer:
         tags: Optional[Dict[str, Any]] = None
     ) -> Span:
         """Inicia novo span."""
-        # Verifica sampling
-        if not self._should_sample():
-            return self._create_no_op_span()
-        
-        context = self._get_context()
-        
         # Determina parent
         if parent_span is None:
-            parent_span = context.current_span
+            parent_span = self._current_span.get()
         
-        # Gera IDs
-        trace_id = parent_span.trace_id if parent_span else str(uuid.uuid4())
-        span_id = str(uuid.uuid4())
-        parent_span_id = parent_span.span_id if parent_span else None
+        # Gera IDs e herda (ou decide) o sampling do trace
+        getrandbits = self._random.getrandbits
+        if parent_span is not None:
+            trace_id = parent_span.trace_id
+            parent_span_id = parent_span.span_id
+            sampled = parent_span.sampled
+        else:
+            trace_id = getrandbits(128)
+            parent_span_id = None
+            sampled = self._should_sample()
         
-        # Cria span
         span = Span(
             trace_id=trace_id,
-            span_id=span_id,
+            span_id=getrandbits(64),
             parent_span_id=parent_span_id,
             operation_name=operation_name,
             start_time=datetime.utcnow(),
             kind=kind,
-            tags=tags or {}
+            tags=tags or {},
+            sampled=sampled
         )
         
+        if not sampled:
+            # Span apenas de propagação: não é registrado
+            return span
+        
         # Adiciona tags padrão
-        span.add_tag("service.name", self.service_name)
-        span.add_tag("span.kind", kind.value)
+        span.tags["service.name"] = self.service_name
+        span.tags["span.kind"] = kind.value
         
         with self._lock:
             # Adiciona ao trace
-            if trace_id not in self._traces:
-                self._traces[trace_id] = Trace(trace_id=trace_id)
+            trace = self._traces.get(trace_id)
+            if trace is None:
+                trace = self._traces[trace_id] = Trace(trace_id=trace_id)
             
-            self._traces[trace_id].add_span(span)
-            self._active_spans[span_id] = span
+            trace.add_span(span)
+            self._active_spans[span.span_id] = span
             
             # Limpa traces antigos periodicamente
             self._maybe_cleanup()
@@ -290,35 +471,54 @@ class Tracer:
         return span
     
     def _should_sample(self) -> bool:
-        """Verifica se deve fazer sampling."""
-        import random
-        return random.random() < self.sampling_rate
-    
-    def _create_no_op_span(self) -> Span:
-        """Cria span no-op para sampling."""
-        return Span(
-            trace_id="no-op",
-            span_id="no-op",
-            parent_span_id=None,
-            operation_name="no-op",
-            start_time=datetime.utcnow()
-        )
+        """Decide o sampling de um novo trace (chamado só no span raiz)."""
+        if self.sampling_rate >= 1.0:
+            return True
+        if self.sampling_rate <= 0.0:
+            return False
+        return self._random.random() < self.sampling_rate
+    
+    def activate(self, span: Optional[Span]) -> contextvars.Token:
+        """Torna o span o atual no contexto; devolve token para `deactivate`."""
+        return self._current_span.set(span)
+    
+    def deactivate(self, token: contextvars.Token) -> None:
+        """Restaura o span anterior ao `activate` correspondente."""
+        self._current_span.reset(token)
+    
+    def bind(self, func: Callable) -> Callable:
+        """
+        Vincula a função ao contexto atual (span incluído).
+        
+        Necessário para `loop.run_in_executor`/`ThreadPoolExecutor.submit`,
+        que não copiam o contexto como `asyncio.to_thread` faz.
+        """
+        context = contextvars.copy_context()
+        
+        @functools.wraps(func)
+        def bound(*args, **kwargs):
+            return context.run(func, *args, **kwargs)
+        
+        return bound
     
     def finish_span(self, span: Span, status: Optional[SpanStatus] = None) -> None:
         """Finaliza span."""
-        if span.span_id == "no-op":
+        if not span.sampled or span.end_time is not None:
             return
         
         span.finish(status)
         
         with self._lock:
-            if span.span_id in self._active_spans:
-                del self._active_spans[span.span_id]
+            self._active_spans.pop(span.span_id, None)
             
             # Se é o último span do trace, exporta
             trace = self._traces.get(span.trace_id)
-            if trace and not any(s.end_time is None for s in trace.spans):
-                self._export_trace(trace)
+            if trace is not None:
+                trace.span_finished(span)
+                if trace.open_spans == 0:
+                    self._completed[trace.trace_id] = None
+                    self._export_trace(trace)
+                    self._evict_completed()
     
     @asynccontextmanager
     async def span(
@@ -329,12 +529,20 @@ class Tracer:
         tags: Optional[Dict[str, Any]] = None
     ):
         """Context manager para spans."""
+        with self.sync_span(operation_name, parent_span, kind, tags) as span:
+            yield span
+    
+    @contextmanager
+    def sync_span(
+        self,
+        operation_name: str,
+        parent_span: Optional[Span] = None,
+        kind: SpanKind = SpanKind.INTERNAL,
+        tags: Optional[Dict[str, Any]] = None
+    ):
+        """Context manager síncrono para spans (também define o span atual)."""
         span = self.start_span(operation_name, parent_span, kind, tags)
-        context = self._get_context()
-        
-        # Salva contexto anterior
-        previous_span = context.current_span
-        context.current_span = span
+        token = self._current_span.set(span)
         
         try:
             yield span
@@ -345,14 +553,19 @@ class Tracer:
             raise
         finally:
             # Restaura contexto
-            context.current_span = previous_span
+            self._current_span.reset(token)
     
     def get_current_span(self) -> Optional[Span]:
         """Obtém span atual do contexto."""
-        return self._get_context().current_span
+        return self._current_span.get()
     
-    def get_trace(self, trace_id: str) -> Optional[Trace]:
-        """Obtém trace por ID."""
+    def get_trace(self, trace_id: Union[int, str]) -> Optional[Trace]:
+        """Obtém trace por ID (inteiro ou hex)."""
+        if isinstance(trace_id, str):
+            try:
+                trace_id = int(trace_id, 16)
+            except ValueError:
+                return None
         with self._lock:
             return self._traces.get(trace_id)
     
@@ -366,44 +579,187 @@ class Tracer:
         self._exporters.append(exporter)
     
     def _export_trace(self, trace: Trace) -> None:
-        """Exporta trace finalizado."""
+        """Enfileira trace finalizado para exportação em lote (não bloqueia)."""
+        if self._exporters:
+            self._export_processor.submit(trace)
+    
+    def force_flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Exporta imediatamente os traces enfileirados."""
+        return self._export_processor.force_flush(timeout)
+    
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Exporta os traces pendentes e encerra o pipeline de exportação."""
+        self._export_processor.shutdown(timeout)
         for exporter in self._exporters:
-            try:
-                exporter(trace)
-            except Exception as e:
-                print(f"Erro ao exportar trace {trace.trace_id}: {e}")
+            close = getattr(exporter, 'close', None)
+            if close is not None:
+                close()
+    
+    def get_export_stats(self) -> Dict[str, int]:
+        """Contadores do pipeline de exportação (enfileirados, exportados, descartados)."""
+        return self._export_processor.stats()
+    
+    def _evict_completed(self) -> None:
+        """Remove os traces concluídos mais antigos acima de `max_traces`."""
+        while len(self._traces) > self.max_traces and self._completed:
+            trace_id, _ = self._completed.popitem(last=False)
+            self._traces.pop(trace_id, None)
     
     def _maybe_cleanup(self) -> None:
         """Limpa traces antigos se necessário."""
-        now = datetime.utcnow()
-        if now - self._last_cleanup < self._cleanup_interval:
+        # Checagem barata (monotônica) no caminho quente de start_span
+        if time.monotonic() < self._next_cleanup:
             return
         
-        self._last_cleanup = now
+        self._next_cleanup = time.monotonic() + self._cleanup_interval.total_seconds()
+        now = datetime.utcnow()
         cutoff = now - self._auto_finish_timeout
         
-        # Finaliza spans abandonados
+        # Finaliza spans abandonados (dict em ordem de início: para no primeiro recente)
         abandoned_spans = []
         for span in self._active_spans.values():
-            if span.start_time < cutoff:
-                abandoned_spans.append(span)
+            if span.start_time >= cutoff:
+                break
+            abandoned_spans.append(span)
         
         for span in abandoned_spans:
             span.set_error("Span timeout - auto finished")
             self.finish_span(span, SpanStatus.TIMEOUT)
-        
-        # Remove traces antigos
-        if len(self._traces) > self.max_traces:
-            # Mantém apenas os mais recentes
-            sorted_traces = sorted(
-                self._traces.items(),
-                key=lambda x: x[1].start_time or datetime.min,
-                reverse=True
-            )
-            
-            to_keep = dict(sorted_traces[:self.max_traces // 2])
-            self._traces.clear()
-            self._traces.update(to_keep)
+
+
+_OTLP_SPAN_KINDS = {
+    SpanKind.INTERNAL: 1,
+    SpanKind.SERVER: 2,
+    SpanKind.CLIENT: 3,
+    SpanKind.PRODUCER: 4,
+    SpanKind.CONSUMER: 5,
+}
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """Converte valor de atributo para AnyValue do OTLP/JSON."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Converte dicionário em lista de KeyValue do OTLP/JSON."""
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _unix_nano(moment: Optional[datetime]) -> Optional[str]:
+    """datetime naive em UTC -> epoch em nanossegundos (string, como no OTLP/JSON)."""
+    if moment is None:
+        return None
+    delta = moment - datetime(1970, 1, 1)
+    return str((delta.days * 86400 + delta.seconds) * 10 ** 9 + delta.microseconds * 1000)
+
+
+def span_to_otlp(span: Span) -> Dict[str, Any]:
+    """Converte span para o formato Span do OTLP/JSON."""
+    otlp_span = {
+        'traceId': format_trace_id(span.trace_id),
+        'spanId': format_span_id(span.span_id),
+        'name': span.operation_name,
+        'kind': _OTLP_SPAN_KINDS.get(span.kind, 1),
+        'startTimeUnixNano': _unix_nano(span.start_time),
+        'endTimeUnixNano': _unix_nano(span.end_time),
+        'attributes': _otlp_attributes(span.tags),
+        'events': [
+            {
+                'timeUnixNano': _unix_nano(event.timestamp),
+                'name': event.name,
+                'attributes': _otlp_attributes(event.attributes)
+            }
+            for event in span.events
+        ],
+        # STATUS_CODE_OK = 1, STATUS_CODE_ERROR = 2
+        'status': {'code': 1 if span.status == SpanStatus.OK else 2}
+    }
+    if span.parent_span_id is not None:
+        otlp_span['parentSpanId'] = format_span_id(span.parent_span_id)
+    if span.error:
+        otlp_span['status']['message'] = span.error
+    return otlp_span
+
+
+class FileTraceExporter:
+    """
+    Exportador de traces para arquivo JSON lines.
+    
+    Mantém o arquivo aberto com escrita bufferizada e faz flush uma vez
+    por lote. No formato OTLP, cada linha é um `ExportTraceServiceRequest`
+    em JSON (resourceSpans/scopeSpans/spans), legível por um OpenTelemetry
+    Collector com o receiver `otlpjsonfile`; no formato nativo, cada linha
+    é um `Trace.to_dict()`.
+    """
+    
+    def __init__(
+        self,
+        file_path: str,
+        otlp: bool = True,
+        service_name: str = "analyzer",
+        buffer_size: int = 64 * 1024
+    ):
+        """
+        Args:
+            file_path: Arquivo de saída (append)
+            otlp: Usa o formato OTLP/JSON (False: Trace.to_dict por linha)
+            service_name: Atributo service.name do resource OTLP
+            buffer_size: Buffer de escrita em bytes
+        """
+        self.file_path = file_path
+        self.otlp = otlp
+        self.service_name = service_name
+        self.buffer_size = buffer_size
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def __call__(self, trace: Trace) -> None:
+        """Exporta um único trace."""
+        self.export_batch([trace])
+    
+    def export_batch(self, traces: List[Trace]) -> None:
+        """Escreve o lote e faz um único flush."""
+        if not traces:
+            return
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.file_path, 'a', buffering=self.buffer_size, encoding='utf-8')
+            if self.otlp:
+                self._file.write(json.dumps(self._to_otlp(traces)))
+                self._file.write('\n')
+            else:
+                for trace in traces:
+                    self._file.write(json.dumps(trace.to_dict()))
+                    self._file.write('\n')
+            self._file.flush()
+    
+    def close(self) -> None:
+        """Fecha o arquivo."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def _to_otlp(self, traces: List[Trace]) -> Dict[str, Any]:
+        """Monta um ExportTraceServiceRequest com todos os spans do lote."""
+        return {
+            'resourceSpans': [{
+                'resource': {
+                    'attributes': _otlp_attributes({'service.name': self.service_name})
+                },
+                'scopeSpans': [{
+                    'scope': {'name': __name__},
+                    'spans': [span_to_otlp(span) for trace in traces for span in trace.spans]
+                }]
+            }]
+        }
 
 
 class TracingExporter:
@@ -413,7 +769,7 @@ class TracingExporter:
     def console_exporter() -> Callable[[Trace], None]:
         """Exportador para console."""
         def export(trace: Trace) -> None:
-            print(f"TRACE {trace.trace_id}:")
+            print(f"TRACE {format_trace_id(trace.trace_id)}:")
             print(f"  Operation: {trace.root_operation}")
             print(f"  Duration: {trace.duration_ms:.2f}ms")
             print(f"  Spans: {len(trace.spans)}")
@@ -429,17 +785,14 @@ class TracingExporter:
         return export
     
     @staticmethod
-    def json_file_exporter(file_path: str) -> Callable[[Trace], None]:
-        """Exportador para arquivo JSON."""
-        def export(trace: Trace) -> None:
-            try:
-                with open(file_path, 'a') as f:
-                    json.dump(trace.to_dict(), f)
-                    f.write('\n')
-            except Exception as e:
-                print(f"Erro ao exportar trace para arquivo: {e}")
-        
-        return export
+    def json_file_exporter(file_path: str) -> FileTraceExporter:
+        """Exportador para arquivo JSON (um Trace.to_dict por linha)."""
+        return FileTraceExporter(file_path, otlp=False)
+    
+    @staticmethod
+    def otlp_file_exporter(file_path: str, service_name: str = "analyzer") -> FileTraceExporter:
+        """Exportador para arquivo JSON lines no formato OTLP."""
+        return FileTraceExporter(file_path, otlp=True, service_name=service_name)
     
     @staticmethod
     def metrics_exporter(metrics_collector) -> Callable[[Trace], None]:
@@ -481,6 +834,7 @@ def get_tracer(service_name: str = "analyzer") -> Tracer:
     global _global_tracer
     if _global_tracer is None:
         _global_tracer = Tracer(service_name)
+        atexit.register(_global_tracer.shutdown)
         
         # Configura exportadores padrão
         _global_tracer.add_exporter(TracingExporter.console_exporter())
@@ -517,9 +871,7 @@ def trace_operation(operation_name: str, kind: SpanKind = SpanKind.INTERNAL):
         else:
             def sync_wrapper(*args, **kwargs):
                 tracer = get_tracer()
-                span = tracer.start_span(operation_name, kind=kind)
-                
-                try:
+                with tracer.sync_span(operation_name, kind=kind) as span:
                     # Adiciona argumentos como tags
                     for i, arg in enumerate(args):
                         if isinstance(arg, (str, int, float, bool)):
@@ -529,13 +881,7 @@ def trace_operation(operation_name: str, kind: SpanKind = SpanKind.INTERNAL):
                         if isinstance(value, (str, int, float, bool)):
                             span.add_tag(f"param_{key}", value)
                     
-                    result = func(*args, **kwargs)
-                    tracer.finish_span(span, SpanStatus.OK)
-                    return result
-                except Exception as e:
-                    span.set_error(e)
-                    tracer.finish_span(span, SpanStatus.ERROR)
-                    raise
+                    return func(*args, **kwargs)
             
             return sync_wrapper
     return decorator
\ No newline at end of file
@@ -2,10 +2,22 @@
 In-Memory Repository Implementations
 
 Implementações em memória dos repositórios para desenvolvimento e testes.
+
+Os repositórios mantêm índices secundários atualizados a cada escrita:
+- Documentos: hash do conteúdo -> IDs (busca O(1), sem recalcular SHA-256)
+  e MinHash LSH para busca de quase-duplicatas
+- Análises: organização -> (created_at, ID) ordenados (busca O(log n)) e
+  agregados diários por organização para `get_analytics`
+- Cache: trie de chaves por segmento ':' para `clear_pattern`
 """
 
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import re
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from itertools import islice
+from operator import itemgetter
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import date, datetime, time, timedelta, timezone
 
 from ...domain.entities.document import Document, DocumentId
 from ...domain.entities.organization import Organization, OrganizationId
@@ -16,41 +28,87 @@ from ...domain.interfaces.repositories import (
     IAnalysisRepository,
     ICacheRepository
 )
+from .minhash_lsh import MinHashLSHIndex, jaccard_similarity
+
+# Chave de ordenação das entradas (created_at, analysis_id) do índice de análises
+_created_at = itemgetter(0)
+
+# Metacaracteres de regex que encerram o prefixo literal de um padrão
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]\\|()')
 
 
 class InMemoryDocumentRepository(IDocumentRepository):
     """Implementação em memória do repositório de documentos."""
     
+    # Abaixo deste limiar o LSH perde recall e a busca similar varre tudo
+    LSH_MIN_THRESHOLD = 0.7
+    
     def __init__(self):
         self._documents: Dict[str, Document] = {}
+        # Índices do conteúdo no último save (como em um banco real)
+        self._ids_by_hash: Dict[str, List[str]] = {}
+        self._hash_by_id: Dict[str, str] = {}
+        self._similarity_index = MinHashLSHIndex()
     
     async def save(self, document: Document) -> None:
         """Salva documento."""
-        self._documents[str(document.id)] = document
+        document_id = str(document.id)
+        content_hash = document.get_content_hash()
+        previous_hash = self._hash_by_id.get(document_id)
+        
+        if previous_hash != content_hash:
+            if previous_hash is not None:
+                self._unindex_hash(document_id, previous_hash)
+            self._ids_by_hash.setdefault(content_hash, []).append(document_id)
+            self._hash_by_id[document_id] = content_hash
+            self._similarity_index.add(document_id, document.get_word_set())
+        
+        self._documents[document_id] = document
     
     async def find_by_id(self, document_id: DocumentId) -> Optional[Document]:
         """Busca documento por ID."""
         return self._documents.get(str(document_id))
     
     async def find_by_content_hash(self, content_hash: str) -> Optional[Document]:
-        """Busca documento por hash do conteúdo."""
-        for document in self._documents.values():
-            if document.get_content_hash() == content_hash:
-                return document
-        return None
+        """Busca documento por hash do conteúdo (o primeiro salvo com esse hash)."""
+        document_ids = self._ids_by_hash.get(content_hash)
+        if not document_ids:
+            return None
+        return self._documents[document_ids[0]]
     
     async def find_similar_documents(
         self, 
         document: Document, 
         threshold: float = 0.9
     ) -> List[Document]:
-        """Busca documentos similares."""
-        similar_docs = []
-        for doc in self._documents.values():
-            if doc.id != document.id:
-                if document.is_content_similar_to(doc.content, threshold):
-                    similar_docs.append(doc)
-        return similar_docs
+        """
+        Busca documentos similares (Jaccard das palavras >= threshold).
+        
+        Args:
+            document: Documento de referência
+            threshold: Limiar de similaridade (0.0 a 1.0)
+            
+        Returns:
+            Documentos similares, mais similares primeiro
+        """
+        words = document.get_word_set()
+        if threshold >= self.LSH_MIN_THRESHOLD:
+            candidate_ids = self._similarity_index.candidates(words)
+        else:
+            candidate_ids = self._documents.keys()
+        
+        # Verificação exata apenas nos candidatos
+        scored = []
+        for candidate_id in candidate_ids:
+            candidate = self._documents[candidate_id]
+            if candidate.id == document.id:
+                continue
+            similarity = jaccard_similarity(words, candidate.get_word_set())
+            if similarity >= threshold:
+                scored.append((similarity, candidate))
+        
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [candidate for _, candidate in scored]
     
     async def list_by_organization(
         self, 
@@ -68,12 +126,21 @@ class InMemoryDocumentRepository(IDocumentRepository):
         """Remove documento."""
         if str(document_id) in self._documents:
             del self._documents[str(document_id)]
+            self._unindex_hash(str(document_id), self._hash_by_id.pop(str(document_id)))
+            self._similarity_index.remove(str(document_id))
             return True
         return False
     
     async def exists(self, document_id: DocumentId) -> bool:
         """Verifica se documento existe."""
         return str(document_id) in self._documents
+    
+    def _unindex_hash(self, document_id: str, content_hash: str) -> None:
+        """Remove documento do índice de hash."""
+        document_ids = self._ids_by_hash[content_hash]
+        document_ids.remove(document_id)
+        if not document_ids:
+            del self._ids_by_hash[content_hash]
 
 
 class InMemoryOrganizationRepository(IOrganizationRepository):
@@ -121,15 +188,114 @@ class InMemoryOrganizationRepository(IOrganizationRepository):
         return str(organization_id) in self._organizations
 
 
+# Escopo com todas as organizações nos índices de análises
+# (OrganizationId tem ao menos 3 caracteres, então não colide)
+_ALL_ORGANIZATIONS = ''
+
+# Contribuição de uma análise para os agregados:
+# (score, status, total de findings, ((severidade, quantidade), ...))
+_Contribution = Tuple[float, str, int, Tuple[Tuple[str, int], ...]]
+
+
+@dataclass(slots=True)
+class _AnalyticsAggregate:
+    """Totais de análises (de um dia ou de um período)."""
+    count: int = 0
+    score_sum: float = 0.0
+    findings: int = 0
+    by_status: Dict[str, int] = field(default_factory=dict)
+    by_severity: Dict[str, int] = field(default_factory=dict)
+    
+    def apply(self, contribution: _Contribution, sign: int = 1) -> None:
+        """Soma (sign=1) ou subtrai (sign=-1) a contribuição de uma análise."""
+        score, status, findings, severities = contribution
+        self.count += sign
+        self.score_sum += sign * score
+        self.findings += sign * findings
+        _add_count(self.by_status, status, sign)
+        for severity, quantity in severities:
+            _add_count(self.by_severity, severity, sign * quantity)
+    
+    def merge(self, other: '_AnalyticsAggregate') -> None:
+        """Soma outro agregado a este."""
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.findings += other.findings
+        for status, quantity in other.by_status.items():
+            _add_count(self.by_status, status, quantity)
+        for severity, quantity in other.by_severity.items():
+            _add_count(self.by_severity, severity, quantity)
+
+
+def _add_count(counts: Dict[str, int], key: str, delta: int) -> None:
+    """Atualiza contador, removendo chaves que chegam a zero."""
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+def _contribution(analysis: Analysis) -> _Contribution:
+    """Calcula a contribuição da análise para os agregados."""
+    severities: Dict[str, int] = {}
+    for finding in analysis.findings:
+        severity = finding.severity.value
+        severities[severity] = severities.get(severity, 0) + 1
+    return (
+        analysis.weighted_score,
+        analysis.status.value,
+        len(analysis.findings),
+        tuple(sorted(severities.items()))
+    )
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Converte data ISO em datetime UTC sem timezone (como `created_at`)."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 class InMemoryAnalysisRepository(IAnalysisRepository):
     """Implementação em memória do repositório de análises."""
     
     def __init__(self):
         self._analyses: Dict[str, Analysis] = {}
+        # escopo (organização ou todas) -> [(created_at, analysis_id)] em ordem crescente
+        self._by_organization: Dict[str, List[Tuple[datetime, str]]] = {}
+        # analysis_id -> (organização, created_at) indexados no último save
+        self._index_keys: Dict[str, Tuple[str, datetime]] = {}
+        # escopo -> dia -> agregado; dias de cada escopo em ordem
+        self._daily: Dict[str, Dict[date, _AnalyticsAggregate]] = {}
+        self._days: Dict[str, List[date]] = {}
+        # analysis_id -> contribuição somada no último save
+        self._contributions: Dict[str, _Contribution] = {}
     
     async def save(self, analysis: Analysis) -> None:
         """Salva análise."""
-        self._analyses[str(analysis.id)] = analysis
+        analysis_id = str(analysis.id)
+        index_key = (str(analysis.organization_id), analysis.created_at)
+        previous_key = self._index_keys.get(analysis_id)
+        contribution = _contribution(analysis)
+        
+        if previous_key != index_key or self._contributions[analysis_id] != contribution:
+            if previous_key is not None:
+                self._unaggregate(analysis_id, previous_key)
+            self._aggregate(analysis_id, index_key, contribution)
+        
+        if previous_key != index_key:
+            if previous_key is not None:
+                self._unindex(analysis_id, previous_key)
+            # Análises chegam em ordem de criação: insort vira append
+            for scope in (index_key[0], _ALL_ORGANIZATIONS):
+                insort(self._by_organization.setdefault(scope, []), (index_key[1], analysis_id))
+            self._index_keys[analysis_id] = index_key
+        
+        self._analyses[analysis_id] = analysis
     
     async def find_by_id(self, analysis_id: AnalysisId) -> Optional[Analysis]:
         """Busca análise por ID."""
@@ -141,14 +307,11 @@ class InMemoryAnalysisRepository(IAnalysisRepository):
         organization_id: OrganizationId
     ) -> List[Analysis]:
         """Busca análises de um documento por organização."""
-        results = []
-        for analysis in self._analyses.values():
-            if (analysis.document_id == document_id and 
-                analysis.organization_id == organization_id):
-                results.append(analysis)
-        
-        # Ordena por data de criação (mais recentes primeiro)
-        return sorted(results, key=lambda a: a.created_at, reverse=True)
+        # Índice da organização já está ordenado (mais recentes primeiro ao inverter)
+        return [
+            analysis for analysis in self._iter_recent(organization_id)
+            if analysis.document_id == document_id
+        ]
     
     async def find_recent_by_organization(
         self,
@@ -156,14 +319,7 @@ class InMemoryAnalysisRepository(IAnalysisRepository):
         limit: int = 10
     ) -> List[Analysis]:
         """Busca análises recentes de uma organização."""
-        org_analyses = [
-            analysis for analysis in self._analyses.values()
-            if analysis.organization_id == organization_id
-        ]
-        
-        # Ordena por data e limita
-        sorted_analyses = sorted(org_analyses, key=lambda a: a.created_at, reverse=True)
-        return sorted_analyses[:limit]
+        return list(islice(self._iter_recent(organization_id), max(limit, 0)))
     
     async def get_analytics(
         self,
@@ -171,25 +327,21 @@ class InMemoryAnalysisRepository(IAnalysisRepository):
         start_date: Optional[str] = None,
         end_date: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Obtém analytics das análises."""
-        analyses = list(self._analyses.values())
-        
-        # Filtra por organização se especificada
-        if organization_id:
-            analyses = [a for a in analyses if a.organization_id == organization_id]
+        """
+        Obtém analytics das análises.
         
-        # Filtra por data se especificada
-        if start_date:
-            start_dt = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            analyses = [a for a in analyses if a.created_at >= start_dt]
+        Dias inteiros do período vêm dos agregados diários; só as análises
+        dos dias parciais nas bordas do período são lidas individualmente.
+        """
+        start_dt = _parse_date(start_date)
+        end_dt = _parse_date(end_date)
+        scope = str(organization_id) if organization_id else _ALL_ORGANIZATIONS
         
-        if end_date:
-            end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            analyses = [a for a in analyses if a.created_at <= end_dt]
+        totals = _AnalyticsAggregate()
+        self._aggregate_period(scope, start_dt, end_dt, totals)
         
         # Calcula estatísticas
-        total_analyses = len(analyses)
-        if total_analyses == 0:
+        if totals.count == 0:
             return {
                 'total_analyses': 0,
                 'average_score': 0,
@@ -198,28 +350,12 @@ class InMemoryAnalysisRepository(IAnalysisRepository):
                 'findings_by_severity': {}
             }
         
-        avg_score = sum(a.weighted_score for a in analyses) / total_analyses
-        total_findings = sum(len(a.findings) for a in analyses)
-        
-        # Conta por status
-        status_counts = {}
-        for analysis in analyses:
-            status = analysis.status.value
-            status_counts[status] = status_counts.get(status, 0) + 1
-        
-        # Conta findings por severidade
-        severity_counts = {}
-        for analysis in analyses:
-            for finding in analysis.findings:
-                severity = finding.severity.value
-                severity_counts[severity] = severity_counts.get(severity, 0) + 1
-        
         return {
-            'total_analyses': total_analyses,
-            'average_score': round(avg_score, 2),
-            'total_findings': total_findings,
-            'analyses_by_status': status_counts,
-            'findings_by_severity': severity_counts,
+            'total_analyses': totals.count,
+            'average_score': round(totals.score_sum / totals.count, 2),
+            'total_findings': totals.findings,
+            'analyses_by_status': totals.by_status,
+            'findings_by_severity': totals.by_severity,
             'period': {
                 'start_date': start_date,
                 'end_date': end_date
@@ -229,16 +365,258 @@ class InMemoryAnalysisRepository(IAnalysisRepository):
     async def delete_old_analyses(self, days_old: int = 90) -> int:
         """Remove análises antigas."""
         cutoff_date = datetime.utcnow() - timedelta(days=days_old)
+        removed = 0
+        
+        # As mais antigas de cada escopo formam um prefixo do índice
+        for scope in list(self._by_organization):
+            entries = self._by_organization[scope]
+            cut = bisect_left(entries, cutoff_date, key=_created_at)
+            if scope != _ALL_ORGANIZATIONS:
+                for created_at, analysis_id in entries[:cut]:
+                    self._unaggregate(analysis_id, (scope, created_at))
+                    del self._analyses[analysis_id]
+                    del self._index_keys[analysis_id]
+                removed += cut
+            del entries[:cut]
+            if not entries:
+                del self._by_organization[scope]
+        
+        return removed
+    
+    def _iter_recent(self, organization_id: OrganizationId):
+        """Itera análises da organização, mais recentes primeiro."""
+        for _, analysis_id in reversed(self._by_organization.get(str(organization_id), [])):
+            yield self._analyses[analysis_id]
+    
+    def _unindex(self, analysis_id: str, index_key: Tuple[str, datetime]) -> None:
+        """Remove análise do índice da organização e do global."""
+        organization_id, created_at = index_key
+        for scope in (organization_id, _ALL_ORGANIZATIONS):
+            entries = self._by_organization[scope]
+            entries.pop(bisect_left(entries, (created_at, analysis_id)))
+            if not entries:
+                del self._by_organization[scope]
+    
+    def _aggregate(
+        self,
+        analysis_id: str,
+        index_key: Tuple[str, datetime],
+        contribution: _Contribution
+    ) -> None:
+        """Soma a contribuição da análise no agregado do seu dia."""
+        organization_id, created_at = index_key
+        day = created_at.date()
+        
+        for scope in (organization_id, _ALL_ORGANIZATIONS):
+            daily = self._daily.setdefault(scope, {})
+            aggregate = daily.get(day)
+            if aggregate is None:
+                aggregate = daily[day] = _AnalyticsAggregate()
+                insort(self._days.setdefault(scope, []), day)
+            aggregate.apply(contribution)
+        
+        self._contributions[analysis_id] = contribution
+    
+    def _unaggregate(self, analysis_id: str, index_key: Tuple[str, datetime]) -> None:
+        """Subtrai a contribuição da análise, descartando dias vazios."""
+        organization_id, created_at = index_key
+        day = created_at.date()
+        contribution = self._contributions.pop(analysis_id)
+        
+        for scope in (organization_id, _ALL_ORGANIZATIONS):
+            daily = self._daily[scope]
+            aggregate = daily[day]
+            aggregate.apply(contribution, sign=-1)
+            if aggregate.count == 0:
+                del daily[day]
+                days = self._days[scope]
+                days.pop(bisect_left(days, day))
+                if not daily:
+                    del self._daily[scope]
+                    del self._days[scope]
+    
+    def _aggregate_period(
+        self,
+        scope: str,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        totals: _AnalyticsAggregate
+    ) -> None:
+        """Soma em `totals` as análises do escopo em [start_dt, end_dt]."""
+        days = self._days.get(scope)
+        if not days:
+            return
+        
+        # Dias inteiros: [first_day, end_day) — start_dt à meia-noite inclui o
+        # próprio dia; end_dt inclui seu dia só se for o último instante dele
+        first_day = days[0]
+        if start_dt is not None:
+            first_day = start_dt.date()
+            if start_dt.time() != time.min:
+                first_day += timedelta(days=1)
+        end_day = days[-1] + timedelta(days=1)
+        if end_dt is not None:
+            end_day = min(end_day, (end_dt + timedelta(microseconds=1)).date())
+        
+        if first_day >= end_day:
+            # Nenhum dia inteiro no período: só análises individuais
+            self._add_entries(scope, start_dt, end_dt, totals)
+            return
+        
+        daily = self._daily[scope]
+        for day in days[bisect_left(days, first_day):bisect_left(days, end_day)]:
+            totals.merge(daily[day])
+        
+        # Bordas parciais lidas do índice por data
+        first_midnight = datetime.combine(first_day, time.min)
+        end_midnight = datetime.combine(end_day, time.min)
+        if start_dt is not None and start_dt < first_midnight:
+            self._add_entries(scope, start_dt, first_midnight, totals, end_inclusive=False)
+        if end_dt is not None and end_dt >= end_midnight:
+            self._add_entries(scope, end_midnight, end_dt, totals)
+    
+    def _add_entries(
+        self,
+        scope: str,
+        start_dt: Optional[datetime],
+        end_dt: Optional[datetime],
+        totals: _AnalyticsAggregate,
+        end_inclusive: bool = True
+    ) -> None:
+        """Soma em `totals` as análises individuais do intervalo (via índice)."""
+        entries = self._by_organization[scope]
+        low = bisect_left(entries, start_dt, key=_created_at) if start_dt else 0
+        if end_dt is None:
+            high = len(entries)
+        elif end_inclusive:
+            high = bisect_right(entries, end_dt, key=_created_at)
+        else:
+            high = bisect_left(entries, end_dt, key=_created_at)
+        
+        for _, analysis_id in entries[low:high]:
+            totals.apply(self._contributions[analysis_id])
+
+
+class _KeyTrie:
+    """
+    Trie de chaves de cache por segmento (separador ':').
+    
+    Subárvores com uma única chave guardam a própria chave (string) no lugar
+    de um nó, então chaves com namespace comum e sufixo único custam uma
+    entrada de dict cada. O nó é expandido quando uma segunda chave chega.
+    """
+    
+    SEPARATOR = ':'
+    
+    def __init__(self):
+        # segmento -> nó (dict) ou chave única da subárvore (str);
+        # None -> chave que termina exatamente no nó
+        self._root: Dict[Optional[str], Any] = {}
+    
+    def add(self, key: str) -> None:
+        """Adiciona chave à trie."""
+        segments = key.split(self.SEPARATOR)
+        node = self._root
         
-        old_analysis_ids = []
-        for analysis_id, analysis in self._analyses.items():
-            if analysis.created_at < cutoff_date:
-                old_analysis_ids.append(analysis_id)
+        for depth, segment in enumerate(segments):
+            child = node.get(segment)
+            if child is None:
+                node[segment] = key
+                return
+            if isinstance(child, str):
+                if child == key:
+                    return
+                child = node[segment] = self._expand(child, depth + 1)
+            node = child
         
-        for analysis_id in old_analysis_ids:
-            del self._analyses[analysis_id]
+        node[None] = key
+    
+    def remove(self, key: str) -> None:
+        """Remove chave da trie, recolhendo nós que ficam com uma só chave."""
+        path = []
+        node = self._root
         
-        return len(old_analysis_ids)
+        for segment in key.split(self.SEPARATOR):
+            child = node.get(segment)
+            if child is None:
+                return
+            if isinstance(child, str):
+                if child != key:
+                    return
+                del node[segment]
+                break
+            path.append((node, segment))
+            node = child
+        else:
+            if node.get(None) != key:
+                return
+            del node[None]
+        
+        for parent, segment in reversed(path):
+            child = parent[segment]
+            if not child:
+                del parent[segment]
+            elif len(child) == 1 and isinstance(next(iter(child.values())), str):
+                parent[segment] = next(iter(child.values()))
+            else:
+                break
+    
+    def with_prefix(self, prefix: str) -> List[str]:
+        """
+        Lista chaves que começam com o prefixo.
+        
+        Args:
+            prefix: Prefixo literal
+            
+        Returns:
+            Chaves encontradas (custo proporcional aos segmentos do prefixo
+            e ao número de chaves retornadas)
+        """
+        segments = prefix.split(self.SEPARATOR)
+        node = self._root
+        
+        for segment in segments[:-1]:
+            child = node.get(segment)
+            if child is None:
+                return []
+            if isinstance(child, str):
+                return [child] if child.startswith(prefix) else []
+            node = child
+        
+        partial = segments[-1]
+        stack = [
+            child for segment, child in node.items()
+            if segment is not None and segment.startswith(partial)
+        ]
+        keys = []
+        while stack:
+            child = stack.pop()
+            if isinstance(child, str):
+                keys.append(child)
+            else:
+                stack.extend(child.values())
+        return keys
+    
+    def _expand(self, key: str, depth: int) -> Dict[Optional[str], Any]:
+        """Cria nó para uma subárvore que tinha apenas `key`."""
+        segments = key.split(self.SEPARATOR)
+        return {segments[depth] if depth < len(segments) else None: key}
+
+
+def _literal_prefix(regex_pattern: str) -> str:
+    """Prefixo que toda chave aceita por `re.match(regex_pattern)` possui."""
+    if '|' in regex_pattern:
+        return ''
+    
+    prefix = []
+    for char in regex_pattern:
+        if char in _REGEX_SPECIAL:
+            # Quantificadores tornam o caractere anterior opcional
+            if char in '*?{' and prefix:
+                prefix.pop()
+            break
+        prefix.append(char)
+    return ''.join(prefix)
 
 
 class InMemoryCacheRepository(ICacheRepository):
@@ -246,6 +624,7 @@ class InMemoryCacheRepository(ICacheRepository):
     
     def __init__(self):
         self._cache: Dict[str, Dict[str, Any]] = {}
+        self._keys = _KeyTrie()
     
     async def get(self, key: str) -> Optional[Dict[str, Any]]:
         """Obtém valor do cache."""
@@ -255,7 +634,7 @@ class InMemoryCacheRepository(ICacheRepository):
             # Verifica TTL
             if 'expires_at' in cache_entry:
                 if datetime.utcnow() > cache_entry['expires_at']:
-                    del self._cache[key]
+                    self._remove(key)
                     return None
             
             return cache_entry.get('value')
@@ -271,6 +650,8 @@ class InMemoryCacheRepository(ICacheRepository):
         """Define valor no cache."""
         expires_at = datetime.utcnow() + timedelta(seconds=ttl_seconds)
         
+        if key not in self._cache:
+            self._keys.add(key)
         self._cache[key] = {
             'value': value,
             'expires_at': expires_at,
@@ -280,7 +661,7 @@ class InMemoryCacheRepository(ICacheRepository):
     async def delete(self, key: str) -> bool:
         """Remove valor do cache."""
         if key in self._cache:
-            del self._cache[key]
+            self._remove(key)
             return True
         return False
     
@@ -291,26 +672,25 @@ class InMemoryCacheRepository(ICacheRepository):
             cache_entry = self._cache[key]
             if 'expires_at' in cache_entry:
                 if datetime.utcnow() > cache_entry['expires_at']:
-                    del self._cache[key]
+                    self._remove(key)
                     return False
             return True
         return False
     
     async def clear_pattern(self, pattern: str) -> int:
         """Remove chaves que correspondem ao padrão."""
-        import re
-        
         # Converte padrão simples com * para regex
         regex_pattern = pattern.replace('*', '.*')
         regex = re.compile(regex_pattern)
         
-        keys_to_delete = []
-        for key in self._cache.keys():
-            if regex.match(key):
-                keys_to_delete.append(key)
+        # Só as chaves sob o prefixo literal do padrão são testadas
+        keys_to_delete = [
+            key for key in self._keys.with_prefix(_literal_prefix(regex_pattern))
+            if regex.match(key)
+        ]
         
         for key in keys_to_delete:
-            del self._cache[key]
+            self._remove(key)
         
         return len(keys_to_delete)
     
@@ -324,6 +704,11 @@ class InMemoryCacheRepository(ICacheRepository):
                 expired_keys.append(key)
         
         for key in expired_keys:
-            del self._cache[key]
+            self._remove(key)
         
-        return len(expired_keys)
\ No newline at end of file
+        return len(expired_keys)
+    
+    def _remove(self, key: str) -> None:
+        """Remove chave do cache e do índice."""
+        del self._cache[key]
+        self._keys.remove(key)
@@ -0,0 +1,18 @@
+"""
+FastAPI Response
+
+Classe de resposta JSON do FastAPI/Starlette serializada pelo json_codec.
+"""
+
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+from .json_codec import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse que serializa com orjson (ou stdlib como fallback)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
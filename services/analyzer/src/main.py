@@ -5,24 +5,41 @@ FastAPI service for document analysis with personalized parameters.
 🚀 CORE DIFFERENTIATOR: Organization-specific analysis weights and rules.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, File, UploadFile
+import asyncio
+import time
+
+from fastapi import FastAPI, HTTPException, Depends, File, UploadFile, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from contextlib import asynccontextmanager
 from datetime import datetime
 
 from .config import settings
 from .services.analyzer_service import AnalyzerService  
 from .services.ocr_service import OCRService
+from .services.admission_controller import (
+    AdmissionRejectedError,
+    estimate_cost,
+    get_admission_controller
+)
 from .models.analysis_models import (
     AnalysisRequest,
     AnalysisResponse,
     DocumentUploadResponse
 )
 from .models.config_models import OrganizationConfig
-from .middleware.auth import verify_api_key
+from .middleware.auth import verify_api_key, verify_admin_key
 from .middleware.rate_limit import rate_limit
 from .utils.logger import setup_logging
+from .infrastructure.monitoring.metrics import get_metrics_collector
+from .infrastructure.monitoring.exposition import CONTENT_TYPE as OPENMETRICS_CONTENT_TYPE
+from .infrastructure.monitoring.stage_timer import StageTimer
+from .infrastructure.serialization.fastapi_response import FastJSONResponse
+from .infrastructure.monitoring.profiler import (
+    MAX_DURATION_SECONDS,
+    ProfilerBusyError,
+    get_profiler
+)
 
 # Setup logging
 logger = setup_logging()
@@ -52,7 +69,8 @@ app = FastAPI(
     title="LicitaReview Document Analyzer",
     description="Intelligent document analysis with personalized parameters",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 # Configure CORS
@@ -64,6 +82,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Registra contagem e latência por rota no MetricsCollector."""
+    started = time.perf_counter()
+    response = await call_next(request)
+    
+    # Template da rota (não o path cru) para manter a cardinalidade baixa
+    route = request.scope.get("route")
+    labels = {
+        "method": request.method,
+        "route": getattr(route, "path", "unmatched"),
+        "status": str(response.status_code)
+    }
+    collector = get_metrics_collector()
+    collector.increment("http_requests_total", labels=labels)
+    collector.observe_histogram("http_request_duration_seconds", time.perf_counter() - started, labels)
+    return response
+
+@app.get("/metrics")
+async def metrics():
+    """Métricas no formato OpenMetrics (scrape do Prometheus)"""
+    return Response(
+        content=get_metrics_collector().to_openmetrics(),
+        media_type=OPENMETRICS_CONTENT_TYPE
+    )
+
+@app.post("/admin/profile")
+async def profile_process(
+    duration: float = Query(10.0, gt=0, le=MAX_DURATION_SECONDS),
+    interval: float = Query(0.005, ge=0.001, le=1.0),
+    format: str = Query("folded", pattern="^(folded|json)$"),
+    _: str = Depends(verify_admin_key)
+):
+    """
+    Coleta um perfil por amostragem do processo durante `duration` segundos.
+    
+    Retorna pilhas no formato folded (flamegraph.pl/speedscope) ou um
+    resumo JSON com as funções mais quentes. A coleta roda fora do event
+    loop, que continua atendendo requests e aparece nas amostras.
+    """
+    try:
+        result = await asyncio.to_thread(get_profiler().profile, duration, interval)
+    except ProfilerBusyError:
+        raise HTTPException(status_code=409, detail="Profiling already in progress")
+    
+    logger.info("🔥 Profile collected", samples=result.samples, stacks=len(result.stacks))
+    
+    if format == "json":
+        return result.to_dict()
+    return PlainTextResponse(result.to_folded())
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -73,6 +142,14 @@ async def health_check():
         "version": "1.0.0"
     }
 
+def _admission_rejected(error: AdmissionRejectedError) -> HTTPException:
+    """503 com Retry-After para análises não admitidas (sobrecarga)."""
+    return HTTPException(
+        status_code=503,
+        detail=f"Serviço sobrecarregado ({error.reason}). Tente novamente em {error.retry_after} segundos.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_document(
     request: AnalysisRequest,
@@ -90,7 +167,10 @@ async def analyze_document(
                    document_id=request.document_id,
                    organization_id=request.organization_config.organization_id)
         
-        analysis_result = await analyzer_service.analyze_document(request)
+        timer = StageTimer("analyze")
+        async with get_admission_controller().admit(estimate_cost(request), request.priority) as waited:
+            timer.record("admission_wait", int(waited * 1e9))
+            analysis_result = await analyzer_service.analyze_document(request, timer)
         
         logger.info("Analysis completed successfully",
                    document_id=request.document_id,
@@ -103,17 +183,20 @@ async def analyze_document(
                 'analysis_engine': 'adaptive-v2.0.0',
                 'custom_rules_applied': len([f for f in analysis_result.findings if f.is_custom_rule]),
                 'organization_preset': analysis_result.applied_config.preset_type.value,
-                'cache_status': 'miss'  # Poderia vir do analyzer_service
+                'cache_status': analysis_result.analysis_metadata.get('cache_status', 'miss')
             },
             api_metadata={
                 'service_version': '1.0.0',
                 'request_timestamp': datetime.utcnow().isoformat(),
                 'api_endpoint': '/analyze'
-            }
+            },
+            timings=timer.timings() if request.include_timings else None
         )
         
         return response
         
+    except AdmissionRejectedError as e:
+        raise _admission_rejected(e)
     except Exception as e:
         logger.error("Analysis failed", 
                     document_id=request.document_id, 
@@ -221,7 +304,10 @@ async def analyze_document_adaptive(
                    weight_distribution=request.organization_config.weights.get_weight_distribution_type())
         
         # Análise com motor adaptativo
-        analysis_result = await analyzer_service.analyze_document(request)
+        timer = StageTimer("analyze_adaptive")
+        async with get_admission_controller().admit(estimate_cost(request), request.priority) as waited:
+            timer.record("admission_wait", int(waited * 1e9))
+            analysis_result = await analyzer_service.analyze_document(request, timer)
         
         # Calcula métricas de personalização
         custom_findings = [f for f in analysis_result.findings if f.is_custom_rule]
@@ -239,7 +325,7 @@ async def analyze_document_adaptive(
                 'dominant_category': analysis_result.applied_config.weights.get_dominant_category(),
                 'templates_validated': len([t for t in analysis_result.applied_config.templates if t.is_active]),
                 'personalization_score': len(custom_findings) / max(1, len(analysis_result.findings)) * 100,
-                'cache_status': 'miss'
+                'cache_status': analysis_result.analysis_metadata.get('cache_status', 'miss')
             },
             api_metadata={
                 'service_version': '1.0.0',
@@ -252,7 +338,8 @@ async def analyze_document_adaptive(
                     'adaptive_scoring',
                     'template_validation'
                 ]
-            }
+            },
+            timings=timer.timings() if request.include_timings else None
         )
         
         logger.info("✅ Adaptive analysis completed successfully",
@@ -265,6 +352,8 @@ async def analyze_document_adaptive(
         
         return response
         
+    except AdmissionRejectedError as e:
+        raise _admission_rejected(e)
     except Exception as e:
         logger.error("❌ Adaptive analysis failed", 
                     document_id=request.document_id,
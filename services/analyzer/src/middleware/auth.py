@@ -4,6 +4,8 @@ LicitaReview - Middleware de Autenticação
 Middleware para verificação de API keys e autenticação de requests.
 """
 
+import hmac
+import os
 from typing import Optional
 from fastapi import HTTPException, Header
 import structlog
@@ -65,6 +67,47 @@ async def verify_api_key(
     return x_api_key
 
 
+def is_admin_key(api_key: Optional[str]) -> bool:
+    """
+    Verifica se a chave é a chave administrativa do serviço.
+    
+    A chave vem da variável de ambiente ADMIN_API_KEY; sem ela os
+    endpoints administrativos ficam desabilitados.
+    
+    Args:
+        api_key: Chave fornecida no request
+        
+    Returns:
+        True se a chave confere com ADMIN_API_KEY
+    """
+    admin_key = os.getenv("ADMIN_API_KEY")
+    if not admin_key or not api_key:
+        return False
+    return hmac.compare_digest(api_key.encode(), admin_key.encode())
+
+
+async def verify_admin_key(
+    x_admin_key: Optional[str] = Header(None, description="Chave administrativa")
+) -> str:
+    """
+    Verifica a chave administrativa do header X-Admin-Key.
+    
+    Args:
+        x_admin_key: Chave fornecida no header X-Admin-Key
+        
+    Returns:
+        Chave validada
+        
+    Raises:
+        HTTPException: Se a chave for inválida ou ausente
+    """
+    if not is_admin_key(x_admin_key):
+        logger.warning("Unauthorized admin request")
+        raise HTTPException(status_code=403, detail="Acesso administrativo negado.")
+    
+    return x_admin_key
+
+
 def get_organization_from_api_key(api_key: str) -> Optional[dict]:
     """
     Extrai informações da organização a partir da API key.
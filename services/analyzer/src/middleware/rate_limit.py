@@ -2,18 +2,28 @@
 LicitaReview - Middleware de Rate Limiting
 
 Controla a taxa de requests para prevenir abuse da API.
+
+Usa contador de janela deslizante (duas janelas fixas ponderadas):
+custo O(1) por verificação e estado constante por (cliente, endpoint).
+O estado fica em memória (tabela LRU limitada) ou no Redis, via script
+Lua atômico, para que os limites valham entre instâncias do Cloud Run.
 """
 
+import os
 import time
-from typing import Dict
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
 from fastapi import HTTPException, Request
 import structlog
 
-logger = structlog.get_logger(__name__)
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
 
-# Armazenamento em memória para rate limiting
-# Em produção, usar Redis ou similar
-request_counts: Dict[str, Dict[str, any]] = {}
+logger = structlog.get_logger(__name__)
 
 # Configurações de rate limiting
 RATE_LIMITS = {
@@ -23,80 +33,335 @@ RATE_LIMITS = {
 }
 
 
+@dataclass
+class RateLimitDecision:
+    """Resultado de uma verificação de rate limit."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    window_seconds: int
+
+
+def _sliding_window(
+    previous: float,
+    current: float,
+    elapsed: float,
+    window: float,
+    limit: int
+) -> Tuple[bool, float, float]:
+    """
+    Avalia o contador de janela deslizante.
+
+    A contagem estimada é `previous * (1 - elapsed/window) + current`.
+
+    Args:
+        previous: Requests da janela fixa anterior
+        current: Requests da janela fixa atual
+        elapsed: Segundos desde o início da janela atual
+        window: Tamanho da janela em segundos
+        limit: Requests permitidas por janela
+
+    Returns:
+        Tupla (permitido, contagem estimada, segundos até liberar)
+    """
+    estimate = previous * (1 - elapsed / window) + current
+    if estimate + 1 <= limit:
+        return True, estimate, 0.0
+
+    if current < limit and previous > 0:
+        # Libera quando a fração da janela anterior decair o suficiente
+        needed = window * (1 - (limit - 1 - current) / previous)
+        return False, estimate, max(needed - elapsed, 0.0)
+
+    # Janela atual cheia: após a virada ela passa a ser a anterior
+    needed = window * (1 - (limit - 1) / current) if current else 0.0
+    return False, estimate, (window - elapsed) + max(needed, 0.0)
+
+
+class InMemoryRateLimitBackend:
+    """
+    Estado por chave em memória: [índice da janela, atual, anterior].
+
+    A tabela é LRU com tamanho máximo: cada acesso move a chave para o
+    fim, então clientes ociosos ficam no início e são descartados primeiro.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._state: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    async def hit(self, key: str, limit: int, window: int, now: float) -> RateLimitDecision:
+        """Registra a tentativa (se permitida) e retorna a decisão."""
+        index = int(now // window)
+        state = self._state.get(key)
+        if state is None:
+            state = [index, 0, 0]
+            self._state[key] = state
+            if len(self._state) > self.max_keys:
+                self._state.popitem(last=False)
+        else:
+            self._state.move_to_end(key)
+            self._roll(state, index)
+
+        allowed, estimate, retry_after = _sliding_window(
+            state[2], state[1], now - index * window, window, limit
+        )
+        if allowed:
+            state[1] += 1
+            estimate += 1
+
+        return RateLimitDecision(allowed, limit, max(0, int(limit - estimate)), retry_after, window)
+
+    async def peek(self, key: str, window: int, now: float) -> Optional[Tuple[int, int]]:
+        """Contagens (anterior, atual) da chave sem registrar tentativa."""
+        state = self._state.get(key)
+        if state is None:
+            return None
+        state = list(state)
+        self._roll(state, int(now // window))
+        return state[2], state[1]
+
+    @staticmethod
+    def _roll(state: list, index: int) -> None:
+        """Avança o estado para a janela `index`."""
+        if state[0] == index:
+            return
+        state[2] = state[1] if state[0] == index - 1 else 0
+        state[1] = 0
+        state[0] = index
+
+
+# Mesmo algoritmo do _sliding_window, executado atomicamente no Redis.
+# KEYS[1] = chave; ARGV = now, window, limit. Retorna {permitido, restantes, retry_after_ms}.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local index = math.floor(now / window)
+
+local state = redis.call('HMGET', KEYS[1], 'index', 'current', 'previous')
+local stored = tonumber(state[1])
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+
+if stored ~= index then
+    if stored == index - 1 then previous = current else previous = 0 end
+    current = 0
+end
+
+local elapsed = now - index * window
+local estimate = previous * (1 - elapsed / window) + current
+local allowed = 0
+local retry_after = 0
+
+if estimate + 1 <= limit then
+    allowed = 1
+    current = current + 1
+    estimate = estimate + 1
+elseif current < limit and previous > 0 then
+    retry_after = math.max(window * (1 - (limit - 1 - current) / previous) - elapsed, 0)
+else
+    local needed = 0
+    if current > 0 then needed = math.max(window * (1 - (limit - 1) / current), 0) end
+    retry_after = (window - elapsed) + needed
+end
+
+redis.call('HSET', KEYS[1], 'index', index, 'current', current, 'previous', previous)
+redis.call('EXPIRE', KEYS[1], math.ceil(window * 2))
+
+return {allowed, math.max(0, math.floor(limit - estimate)), math.floor(retry_after * 1000)}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Estado compartilhado no Redis (um hash por chave, com TTL de 2 janelas).
+
+    A leitura, decisão e escrita rodam num único script Lua, então
+    instâncias concorrentes não ultrapassam o limite.
+    """
+
+    def __init__(self, client: Any, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(_SLIDING_WINDOW_LUA)
+
+    async def hit(self, key: str, limit: int, window: int, now: float) -> RateLimitDecision:
+        """Registra a tentativa (se permitida) e retorna a decisão."""
+        allowed, remaining, retry_after_ms = await self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[repr(now), window, limit]
+        )
+        return RateLimitDecision(bool(allowed), limit, int(remaining), int(retry_after_ms) / 1000, window)
+
+    async def peek(self, key: str, window: int, now: float) -> Optional[Tuple[int, int]]:
+        """Contagens (anterior, atual) da chave sem registrar tentativa."""
+        state = await self.client.hmget(f"{self.prefix}:{key}", 'index', 'current', 'previous')
+        if state[0] is None:
+            return None
+        stored, current, previous = int(state[0]), int(state[1]), int(state[2])
+        index = int(now // window)
+        if stored == index:
+            return previous, current
+        return (current if stored == index - 1 else 0), 0
+
+
+class SlidingWindowRateLimiter:
+    """
+    Rate limiter por (cliente, tipo de endpoint).
+
+    Se o backend Redis falhar, a verificação cai para o backend em
+    memória da instância em vez de bloquear ou liberar tudo.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        limits: Optional[Dict[str, Dict[str, int]]] = None
+    ):
+        self.fallback = InMemoryRateLimitBackend()
+        self.backend = self.fallback if backend is None else backend
+        self.limits = limits or RATE_LIMITS
+
+    def _limit_for(self, endpoint: str) -> Dict[str, int]:
+        return self.limits.get(endpoint, self.limits['default'])
+
+    async def check(
+        self,
+        client_id: str,
+        endpoint: str,
+        now: Optional[float] = None
+    ) -> RateLimitDecision:
+        """
+        Verifica e registra uma request.
+
+        Args:
+            client_id: Identificador do cliente
+            endpoint: Tipo do endpoint (analyze, upload, default)
+            now: Instante da request (default: agora)
+
+        Returns:
+            RateLimitDecision
+        """
+        config = self._limit_for(endpoint)
+        now = time.time() if now is None else now
+        key = f"{client_id}:{endpoint}"
+
+        try:
+            return await self.backend.hit(key, config['requests'], config['window_seconds'], now)
+        except Exception as e:
+            if self.backend is self.fallback:
+                raise
+            logger.warning("⚠️ Rate limit backend unavailable, using in-memory fallback", error=str(e))
+            return await self.fallback.hit(key, config['requests'], config['window_seconds'], now)
+
+    async def status(self, client_id: str, endpoint: str = 'default') -> Dict[str, Any]:
+        """Status atual do cliente sem registrar request."""
+        config = self._limit_for(endpoint)
+        window = config['window_seconds']
+        now = time.time()
+
+        counts = await self.backend.peek(f"{client_id}:{endpoint}", window, now)
+
+        if counts is None:
+            return {
+                'requests_made': 0,
+                'requests_remaining': config['requests'],
+                'reset_time': None,
+                'window_seconds': window
+            }
+
+        previous, current = counts
+        elapsed = now - (now // window) * window
+        _, estimate, retry_after = _sliding_window(previous, current, elapsed, window, config['requests'])
+
+        return {
+            'requests_made': int(round(estimate)),
+            'requests_remaining': max(0, int(config['requests'] - estimate)),
+            'reset_time': now + retry_after if retry_after else None,
+            'window_seconds': window
+        }
+
+
+def _create_rate_limiter() -> SlidingWindowRateLimiter:
+    """Cria o limiter: Redis se RATE_LIMIT_REDIS_URL estiver definido, senão memória."""
+    redis_url = os.getenv("RATE_LIMIT_REDIS_URL")
+    if redis_url and aioredis is not None:
+        logger.info("✅ Rate limiting backed by Redis")
+        return SlidingWindowRateLimiter(RedisRateLimitBackend(aioredis.Redis.from_url(redis_url)))
+    return SlidingWindowRateLimiter()
+
+
+_rate_limiter: Optional[SlidingWindowRateLimiter] = None
+
+
+def get_rate_limiter() -> SlidingWindowRateLimiter:
+    """Obtém instância global do rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = _create_rate_limiter()
+    return _rate_limiter
+
+
+def _client_id(request: Request) -> str:
+    """Identifica cliente (IP + hash estável do User-Agent, igual entre instâncias)."""
+    client_ip = request.client.host if request.client else "unknown"
+    user_agent = request.headers.get("User-Agent", "unknown")[:50]
+    return f"{client_ip}_{zlib.crc32(user_agent.encode()) % 10000}"
+
+
 async def rate_limit(request: Request) -> None:
     """
     Middleware de rate limiting baseado em IP e endpoint.
-    
+
     Args:
         request: Request do FastAPI
-        
+
     Raises:
         HTTPException: Se limite de rate excedido
     """
-    # Identifica cliente (IP + User-Agent)
-    client_ip = request.client.host if request.client else "unknown"
-    user_agent = request.headers.get("User-Agent", "unknown")[:50]
-    client_id = f"{client_ip}_{hash(user_agent) % 10000}"
-    
-    # Determina endpoint e limite aplicável
+    client_id = _client_id(request)
     endpoint = _get_endpoint_type(request.url.path)
-    limit_config = RATE_LIMITS.get(endpoint, RATE_LIMITS['default'])
-    
-    current_time = time.time()
-    window_start = current_time - limit_config['window_seconds']
-    
-    # Inicializa ou limpa dados antigos do cliente
-    if client_id not in request_counts:
-        request_counts[client_id] = {'requests': [], 'first_request': current_time}
-    
-    client_data = request_counts[client_id]
-    
-    # Remove requests antigas da janela
-    client_data['requests'] = [
-        req_time for req_time in client_data['requests'] 
-        if req_time > window_start
-    ]
-    
-    # Verifica se excedeu o limite
-    if len(client_data['requests']) >= limit_config['requests']:
+
+    decision = await get_rate_limiter().check(client_id, endpoint)
+
+    if not decision.allowed:
+        retry_after = max(1, int(decision.retry_after + 0.999))
         logger.warning(
             "Rate limit exceeded",
             client_id=client_id,
             endpoint=endpoint,
-            requests_count=len(client_data['requests']),
-            limit=limit_config['requests'],
-            window_seconds=limit_config['window_seconds']
+            limit=decision.limit,
+            window_seconds=decision.window_seconds,
+            retry_after=retry_after
         )
-        
-        # Calcula tempo para reset
-        oldest_request = min(client_data['requests'])
-        retry_after = int(oldest_request + limit_config['window_seconds'] - current_time + 1)
-        
+
         raise HTTPException(
             status_code=429,
             detail=f"Rate limit excedido. Tente novamente em {retry_after} segundos.",
             headers={"Retry-After": str(retry_after)}
         )
-    
-    # Registra request atual
-    client_data['requests'].append(current_time)
-    
+
     logger.debug(
         "Rate limit check passed",
         client_id=client_id,
         endpoint=endpoint,
-        current_requests=len(client_data['requests']),
-        limit=limit_config['requests']
+        requests_remaining=decision.remaining,
+        limit=decision.limit
     )
 
 
 def _get_endpoint_type(path: str) -> str:
     """
     Determina o tipo de endpoint baseado no path.
-    
+
     Args:
         path: Path da URL
-        
+
     Returns:
         Tipo do endpoint para rate limiting
     """
@@ -108,47 +373,15 @@ def _get_endpoint_type(path: str) -> str:
         return 'default'
 
 
-def get_rate_limit_status(client_id: str, endpoint: str = 'default') -> Dict[str, any]:
+async def get_rate_limit_status(client_id: str, endpoint: str = 'default') -> Dict[str, Any]:
     """
     Retorna status atual do rate limiting para um cliente.
-    
+
     Args:
         client_id: Identificador do cliente
         endpoint: Tipo de endpoint
-        
+
     Returns:
         Dict com status do rate limiting
     """
-    if client_id not in request_counts:
-        return {
-            'requests_made': 0,
-            'requests_remaining': RATE_LIMITS[endpoint]['requests'],
-            'reset_time': None
-        }
-    
-    client_data = request_counts[client_id]
-    limit_config = RATE_LIMITS[endpoint]
-    current_time = time.time()
-    window_start = current_time - limit_config['window_seconds']
-    
-    # Conta requests na janela atual
-    recent_requests = [
-        req_time for req_time in client_data['requests']
-        if req_time > window_start
-    ]
-    
-    requests_made = len(recent_requests)
-    requests_remaining = max(0, limit_config['requests'] - requests_made)
-    
-    # Calcula quando o rate limit será resetado
-    reset_time = None
-    if recent_requests:
-        oldest_request = min(recent_requests)
-        reset_time = oldest_request + limit_config['window_seconds']
-    
-    return {
-        'requests_made': requests_made,
-        'requests_remaining': requests_remaining,
-        'reset_time': reset_time,
-        'window_seconds': limit_config['window_seconds']
-    }
\ No newline at end of file
+    return await get_rate_limiter().status(client_id, endpoint)
@@ -0,0 +1,46 @@
+"""
+Embeddings
+
+Funções de embedding locais, sem dependência de serviços externos,
+compartilhadas pelo índice vetorial local e pelo chunking semântico.
+"""
+
+import hashlib
+import re
+from typing import List
+
+import numpy as np
+
+
+class HashingEmbedder:
+    """
+    Embedder determinístico baseado em feature hashing.
+
+    Não captura semântica como um modelo real, mas textos com vocabulário
+    parecido ficam próximos. Serve como stand-in em testes e ambientes
+    sem acesso ao Vertex AI.
+    """
+
+    _token_pattern = re.compile(r'\w+')
+
+    def __init__(self, dim: int = 256):
+        """
+        Args:
+            dim: Dimensão dos vetores gerados
+        """
+        self.dim = dim
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        """Gera embeddings normalizados para uma lista de textos."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            for token in self._token_pattern.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], 'little') % self.dim
+                sign = 1.0 if digest[4] & 1 else -1.0
+                matrix[row, bucket] += sign
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
@@ -6,12 +6,17 @@ a qualidade das análises e respostas do sistema.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Callable
 from enum import Enum
+import hashlib
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 import logging
 
+import numpy as np
+
+from .embeddings import HashingEmbedder
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,9 +97,35 @@ class AdaptiveChunker:
 
     Diferentes tipos de documentos (editais, contratos, leis) têm estruturas
     diferentes e requerem estratégias de chunking específicas.
+
+    A estratégia SEMANTIC embeda as sentenças em lotes (com cache por hash),
+    compara janelas adjacentes de sentenças e corta nos vales de similaridade.
     """
 
-    def __init__(self):
+    # Stopwords PT-BR usadas na extração de tópicos
+    _stopwords = frozenset({
+        'o', 'a', 'de', 'da', 'do', 'em', 'para', 'com', 'que', 'e',
+        'os', 'as', 'dos', 'das', 'no', 'na', 'nos', 'nas', 'por', 'ao',
+    })
+    _topic_pattern = re.compile(r'\b[a-záàâãéêíóôõúç]{4,}\b')
+    _sentence_pattern = re.compile(r'[^.!?\n]+(?:[.!?]+|\n|$)')
+
+    def __init__(
+        self,
+        embedder: Optional[Callable[[List[str]], Any]] = None,
+        window_size: int = 3,
+        embedding_batch_size: int = 64,
+        embedding_cache_size: int = 20000,
+        valley_sensitivity: float = 0.5
+    ):
+        """
+        Args:
+            embedder: Função textos → embeddings (default: HashingEmbedder local)
+            window_size: Sentenças por janela na comparação de similaridade
+            embedding_batch_size: Sentenças por chamada ao embedder
+            embedding_cache_size: Embeddings de sentenças mantidos em cache
+            valley_sensitivity: Desvios-padrão abaixo da média para um vale
+        """
         # Tamanhos adaptativos por tipo de documento
         self.chunk_sizes = {
             'edital': 700,      # Editais são mais estruturados
@@ -110,6 +141,13 @@ class AdaptiveChunker:
             'lei': r'Art\.?\s*\d+|Artigo\s+\d+|CAPÍTULO\s+[IVX]+',
         }
 
+        self.embedder = embedder or HashingEmbedder()
+        self.window_size = window_size
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_cache_size = embedding_cache_size
+        self.valley_sensitivity = valley_sensitivity
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
     def chunk_document(
         self,
         text: str,
@@ -172,57 +210,164 @@ class AdaptiveChunker:
         document_id: str,
         document_type: str
     ) -> List[EnhancedChunk]:
-        """Chunking semântico por parágrafos e seções."""
-        chunks = []
-
-        # Dividir por parágrafos duplos
-        paragraphs = re.split(r'\n\s*\n', text)
+        """
+        Chunking semântico por vales de similaridade entre sentenças.
 
-        current_chunk = []
-        current_size = 0
+        1. Divide o texto em sentenças (com posições)
+        2. Embeda as sentenças em lotes (cache por hash)
+        3. Calcula, de uma vez, a similaridade entre as janelas antes e
+           depois de cada fronteira de sentença
+        4. Corta nos vales de similaridade, respeitando o tamanho do chunk
+        """
         chunk_size = self.chunk_sizes.get(document_type, 512)
-        start_pos = 0
+        spans = self._split_sentences(text)
 
-        for i, para in enumerate(paragraphs):
-            para = para.strip()
-            if not para:
-                continue
+        if not spans:
+            return []
 
-            para_size = len(para)
+        boundaries = [start for start, _ in spans[1:]]
+        similarities = self._boundary_similarities([text[s:e] for s, e in spans])
+        cuts = self._select_cuts(spans, similarities, chunk_size)
 
-            if current_size + para_size > chunk_size and current_chunk:
-                # Criar chunk
-                chunk_text = '\n\n'.join(current_chunk)
+        chunks = []
+        chunk_start = spans[0][0]
+        for cut in cuts + [None]:
+            chunk_end = spans[-1][1] if cut is None else boundaries[cut]
+            chunk_text = text[chunk_start:chunk_end].strip()
+            if chunk_text:
                 metadata = self._create_metadata(
                     chunk_text,
                     document_id,
                     len(chunks),
-                    start_pos,
-                    start_pos + len(chunk_text)
+                    chunk_start,
+                    chunk_end
                 )
                 chunks.append(EnhancedChunk(text=chunk_text, metadata=metadata))
+            chunk_start = chunk_end
 
-                # Reset
-                current_chunk = [para]
-                current_size = para_size
-                start_pos = start_pos + len(chunk_text)
+        return chunks
+
+    def _split_sentences(self, text: str) -> List[Tuple[int, int]]:
+        """Divide o texto em sentenças, retornando (início, fim) de cada uma."""
+        return [
+            match.span()
+            for match in self._sentence_pattern.finditer(text)
+            if match.group(0).strip()
+        ]
+
+    def _embed_sentences(self, sentences: List[str]) -> np.ndarray:
+        """
+        Embeda sentenças em lotes, reaproveitando o cache por hash.
+
+        Re-chunkar o mesmo documento (por exemplo, com outro tamanho)
+        não gera novas chamadas ao embedder.
+        """
+        keys = [
+            hashlib.blake2b(s.strip().encode('utf-8'), digest_size=16).hexdigest()
+            for s in sentences
+        ]
+
+        missing: Dict[str, str] = {}
+        for key, sentence in zip(keys, sentences):
+            if key in self._embedding_cache:
+                self._embedding_cache.move_to_end(key)
             else:
-                current_chunk.append(para)
-                current_size += para_size
+                missing.setdefault(key, sentence.strip())
 
-        # Último chunk
-        if current_chunk:
-            chunk_text = '\n\n'.join(current_chunk)
-            metadata = self._create_metadata(
-                chunk_text,
-                document_id,
-                len(chunks),
-                start_pos,
-                start_pos + len(chunk_text)
-            )
-            chunks.append(EnhancedChunk(text=chunk_text, metadata=metadata))
+        pending = list(missing.items())
+        for start in range(0, len(pending), self.embedding_batch_size):
+            batch = pending[start:start + self.embedding_batch_size]
+            vectors = np.asarray(self.embedder([s for _, s in batch]), dtype=np.float32)
+            for (key, _), vector in zip(batch, vectors):
+                self._embedding_cache[key] = vector
 
-        return chunks
+        matrix = np.stack([self._embedding_cache[key] for key in keys])
+
+        while len(self._embedding_cache) > self.embedding_cache_size:
+            self._embedding_cache.popitem(last=False)
+
+        return matrix
+
+    def _boundary_similarities(self, sentences: List[str]) -> np.ndarray:
+        """
+        Similaridade de cosseno entre as janelas antes/depois de cada fronteira.
+
+        Retorna um vetor com len(sentences) - 1 posições; a posição i
+        corresponde à fronteira entre as sentenças i e i + 1.
+        """
+        if len(sentences) < 2:
+            return np.zeros(0, dtype=np.float32)
+
+        embeddings = self._embed_sentences(sentences)
+        n = len(sentences)
+        w = self.window_size
+
+        # Somas de janelas via soma acumulada (O(n·d) para todas as fronteiras)
+        cumsum = np.vstack([
+            np.zeros((1, embeddings.shape[1]), dtype=np.float32),
+            np.cumsum(embeddings, axis=0)
+        ])
+        idx = np.arange(1, n)
+        left = cumsum[idx] - cumsum[np.maximum(idx - w, 0)]
+        right = cumsum[np.minimum(idx + w, n)] - cumsum[idx]
+
+        norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+        dots = np.einsum('ij,ij->i', left, right)
+        return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+    def _select_cuts(
+        self,
+        spans: List[Tuple[int, int]],
+        similarities: np.ndarray,
+        chunk_size: int
+    ) -> List[int]:
+        """
+        Escolhe as fronteiras de corte.
+
+        Corta em vales (mínimos locais abaixo de média - k·desvio) quando o
+        chunk atual e o restante do texto já têm tamanho mínimo; se o chunk estouraria o limite,
+        corta na fronteira de menor similaridade dentro dele.
+        """
+        if not len(similarities):
+            return []
+
+        threshold = similarities.mean() - self.valley_sensitivity * similarities.std()
+        padded = np.concatenate([[np.inf], similarities, [np.inf]])
+        is_valley = (
+            (similarities <= padded[:-2])
+            & (similarities <= padded[2:])
+            & (similarities < threshold)
+        )
+
+        min_size = chunk_size // 4
+        cuts: List[int] = []
+        chunk_start = spans[0][0]
+        text_end = spans[-1][1]
+        first_boundary = 0
+
+        for b in range(len(similarities)):
+            boundary_pos = spans[b + 1][0]
+            size_if_cut = boundary_pos - chunk_start
+            next_end = spans[b + 1][1]
+
+            if is_valley[b] and min(size_if_cut, text_end - boundary_pos) >= min_size:
+                cut = b
+            elif next_end - chunk_start > chunk_size and size_if_cut > 0:
+                # Estouraria o limite: corta no ponto menos similar do chunk
+                # que ainda deixa um chunk com o tamanho mínimo
+                candidates = [
+                    c for c in range(first_boundary, b + 1)
+                    if spans[c + 1][0] - chunk_start >= min_size
+                ] or [b]
+                cut = candidates[int(np.argmin(similarities[candidates]))]
+            else:
+                continue
+
+            cuts.append(cut)
+            chunk_start = spans[cut + 1][0]
+            first_boundary = cut + 1
+
+        return cuts
 
     def _fixed_chunking(
         self,
@@ -390,21 +535,14 @@ class AdaptiveChunker:
 
     def _extract_topics(self, text: str, top_n: int = 5) -> List[str]:
         """Extrai tópicos principais (palavras-chave) do texto."""
-        # Stopwords PT-BR
-        stopwords = {
-            'o', 'a', 'de', 'da', 'do', 'em', 'para', 'com', 'que', 'e',
-            'os', 'as', 'dos', 'das', 'no', 'na', 'nos', 'nas', 'por', 'ao',
-        }
-
         # Tokenizar e filtrar
-        words = re.findall(r'\b[a-záàâãéêíóôõúç]{4,}\b', text.lower())
-        words = [w for w in words if w not in stopwords]
+        words = [
+            w for w in self._topic_pattern.findall(text.lower())
+            if w not in self._stopwords
+        ]
 
-        # Contar frequência
-        word_counts = Counter(words)
-
-        # Retornar top N
-        return [word for word, _ in word_counts.most_common(top_n)]
+        # Retornar top N por frequência
+        return [word for word, _ in Counter(words).most_common(top_n)]
 
 
 class QueryExpander:
@@ -537,27 +675,57 @@ class SemanticDeduplicator:
     Remove chunks semanticamente duplicados ou muito similares.
 
     Evita redundância no corpus RAG, melhorando qualidade e reduzindo custos.
+
+    Os embeddings são normalizados uma única vez em uma matriz float32 e a
+    passada gulosa compara blocos de chunks contra os já aceitos com produtos
+    de matrizes. Acima de `approximate_threshold` chunks, os candidatos são
+    restritos a buckets LSH (projeções aleatórias) para evitar o custo O(n²).
     """
 
-    def __init__(self, similarity_threshold: float = 0.95):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        block_size: int = 1024,
+        approximate_threshold: Optional[int] = 20000,
+        lsh_bits: int = 12,
+        lsh_tables: int = 16,
+        seed: int = 42
+    ):
         """
         Args:
             similarity_threshold: Threshold de similaridade (0-1)
                                  para considerar duplicado
+            block_size: Linhas por bloco no modo exato
+            approximate_threshold: A partir de quantos chunks usar LSH
+                                   (None desativa o modo aproximado)
+            lsh_bits: Hiperplanos por tabela LSH
+            lsh_tables: Número de tabelas LSH
+            seed: Semente dos hiperplanos aleatórios
         """
         self.similarity_threshold = similarity_threshold
+        self.block_size = block_size
+        self.approximate_threshold = approximate_threshold
+        self.lsh_bits = lsh_bits
+        self.lsh_tables = lsh_tables
+        self.seed = seed
 
     def deduplicate(
         self,
         chunks: List[EnhancedChunk],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        approximate: Optional[bool] = None
     ) -> Tuple[List[EnhancedChunk], List[int]]:
         """
         Remove chunks duplicados baseado em similaridade semântica.
 
+        Um chunk é duplicado se sua similaridade com algum chunk anterior já
+        aceito for maior ou igual ao threshold.
+
         Args:
             chunks: Lista de chunks
-            embeddings: Embeddings correspondentes
+            embeddings: Embeddings correspondentes (lista ou array n×d)
+            approximate: Força (True) ou desativa (False) o modo LSH;
+                         None decide por `approximate_threshold`
 
         Returns:
             (chunks_únicos, índices_removidos)
@@ -565,51 +733,109 @@ class SemanticDeduplicator:
         if not chunks:
             return [], []
 
-        unique_chunks = []
-        unique_embeddings = []
-        removed_indices = []
+        matrix = self._normalize(embeddings)
 
-        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-            is_duplicate = False
+        if approximate is None:
+            approximate = (
+                self.approximate_threshold is not None
+                and len(chunks) >= self.approximate_threshold
+            )
 
-            # Comparar com chunks já aceitos
-            for existing_emb in unique_embeddings:
-                similarity = self._cosine_similarity(embedding, existing_emb)
+        if approximate:
+            keep = self._greedy_lsh(matrix)
+        else:
+            keep = self._greedy_exact(matrix)
 
-                if similarity >= self.similarity_threshold:
-                    is_duplicate = True
-                    break
-
-            if not is_duplicate:
-                unique_chunks.append(chunk)
-                unique_embeddings.append(embedding)
-            else:
-                removed_indices.append(i)
+        unique_chunks = [chunk for chunk, kept in zip(chunks, keep) if kept]
+        removed_indices = np.flatnonzero(~keep).tolist()
 
         logger.info(
             f"Deduplicação: {len(chunks)} → {len(unique_chunks)} chunks "
-            f"({len(removed_indices)} removidos)"
+            f"({len(removed_indices)} removidos, "
+            f"modo {'lsh' if approximate else 'exato'})"
         )
 
         return unique_chunks, removed_indices
 
-    def _cosine_similarity(
-        self,
-        vec1: List[float],
-        vec2: List[float]
-    ) -> float:
-        """Calcula similaridade de cosseno entre dois vetores."""
-        if len(vec1) != len(vec2):
-            return 0.0
+    def _normalize(self, embeddings: Any) -> np.ndarray:
+        """Converte embeddings em matriz float32 com linhas de norma unitária."""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("Embeddings devem ter a mesma dimensão (matriz n×d)")
+
+        matrix = matrix.copy() if matrix is embeddings else matrix
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # Vetores nulos têm similaridade 0 com qualquer outro
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def _greedy_exact(self, matrix: np.ndarray) -> np.ndarray:
+        """Passada gulosa exata em blocos; retorna máscara de chunks mantidos."""
+        n = matrix.shape[0]
+        threshold = self.similarity_threshold
+        keep = np.zeros(n, dtype=bool)
+        accepted = np.empty_like(matrix)
+        accepted_count = 0
+
+        for start in range(0, n, self.block_size):
+            block = matrix[start:start + self.block_size]
+
+            # Duplicados de chunks aceitos em blocos anteriores
+            if accepted_count:
+                sims = block @ accepted[:accepted_count].T
+                duplicate = (sims >= threshold).any(axis=1)
+            else:
+                duplicate = np.zeros(block.shape[0], dtype=bool)
 
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        norm1 = sum(a * a for a in vec1) ** 0.5
-        norm2 = sum(b * b for b in vec2) ** 0.5
+            # Dentro do bloco a ordem importa: cada aceito elimina os seguintes
+            inner = block @ block.T
+            for j in range(block.shape[0]):
+                if duplicate[j]:
+                    continue
+                keep[start + j] = True
+                accepted[accepted_count] = block[j]
+                accepted_count += 1
+                duplicate[j + 1:] |= inner[j, j + 1:] >= threshold
 
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        return keep
+
+    def _greedy_lsh(self, matrix: np.ndarray) -> np.ndarray:
+        """
+        Passada gulosa aproximada com LSH por projeções aleatórias.
+
+        Cada chunk só é comparado com os aceitos que compartilham bucket em
+        ao menos uma tabela; pares acima do threshold podem escapar com
+        probabilidade pequena (controlada por `lsh_bits`/`lsh_tables`).
+        """
+        n, dim = matrix.shape
+        threshold = self.similarity_threshold
+        rng = np.random.default_rng(self.seed)
+        planes = rng.standard_normal((dim, self.lsh_bits * self.lsh_tables)).astype(np.float32)
+
+        # Assinaturas de todos os chunks em um único produto de matrizes
+        bits = (matrix @ planes > 0).reshape(n, self.lsh_tables, self.lsh_bits)
+        weights = (1 << np.arange(self.lsh_bits, dtype=np.int64))
+        keys = (bits * weights).sum(axis=2)
+
+        buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.lsh_tables)]
+        keep = np.zeros(n, dtype=bool)
+
+        for i in range(n):
+            row_keys = keys[i].tolist()
+            candidates: List[int] = []
+            for table, key in zip(buckets, row_keys):
+                bucket = table.get(key)
+                if bucket:
+                    candidates.extend(bucket)
+
+            if candidates and (matrix[candidates] @ matrix[i]).max() >= threshold:
+                continue
+
+            keep[i] = True
+            for table, key in zip(buckets, row_keys):
+                table.setdefault(key, []).append(i)
 
-        return dot_product / (norm1 * norm2)
+        return keep
 
 
 class CitationQualityScorer:
@@ -327,6 +327,10 @@ class AnalysisRequest(BaseModel):
         pattern=r"^(low|normal|high|urgent)$",
         description="Prioridade da análise"
     )
+    include_timings: bool = Field(
+        default=False,
+        description="Incluir breakdown de latência por etapa na resposta"
+    )
     
     model_config = ConfigDict(validate_assignment=True)
     
@@ -334,6 +338,12 @@ class AnalysisRequest(BaseModel):
         """
         Gera chave de cache baseada nos parâmetros de análise.
         
+        A chave identifica o resultado final (já ponderado pela organização).
+        Este caminho ainda não tem o estágio base por hash do conteúdo do
+        AnalysisEngine do document-analyzer: o AdaptiveAnalyzer usado pelo
+        AnalyzerService não tem API de análise base separável (e sua análise
+        base lê a configuração da organização).
+        
         Returns:
             String única para identificar análises equivalentes
         """
@@ -660,6 +670,10 @@ class AnalysisResponse(BaseModel):
         default_factory=dict,
         description="Metadados da API"
     )
+    timings: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Latência por etapa em ms (quando include_timings=True)"
+    )
     
     model_config = ConfigDict(use_enum_values=True, validate_assignment=True)
     
@@ -30,6 +30,7 @@ from ..models.analysis_models import DocumentAnalysis, ScoreBreakdown
 from ..models.config_models import AnalysisConfig, CustomRule, ParameterWeights
 from ..models.document_models import Document
 from ..utils.logger import get_logger
+from ..infrastructure.monitoring.stage_timer import StageTimer, current_stage_timer, timed_stage
 
 logger = get_logger(__name__)
 
@@ -89,6 +90,7 @@ class AdaptiveAnalysisResult:
     metadata: Dict[str, Any]
     created_at: datetime
     updated_at: datetime
+    timings: Optional[Dict[str, Any]] = None
 
 class AdaptiveAnalyzer:
     """Motor de Análise Adaptativo Principal"""
@@ -111,36 +113,45 @@ class AdaptiveAnalyzer:
         """Executa análise adaptativa completa de um documento"""
         start_time = datetime.now()
         analysis_id = f"analysis_{document.id}_{int(start_time.timestamp())}"
+        # Reaproveita o cronômetro do chamador (ex.: AnalyzerService) se houver
+        timer = current_stage_timer() or StageTimer("adaptive_analyzer")
         
         try:
             self.logger.info(f"Iniciando análise adaptativa para documento {document.id}")
             
-            # 1. Preparação e validação inicial
-            await self._validate_inputs(document, context)
-            
-            # 2. Análise de contexto e adaptação de parâmetros
-            adapted_weights = await self._adapt_parameters(document, context)
-            
-            # 3. Análise base do documento
-            base_analysis = await self._perform_base_analysis(document, context)
-            
-            # 4. Aplicação de regras personalizadas
-            rule_results = await self._apply_custom_rules(document, context, base_analysis)
-            
-            # 5. Cálculo de pontuação adaptativa
-            adaptive_score = await self._calculate_adaptive_score(
-                base_analysis, rule_results, adapted_weights
-            )
-            
-            # 6. Geração de flags e recomendações
-            flags, recommendations = await self._generate_insights(
-                document, base_analysis, rule_results, adaptive_score
-            )
-            
-            # 7. Cálculo de confiança
-            confidence = await self._calculate_confidence(
-                document, context, base_analysis, rule_results
-            )
+            with timer.activate():
+                # 1. Preparação e validação inicial
+                with timer.stage("validation"):
+                    await self._validate_inputs(document, context)
+                
+                # 2. Análise de contexto e adaptação de parâmetros
+                with timer.stage("parameter_adaptation"):
+                    adapted_weights = await self._adapt_parameters(document, context)
+                
+                # 3. Análise base do documento (etapas de features medidas individualmente)
+                base_analysis = await self._perform_base_analysis(document, context)
+                
+                # 4. Aplicação de regras personalizadas
+                with timer.stage("custom_rules"):
+                    rule_results = await self._apply_custom_rules(document, context, base_analysis)
+                
+                # 5. Cálculo de pontuação adaptativa
+                with timer.stage("scoring"):
+                    adaptive_score = await self._calculate_adaptive_score(
+                        base_analysis, rule_results, adapted_weights
+                    )
+                
+                # 6. Geração de flags e recomendações
+                with timer.stage("insights"):
+                    flags, recommendations = await self._generate_insights(
+                        document, base_analysis, rule_results, adaptive_score
+                    )
+                
+                # 7. Cálculo de confiança
+                with timer.stage("confidence"):
+                    confidence = await self._calculate_confidence(
+                        document, context, base_analysis, rule_results
+                    )
             
             # 8. Compilação do resultado final
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -168,7 +179,9 @@ class AdaptiveAnalyzer:
             )
             
             # 9. Atualização do cache e aprendizado
-            await self._update_learning_data(document, context, result)
+            with timer.stage("learning_update"):
+                await self._update_learning_data(document, context, result)
+            result.timings = timer.timings()
             
             self.logger.info(f"Análise adaptativa concluída para documento {document.id} em {processing_time:.2f}s")
             return result
@@ -190,7 +203,8 @@ class AdaptiveAnalyzer:
                 processing_time=processing_time,
                 metadata={'error': str(e)},
                 created_at=start_time,
-                updated_at=datetime.now()
+                updated_at=datetime.now(),
+                timings=timer.timings()
             )
     
     async def _validate_inputs(self, document: Document, context: AdaptiveContext) -> None:
@@ -596,6 +610,7 @@ class AdaptiveAnalyzer:
     
     # Métodos auxiliares para análises específicas
     
+    @timed_stage("features.text")
     async def _analyze_text_content(self, content: str) -> Dict[str, Any]:
         """Analisa conteúdo textual do documento"""
         return {
@@ -606,6 +621,7 @@ class AdaptiveAnalyzer:
             'key_terms': self._extract_key_terms(content)
         }
     
+    @timed_stage("features.structure")
     async def _analyze_document_structure(self, document: Document) -> Dict[str, Any]:
         """Analisa estrutura do documento"""
         return {
@@ -616,6 +632,7 @@ class AdaptiveAnalyzer:
             'has_lists': bool(re.search(r'^\s*[-*•]', document.content, re.MULTILINE))
         }
     
+    @timed_stage("features.metadata")
     async def _analyze_metadata(self, document: Document) -> Dict[str, Any]:
         """Analisa metadados do documento"""
         metadata = document.metadata or {}
@@ -627,6 +644,7 @@ class AdaptiveAnalyzer:
             'metadata_completeness': len(metadata) / 10  # Normalizado
         }
     
+    @timed_stage("features.compliance")
     async def _analyze_basic_compliance(self, document: Document, context: AdaptiveContext) -> Dict[str, Any]:
         """Analisa conformidade básica"""
         return {
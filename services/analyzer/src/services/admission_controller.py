@@ -0,0 +1,273 @@
+"""
+Admission Controller
+
+Controle de admissão das análises por custo estimado:
+- Limita as análises em andamento por unidades de custo (não por contagem)
+- Excedente espera numa fila de prioridade (urgent > high > normal > low)
+  com prazo máximo de espera
+- Fila cheia: descarta a request de menor prioridade (ou a nova) com
+  503 + Retry-After
+- Profundidade da fila, unidades em uso, espera e rejeições vão para o
+  MetricsCollector
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional
+
+import structlog
+
+from ..config import settings
+from ..domain.services.analysis_domain_service import complexity_factors
+from ..infrastructure.monitoring.metrics import get_metrics_collector
+from ..models.analysis_models import AnalysisRequest
+
+logger = structlog.get_logger(__name__)
+
+PRIORITY_ORDER = {'urgent': 0, 'high': 1, 'normal': 2, 'low': 3}
+
+# Peso relativo de cada tipo de análise
+ANALYSIS_TYPE_COST = {'quick': 0.5, 'standard': 1.0, 'detailed': 2.0, 'custom': 1.5}
+
+
+class AdmissionRejectedError(RuntimeError):
+    """Request não admitida (fila cheia, descartada ou prazo de espera esgotado)."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Analysis not admitted: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def estimate_cost(request: AnalysisRequest, content_length: int = 0) -> float:
+    """
+    Estima o custo de uma análise em unidades.
+
+    Usa os mesmos fatores de AnalysisDomainService.estimate_analysis_complexity.
+    O conteúdo só é carregado depois da admissão, então o tamanho é
+    opcional (default: apenas regras e tipo de análise).
+
+    Args:
+        request: Request de análise
+        content_length: Tamanho do conteúdo, se conhecido
+
+    Returns:
+        Custo em unidades (1.0 = análise standard sem regras personalizadas)
+    """
+    factors = complexity_factors(content_length, len(request.organization_config.get_active_rules()))
+    base = 1 + factors['content_complexity'] + factors['rules_complexity']
+    return base * ANALYSIS_TYPE_COST.get(request.analysis_type, 1.0)
+
+
+@dataclass(order=True)
+class _Waiter:
+    """Request na fila; ordenada por prioridade e ordem de chegada."""
+    priority: int
+    sequence: int
+    cost: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    label: str = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Controle de admissão por unidades de custo com fila de prioridade.
+
+    A fila é estrita: enquanto a primeira request não couber, as
+    seguintes esperam (requests caras não sofrem starvation). Uma request
+    mais cara que a capacidade inteira só roda sozinha.
+    """
+
+    def __init__(
+        self,
+        capacity: float = 16.0,
+        max_queue: int = 50,
+        queue_timeout: float = 30.0,
+        collector: Optional[Any] = None
+    ):
+        """
+        Inicializa o controlador.
+
+        Args:
+            capacity: Unidades de custo simultâneas em andamento
+            max_queue: Tamanho máximo da fila de espera
+            queue_timeout: Espera máxima na fila em segundos
+            collector: MetricsCollector de destino (default: coletor global)
+        """
+        self.capacity = capacity
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._collector = collector or get_metrics_collector()
+        self._in_flight = 0.0
+        self._queue: List[_Waiter] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+        # Média móvel do tempo de execução por unidade de custo (Retry-After)
+        self._seconds_per_unit = 1.0
+
+    @property
+    def in_flight(self) -> float:
+        """Unidades de custo em andamento."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests aguardando na fila."""
+        return self._queued
+
+    @asynccontextmanager
+    async def admit(
+        self,
+        cost: float,
+        priority: str = 'normal',
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[float]:
+        """
+        Aguarda admissão e libera as unidades ao final do bloco.
+
+        Args:
+            cost: Custo estimado da análise
+            priority: Prioridade (urgent, high, normal, low)
+            timeout: Espera máxima na fila (default: queue_timeout)
+
+        Yields:
+            Segundos de espera na fila
+
+        Raises:
+            AdmissionRejectedError: Fila cheia, descarte ou prazo esgotado
+        """
+        waited = await self.acquire(cost, priority, timeout)
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(cost, time.monotonic() - started)
+
+    async def acquire(self, cost: float, priority: str = 'normal', timeout: Optional[float] = None) -> float:
+        """Reserva `cost` unidades, esperando na fila se necessário. Retorna a espera."""
+        rank = PRIORITY_ORDER.get(priority, PRIORITY_ORDER['normal'])
+
+        if not self._queued and self._fits(cost):
+            self._in_flight += cost
+            self._observe_wait(priority, 0.0)
+            return 0.0
+
+        if self._queued >= self.max_queue and not self._shed_for(rank):
+            self._reject('queue_full', priority, cost)
+
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(rank, next(self._sequence), cost, loop.create_future(), loop.time(), priority)
+        heapq.heappush(self._queue, waiter)
+        self._queued += 1
+        self._publish()
+
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter.future),
+                self.queue_timeout if timeout is None else timeout
+            )
+        except asyncio.TimeoutError:
+            if not waiter.future.done():
+                self._abandon(waiter)
+                self._reject('queue_timeout', priority, cost)
+        except asyncio.CancelledError:
+            if not waiter.future.done():
+                self._abandon(waiter)
+            elif not waiter.future.cancelled() and waiter.future.exception() is None:
+                # Admitida no mesmo instante do cancelamento: devolve as unidades
+                self.release(cost)
+            raise
+
+        # Exceção definida por _shed_for: a request foi descartada da fila
+        waiter.future.result()
+        waited = loop.time() - waiter.enqueued_at
+        self._observe_wait(priority, waited)
+        return waited
+
+    def release(self, cost: float, duration: Optional[float] = None) -> None:
+        """Libera `cost` unidades e admite as próximas da fila."""
+        self._in_flight = max(0.0, self._in_flight - cost)
+        if duration is not None and cost > 0:
+            self._seconds_per_unit = 0.8 * self._seconds_per_unit + 0.2 * (duration / cost)
+        self._dispatch()
+
+    def retry_after(self, cost: float = 1.0) -> int:
+        """Estimativa em segundos até haver capacidade para `cost` unidades."""
+        pending = self._in_flight + sum(w.cost for w in self._queue if not w.future.done()) + cost
+        return max(1, math.ceil(pending / self.capacity * self._seconds_per_unit))
+
+    def _fits(self, cost: float) -> bool:
+        return self._in_flight == 0 or self._in_flight + cost <= self.capacity
+
+    def _dispatch(self) -> None:
+        """Admite, em ordem de prioridade, as requests que couberem."""
+        while self._queue:
+            head = self._queue[0]
+            if head.future.done():
+                heapq.heappop(self._queue)
+                continue
+            if not self._fits(head.cost):
+                break
+            heapq.heappop(self._queue)
+            self._queued -= 1
+            self._in_flight += head.cost
+            head.future.set_result(None)
+        self._publish()
+
+    def _shed_for(self, rank: int) -> bool:
+        """Descarta a request de menor prioridade da fila se for menos prioritária que `rank`."""
+        candidates = [w for w in self._queue if not w.future.done()]
+        if not candidates:
+            return False
+        victim = max(candidates, key=lambda w: (w.priority, w.sequence))
+        if victim.priority <= rank:
+            return False
+
+        self._queued -= 1
+        self._count_rejection('shed', victim.label)
+        victim.future.set_exception(AdmissionRejectedError('shed', self.retry_after(victim.cost)))
+        return True
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Remove a request da fila (marcada como concluída; retirada do heap depois)."""
+        waiter.future.cancel()
+        self._queued -= 1
+        self._dispatch()
+
+    def _reject(self, reason: str, priority: str, cost: float) -> None:
+        self._count_rejection(reason, priority)
+        raise AdmissionRejectedError(reason, self.retry_after(cost))
+
+    def _count_rejection(self, reason: str, priority: str) -> None:
+        logger.warning("⚠️ Analysis request not admitted", reason=reason, priority=priority,
+                       queue_depth=self._queued, in_flight_units=self._in_flight)
+        self._collector.increment("admission_rejected_total", labels={'reason': reason, 'priority': priority})
+
+    def _observe_wait(self, priority: str, waited: float) -> None:
+        self._collector.observe_histogram("admission_wait_seconds", waited, {'priority': priority})
+
+    def _publish(self) -> None:
+        self._collector.set_gauge("admission_queue_depth", self._queued)
+        self._collector.set_gauge("admission_in_flight_units", self._in_flight)
+
+
+# Instância global
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Obtém instância global do controlador de admissão."""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            capacity=settings.ADMISSION_CAPACITY_UNITS,
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT
+        )
+    return _admission_controller
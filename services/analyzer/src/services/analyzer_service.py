@@ -6,15 +6,18 @@ padrão, coordenando análises personalizadas e gerenciando cache de resultados.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set
+import asyncio
 import hashlib
 import re
-from dataclasses import dataclass
 
 import structlog
 from fastapi import UploadFile
 
 from .adaptive_analyzer import AdaptiveAnalyzer
+from .result_cache import ResultCache, CACHE_MISS, CACHE_STALE, estimate_result_size
+from ..config import settings
+from ..infrastructure.monitoring.stage_timer import StageTimer
 from ..models.document_models import Document
 from ..models.config_models import OrganizationConfig, AnalysisWeights, AnalysisPreset
 from ..models.analysis_models import (
@@ -26,15 +29,6 @@ from ..models.analysis_models import (
 logger = structlog.get_logger(__name__)
 
 
-@dataclass
-class CachedResult:
-    """Resultado em cache com metadados."""
-    result: AnalysisResult
-    cached_at: datetime
-    cache_key: str
-    ttl_minutes: int = 60
-
-
 class AnalyzerService:
     """
     Serviço principal de análise que coordena o motor adaptativo.
@@ -49,7 +43,14 @@ class AnalyzerService:
     
     def __init__(self):
         self.logger = structlog.get_logger(self.__class__.__name__)
-        self.cache: Dict[str, CachedResult] = {}
+        self.cache = ResultCache(
+            max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+            max_bytes=settings.RESULT_CACHE_MAX_BYTES,
+            ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+            stale_seconds=settings.RESULT_CACHE_STALE_SECONDS,
+            sizeof=estimate_result_size
+        )
+        self._revalidations: Set[asyncio.Task] = set()
         self.is_initialized = False
     
     async def initialize(self):
@@ -68,20 +69,27 @@ class AnalyzerService:
     async def cleanup(self):
         """Limpa recursos do serviço."""
         self.logger.info("🧹 Cleaning up AnalyzerService")
+        for task in list(self._revalidations):
+            task.cancel()
         self.cache.clear()
         self.is_initialized = False
     
-    async def analyze_document(self, request: AnalysisRequest) -> AnalysisResult:
+    async def analyze_document(
+        self,
+        request: AnalysisRequest,
+        timer: Optional[StageTimer] = None
+    ) -> AnalysisResult:
         """
         🚨 MÉTODO PRINCIPAL - Executa análise de documento com parâmetros personalizados.
         
         Args:
             request: Request de análise com configuração organizacional
+            timer: Cronômetro de etapas (breakdown de latência por etapa)
             
         Returns:
             AnalysisResult com análise personalizada
         """
-        start_time = datetime.utcnow()
+        timer = timer or StageTimer("analyzer_service")
         
         self.logger.info(
             "📋 Starting document analysis",
@@ -91,77 +99,26 @@ class AnalyzerService:
         )
         
         try:
-            # 1. Verifica cache se não for reanalise forçada
-            if not request.force_reanalysis:
-                cached_result = await self._get_cached_result(request)
-                if cached_result:
-                    self.logger.info(
-                        "✅ Returning cached result",
-                        document_id=request.document_id,
-                        cache_age_minutes=(datetime.utcnow() - cached_result.cached_at).seconds // 60
-                    )
-                    return cached_result.result
-            
-            # 2. Carrega documento (simulado - em produção viria do banco de dados)
-            document = await self._load_document(request.document_id)
-            if not document:
-                raise ValueError(f"Document {request.document_id} not found")
-            
-            # 3. Determina tipo de documento
-            doc_type = await self._determine_document_type(document)
-            
-            # 4. Cria analisador adaptativo
-            adaptive_analyzer = AdaptiveAnalyzer(
-                doc_type=doc_type,
-                org_config=request.organization_config
-            )
-            
-            # 5. Executa análise adaptativa
-            result = await adaptive_analyzer.analyze_with_custom_params(document)
-            
-            # 6. Adiciona metadados do request
-            result.request_id = id(request)  # Simulado
-            result.analysis_metadata.update({
-                'request_analysis_type': request.analysis_type,
-                'custom_parameters': request.custom_parameters,
-                'minimum_confidence': request.minimum_confidence,
-                'include_suggestions': request.include_suggestions,
-                'requested_by': request.requested_by,
-                'priority': request.priority
-            })
-            
-            # 7. Filtra findings por confiança mínima
-            if request.minimum_confidence > 0:
-                result.findings = [
-                    f for f in result.findings 
-                    if f.confidence >= request.minimum_confidence
-                ]
-            
-            # 8. Limita número de findings se especificado
-            if request.max_findings and len(result.findings) > request.max_findings:
-                # Mantém findings mais críticos
-                result.findings = sorted(
-                    result.findings,
-                    key=lambda f: (f.get_severity_weight(), f.confidence),
-                    reverse=True
-                )[:request.max_findings]
-            
-            # 9. Cache do resultado
-            await self._cache_result(request, result)
-            
-            execution_time = (datetime.utcnow() - start_time).total_seconds()
-            
-            self.logger.info(
-                "✅ Document analysis completed",
-                document_id=request.document_id,
-                organization_id=request.organization_config.organization_id,
-                weighted_score=result.weighted_score,
-                findings_count=len(result.findings),
-                execution_time=execution_time
-            )
-            
-            return result
-            
+            with timer.activate():
+                # 1. Verifica cache se não for reanalise forçada
+                if not request.force_reanalysis:
+                    cache_key = request.get_cache_key()
+                    with timer.stage("cache_lookup"):
+                        cached_result, cache_status = self.cache.get(cache_key)
+                    if cached_result is not None:
+                        if cache_status == CACHE_STALE and self.cache.begin_revalidation(cache_key):
+                            self._schedule_revalidation(request)
+                        self.logger.info(
+                            "✅ Returning cached result",
+                            document_id=request.document_id,
+                            cache_status=cache_status,
+                            cache_age_seconds=int(self.cache.age_seconds(cache_key) or 0)
+                        )
+                        return self._with_cache_status(cached_result, cache_status)
+                
+                result = await self._run_analysis(request, timer)
+                return self._with_cache_status(result, CACHE_MISS)
+                
         except Exception as e:
             self.logger.error(
                 "❌ Document analysis failed",
@@ -172,6 +129,111 @@ class AnalyzerService:
             )
             raise
     
+    async def _run_analysis(self, request: AnalysisRequest, timer: StageTimer) -> AnalysisResult:
+        """
+        Executa a análise completa (sem consultar o cache) e armazena o resultado.
+        
+        Args:
+            request: Request de análise
+            timer: Cronômetro de etapas ativo
+            
+        Returns:
+            AnalysisResult recém-calculado
+        """
+        start_time = datetime.utcnow()
+        
+        # 2. Carrega documento (simulado - em produção viria do banco de dados)
+        with timer.stage("load_document"):
+            document = await self._load_document(request.document_id)
+        if not document:
+            raise ValueError(f"Document {request.document_id} not found")
+        
+        # 3. Determina tipo de documento
+        with timer.stage("classification"):
+            doc_type = await self._determine_document_type(document)
+        
+        # 4. Cria analisador adaptativo
+        adaptive_analyzer = AdaptiveAnalyzer(
+            doc_type=doc_type,
+            org_config=request.organization_config
+        )
+        
+        # 5. Executa análise adaptativa
+        # (etapas internas registradas pelo analisador no mesmo cronômetro)
+        result = await adaptive_analyzer.analyze_with_custom_params(document)
+        
+        # 6. Adiciona metadados do request
+        result.request_id = id(request)  # Simulado
+        result.analysis_metadata.update({
+            'request_analysis_type': request.analysis_type,
+            'custom_parameters': request.custom_parameters,
+            'minimum_confidence': request.minimum_confidence,
+            'include_suggestions': request.include_suggestions,
+            'requested_by': request.requested_by,
+            'priority': request.priority
+        })
+        
+        # 7. Filtra findings por confiança mínima
+        if request.minimum_confidence > 0:
+            result.findings = [
+                f for f in result.findings 
+                if f.confidence >= request.minimum_confidence
+            ]
+        
+        # 8. Limita número de findings se especificado
+        if request.max_findings and len(result.findings) > request.max_findings:
+            # Mantém findings mais críticos
+            result.findings = sorted(
+                result.findings,
+                key=lambda f: (f.get_severity_weight(), f.confidence),
+                reverse=True
+            )[:request.max_findings]
+        
+        # 9. Cache do resultado
+        with timer.stage("cache_store"):
+            await self._cache_result(request, result)
+        
+        execution_time = (datetime.utcnow() - start_time).total_seconds()
+        
+        self.logger.info(
+            "✅ Document analysis completed",
+            document_id=request.document_id,
+            organization_id=request.organization_config.organization_id,
+            weighted_score=result.weighted_score,
+            findings_count=len(result.findings),
+            execution_time=execution_time
+        )
+        
+        return result
+    
+    def _schedule_revalidation(self, request: AnalysisRequest) -> None:
+        """Recalcula em background um resultado servido como stale."""
+        task = asyncio.create_task(self._revalidate(request))
+        self._revalidations.add(task)
+        task.add_done_callback(self._revalidations.discard)
+    
+    async def _revalidate(self, request: AnalysisRequest) -> None:
+        """Atualiza a entrada do cache; em caso de falha mantém o valor stale."""
+        timer = StageTimer("analyzer_service_revalidate")
+        try:
+            with timer.activate():
+                await self._run_analysis(request, timer)
+            self.logger.info("🔄 Cached result revalidated", document_id=request.document_id)
+        except Exception as e:
+            self.cache.end_revalidation(request.get_cache_key())
+            self.logger.warning(
+                "⚠️ Cache revalidation failed",
+                document_id=request.document_id,
+                error=str(e)
+            )
+    
+    @staticmethod
+    def _with_cache_status(result: AnalysisResult, cache_status: str) -> AnalysisResult:
+        """Cópia rasa do resultado com `cache_status` nos metadados (o objeto em cache não é alterado)."""
+        return result.model_copy(update={
+            'analysis_metadata': {**result.analysis_metadata, 'cache_status': cache_status}
+        })
+    
     async def process_upload(self, file: UploadFile) -> DocumentUploadResponse:
         """
         Processa upload de documento e prepara para análise.
@@ -361,41 +423,9 @@ class AnalyzerService:
         
         return validation_result
     
-    async def _get_cached_result(self, request: AnalysisRequest) -> Optional[CachedResult]:
-        """Busca resultado em cache."""
-        cache_key = request.get_cache_key()
-        
-        if cache_key not in self.cache:
-            return None
-        
-        cached = self.cache[cache_key]
-        
-        # Verifica TTL
-        age_minutes = (datetime.utcnow() - cached.cached_at).seconds // 60
-        if age_minutes > cached.ttl_minutes:
-            del self.cache[cache_key]
-            return None
-        
-        return cached
-    
     async def _cache_result(self, request: AnalysisRequest, result: AnalysisResult):
-        """Armazena resultado em cache."""
-        cache_key = request.get_cache_key()
-        
-        cached = CachedResult(
-            result=result,
-            cached_at=datetime.utcnow(),
-            cache_key=cache_key,
-            ttl_minutes=60  # Cache por 1 hora
-        )
-        
-        self.cache[cache_key] = cached
-        
-        # Limita tamanho do cache
-        if len(self.cache) > 1000:
-            # Remove entradas mais antigas
-            oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k].cached_at)
-            del self.cache[oldest_key]
+        """Armazena resultado em cache (LRU limitado por entradas e bytes)."""
+        self.cache.put(request.get_cache_key(), result)
     
     async def _load_document(self, document_id: str) -> Optional[Document]:
         """
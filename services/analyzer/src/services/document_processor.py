@@ -8,11 +8,18 @@ Processa documentos para uso no Vertex AI RAG Engine:
 - Token counting
 """
 
+import asyncio
+import gzip
+import random
 import re
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 import structlog
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout as RequestsTimeout
 
 try:
     import tiktoken
@@ -20,6 +27,7 @@ except ImportError:
     tiktoken = None
 
 from google.cloud import storage
+from google.api_core import exceptions as gcp_exceptions
 
 from ..config_rag import get_rag_config, ChunkConfig
 from ..models.document_models import Document
@@ -27,6 +35,8 @@ from ..models.rag_models import (
     DocumentChunk,
     ProcessedDocument,
 )
+from .metadata_scanner import MetadataScanner, ScanResult, get_metadata_scanner
+from .local_vector_index import LocalVectorIndex, get_local_vector_index
 
 logger = structlog.get_logger(__name__)
 
@@ -449,33 +459,22 @@ class MetadataExtractor:
     - Órgão
     - Valor estimado
     - Prazos
-    - Entidades nomeadas
+    - Número do edital/processo
+
+    Usa o MetadataScanner pré-compilado: uma única varredura do cabeçalho
+    do documento (com fallback para o texto completo) em vez de uma busca
+    por campo sobre o conteúdo inteiro.
     """
 
-    def __init__(self):
-        """Inicializa extrator de metadata."""
-        self.logger = structlog.get_logger(self.__class__.__name__)
+    def __init__(self, scanner: Optional[MetadataScanner] = None):
+        """
+        Inicializa extrator de metadata.
 
-        # Patterns regex para extração
-        self.patterns = {
-            'modalidade': [
-                (r'pregão\s+eletrônico', 'Pregão Eletrônico'),
-                (r'pregão\s+presencial', 'Pregão Presencial'),
-                (r'concorrência\s+pública', 'Concorrência Pública'),
-                (r'tomada\s+de\s+preços', 'Tomada de Preços'),
-                (r'convite', 'Convite'),
-                (r'dispensa\s+de\s+licitação', 'Dispensa'),
-                (r'inexigibilidade', 'Inexigibilidade'),
-            ],
-            'valor': [
-                r'R\$\s*[\d.,]+',
-                r'reais',
-            ],
-            'prazo': [
-                r'\d+\s*\(\w+\)\s*dias',
-                r'prazo\s+de\s+\d+\s+dias',
-            ],
-        }
+        Args:
+            scanner: Scanner de campos (default: tabela licitatória compartilhada)
+        """
+        self.logger = structlog.get_logger(self.__class__.__name__)
+        self.scanner = scanner or get_metadata_scanner()
 
     async def extract(self, document: Document) -> Dict[str, Any]:
         """
@@ -485,105 +484,40 @@ class MetadataExtractor:
             document: Documento para extrair metadata
 
         Returns:
-            Dicionário com metadata extraída
+            Dicionário com metadata extraída (inclui `field_spans`)
         """
         self.logger.info(
             "🔍 Extracting metadata",
             document_id=document.id
         )
 
-        content = (document.content or '').lower()
+        scan = self.scanner.scan(document.content or '')
 
         metadata = {
             'document_id': document.id,
             'document_title': document.title,
             'file_type': document.metadata.file_type if document.metadata else 'unknown',
             'extracted_at': datetime.utcnow().isoformat(),
+            'document_type': scan.get('document_type', 'Documento'),
+            'modalidade': scan.get('modalidade'),
+            'valor_estimado': scan.get('valor_estimado'),
+            'prazo': scan.get('prazo'),
+            'numero': scan.get('numero'),
+            'orgao': self._extract_organ(document, scan),
+            'field_spans': {name: list(span) for name, span in scan.spans().items()},
         }
 
-        # Tipo de documento
-        metadata['document_type'] = self._extract_document_type(content)
-
-        # Modalidade
-        metadata['modalidade'] = self._extract_modalidade(content)
-
-        # Valor
-        metadata['valor_estimado'] = self._extract_value(content)
-
-        # Prazo
-        metadata['prazo'] = self._extract_deadline(content)
-
-        # Número do edital/processo
-        metadata['numero'] = self._extract_number(content)
-
-        # Órgão
-        metadata['orgao'] = self._extract_organ(document)
-
         self.logger.info(
             "✅ Metadata extracted",
             document_id=document.id,
-            metadata_fields=len(metadata)
+            metadata_fields=len(metadata),
+            scanned_chars=scan.scanned_chars,
+            used_fallback=scan.used_fallback
         )
 
         return metadata
 
-    def _extract_document_type(self, content: str) -> str:
-        """Extrai tipo do documento."""
-        patterns = {
-            'Edital': r'edital',
-            'Termo de Referência': r'termo\s+de\s+referência',
-            'Contrato': r'contrato',
-            'Ata de Registro de Preços': r'ata\s+de\s+registro',
-            'Projeto Básico': r'projeto\s+básico',
-        }
-
-        for doc_type, pattern in patterns.items():
-            if re.search(pattern, content):
-                return doc_type
-
-        return 'Documento'
-
-    def _extract_modalidade(self, content: str) -> Optional[str]:
-        """Extrai modalidade da licitação."""
-        for pattern, modalidade in self.patterns['modalidade']:
-            if re.search(pattern, content):
-                return modalidade
-        return None
-
-    def _extract_value(self, content: str) -> Optional[str]:
-        """Extrai valor estimado."""
-        match = re.search(r'R\$\s*([\d.,]+)', content)
-        if match:
-            return f"R$ {match.group(1)}"
-        return None
-
-    def _extract_deadline(self, content: str) -> Optional[str]:
-        """Extrai prazo."""
-        match = re.search(r'(\d+)\s*\(\w+\)\s*dias', content)
-        if match:
-            return f"{match.group(1)} dias"
-
-        match = re.search(r'prazo\s+de\s+(\d+)\s+dias', content)
-        if match:
-            return f"{match.group(1)} dias"
-
-        return None
-
-    def _extract_number(self, content: str) -> Optional[str]:
-        """Extrai número do processo/edital."""
-        patterns = [
-            r'(?:edital|pregão|processo)\s+(?:n[°º]?\.?)?\s*([\d/\-]+)',
-            r'nº\s*([\d/\-]+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, content)
-            if match:
-                return match.group(1)
-
-        return None
-
-    def _extract_organ(self, document: Document) -> Optional[str]:
+    def _extract_organ(self, document: Document, scan: ScanResult) -> Optional[str]:
         """Extrai órgão responsável."""
         # Tenta pegar de metadata existente (custom_fields)
         if hasattr(document, 'metadata') and document.metadata:
@@ -593,18 +527,50 @@ class MetadataExtractor:
                 return organ
 
         # Busca no conteúdo
-        content = (document.content or '')
-        patterns = [
-            r'prefeitura\s+municipal\s+de\s+(\w+)',
-            r'governo\s+do\s+estado\s+(?:de|do)\s+(\w+)',
-        ]
+        return scan.get('orgao')
+
 
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                return match.group(0)
+_storage_clients: Dict[Tuple[str, int], storage.Client] = {}
+_storage_clients_lock = threading.Lock()
 
-        return None
+# Falhas transitórias que justificam nova tentativa de upload
+RETRYABLE_UPLOAD_ERRORS = (
+    gcp_exceptions.TooManyRequests,
+    gcp_exceptions.ServerError,
+    RequestsConnectionError,
+    RequestsTimeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def get_storage_client(project_id: str, pool_size: int = 16) -> storage.Client:
+    """
+    Retorna cliente GCS compartilhado por projeto.
+
+    Todos os GCSDocumentManager do processo reutilizam o mesmo cliente e,
+    portanto, o mesmo pool de conexões HTTP (dimensionado para o número
+    máximo de uploads simultâneos).
+
+    Args:
+        project_id: Projeto GCP
+        pool_size: Conexões mantidas no pool HTTP
+
+    Returns:
+        Cliente do Cloud Storage
+    """
+    key = (project_id, pool_size)
+    with _storage_clients_lock:
+        client = _storage_clients.get(key)
+        if client is None:
+            client = storage.Client(project=project_id)
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size
+            )
+            client._http.mount("https://", adapter)
+            _storage_clients[key] = client
+        return client
 
 
 class GCSDocumentManager:
@@ -615,20 +581,35 @@ class GCSDocumentManager:
     - Upload de documentos processados
     - Organização por organização
     - Metadata management
+    - Uploads fora do event loop, com concorrência limitada e retry com backoff
+    - Upload em lote e compressão gzip opcional
     """
 
-    def __init__(self, bucket_name: Optional[str] = None):
+    def __init__(
+        self,
+        bucket_name: Optional[str] = None,
+        client: Optional[storage.Client] = None,
+        max_concurrency: Optional[int] = None
+    ):
         """
         Inicializa gerenciador GCS.
 
         Args:
             bucket_name: Nome do bucket GCS
+            client: Cliente GCS (default: cliente compartilhado do projeto)
+            max_concurrency: Uploads simultâneos (default: configuração RAG)
         """
         self.config = get_rag_config()
         self.bucket_name = bucket_name or self.config.gcs_bucket_name
-        self.client = storage.Client(project=self.config.project_id)
+        self.max_concurrency = max_concurrency or self.config.gcs_max_concurrent_uploads
+        self.client = client or get_storage_client(self.config.project_id, self.max_concurrency)
         self.bucket = self.client.bucket(self.bucket_name)
         self.logger = structlog.get_logger(self.__class__.__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="gcs-upload"
+        )
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
 
     async def upload_for_rag(
         self,
@@ -639,6 +620,9 @@ class GCSDocumentManager:
         """
         Upload de documento processado para GCS.
 
+        A chamada bloqueante do cliente GCS roda no pool de threads do
+        gerenciador, sem travar o event loop.
+
         Args:
             document: Documento original
             organization_id: ID da organização
@@ -656,7 +640,6 @@ class GCSDocumentManager:
         try:
             # Define path no GCS
             blob_path = f"{self.config.gcs_base_path}/{organization_id}/{document.id}.txt"
-            blob = self.bucket.blob(blob_path)
 
             # Prepara conteúdo
             if processed_doc:
@@ -674,12 +657,8 @@ class GCSDocumentManager:
             }
 
             # Upload
-            blob.metadata = blob_metadata
-            blob.upload_from_string(
-                content,
-                content_type='text/plain',
-                timeout=300
-            )
+            async with self._get_semaphore():
+                await self._upload_with_retry(blob_path, content, blob_metadata)
 
             gcs_uri = f"gs://{self.bucket_name}/{blob_path}"
 
@@ -699,6 +678,125 @@ class GCSDocumentManager:
             )
             raise
 
+    async def upload_batch_for_rag(
+        self,
+        items: List[Tuple[Document, Optional[ProcessedDocument]]],
+        organization_id: str
+    ) -> List[Union[str, BaseException]]:
+        """
+        Upload concorrente de vários documentos (limitado por `max_concurrency`).
+
+        Args:
+            items: Pares (documento, documento processado opcional)
+            organization_id: ID da organização
+
+        Returns:
+            Lista alinhada com `items`: GCS URI ou a exceção da falha
+        """
+        self.logger.info(
+            "☁️ Uploading document batch to GCS",
+            organization_id=organization_id,
+            total=len(items)
+        )
+
+        results = await asyncio.gather(
+            *(
+                self.upload_for_rag(document, organization_id, processed_doc)
+                for document, processed_doc in items
+            ),
+            return_exceptions=True
+        )
+
+        failed = sum(1 for result in results if isinstance(result, BaseException))
+        self.logger.info(
+            "✅ Document batch uploaded to GCS",
+            organization_id=organization_id,
+            successful=len(items) - failed,
+            failed=failed
+        )
+
+        return results
+
+    async def close(self):
+        """Libera o pool de threads de upload."""
+        self._executor.shutdown(wait=False)
+        self._semaphores.clear()
+
+    async def _upload_with_retry(
+        self,
+        blob_path: str,
+        content: str,
+        blob_metadata: Dict[str, str]
+    ) -> None:
+        """Executa o upload no pool de threads com retry e backoff exponencial."""
+        loop = asyncio.get_running_loop()
+        attempts = self.config.gcs_upload_max_retries + 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                await loop.run_in_executor(
+                    self._executor,
+                    self._upload_blob,
+                    blob_path,
+                    content,
+                    blob_metadata
+                )
+                return
+            except RETRYABLE_UPLOAD_ERRORS as e:
+                if attempt == attempts:
+                    raise
+                delay = min(
+                    self.config.gcs_upload_backoff_seconds * (2 ** (attempt - 1)),
+                    30.0
+                ) * (0.5 + random.random() / 2)
+                self.logger.warning(
+                    "⚠️ GCS upload failed, retrying",
+                    blob_path=blob_path,
+                    attempt=attempt,
+                    retry_in=f"{delay:.2f}s",
+                    error=str(e)
+                )
+                await asyncio.sleep(delay)
+
+    def _upload_blob(
+        self,
+        blob_path: str,
+        content: str,
+        blob_metadata: Dict[str, str]
+    ) -> None:
+        """Upload bloqueante (executado fora do event loop)."""
+        blob = self.bucket.blob(blob_path)
+        blob.metadata = blob_metadata
+        data = content.encode('utf-8')
+
+        if self.config.gcs_gzip_uploads and len(data) >= 1024:
+            # Armazenado comprimido; o GCS descomprime na leitura (transcoding)
+            data = gzip.compress(data, compresslevel=6)
+            blob.content_encoding = 'gzip'
+
+        blob.upload_from_string(
+            data,
+            content_type='text/plain; charset=utf-8',
+            timeout=300
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Semáforo de concorrência do event loop corrente.
+
+        A chave é o próprio loop (não `id(loop)`, que um loop novo pode
+        reaproveitar); semáforos de loops já encerrados são descartados
+        quando um loop novo registra o seu.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            for closed in [other for other in self._semaphores if other.is_closed()]:
+                del self._semaphores[closed]
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
     def _concatenate_chunks(self, chunks: List[DocumentChunk]) -> str:
         """Concatena chunks em texto único."""
         return '\n\n'.join(chunk.content for chunk in chunks)
@@ -712,12 +810,14 @@ class DocumentProcessor:
     - Chunking
     - Extração de metadata
     - Upload para GCS
+    - Indexação dos chunks no índice vetorial local (se habilitado)
     """
 
     def __init__(
         self,
         chunk_config: Optional[ChunkConfig] = None,
-        gcs_manager: Optional[GCSDocumentManager] = None
+        gcs_manager: Optional[GCSDocumentManager] = None,
+        local_index: Optional[LocalVectorIndex] = None
     ):
         """
         Inicializa processador.
@@ -725,12 +825,20 @@ class DocumentProcessor:
         Args:
             chunk_config: Configuração de chunking
             gcs_manager: Gerenciador GCS
+            local_index: Índice vetorial local (default: configuração RAG)
         """
         self.chunker = SmartChunker(chunk_config)
         self.metadata_extractor = MetadataExtractor()
         self.gcs_manager = gcs_manager or GCSDocumentManager()
+        self._owns_gcs_manager = gcs_manager is None
+        self.local_index = local_index if local_index is not None else get_local_vector_index()
         self.logger = structlog.get_logger(self.__class__.__name__)
 
+    async def cleanup(self):
+        """Libera o gerenciador GCS criado pelo processador."""
+        if self._owns_gcs_manager:
+            await self.gcs_manager.close()
+
     async def process_for_rag(
         self,
         document: Document,
@@ -781,6 +889,22 @@ class DocumentProcessor:
             )
             processed_doc.gcs_uri = gcs_uri
 
+        # Indexa chunks localmente (embedding fora do event loop)
+        if self.local_index is not None and organization_id and chunks:
+            try:
+                await asyncio.to_thread(
+                    self._index_chunks,
+                    document,
+                    organization_id,
+                    processed_doc
+                )
+            except Exception as e:
+                self.logger.warning(
+                    "⚠️ Failed to index chunks locally",
+                    document_id=document.id,
+                    error=str(e)
+                )
+
         self.logger.info(
             "✅ Document processed for RAG",
             document_id=document.id,
@@ -790,3 +914,27 @@ class DocumentProcessor:
         )
 
         return processed_doc
+
+    def _index_chunks(
+        self,
+        document: Document,
+        organization_id: str,
+        processed_doc: ProcessedDocument
+    ) -> None:
+        """Substitui os chunks do documento no índice vetorial local."""
+        self.local_index.delete_document(document.id)
+        self.local_index.add_texts(
+            ids=[chunk.chunk_id for chunk in processed_doc.chunks],
+            texts=[chunk.content for chunk in processed_doc.chunks],
+            metadatas=[
+                {
+                    'document_id': document.id,
+                    'document_title': document.title,
+                    'organization_id': organization_id,
+                    'chunk_index': chunk.chunk_index,
+                    'section_title': chunk.metadata.get('section_title'),
+                    'gcs_uri': processed_doc.gcs_uri,
+                }
+                for chunk in processed_doc.chunks
+            ]
+        )
@@ -57,6 +57,7 @@ class KnowledgeBaseManager:
         self.config = get_rag_config()
         self.rag_service = rag_service
         self.document_processor = document_processor or DocumentProcessor()
+        self._owns_document_processor = document_processor is None
         self.gcs_manager = GCSDocumentManager()
 
         # Firestore para persistência de metadados
@@ -67,6 +68,14 @@ class KnowledgeBaseManager:
         self.logger = structlog.get_logger(self.__class__.__name__)
         self._kb_cache: Dict[str, OrganizationKnowledgeBase] = {}
 
+    async def cleanup(self):
+        """Libera os pools de upload GCS do gerenciador."""
+        self.logger.info("🧹 Cleaning up Knowledge Base Manager")
+        await self.gcs_manager.close()
+        if self._owns_document_processor:
+            await self.document_processor.cleanup()
+        self._kb_cache.clear()
+
     # ==================== Organization Knowledge Base ====================
 
     async def create_organization_kb(
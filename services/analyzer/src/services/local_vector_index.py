@@ -0,0 +1,603 @@
+"""
+Local Vector Index
+
+Índice vetorial local e persistente para retrieval offline e reranking:
+- Matriz float32 em arquivo mapeado em memória (np.memmap)
+- Log de registros (JSON lines) com ids, metadata e remoções
+- Busca exata (flat) ou aproximada (IVF com k-means)
+- Função de embedding plugável (stand-in determinístico em ml.embeddings)
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+import structlog
+
+from ..config_rag import get_rag_config
+
+logger = structlog.get_logger(__name__)
+
+EmbeddingFunction = Callable[[List[str]], Sequence[Sequence[float]]]
+
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.jsonl"
+HEADER_FILE = "index.json"
+CENTROIDS_FILE = "centroids.npy"
+
+
+class VertexTextEmbedder:
+    """Embedder usando os modelos de embedding de texto do Vertex AI."""
+
+    def __init__(self, model_name: str = "text-embedding-004", batch_size: int = 250):
+        """
+        Args:
+            model_name: Modelo de embedding
+            batch_size: Máximo de textos por requisição
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        """Gera embeddings em lotes."""
+        if self._model is None:
+            from vertexai.language_models import TextEmbeddingModel
+            self._model = TextEmbeddingModel.from_pretrained(self.model_name)
+
+        vectors: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            vectors.extend(e.values for e in self._model.get_embeddings(batch))
+        return vectors
+
+
+@dataclass
+class SearchHit:
+    """Resultado de uma busca no índice local."""
+    id: str
+    score: float  # Similaridade de cosseno
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def distance(self) -> float:
+        """Distância de cosseno (1 - similaridade)."""
+        return 1.0 - self.score
+
+
+class LocalVectorIndex:
+    """
+    Índice vetorial local com persistência opcional em disco.
+
+    Os vetores são normalizados e armazenados em linhas de uma matriz
+    float32; remoções marcam a linha como morta (tombstone) e `compact()`
+    reescreve o arquivo. Reinserir um id existente substitui o vetor.
+
+    Tipos de índice:
+    - flat: produto da consulta com todas as linhas vivas (exato)
+    - ivf: k-means sobre os vetores; a busca visita `nprobe` listas
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        embedding_function: Optional[EmbeddingFunction] = None,
+        dim: Optional[int] = None,
+        index_type: str = "flat",
+        nlist: int = 64,
+        nprobe: int = 8
+    ):
+        """
+        Inicializa índice.
+
+        Args:
+            directory: Diretório de persistência (None = somente memória)
+            embedding_function: Função texto → vetor para add_texts/search_text
+            dim: Dimensão dos vetores (inferida no primeiro add se None)
+            index_type: "flat" ou "ivf"
+            nlist: Número de listas (centroides) do IVF
+            nprobe: Listas visitadas por busca no IVF
+        """
+        if index_type not in ("flat", "ivf"):
+            raise ValueError(f"index_type inválido: {index_type}")
+
+        self.directory = directory
+        self.embedding_function = embedding_function
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.logger = structlog.get_logger(self.__class__.__name__)
+
+        self._lock = threading.RLock()
+        self._dim = dim
+        self._vectors: Optional[np.ndarray] = None
+        self._size = 0  # Linhas usadas (vivas + mortas)
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_ids: List[str] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._rows: Dict[str, int] = {}
+        self._by_document: Dict[str, Set[str]] = {}
+
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    # ==================== Propriedades ====================
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Dimensão dos vetores."""
+        return self._dim
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    # ==================== Escrita ====================
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: Any,
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+    ) -> None:
+        """
+        Adiciona (ou substitui) vetores.
+
+        Args:
+            ids: Identificadores únicos
+            vectors: Matriz n×d (lista ou array)
+            metadatas: Metadata por item (deve ser serializável em JSON)
+        """
+        if not len(ids):
+            return
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError("vectors deve ser uma matriz com uma linha por id")
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError("metadatas deve ter o mesmo tamanho de ids")
+
+        with self._lock:
+            if self._dim is None:
+                self._dim = matrix.shape[1]
+            if matrix.shape[1] != self._dim:
+                raise ValueError(f"Dimensão {matrix.shape[1]} difere do índice ({self._dim})")
+
+            matrix = self._normalize(matrix)
+            self._ensure_capacity(self._size + len(ids))
+
+            start = self._size
+            self._vectors[start:start + len(ids)] = matrix
+            if isinstance(self._vectors, np.memmap):
+                self._vectors.flush()
+
+            records = []
+            for offset, item_id in enumerate(ids):
+                row = start + offset
+                metadata = dict(metadatas[offset] or {}) if metadatas is not None else {}
+                self._remove_row(item_id)
+                self._append_row(row, item_id, metadata)
+                records.append({'op': 'add', 'id': item_id, 'row': row, 'metadata': metadata})
+
+            self._size = start + len(ids)
+            if self._centroids is not None:
+                self._assignments[start:self._size] = self._assign(matrix)
+
+            self._write_records(records)
+            self._write_header()
+
+    def add_texts(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Dict[str, Any]]]] = None,
+        store_text: bool = True
+    ) -> None:
+        """
+        Gera embeddings com a função configurada e adiciona ao índice.
+
+        Args:
+            ids: Identificadores únicos
+            texts: Textos a indexar
+            metadatas: Metadata por item
+            store_text: Guarda o texto em metadata['text']
+        """
+        if not texts:
+            return
+        vectors = self._embed(list(texts))
+        metadatas = [dict(m or {}) for m in (metadatas or [None] * len(texts))]
+        if store_text:
+            for metadata, text in zip(metadatas, texts):
+                metadata['text'] = text
+        self.add(ids, vectors, metadatas)
+
+    def delete(self, ids: Iterable[str]) -> int:
+        """
+        Remove itens do índice.
+
+        Returns:
+            Número de itens removidos
+        """
+        with self._lock:
+            removed = [item_id for item_id in ids if self._remove_row(item_id)]
+            if removed:
+                self._write_records([{'op': 'delete', 'id': item_id} for item_id in removed])
+            return len(removed)
+
+    def delete_document(self, document_id: str) -> int:
+        """Remove todos os itens cujo metadata['document_id'] é `document_id`."""
+        with self._lock:
+            return self.delete(list(self._by_document.get(document_id, ())))
+
+    # ==================== Busca ====================
+
+    def search(
+        self,
+        query_vector: Any,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        candidate_ids: Optional[Iterable[str]] = None
+    ) -> List[SearchHit]:
+        """
+        Busca os vetores mais similares à consulta.
+
+        Args:
+            query_vector: Vetor de consulta
+            top_k: Número de resultados
+            filters: Igualdade exigida em campos de metadata
+            candidate_ids: Restringe a busca a estes ids (reranking)
+
+        Returns:
+            Hits ordenados por similaridade decrescente
+        """
+        with self._lock:
+            if not self._rows or top_k <= 0:
+                return []
+
+            query = self._normalize(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))[0]
+            if query.shape[0] != self._dim:
+                raise ValueError(f"Dimensão {query.shape[0]} difere do índice ({self._dim})")
+
+            if candidate_ids is not None:
+                rows = np.fromiter(
+                    (self._rows[i] for i in candidate_ids if i in self._rows),
+                    dtype=np.int64
+                )
+            elif self.index_type == "ivf" and self._ensure_trained():
+                rows = self._probe_rows(query)
+            else:
+                rows = np.flatnonzero(self._alive[:self._size])
+
+            if filters and len(rows):
+                mask = np.fromiter(
+                    (self._matches(self._metadata[r], filters) for r in rows.tolist()),
+                    dtype=bool,
+                    count=len(rows)
+                )
+                rows = rows[mask]
+            if not len(rows):
+                return []
+
+            scores = self._vectors[rows] @ query
+            k = min(top_k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+
+            return [
+                SearchHit(
+                    id=self._row_ids[rows[i]],
+                    score=float(scores[i]),
+                    metadata=dict(self._metadata[rows[i]] or {})
+                )
+                for i in top
+            ]
+
+    def search_text(
+        self,
+        query: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        candidate_ids: Optional[Iterable[str]] = None
+    ) -> List[SearchHit]:
+        """Busca usando a função de embedding configurada para a consulta."""
+        return self.search(self._embed([query])[0], top_k, filters, candidate_ids)
+
+    def rerank(self, query_vector: Any, candidate_ids: Sequence[str]) -> List[SearchHit]:
+        """Reordena candidatos já indexados pela similaridade com a consulta."""
+        return self.search(query_vector, len(candidate_ids), candidate_ids=candidate_ids)
+
+    # ==================== Manutenção ====================
+
+    def train(self, iterations: int = 10, sample_size: int = 50000, seed: int = 42) -> None:
+        """Treina os centroides do IVF (k-means) sobre os vetores vivos."""
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._size])
+            if not len(rows):
+                return
+
+            rng = np.random.default_rng(seed)
+            if len(rows) > sample_size:
+                rows = rng.choice(rows, sample_size, replace=False)
+            data = np.asarray(self._vectors[rows])
+            nlist = min(self.nlist, len(data))
+
+            centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(data @ centroids.T, axis=1)
+                for c in range(nlist):
+                    members = data[labels == c]
+                    if len(members):
+                        centroids[c] = members.mean(axis=0)
+                centroids = self._normalize(centroids)
+
+            self._centroids = centroids
+            self._assignments = np.full(len(self._alive), -1, dtype=np.int32)
+            self._assignments[:self._size] = self._assign(np.asarray(self._vectors[:self._size]))
+
+            if self.directory:
+                np.save(os.path.join(self.directory, CENTROIDS_FILE), centroids)
+
+            self.logger.info("🧭 IVF trained", nlist=nlist, vectors=len(rows))
+
+    def compact(self) -> None:
+        """
+        Remove linhas mortas, reescrevendo vetores e log de registros.
+
+        Em disco, os arquivos compactados são gravados como temporários no
+        mesmo diretório e trocados com os atuais via `os.replace`: uma falha
+        antes da troca mantém o índice persistido intacto.
+        """
+        with self._lock:
+            rows = np.flatnonzero(self._alive[:self._size])
+            vectors = np.array(self._vectors[rows]) if len(rows) else None
+            ids = [self._row_ids[r] for r in rows.tolist()]
+            metadatas = [self._metadata[r] for r in rows.tolist()]
+
+            if not self.directory:
+                self._reset_storage()
+                if vectors is not None:
+                    self.add(ids, vectors, metadatas)
+                return
+            if self._dim is None:
+                return
+
+            vectors_path = os.path.join(self.directory, VECTORS_FILE)
+            records_path = os.path.join(self.directory, RECORDS_FILE)
+            try:
+                self._write_compacted(vectors_path + '.tmp', records_path + '.tmp', ids, vectors, metadatas)
+            except BaseException:
+                for path in (vectors_path + '.tmp', records_path + '.tmp'):
+                    if os.path.exists(path):
+                        os.remove(path)
+                raise
+
+            self._reset_storage()
+            os.replace(vectors_path + '.tmp', vectors_path)
+            os.replace(records_path + '.tmp', records_path)
+            self._size = len(ids)
+            self._write_header()
+            self._load()
+
+    # ==================== Internos ====================
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        if self.embedding_function is None:
+            raise RuntimeError("LocalVectorIndex sem embedding_function configurada")
+        return np.asarray(self.embedding_function(texts), dtype=np.float32)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        matrix = np.array(matrix, dtype=np.float32, copy=True)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    @staticmethod
+    def _matches(metadata: Optional[Dict[str, Any]], filters: Dict[str, Any]) -> bool:
+        metadata = metadata or {}
+        return all(metadata.get(key) == value for key, value in filters.items())
+
+    def _append_row(self, row: int, item_id: str, metadata: Dict[str, Any]) -> None:
+        while len(self._row_ids) <= row:
+            self._row_ids.append('')
+            self._metadata.append(None)
+        self._row_ids[row] = item_id
+        self._metadata[row] = metadata
+        self._alive[row] = True
+        self._rows[item_id] = row
+        document_id = metadata.get('document_id')
+        if document_id is not None:
+            self._by_document.setdefault(document_id, set()).add(item_id)
+
+    def _remove_row(self, item_id: str) -> bool:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        metadata = self._metadata[row] or {}
+        self._metadata[row] = None
+        document_id = metadata.get('document_id')
+        if document_id in self._by_document:
+            self._by_document[document_id].discard(item_id)
+            if not self._by_document[document_id]:
+                del self._by_document[document_id]
+        return True
+
+    def _ensure_capacity(self, needed: int) -> None:
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+
+        new_capacity = max(needed, capacity * 2, 1024)
+        if self.directory:
+            path = os.path.join(self.directory, VECTORS_FILE)
+            if self._vectors is not None:
+                self._vectors.flush()
+                del self._vectors
+            with open(path, 'ab') as fh:
+                fh.truncate(new_capacity * self._dim * 4)
+            self._vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(new_capacity, self._dim))
+        else:
+            grown = np.zeros((new_capacity, self._dim), dtype=np.float32)
+            if self._vectors is not None:
+                grown[:self._size] = self._vectors[:self._size]
+            self._vectors = grown
+
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._alive = alive
+        assignments = np.full(new_capacity, -1, dtype=np.int32)
+        assignments[:len(self._assignments)] = self._assignments
+        self._assignments = assignments
+
+    def _reset_storage(self) -> None:
+        if isinstance(self._vectors, np.memmap):
+            self._vectors.flush()
+        self._vectors = None
+        self._size = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._row_ids = []
+        self._metadata = []
+        self._rows = {}
+        self._by_document = {}
+
+    def _assign(self, matrix: np.ndarray) -> np.ndarray:
+        return np.argmax(matrix @ self._centroids.T, axis=1).astype(np.int32)
+
+    def _ensure_trained(self) -> bool:
+        """Treina o IVF sob demanda quando há vetores suficientes."""
+        if self._centroids is None and len(self._rows) >= self.nlist * 39:
+            self.train()
+        return self._centroids is not None
+
+    def _probe_rows(self, query: np.ndarray) -> np.ndarray:
+        nprobe = min(self.nprobe, len(self._centroids))
+        nearest = np.argpartition(-(self._centroids @ query), nprobe - 1)[:nprobe]
+        assignments = self._assignments[:self._size]
+        mask = np.isin(assignments, nearest) & self._alive[:self._size]
+        return np.flatnonzero(mask)
+
+    # ==================== Persistência ====================
+
+    def _write_records(self, records: List[Dict[str, Any]]) -> None:
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, RECORDS_FILE)
+        with open(path, 'a', encoding='utf-8') as fh:
+            for record in records:
+                fh.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+    def _write_compacted(
+        self,
+        vectors_path: str,
+        records_path: str,
+        ids: List[str],
+        vectors: Optional[np.ndarray],
+        metadatas: List[Optional[Dict[str, Any]]]
+    ) -> None:
+        """Grava vetores (linhas 0..n-1) e log de registros compactados."""
+        capacity = max(len(ids), 1024)
+        with open(vectors_path, 'wb') as fh:
+            if vectors is not None:
+                fh.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            fh.truncate(capacity * self._dim * 4)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        with open(records_path, 'w', encoding='utf-8') as fh:
+            for row, (item_id, metadata) in enumerate(zip(ids, metadatas)):
+                record = {'op': 'add', 'id': item_id, 'row': row, 'metadata': metadata or {}}
+                fh.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _write_header(self) -> None:
+        if not self.directory:
+            return
+        header = {'dim': self._dim, 'size': self._size, 'index_type': self.index_type}
+        path = os.path.join(self.directory, HEADER_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fh:
+            json.dump(header, fh)
+        os.replace(tmp_path, path)
+
+    def _load(self) -> None:
+        header_path = os.path.join(self.directory, HEADER_FILE)
+        if not os.path.exists(header_path):
+            return
+
+        with open(header_path, encoding='utf-8') as fh:
+            header = json.load(fh)
+        if not header.get('dim'):
+            return
+
+        self._dim = header['dim']
+        vectors_path = os.path.join(self.directory, VECTORS_FILE)
+        capacity = os.path.getsize(vectors_path) // (self._dim * 4)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode='r+', shape=(capacity, self._dim))
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._assignments = np.full(capacity, -1, dtype=np.int32)
+
+        # Reaplica o log; linhas além do header não chegaram a ser confirmadas
+        size = header['size']
+        records_path = os.path.join(self.directory, RECORDS_FILE)
+        if os.path.exists(records_path):
+            with open(records_path, encoding='utf-8') as fh:
+                for line in fh:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record['op'] == 'add' and record['row'] < size:
+                        self._remove_row(record['id'])
+                        self._append_row(record['row'], record['id'], record.get('metadata') or {})
+                    elif record['op'] == 'delete':
+                        self._remove_row(record['id'])
+        self._size = size
+
+        centroids_path = os.path.join(self.directory, CENTROIDS_FILE)
+        if self.index_type == "ivf" and os.path.exists(centroids_path):
+            self._centroids = np.load(centroids_path)
+            self._assignments[:size] = self._assign(np.asarray(self._vectors[:size]))
+
+        self.logger.info(
+            "📂 Local vector index loaded",
+            directory=self.directory,
+            items=len(self._rows),
+            dim=self._dim
+        )
+
+
+_local_index: Optional[LocalVectorIndex] = None
+
+
+def get_local_vector_index() -> Optional[LocalVectorIndex]:
+    """
+    Retorna o índice local compartilhado, se habilitado na configuração RAG.
+
+    Returns:
+        Índice configurado ou None quando `local_index_enabled` é False
+    """
+    global _local_index
+    config = get_rag_config()
+    if not config.local_index_enabled:
+        return None
+
+    if _local_index is None:
+        _local_index = LocalVectorIndex(
+            directory=config.local_index_path,
+            embedding_function=VertexTextEmbedder(
+                model_name=config.embedding_model,
+                batch_size=config.embedding_batch_size
+            ),
+            index_type=config.local_index_type
+        )
+    return _local_index
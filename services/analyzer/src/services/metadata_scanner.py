@@ -0,0 +1,212 @@
+"""
+Metadata Scanner
+
+Extração de campos de documentos licitatórios com tabela pré-compilada:
+- Tabela de padrões pré-compilada, agrupada por campo em ordem de prioridade
+- Varredura limitada ao cabeçalho do documento, com fallback para o texto completo
+- Retorna o trecho (span) de cada valor encontrado
+- Reutilizável por qualquer serviço que precise de features baseadas em regex
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Match, Tuple, Union
+
+# Tamanho padrão da janela inicial (caracteres). Tipo, modalidade, número,
+# valor e prazo aparecem quase sempre no preâmbulo do edital.
+DEFAULT_HEAD_SIZE = 16 * 1024
+
+ValueSpec = Union[Any, Callable[[Match], Any]]
+
+
+@dataclass(frozen=True)
+class PatternSpec:
+    """Padrão de um campo; a ordem na tabela define a prioridade."""
+    field: str
+    pattern: str
+    value: ValueSpec
+
+
+@dataclass(frozen=True)
+class FieldMatch:
+    """Valor extraído de um campo com sua posição no texto."""
+    value: Any
+    span: Tuple[int, int]
+    priority: int
+
+
+@dataclass
+class ScanResult:
+    """Resultado de uma varredura."""
+    matches: Dict[str, FieldMatch] = field(default_factory=dict)
+    scanned_chars: int = 0
+    used_fallback: bool = False
+
+    def get(self, field_name: str, default: Any = None) -> Any:
+        """Retorna o valor de um campo ou `default` se não encontrado."""
+        match = self.matches.get(field_name)
+        return match.value if match else default
+
+    def values(self) -> Dict[str, Any]:
+        """Retorna apenas os valores encontrados por campo."""
+        return {name: match.value for name, match in self.matches.items()}
+
+    def spans(self) -> Dict[str, Tuple[int, int]]:
+        """Retorna os spans (início, fim) encontrados por campo."""
+        return {name: match.span for name, match in self.matches.items()}
+
+
+class MetadataScanner:
+    """
+    Scanner de campos baseado em uma tabela de padrões pré-compilada.
+
+    Cada campo tem uma lista ordenada de padrões; o primeiro padrão da lista
+    que ocorrer no texto vence (mesma semântica dos `re.search` encadeados).
+    Os padrões são escritos para texto em minúsculas: apenas a janela varrida
+    é convertida (uma vez) e os spans continuam válidos no texto original.
+    """
+
+    def __init__(
+        self,
+        specs: Iterable[PatternSpec],
+        head_size: Optional[int] = DEFAULT_HEAD_SIZE
+    ):
+        """
+        Inicializa scanner.
+
+        Args:
+            specs: Padrões em ordem de prioridade por campo
+            head_size: Caracteres iniciais varridos antes do fallback
+                (None varre sempre o texto completo)
+        """
+        self.head_size = head_size
+        self._table: Dict[str, List[Tuple[PatternSpec, Pattern]]] = {}
+        for spec in specs:
+            self._table.setdefault(spec.field, []).append((spec, re.compile(spec.pattern)))
+        self._ignorecase: Dict[str, Pattern] = {}
+
+    @property
+    def fields(self) -> List[str]:
+        """Campos conhecidos pelo scanner."""
+        return list(self._table)
+
+    def scan(
+        self,
+        text: str,
+        fields: Optional[Iterable[str]] = None,
+        head_size: Optional[int] = -1
+    ) -> ScanResult:
+        """
+        Varre o texto e extrai os campos.
+
+        Args:
+            text: Texto original (não é necessário normalizar caixa)
+            fields: Subconjunto de campos (default: todos)
+            head_size: Sobrescreve a janela inicial (-1 usa a do scanner)
+
+        Returns:
+            ScanResult com valores e spans
+        """
+        text = text or ''
+        wanted = list(self._table) if fields is None else [f for f in fields if f in self._table]
+        if head_size == -1:
+            head_size = self.head_size
+
+        result = ScanResult()
+        if not text or not wanted:
+            return result
+
+        limit = len(text) if head_size is None else min(len(text), head_size)
+        self._scan_window(text, 0, limit, wanted, result.matches)
+        result.scanned_chars = limit
+
+        missing = [f for f in wanted if f not in result.matches]
+        if missing and limit < len(text):
+            # Campos ausentes no cabeçalho: varre o restante do documento,
+            # recuando o suficiente para não perder matches na fronteira.
+            start = max(0, limit - 256)
+            self._scan_window(text, start, len(text), missing, result.matches)
+            result.scanned_chars = len(text)
+            result.used_fallback = True
+
+        return result
+
+    def _scan_window(
+        self,
+        text: str,
+        start: int,
+        end: int,
+        fields: List[str],
+        found: Dict[str, FieldMatch]
+    ) -> None:
+        """Extrai os campos de text[start:end] convertendo a janela uma única vez."""
+        window = text[start:end]
+        lowered = window.lower()
+        # lower() pode alterar o comprimento de alguns caracteres Unicode;
+        # nesse caso os spans não seriam válidos e usamos IGNORECASE.
+        same_length = len(lowered) == len(window)
+        haystack = lowered if same_length else window
+
+        for name in fields:
+            for priority, (spec, compiled) in enumerate(self._table[name]):
+                if not same_length:
+                    compiled = self._case_insensitive(spec.pattern)
+                match = compiled.search(haystack)
+                if match is None:
+                    continue
+                if same_length and callable(spec.value):
+                    # Reancora no trecho original para preservar a caixa do valor
+                    original = self._case_insensitive(spec.pattern).match(window, match.start())
+                    match = original or match
+                value = spec.value(match) if callable(spec.value) else spec.value
+                span = (match.start() + start, match.end() + start)
+                found[name] = FieldMatch(value=value, span=span, priority=priority)
+                break
+
+    def _case_insensitive(self, pattern: str) -> Pattern:
+        """Variante IGNORECASE de um padrão, compilada sob demanda."""
+        compiled = self._ignorecase.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern, re.IGNORECASE)
+            self._ignorecase[pattern] = compiled
+        return compiled
+
+
+# Tabela de metadata de documentos licitatórios. A ordem dentro de cada
+# campo reproduz a prioridade das extrações originais.
+LICITACAO_METADATA_SPECS: Tuple[PatternSpec, ...] = (
+    PatternSpec('document_type', r'edital', 'Edital'),
+    PatternSpec('document_type', r'termo\s+de\s+referência', 'Termo de Referência'),
+    PatternSpec('document_type', r'contrato', 'Contrato'),
+    PatternSpec('document_type', r'ata\s+de\s+registro', 'Ata de Registro de Preços'),
+    PatternSpec('document_type', r'projeto\s+básico', 'Projeto Básico'),
+
+    PatternSpec('modalidade', r'pregão\s+eletrônico', 'Pregão Eletrônico'),
+    PatternSpec('modalidade', r'pregão\s+presencial', 'Pregão Presencial'),
+    PatternSpec('modalidade', r'concorrência\s+pública', 'Concorrência Pública'),
+    PatternSpec('modalidade', r'tomada\s+de\s+preços', 'Tomada de Preços'),
+    PatternSpec('modalidade', r'convite', 'Convite'),
+    PatternSpec('modalidade', r'dispensa\s+de\s+licitação', 'Dispensa'),
+    PatternSpec('modalidade', r'inexigibilidade', 'Inexigibilidade'),
+
+    PatternSpec('valor_estimado', r'r\$\s*([\d.,]+)', lambda m: f"R$ {m.group(1)}"),
+
+    PatternSpec('prazo', r'(\d+)\s*\(\w+\)\s*dias', lambda m: f"{m.group(1)} dias"),
+    PatternSpec('prazo', r'prazo\s+de\s+(\d+)\s+dias', lambda m: f"{m.group(1)} dias"),
+
+    PatternSpec('numero', r'(?:edital|pregão|processo)\s+(?:n[°º]?\.?)?\s*([\d/\-]+)', lambda m: m.group(1)),
+    PatternSpec('numero', r'nº\s*([\d/\-]+)', lambda m: m.group(1)),
+
+    PatternSpec('orgao', r'prefeitura\s+municipal\s+de\s+(\w+)', lambda m: m.group(0)),
+    PatternSpec('orgao', r'governo\s+do\s+estado\s+(?:de|do)\s+(\w+)', lambda m: m.group(0)),
+)
+
+_default_scanner: Optional[MetadataScanner] = None
+
+
+def get_metadata_scanner() -> MetadataScanner:
+    """Retorna o scanner compartilhado de metadata licitatória."""
+    global _default_scanner
+    if _default_scanner is None:
+        _default_scanner = MetadataScanner(LICITACAO_METADATA_SPECS)
+    return _default_scanner
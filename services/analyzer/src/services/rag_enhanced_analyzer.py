@@ -25,6 +25,7 @@ from ..models.rag_models import (
 from .adaptive_analyzer import AdaptiveAnalyzer
 from .rag_service import RAGService
 from .knowledge_base_manager import KnowledgeBaseManager
+from ..infrastructure.monitoring.stage_timer import StageTimer, current_stage_timer, timed_stage
 
 logger = structlog.get_logger(__name__)
 
@@ -90,38 +91,41 @@ class RAGEnhancedAnalyzer:
         )
 
         start_time = time.time()
+        # Etapas medidas pelos métodos decorados com timed_stage
+        timer = current_stage_timer() or StageTimer("rag_enhanced_analyzer")
 
         try:
-            # 1. Análise tradicional (sempre executada)
-            traditional_result = await self._traditional_analysis(document)
-
-            # 2. Análise RAG (se habilitado)
-            if self.use_rag:
-                rag_insights = await self._rag_enhanced_analysis(document)
-
-                # 3. Merge resultados
-                enhanced_result = await self._merge_results(
-                    traditional_result,
-                    rag_insights
-                )
+            with timer.activate():
+                # 1. Análise tradicional (sempre executada)
+                traditional_result = await self._traditional_analysis(document)
+
+                # 2. Análise RAG (se habilitado)
+                if self.use_rag:
+                    rag_insights = await self._rag_enhanced_analysis(document)
+
+                    # 3. Merge resultados
+                    enhanced_result = await self._merge_results(
+                        traditional_result,
+                        rag_insights
+                    )
 
-                execution_time = time.time() - start_time
+                    execution_time = time.time() - start_time
 
-                self.logger.info(
-                    "✅ RAG-enhanced analysis completed",
-                    document_id=document.id,
-                    rag_sources=rag_insights.total_sources,
-                    execution_time=f"{execution_time:.2f}s"
-                )
+                    self.logger.info(
+                        "✅ RAG-enhanced analysis completed",
+                        document_id=document.id,
+                        rag_sources=rag_insights.total_sources,
+                        execution_time=f"{execution_time:.2f}s"
+                    )
 
-                return enhanced_result
-            else:
-                # RAG desabilitado - retorna análise tradicional
-                self.logger.info(
-                    "✅ Traditional analysis completed (RAG disabled)",
-                    document_id=document.id
-                )
-                return traditional_result
+                    return enhanced_result
+                else:
+                    # RAG desabilitado - retorna análise tradicional
+                    self.logger.info(
+                        "✅ Traditional analysis completed (RAG disabled)",
+                        document_id=document.id
+                    )
+                    return traditional_result
 
         except Exception as e:
             self.logger.error(
@@ -131,6 +135,7 @@ class RAGEnhancedAnalyzer:
             )
             raise
 
+    @timed_stage("traditional_analysis")
     async def _traditional_analysis(
         self,
         document: Document
@@ -188,9 +193,7 @@ class RAGEnhancedAnalyzer:
 
         try:
             # Obtém knowledge base
-            kb = await self.kb_manager.get_organization_kb(
-                self.org_config.organization_id
-            )
+            kb = await self._get_knowledge_base()
 
             if not kb:
                 self.logger.warning(
@@ -247,6 +250,14 @@ class RAGEnhancedAnalyzer:
             )
             return insights
 
+    @timed_stage("rag.knowledge_base")
+    async def _get_knowledge_base(self):
+        """Obtém a knowledge base da organização."""
+        return await self.kb_manager.get_organization_kb(
+            self.org_config.organization_id
+        )
+
+    @timed_stage("rag.legal")
     async def _analyze_legal_with_rag(
         self,
         document: Document,
@@ -313,6 +324,7 @@ class RAGEnhancedAnalyzer:
             )
             return None
 
+    @timed_stage("rag.structural")
     async def _analyze_structure_with_rag(
         self,
         document: Document,
@@ -370,6 +382,7 @@ class RAGEnhancedAnalyzer:
             )
             return None
 
+    @timed_stage("rag.conformity")
     async def _check_conformity_with_rag(
         self,
         document: Document,
@@ -428,6 +441,7 @@ class RAGEnhancedAnalyzer:
             )
             return None
 
+    @timed_stage("rag.merge")
     async def _merge_results(
         self,
         traditional_result: AnalysisResult,
@@ -5,6 +5,7 @@ Serviço principal para integração com Vertex AI RAG Engine.
 Gerencia corpus, importação de documentos, retrieval e geração.
 """
 
+import asyncio
 import time
 from datetime import datetime
 from typing import List, Optional, Dict, Any
@@ -27,6 +28,7 @@ from ..models.rag_models import (
     ImportResult,
     RAGError,
 )
+from .local_vector_index import LocalVectorIndex, get_local_vector_index
 
 logger = structlog.get_logger(__name__)
 
@@ -40,14 +42,21 @@ class RAGService:
     - Importação de documentos para corpus
     - Recuperação de contextos relevantes (retrieval)
     - Geração de respostas fundamentadas (RAG)
+    - Índice vetorial local como primeira camada ou fallback do retrieval
     """
 
-    def __init__(self):
-        """Inicializa o serviço RAG."""
+    def __init__(self, local_index: Optional[LocalVectorIndex] = None):
+        """
+        Inicializa o serviço RAG.
+
+        Args:
+            local_index: Índice vetorial local (default: configuração RAG)
+        """
         self.config = get_rag_config()
         self.logger = structlog.get_logger(self.__class__.__name__)
         self.is_initialized = False
         self._corpus_cache: Dict[str, RagCorpus] = {}
+        self.local_index = local_index if local_index is not None else get_local_vector_index()
 
     async def initialize(self):
         """
@@ -416,6 +425,17 @@ class RAGService:
 
         start_time = time.time()
 
+        local_filters = self._local_index_filters(corpus_id)
+        if local_filters is not None and self.config.local_index_mode == "first_tier":
+            local_result = await self._retrieve_local(
+                corpus_id, query, similarity_top_k, vector_distance_threshold,
+                local_filters, start_time
+            )
+            if local_result and local_result.total_found >= min(
+                self.config.local_index_min_results, similarity_top_k
+            ):
+                return local_result
+
         try:
             corpus_name = f"projects/{self.config.project_id}/locations/{self.config.location}/ragCorpora/{corpus_id}"
 
@@ -471,6 +491,15 @@ class RAGService:
                 error=str(e)
             )
 
+            if local_filters is not None and self.config.local_index_mode == "fallback":
+                local_result = await self._retrieve_local(
+                    corpus_id, query, similarity_top_k, vector_distance_threshold,
+                    local_filters, start_time
+                )
+                if local_result is not None:
+                    local_result.metadata['vertex_error'] = str(e)
+                    return local_result
+
             return RetrievalResult(
                 query=query,
                 contexts=[],
@@ -594,6 +623,83 @@ class RAGService:
                 metadata={'error': str(e)}
             )
 
+    # ==================== Local Index ====================
+
+    def _local_index_filters(self, corpus_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Filtros do índice local para um corpus.
+
+        Só corpus privados de organização conhecidos no cache são atendidos
+        localmente, para nunca misturar chunks de organizações diferentes.
+        """
+        if self.local_index is None:
+            return None
+        corpus = self._corpus_cache.get(corpus_id)
+        if corpus is None or corpus.is_shared or not corpus.organization_id:
+            return None
+        return {'organization_id': corpus.organization_id}
+
+    async def _retrieve_local(
+        self,
+        corpus_id: str,
+        query: str,
+        similarity_top_k: int,
+        vector_distance_threshold: float,
+        filters: Dict[str, Any],
+        start_time: float
+    ) -> Optional[RetrievalResult]:
+        """Recupera contextos do índice local (embedding da query fora do event loop)."""
+        try:
+            hits = await asyncio.to_thread(
+                self.local_index.search_text,
+                query,
+                similarity_top_k,
+                filters
+            )
+        except Exception as e:
+            self.logger.warning(
+                "⚠️ Local index retrieval failed",
+                corpus_id=corpus_id,
+                error=str(e)
+            )
+            return None
+
+        contexts = [
+            RetrievedContext(
+                source_document_id=hit.metadata.get('document_id', hit.id),
+                source_file_name=hit.metadata.get('document_title') or hit.metadata.get('document_id', hit.id),
+                chunk_text=hit.metadata.get('text', ''),
+                relevance_score=hit.score,
+                distance=hit.distance,
+                metadata={
+                    'source_uri': hit.metadata.get('gcs_uri', ''),
+                    'chunk_index': hit.metadata.get('chunk_index', 0),
+                    'section': hit.metadata.get('section_title', ''),
+                    'retriever': 'local_index'
+                }
+            )
+            for hit in hits
+            if hit.distance <= vector_distance_threshold
+        ]
+
+        retrieval_time = (time.time() - start_time) * 1000
+
+        self.logger.info(
+            "✅ Contexts retrieved from local index",
+            corpus_id=corpus_id,
+            contexts_found=len(contexts),
+            retrieval_time_ms=f"{retrieval_time:.2f}ms"
+        )
+
+        return RetrievalResult(
+            query=query,
+            contexts=contexts,
+            total_found=len(contexts),
+            corpus_ids_searched=[corpus_id],
+            retrieval_time_ms=retrieval_time,
+            metadata={'retriever': 'local_index'}
+        )
+
     # ==================== Helper Methods ====================
 
     async def _ensure_initialized(self):
@@ -0,0 +1,185 @@
+"""
+LicitaReview - Cache de Resultados de Análise
+
+Cache LRU + TTL em memória para resultados do AnalyzerService:
+- get/put/evict O(1) (OrderedDict em ordem de uso)
+- Limite por número de entradas e por bytes estimados
+- Idade medida com relógio monotônico
+- Stale-while-revalidate: após o TTL a entrada ainda é servida por uma
+  janela extra enquanto um único chamador a recalcula
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+CACHE_HIT = "hit"
+CACHE_STALE = "stale"
+CACHE_MISS = "miss"
+
+# Estimativa de tamanho de um AnalysisResult (ordem de grandeza do JSON):
+# parte fixa (scores, configuração aplicada, metadados) + custo por finding
+RESULT_BASE_BYTES = 4096
+FINDING_BASE_BYTES = 512
+_FINDING_TEXT_FIELDS = ('title', 'description', 'suggestion', 'context', 'location')
+
+
+def estimate_result_size(result: Any) -> int:
+    """
+    Estima o tamanho de um resultado de análise sem serializá-lo.
+
+    Soma uma parte fixa, um custo por finding e o tamanho dos textos
+    livres (findings e recomendações), que dominam o tamanho real.
+
+    Args:
+        result: AnalysisResult (ou objeto com `findings` e `recommendations`)
+
+    Returns:
+        Tamanho estimado em bytes
+    """
+    size = RESULT_BASE_BYTES
+    for finding in getattr(result, 'findings', None) or ():
+        size += FINDING_BASE_BYTES
+        for name in _FINDING_TEXT_FIELDS:
+            size += len(getattr(finding, name, None) or '')
+    for recommendation in getattr(result, 'recommendations', None) or ():
+        size += len(recommendation)
+    return size
+
+
+@dataclass
+class CacheEntry:
+    """Entrada do cache com metadados."""
+    value: Any
+    stored_at: float
+    size: int
+    revalidating: bool = False
+
+
+class ResultCache:
+    """
+    Cache LRU com expiração e stale-while-revalidate.
+
+    A entrada menos usada recentemente fica no início do OrderedDict e é
+    a primeira removida quando um dos limites (entradas ou bytes) estoura.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: float = 3600.0,
+        stale_seconds: float = 0.0,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries: Número máximo de entradas
+            max_bytes: Tamanho máximo estimado em bytes (None = sem limite)
+            ttl_seconds: Tempo em que a entrada é servida como fresca
+            stale_seconds: Janela após o TTL em que a entrada é servida
+                como `stale` enquanto é recalculada
+            sizeof: Função que estima o tamanho de um valor em bytes
+            clock: Relógio monotônico (segundos)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def size_bytes(self) -> int:
+        """Tamanho estimado total das entradas."""
+        return self._bytes
+
+    def get(self, key: str) -> Tuple[Optional[Any], str]:
+        """
+        Busca valor no cache.
+
+        Args:
+            key: Chave do resultado
+
+        Returns:
+            Tupla (valor ou None, status: hit, stale ou miss)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, CACHE_MISS
+
+        age = self._clock() - entry.stored_at
+        if age > self.ttl_seconds + self.stale_seconds:
+            self._remove(key)
+            return None, CACHE_MISS
+
+        self._entries.move_to_end(key)
+        if age > self.ttl_seconds:
+            return entry.value, CACHE_STALE
+        return entry.value, CACHE_HIT
+
+    def put(self, key: str, value: Any) -> None:
+        """Armazena valor e remove as entradas menos recentes acima dos limites."""
+        if key in self._entries:
+            self._remove(key)
+
+        entry = CacheEntry(value=value, stored_at=self._clock(), size=self._sizeof(value))
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes and len(self._entries) > 1
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def age_seconds(self, key: str) -> Optional[float]:
+        """Idade da entrada em segundos."""
+        entry = self._entries.get(key)
+        return None if entry is None else self._clock() - entry.stored_at
+
+    def begin_revalidation(self, key: str) -> bool:
+        """
+        Marca a entrada como em revalidação.
+
+        Returns:
+            True só para o primeiro chamador (os demais continuam servindo stale)
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.revalidating:
+            return False
+        entry.revalidating = True
+        return True
+
+    def end_revalidation(self, key: str) -> None:
+        """Libera a marcação (usado quando a revalidação falha)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.revalidating = False
+
+    def invalidate(self, key: str) -> None:
+        """Remove uma entrada."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
@@ -0,0 +1,169 @@
+"""
+Testes para o controle de admissão
+
+Testa o limite por unidades de custo, a ordem da fila de prioridade,
+o descarte com Retry-After e as métricas de fila e espera.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.infrastructure.monitoring.metrics import MetricsCollector
+from src.services.admission_controller import (
+    AdmissionController,
+    AdmissionRejectedError,
+    estimate_cost
+)
+
+
+@pytest.fixture
+def collector():
+    """Coletor isolado do coletor global."""
+    return MetricsCollector()
+
+
+def make_controller(collector, **overrides) -> AdmissionController:
+    params = dict(capacity=4.0, max_queue=2, queue_timeout=1.0, collector=collector)
+    params.update(overrides)
+    return AdmissionController(**params)
+
+
+async def settle() -> None:
+    """Deixa as tasks pendentes avançarem até a fila."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestEstimateCost:
+    """Testes para estimate_cost."""
+
+    def test_cost_grows_with_rules_content_and_type(self):
+        """Testa os fatores de complexidade do domínio e o peso do tipo."""
+        def request(rules: int, analysis_type: str = 'standard'):
+            config = SimpleNamespace(get_active_rules=lambda: [object()] * rules)
+            return SimpleNamespace(organization_config=config, analysis_type=analysis_type)
+
+        assert estimate_cost(request(0)) == 1.0
+        assert estimate_cost(request(5)) == 2.0
+        assert estimate_cost(request(0), content_length=20000) == 3.0
+        assert estimate_cost(request(0, 'quick')) == 0.5
+        assert estimate_cost(request(50, 'detailed')) == 8.0
+
+
+class TestAdmissionController:
+    """Testes para AdmissionController."""
+
+    @pytest.mark.asyncio
+    async def test_admits_within_capacity(self, collector):
+        """Testa admissão imediata enquanto houver unidades livres."""
+        controller = make_controller(collector)
+        async with controller.admit(3.0) as waited:
+            assert waited == 0.0
+            assert controller.in_flight == 3.0
+
+        assert controller.in_flight == 0.0
+        assert collector.get_metric("admission_wait_seconds").get_sketch().count == 1
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_runs_alone(self, collector):
+        """Testa que uma request maior que a capacidade roda quando não há outras."""
+        controller = make_controller(collector)
+        async with controller.admit(10.0):
+            assert controller.in_flight == 10.0
+
+    @pytest.mark.asyncio
+    async def test_queue_is_served_by_priority(self, collector):
+        """Testa que, liberada a capacidade, a fila é servida por prioridade."""
+        controller = make_controller(collector, max_queue=5)
+        order = []
+
+        async def run(name: str, priority: str):
+            async with controller.admit(4.0, priority):
+                order.append(name)
+
+        await controller.acquire(4.0)
+        tasks = [
+            asyncio.create_task(run("low", "low")),
+            asyncio.create_task(run("normal", "normal")),
+            asyncio.create_task(run("urgent", "urgent"))
+        ]
+        await settle()
+        assert controller.queue_depth == 3
+        assert collector.get_metric("admission_queue_depth").get_latest_value() == 3
+
+        controller.release(4.0)
+        await asyncio.gather(*tasks)
+
+        assert order == ["urgent", "normal", "low"]
+        assert controller.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_with_retry_after(self, collector):
+        """Testa 503 lógico (AdmissionRejectedError) com fila cheia."""
+        controller = make_controller(collector)
+        await controller.acquire(4.0)
+        waiting = [asyncio.create_task(controller.acquire(1.0)) for _ in range(2)]
+        await settle()
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire(1.0)
+
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after >= 1
+        assert collector.get_metric("admission_rejected_total").get_latest_value() == 1
+
+        controller.release(4.0)
+        await asyncio.gather(*waiting)
+
+    @pytest.mark.asyncio
+    async def test_high_priority_sheds_lowest_queued(self, collector):
+        """Testa que uma request urgente descarta a de menor prioridade da fila."""
+        controller = make_controller(collector)
+        await controller.acquire(4.0)
+        low = asyncio.create_task(controller.acquire(1.0, "low"))
+        normal = asyncio.create_task(controller.acquire(1.0, "normal"))
+        await settle()
+
+        urgent = asyncio.create_task(controller.acquire(1.0, "urgent"))
+        await settle()
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await low
+        assert exc_info.value.reason == "shed"
+        assert controller.queue_depth == 2
+
+        controller.release(4.0)
+        await asyncio.gather(normal, urgent)
+        assert controller.in_flight == 2.0
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self, collector):
+        """Testa rejeição ao esgotar o prazo de espera e limpeza da fila."""
+        controller = make_controller(collector)
+        await controller.acquire(4.0)
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire(1.0, timeout=0.01)
+
+        assert exc_info.value.reason == "queue_timeout"
+        assert controller.queue_depth == 0
+        controller.release(4.0)
+        assert controller.in_flight == 0.0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self, collector):
+        """Testa que uma request cancelada (cliente desconectou) sai da fila."""
+        controller = make_controller(collector)
+        await controller.acquire(4.0)
+        waiter = asyncio.create_task(controller.acquire(1.0))
+        await settle()
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert controller.queue_depth == 0
+        controller.release(4.0)
+        assert controller.in_flight == 0.0
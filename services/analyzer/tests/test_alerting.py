@@ -0,0 +1,157 @@
+"""
+Testes para o sistema de alertas
+
+Testa os avaliadores incrementais de janela, o disparo orientado a
+eventos, os filtros por labels e o histórico indexado por tempo.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.infrastructure.monitoring.alerting import (
+    Alert,
+    AlertManager,
+    AlertRule,
+    AlertSeverity,
+    AlertStatus,
+    WindowEvaluator
+)
+from src.infrastructure.monitoring.metrics import MetricsCollector
+
+
+def make_rule(rule_id: str = "errors", **overrides) -> AlertRule:
+    """Regra de soma de erros por minuto."""
+    params = dict(
+        id=rule_id,
+        name="Erros",
+        description="Mais de 3 erros por minuto",
+        metric_name="org_errors_total",
+        condition="greater_than",
+        threshold=3.0,
+        severity=AlertSeverity.ERROR,
+        evaluation_window_minutes=1,
+        cooldown_minutes=5,
+        aggregation="sum"
+    )
+    params.update(overrides)
+    return AlertRule(**params)
+
+
+@pytest.fixture
+def manager():
+    """AlertManager sem canais sobre um coletor isolado."""
+    return AlertManager(MetricsCollector())
+
+
+class TestWindowEvaluator:
+    """Testes para WindowEvaluator."""
+
+    def test_sliding_window_aggregates(self):
+        """Testa soma, média, máximo e taxa dentro da janela."""
+        evaluator = WindowEvaluator(make_rule())
+        for offset, value in enumerate((1.0, 5.0, 3.0)):
+            evaluator.observe(value, 1000.0 + offset)
+
+        assert evaluator.value(1003.0) == 9.0
+        for aggregation, expected in (("avg", 3.0), ("max", 5.0), ("count", 3.0), ("rate", 9.0 / 60)):
+            evaluator.rule.aggregation = aggregation
+            assert evaluator.value(1003.0) == pytest.approx(expected)
+
+    def test_old_observations_expire(self):
+        """Testa que observações fora da janela saem do agregado."""
+        evaluator = WindowEvaluator(make_rule())
+        evaluator.observe(10.0, 1000.0)
+        evaluator.observe(1.0, 1050.0)
+
+        assert evaluator.value(1055.0) == 11.0
+        assert evaluator.value(1065.0) == 1.0
+        assert evaluator.value(1200.0) == 0.0
+
+
+class TestAlertManager:
+    """Testes para AlertManager."""
+
+    @pytest.mark.asyncio
+    async def test_counter_increments_trigger_on_ingest(self, manager):
+        """Testa que a regra vira pendente na ingestão e dispara com a soma."""
+        manager.add_rule(make_rule())
+        for _ in range(3):
+            manager.metrics_collector.increment("org_errors_total")
+        assert manager._pending == {}
+
+        manager.metrics_collector.increment("org_errors_total")
+        assert "errors" in manager._pending
+
+        await manager._evaluate_pending()
+
+        alerts = manager.get_active_alerts()
+        assert len(alerts) == 1 and alerts[0].current_value == 4.0
+        assert manager._pending == {}
+
+    @pytest.mark.asyncio
+    async def test_per_organization_rules(self, manager):
+        """Testa que regras com filtro de labels só veem sua organização."""
+        for org in ("org_a", "org_b"):
+            manager.add_rule(make_rule(f"errors_{org}", labels={'organization_id': org}))
+
+        for _ in range(5):
+            manager.metrics_collector.increment("org_errors_total", labels={'organization_id': 'org_a'})
+        manager.metrics_collector.increment("org_errors_total")
+        await manager._evaluate_pending()
+
+        assert [alert.rule_id for alert in manager.get_active_alerts()] == ["errors_org_a"]
+        assert manager._evaluators["errors_org_b"].value() == 0.0
+
+    @pytest.mark.asyncio
+    async def test_monitoring_loop_wakes_on_update(self):
+        """Testa que o loop avalia na hora, sem esperar a varredura."""
+        manager = AlertManager(MetricsCollector(), sweep_interval=60)
+        manager.add_rule(make_rule(threshold=0.0))
+        await manager.start_monitoring()
+        try:
+            manager.metrics_collector.increment("org_errors_total")
+            for _ in range(50):
+                if manager.get_active_alerts():
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await manager.stop_monitoring()
+
+        assert len(manager.get_active_alerts()) == 1
+
+    @pytest.mark.asyncio
+    async def test_cooldown_prevents_repeat(self, manager):
+        """Testa que a regra em cooldown não dispara de novo."""
+        manager.add_rule(make_rule(threshold=0.0))
+        manager.metrics_collector.increment("org_errors_total")
+        await manager._evaluate_pending()
+        manager.metrics_collector.increment("org_errors_total")
+        await manager._evaluate_rules()
+
+        assert len(manager.alert_history) == 1
+
+    def test_remove_rule_unsubscribes(self, manager):
+        """Testa que remover a última regra da métrica cancela a assinatura."""
+        manager.add_rule(make_rule())
+        manager.remove_rule("errors")
+
+        assert "org_errors_total" not in manager._index
+        assert "org_errors_total" not in manager.metrics_collector._listeners
+
+    def test_history_indexed_by_time(self):
+        """Testa consulta por período e limite do histórico."""
+        manager = AlertManager(MetricsCollector(), max_history=3)
+        now = datetime.utcnow()
+        for hours_ago in (30, 20, 10, 5, 2, 1, 0):
+            manager._record_history(Alert(
+                id=str(hours_ago), rule_id="r", rule_name="r", metric_name="m",
+                current_value=1.0, threshold=0.0, severity=AlertSeverity.INFO,
+                status=AlertStatus.TRIGGERED, triggered_at=now - timedelta(hours=hours_ago),
+                message=""
+            ))
+
+        assert [a.id for a in manager.get_alert_history(hours=3)] == ["2", "1", "0"]
+        assert len(manager.alert_history) <= 6
+        assert manager.get_alert_statistics()["alerts_last_24h"] == len(manager.get_alert_history(24))
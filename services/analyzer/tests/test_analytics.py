@@ -0,0 +1,143 @@
+"""
+Testes para o MetricsStore de analytics
+
+Testa os agregados por janela (anéis de buckets de minuto e hora),
+a cauda de eventos brutos e os endpoints /api/analytics.
+"""
+
+import time
+
+import pytest
+
+from src.api import analytics
+from src.api.analytics import MetricsStore, RollingWindow
+
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Store isolado usado pelos endpoints."""
+    store = MetricsStore(raw_tail_size=5)
+    monkeypatch.setattr(analytics, "metrics_store", store)
+    return store
+
+
+class TestRollingWindow:
+    """Testes para RollingWindow."""
+
+    def test_stale_slots_are_recycled(self):
+        """Testa que um slot antigo na mesma posição é substituído."""
+        window = RollingWindow(resolution=60, size=3)
+        old = window.bucket_for(0)
+        window.bucket_for(180)  # mesma posição, 3 minutos depois
+
+        assert window.bucket_for(180) is not old
+        assert [b.slot for b in window.buckets(0, 180)] == [3]
+
+    def test_query_limited_to_window(self):
+        """Testa consulta apenas pelos buckets do intervalo."""
+        window = RollingWindow(resolution=60, size=10)
+        for minute in range(5):
+            window.bucket_for(minute * 60)
+
+        assert [b.slot for b in window.buckets(120, 239)] == [2, 3]
+
+
+class TestMetricsStore:
+    """Testes para MetricsStore."""
+
+    def test_request_stats_by_period(self, store):
+        """Testa contagens, erros e percentis só dentro do período."""
+        for i in range(100):
+            store.record_request("/analyze", "POST", 500 if i < 5 else 200, float(i + 1), timestamp=NOW - 30)
+        store.record_request("/analyze", "POST", 200, 5000.0, timestamp=NOW - 7200)
+
+        stats = store.request_stats(60, now=NOW)[("/analyze", None)]
+
+        assert stats.count == 100 and stats.errors == 5
+        assert stats.avg == pytest.approx(50.5)
+        assert stats.quantile(0.95) == pytest.approx(95, rel=0.02)
+        assert store.request_stats(180, now=NOW)[("/analyze", None)].count == 101
+
+    def test_long_periods_use_hour_buckets(self, store):
+        """Testa que períodos acima de 24h usam a janela horária."""
+        store.record_request("/health", "GET", 200, 1.0, timestamp=NOW - 3 * 86400)
+
+        assert store.window_for(10080) is store.hours
+        assert store.request_stats(10080, now=NOW)[("/health", None)].count == 1
+        assert store.request_stats(1440, now=NOW) == {}
+
+    def test_request_series_granularity(self, store):
+        """Testa agrupamento da série temporal por granularidade."""
+        start = NOW - NOW % 3600 - 3600
+        for minute in range(10):
+            store.record_request("/analyze", "POST", 200, 10.0, timestamp=start + minute * 60)
+
+        by_five = store.request_series(180, 300, now=NOW)
+        by_hour = store.request_series(180, 3600, now=NOW)
+
+        assert [stats.count for _, stats in by_five] == [5, 5]
+        assert by_hour == [(start, by_hour[0][1])] and by_hour[0][1].count == 10
+
+    def test_raw_tail_is_bounded(self, store):
+        """Testa que a cauda bruta mantém só os eventos mais recentes."""
+        for i in range(20):
+            store.record_error("timeout", f"erro {i}", "/analyze")
+
+        recent = store.get_recent_metrics('error', minutes=5)
+
+        assert [m['error_message'] for m in recent] == [f"erro {i}" for i in range(15, 20)]
+        assert store.error_stats(5)["timeout"].count == 20
+
+    def test_cleanup_drops_old_buckets(self, store):
+        """Testa remoção de buckets e eventos antigos."""
+        store.record_request("/analyze", "POST", 200, 1.0, timestamp=time.time() - 2 * 86400)
+        store.record_request("/analyze", "POST", 200, 1.0)
+
+        store.cleanup_old_metrics(days=1)
+
+        assert store.request_stats(43200)[("/analyze", None)].count == 1
+        assert len(store.get_recent_metrics('request', minutes=43200)) == 1
+
+
+class TestAnalyticsEndpoints:
+    """Testes para os endpoints de analytics."""
+
+    @pytest.mark.asyncio
+    async def test_overview_and_health(self, store):
+        """Testa overview e health a partir dos agregados."""
+        store.record_request("/analyze", "POST", 200, 100.0)
+        store.record_request("/analyze", "POST", 503, 300.0)
+        store.record_analysis("doc-1", "standard", 250.0, 1200, "gemini", True)
+        store.record_error("timeout", "deadline exceeded", "/analyze")
+        store.record_feedback("doc-1", True, 5.0)
+
+        overview = await analytics.get_analytics_overview(period="1h")
+        health = await analytics.get_system_health()
+
+        assert overview.total_requests == 2
+        assert overview.total_analyses == 1
+        assert overview.error_rate == pytest.approx(50.0)
+        assert overview.avg_tokens_per_analysis == 1200
+        assert overview.positive_feedback_rate == 100.0
+        assert health.status == "degraded"
+        assert health.avg_latency_ms == pytest.approx(200.0)
+
+    @pytest.mark.asyncio
+    async def test_model_performance_and_errors(self, store):
+        """Testa performance por modelo e exemplos recentes de erros."""
+        store.record_analysis("doc-1", "standard", 100.0, 0, "gemini", True, experiment_id="gemini-a")
+        store.record_analysis("doc-2", "standard", 300.0, 0, "gemini", False, experiment_id="gemini-b")
+        store.record_feedback("doc-1", False, None, experiment_id="gemini-a")
+        for i in range(5):
+            store.record_error("timeout", f"erro {i}", "/analyze")
+
+        models = await analytics.get_model_performance(period="24h")
+        errors = await analytics.get_error_summary(period="24h")
+
+        assert len(models) == 1
+        assert models[0].total_requests == 2 and models[0].success_rate == 50.0
+        assert models[0].feedback_score == 0.0
+        assert errors[0].count == 5
+        assert errors[0].recent_examples == ["erro 2", "erro 3", "erro 4"]
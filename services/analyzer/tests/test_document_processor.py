@@ -4,15 +4,24 @@ Testes para Document Processor
 Testa chunking, metadata extraction e GCS upload.
 """
 
+import asyncio
+import gzip
+import threading
+import time
 import pytest
+from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 
+from google.api_core import exceptions as gcp_exceptions
+
 from src.services.document_processor import (
     SmartChunker,
     MetadataExtractor,
     TokenCounter,
-    DocumentProcessor
+    DocumentProcessor,
+    GCSDocumentManager
 )
+from src.services.metadata_scanner import MetadataScanner, LICITACAO_METADATA_SPECS
 from src.models.document_models import (
     Document,
     DocumentClassification,
@@ -164,6 +173,180 @@ class TestMetadataExtractor:
         valor = metadata.get('valor_estimado') or ''
         assert 'R$' in valor or valor == ''  # Aceita tanto encontrar o valor quanto não encontrar
 
+    @pytest.mark.asyncio
+    async def test_extract_returns_spans(self, extractor):
+        """Testa que os spans apontam para o trecho original."""
+        content = "EDITAL DE PREGÃO ELETRÔNICO Nº 001/2024 - Valor estimado: R$ 150.000,00"
+        document = create_test_document(content=content)
+
+        metadata = await extractor.extract(document)
+
+        assert metadata['valor_estimado'] == 'R$ 150.000,00'
+        start, end = metadata['field_spans']['modalidade']
+        assert content[start:end] == 'PREGÃO ELETRÔNICO'
+
+    def test_scan_falls_back_to_full_text(self):
+        """Testa fallback para o texto completo quando o campo não está no cabeçalho."""
+        scanner = MetadataScanner(LICITACAO_METADATA_SPECS, head_size=64)
+        content = "EDITAL " + "x " * 100 + "prazo de 30 dias"
+
+        result = scanner.scan(content)
+
+        assert result.get('document_type') == 'Edital'
+        assert result.get('prazo') == '30 dias'
+        assert result.used_fallback
+
+
+class FilesystemBlob:
+    """Stand-in de Blob do GCS que grava no sistema de arquivos."""
+
+    def __init__(self, bucket: 'FilesystemBucket', name: str):
+        self.bucket = bucket
+        self.name = name
+        self.metadata = None
+        self.content_encoding = None
+
+    def upload_from_string(self, data, content_type=None, timeout=None):
+        self.bucket.before_upload(self)
+        path = self.bucket.root / self.name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data if isinstance(data, bytes) else data.encode('utf-8'))
+        self.bucket.uploaded[self.name] = self
+
+
+class FilesystemBucket:
+    """Stand-in de Bucket com hook para simular latência e falhas."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.uploaded = {}
+        self.before_upload = lambda blob: None
+
+    def blob(self, name: str) -> FilesystemBlob:
+        return FilesystemBlob(self, name)
+
+
+class FilesystemStorageClient:
+    """Stand-in de storage.Client com um bucket no sistema de arquivos."""
+
+    def __init__(self, root: Path):
+        self._bucket = FilesystemBucket(root)
+
+    def bucket(self, name: str) -> FilesystemBucket:
+        return self._bucket
+
+
+class TestGCSDocumentManager:
+    """Testes para GCSDocumentManager contra stand-in em sistema de arquivos."""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Fixture do manager com backoff curto."""
+        manager = GCSDocumentManager(
+            bucket_name="test-bucket",
+            client=FilesystemStorageClient(tmp_path),
+            max_concurrency=2
+        )
+        manager.config = manager.config.model_copy(update={'gcs_upload_backoff_seconds': 0.01})
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_upload_writes_blob(self, manager, tmp_path):
+        """Testa upload com metadata e URI gs://."""
+        document = create_test_document(doc_id="doc-1", content="EDITAL de teste")
+
+        uri = await manager.upload_for_rag(document, "org-1")
+
+        blob_path = f"{manager.config.gcs_base_path}/org-1/doc-1.txt"
+        assert uri == f"gs://test-bucket/{blob_path}"
+        assert (tmp_path / blob_path).read_text() == "EDITAL de teste"
+        assert manager.bucket.uploaded[blob_path].metadata['organization_id'] == "org-1"
+
+    @pytest.mark.asyncio
+    async def test_gzip_upload(self, manager, tmp_path):
+        """Testa compressão gzip opcional para textos grandes."""
+        manager.config = manager.config.model_copy(update={'gcs_gzip_uploads': True})
+        content = "cláusula " * 500
+        document = create_test_document(doc_id="doc-gz", content=content)
+
+        await manager.upload_for_rag(document, "org-1")
+
+        blob_path = f"{manager.config.gcs_base_path}/org-1/doc-gz.txt"
+        assert manager.bucket.uploaded[blob_path].content_encoding == 'gzip'
+        assert gzip.decompress((tmp_path / blob_path).read_bytes()).decode('utf-8') == content
+
+    @pytest.mark.asyncio
+    async def test_retry_on_transient_error(self, manager):
+        """Testa retry com backoff em falhas transitórias."""
+        failures = {'count': 0}
+
+        def flaky(blob):
+            if failures['count'] < 2:
+                failures['count'] += 1
+                raise gcp_exceptions.ServiceUnavailable("indisponível")
+        manager.bucket.before_upload = flaky
+
+        uri = await manager.upload_for_rag(create_test_document(doc_id="doc-r"), "org-1")
+
+        assert uri.endswith("doc-r.txt")
+        assert failures['count'] == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_upload_is_bounded_and_non_blocking(self, manager):
+        """Testa concorrência limitada e event loop livre durante uploads."""
+        state = {'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def slow(blob):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.05)
+            with lock:
+                state['active'] -= 1
+        manager.bucket.before_upload = slow
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        items = [(create_test_document(doc_id=f"doc-{i}"), None) for i in range(6)]
+        results = await manager.upload_batch_for_rag(items, "org-1")
+        ticker_task.cancel()
+
+        assert all(isinstance(r, str) for r in results)
+        assert state['peak'] <= 2
+        assert ticks > 10
+
+    def test_semaphores_follow_event_loop_lifetime(self, manager):
+        """Testa semáforo por event loop, descartado após o loop encerrar."""
+        loops = []
+        for run in range(3):
+            items = [(create_test_document(doc_id=f"doc-{run}-{i}"), None) for i in range(4)]
+            results = asyncio.run(manager.upload_batch_for_rag(items, "org-1"))
+            assert all(isinstance(r, str) for r in results)
+            loops.append(next(iter(manager._semaphores)))
+
+        assert len(set(map(id, loops))) == 3
+        assert list(manager._semaphores) == [loops[-1]]
+
+    @pytest.mark.asyncio
+    async def test_processor_cleanup_closes_owned_manager(self, tmp_path):
+        """Testa que cleanup() encerra o pool de upload criado pelo processador."""
+        with patch('src.services.document_processor.get_storage_client',
+                   return_value=FilesystemStorageClient(tmp_path)):
+            processor = DocumentProcessor(local_index=None)
+        executor = processor.gcs_manager._executor
+
+        await processor.cleanup()
+
+        assert executor._shutdown
+
 
 class TestDocumentProcessor:
     """Testes para DocumentProcessor completo."""
@@ -0,0 +1,97 @@
+"""
+Testes para as entidades de análise do domínio
+
+Testa o layout compacto (slots, imutabilidade) de Finding e Analysis e a
+normalização de enums e referências repetidas.
+"""
+
+import dataclasses
+import json
+import pickle
+
+import pytest
+
+from src.domain.entities.analysis import (
+    Analysis,
+    ConformityScores,
+    Finding,
+    FindingCategory,
+    FindingSeverity
+)
+from src.infrastructure.serialization import to_builtins
+
+
+def make_finding(**overrides) -> Finding:
+    data = {
+        'id': "f1",
+        'category': FindingCategory.JURIDICO,
+        'severity': FindingSeverity.ALTA,
+        'title': "Prazo sem fundamento legal",
+        'description': "O prazo de entrega não cita a lei aplicável.",
+        'suggestion': "Citar o art. 40 da Lei 14.133/2021.",
+        'rule_id': "rule-prazo",
+        'regulatory_reference': "Lei 14.133/2021"
+    }
+    data.update(overrides)
+    return Finding(**data)
+
+
+class TestFinding:
+    """Testes para Finding."""
+
+    def test_slotted_and_frozen(self):
+        """Testa ausência de __dict__ e imutabilidade."""
+        finding = make_finding()
+
+        assert not hasattr(finding, '__dict__')
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            finding.title = "outro"
+
+    def test_values_from_json_are_shared(self):
+        """Testa enums a partir de strings e referências internadas."""
+        rows = json.loads(json.dumps([
+            {'category': "juridico", 'severity': "critica", 'rule_id': "rule-prazo"}
+        ] * 2))
+        first, second = (make_finding(**row) for row in rows)
+
+        assert first.category is FindingCategory.JURIDICO
+        assert first.severity is FindingSeverity.CRITICA
+        assert first.rule_id is second.rule_id
+
+    def test_invalid_severity_rejected(self):
+        """Testa que valores fora do enum continuam rejeitados."""
+        with pytest.raises(ValueError):
+            make_finding(severity="gravissima")
+
+    def test_severity_weight_and_serialization(self):
+        """Testa peso da severidade, to_dict e to_builtins."""
+        finding = make_finding()
+
+        assert finding.get_severity_weight() == 3.0
+        assert finding.to_dict()['severity_weight'] == 3.0
+        assert to_builtins(finding)['severity'] == "alta"
+
+    def test_pickle_round_trip(self):
+        """Testa que findings slotted continuam serializáveis com pickle."""
+        finding = make_finding()
+        assert pickle.loads(pickle.dumps(finding)) == finding
+
+
+class TestAnalysis:
+    """Testes para Analysis."""
+
+    def test_slotted_but_mutable(self):
+        """Testa que a análise não tem __dict__ mas aceita atualização de campos."""
+        analysis = Analysis.create(
+            document_id="doc-1",
+            organization_id="org-1",
+            conformity_scores=ConformityScores(80.0, 70.0, 90.0, 60.0, 75.0),
+            weighted_score=75.0
+        )
+        analysis.findings = [make_finding()]
+        analysis.mark_as_completed()
+
+        assert not hasattr(analysis, '__dict__')
+        assert analysis.to_dict()['executive_summary']['high_priority_issues'] == 1
+        with pytest.raises(AttributeError):
+            analysis.cache_hit = True
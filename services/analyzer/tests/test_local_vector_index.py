@@ -0,0 +1,171 @@
+"""
+Testes para Local Vector Index
+
+Testa add/delete/search, persistência e integração com RAGService
+e DocumentProcessor usando o HashingEmbedder como stand-in.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from src.ml.embeddings import HashingEmbedder
+from src.services.local_vector_index import LocalVectorIndex
+from src.services.rag_service import RAGService
+from src.services.document_processor import DocumentProcessor
+from src.models.rag_models import RagCorpus
+from tests.test_document_processor import create_test_document
+
+
+TEXTS = {
+    'c1': "prazo de entrega dos materiais em trinta dias",
+    'c2': "habilitação jurídica e regularidade fiscal do licitante",
+    'c3': "valor estimado da contratação e dotação orçamentária",
+}
+
+
+@pytest.fixture
+def index():
+    """Fixture de índice em memória populado."""
+    idx = LocalVectorIndex(embedding_function=HashingEmbedder(dim=128))
+    idx.add_texts(
+        ids=list(TEXTS),
+        texts=list(TEXTS.values()),
+        metadatas=[{'document_id': 'doc-1', 'organization_id': 'org-1'}] * 3
+    )
+    return idx
+
+
+class TestLocalVectorIndex:
+    """Testes para LocalVectorIndex."""
+
+    def test_search_returns_most_similar(self, index):
+        """Testa que a busca retorna o chunk com vocabulário mais próximo."""
+        hits = index.search_text("regularidade fiscal do licitante", top_k=2)
+
+        assert hits[0].id == 'c2'
+        assert hits[0].score >= hits[1].score
+        assert hits[0].metadata['text'] == TEXTS['c2']
+
+    def test_filters_and_delete(self, index):
+        """Testa filtros de metadata e remoção."""
+        assert index.search_text("prazo", filters={'organization_id': 'org-2'}) == []
+
+        assert index.delete(['c1']) == 1
+        assert 'c1' not in index
+        assert all(hit.id != 'c1' for hit in index.search_text("prazo de entrega"))
+
+    def test_upsert_replaces_vector(self, index):
+        """Testa que reinserir um id substitui o item."""
+        index.add_texts(['c1'], [TEXTS['c3']], [{'document_id': 'doc-1'}])
+
+        assert len(index) == 3
+        hits = index.search_text(TEXTS['c3'], top_k=2)
+        assert {hit.id for hit in hits} == {'c1', 'c3'}
+
+    def test_rerank_candidates(self, index):
+        """Testa reranking restrito a candidatos."""
+        query = HashingEmbedder(dim=128)([TEXTS['c3']])[0]
+
+        hits = index.rerank(query, ['c1', 'c3', 'inexistente'])
+
+        assert [hit.id for hit in hits] == ['c3', 'c1']
+
+    def test_persistence_roundtrip(self, tmp_path):
+        """Testa que vetores, metadata e remoções sobrevivem à reabertura."""
+        embedder = HashingEmbedder(dim=64)
+        idx = LocalVectorIndex(directory=str(tmp_path), embedding_function=embedder)
+        idx.add_texts(list(TEXTS), list(TEXTS.values()), [{'document_id': 'doc-1'}] * 3)
+        idx.delete(['c3'])
+
+        reopened = LocalVectorIndex(directory=str(tmp_path), embedding_function=embedder)
+
+        assert len(reopened) == 2
+        assert reopened.search_text(TEXTS['c2'], top_k=1)[0].id == 'c2'
+        assert reopened.delete_document('doc-1') == 2
+
+    def test_compact_persisted_index(self, tmp_path):
+        """Testa que compact() remove linhas mortas e o índice reabre igual."""
+        embedder = HashingEmbedder(dim=64)
+        idx = LocalVectorIndex(directory=str(tmp_path), embedding_function=embedder)
+        idx.add_texts(list(TEXTS), list(TEXTS.values()), [{'document_id': 'doc-1'}] * 3)
+        idx.delete(['c1'])
+
+        idx.compact()
+        idx.add_texts(['c4'], [TEXTS['c1']])
+
+        reopened = LocalVectorIndex(directory=str(tmp_path), embedding_function=embedder)
+        assert len(reopened) == 3
+        assert reopened.search_text(TEXTS['c2'], top_k=1)[0].id == 'c2'
+        assert reopened.search_text(TEXTS['c1'], top_k=1)[0].id == 'c4'
+
+    def test_compact_failure_keeps_persisted_index(self, tmp_path):
+        """Testa que uma falha ao gravar a compactação não perde o índice."""
+        embedder = HashingEmbedder(dim=64)
+        idx = LocalVectorIndex(directory=str(tmp_path), embedding_function=embedder)
+        idx.add_texts(list(TEXTS), list(TEXTS.values()), [{'document_id': 'doc-1'}] * 3)
+        idx.delete(['c3'])
+
+        with patch('src.services.local_vector_index.os.fsync', side_effect=OSError("disco cheio")):
+            with pytest.raises(OSError):
+                idx.compact()
+
+        assert not any(p.name.endswith('.tmp') for p in tmp_path.iterdir())
+        reopened = LocalVectorIndex(directory=str(tmp_path), embedding_function=embedder)
+        assert len(reopened) == 2
+        assert reopened.search_text(TEXTS['c2'], top_k=1)[0].id == 'c2'
+
+    def test_ivf_search(self):
+        """Testa busca IVF contra a busca exata."""
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((500, 32)).astype(np.float32)
+        ids = [f"v{i}" for i in range(500)]
+        idx = LocalVectorIndex(index_type="ivf", nlist=8, nprobe=8)
+        idx.add(ids, vectors)
+        idx.train()
+
+        hits = idx.search(vectors[42], top_k=1)
+
+        assert hits[0].id == 'v42'
+        assert hits[0].score == pytest.approx(1.0, abs=1e-5)
+
+
+class TestLocalIndexIntegration:
+    """Testes de integração com RAGService e DocumentProcessor."""
+
+    @pytest.mark.asyncio
+    async def test_document_processor_populates_index(self):
+        """Testa que o processamento indexa os chunks da organização."""
+        idx = LocalVectorIndex(embedding_function=HashingEmbedder(dim=128))
+        with patch('src.services.document_processor.GCSDocumentManager'):
+            processor = DocumentProcessor(local_index=idx)
+        processor.gcs_manager.upload_for_rag = AsyncMock(return_value="gs://bucket/doc.txt")
+
+        document = create_test_document(doc_id="doc-9", content="EDITAL. Prazo de entrega em 30 dias.")
+        processed = await processor.process_for_rag(document, "org-1")
+
+        assert len(idx) == processed.total_chunks
+        hit = idx.search_text("prazo de entrega", top_k=1)[0]
+        assert hit.metadata['organization_id'] == 'org-1'
+        assert hit.metadata['gcs_uri'] == "gs://bucket/doc.txt"
+
+    @pytest.mark.asyncio
+    async def test_rag_service_falls_back_to_local_index(self, index):
+        """Testa fallback para o índice local quando o Vertex falha."""
+        rag_service = RAGService(local_index=index)
+        rag_service.is_initialized = True
+        rag_service._corpus_cache['corpus-1'] = RagCorpus(
+            corpus_id='corpus-1',
+            corpus_name='org-org-1-private',
+            display_name='Org 1',
+            description='',
+            organization_id='org-1'
+        )
+
+        with patch('src.services.rag_service.rag.retrieval_query', side_effect=RuntimeError("offline")):
+            result = await rag_service.retrieve_contexts(
+                'corpus-1', "regularidade fiscal do licitante", vector_distance_threshold=0.9
+            )
+
+        assert result.metadata['retriever'] == 'local_index'
+        assert result.contexts[0].chunk_text == TEXTS['c2']
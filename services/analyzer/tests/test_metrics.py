@@ -0,0 +1,330 @@
+"""
+Testes para o sistema de métricas
+
+Testa os sketches de quantis, a série colunar de pontos, o resumo
+do MetricsCollector, a coleta de métricas de sistema e a exposição
+OpenMetrics.
+"""
+
+import asyncio
+import gc
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.infrastructure.monitoring.metrics import (
+    Metric,
+    MetricsCollector,
+    MetricType,
+    MetricUnit,
+    PointSeries
+)
+from src.infrastructure.monitoring.sketches import DDSketch, SlicedSketch
+from src.infrastructure.monitoring.exposition import format_labels
+
+
+def exact_quantile(values: list, q: float) -> float:
+    """Quantil exato por ordenação (referência)."""
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch:
+    """Testes para DDSketch."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Testa erro relativo dos quantis contra a ordenação exata."""
+        rng = random.Random(0)
+        values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            expected = exact_quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.011)
+        assert sketch.count == len(values)
+        assert sketch.min == min(values) and sketch.max == max(values)
+
+    def test_merge_matches_single_sketch(self):
+        """Testa que mesclar sketches equivale a um único sketch."""
+        values = [i * 0.37 for i in range(-500, 2000)]
+        full, left, right = DDSketch(), DDSketch(), DDSketch()
+        for i, value in enumerate(values):
+            full.add(value)
+            (left if i % 2 else right).add(value)
+
+        left.merge(right)
+
+        for q in (0.01, 0.5, 0.9, 0.99):
+            assert left.quantile(q) == full.quantile(q)
+
+    def test_bins_are_bounded(self):
+        """Testa memória constante: bins colapsados acima do limite."""
+        sketch = DDSketch(relative_accuracy=0.01, max_bins=64)
+        values = [10 ** exponent * (1 + step / 100) for exponent in range(-8, 8) for step in range(100)]
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.bins <= 64
+        assert sketch.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.011)
+
+    def test_roundtrip_serialization(self):
+        """Testa to_dict/from_dict via JSON."""
+        sketch = DDSketch()
+        for value in (0.0, 0.5, 1.5, 3.0):
+            sketch.add(value)
+
+        restored = DDSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+        assert restored.count == 4 and restored.sum == sketch.sum
+
+
+class TestSlicedSketch:
+    """Testes para SlicedSketch."""
+
+    def test_window_query_and_retention(self):
+        """Testa consulta por janela e descarte de fatias antigas."""
+        series = SlicedSketch(slice_seconds=60, max_slices=3)
+        for minute in range(5):
+            series.add(float(minute + 1), timestamp=minute * 60 + 1)
+
+        assert series.slices() == [120, 180, 240]
+        window = series.query(start=180, end=239)
+        assert window.count == 1 and window.max == 4.0
+
+    def test_merge_across_workers(self):
+        """Testa mesclagem de séries serializadas por fatia."""
+        worker_a, worker_b = SlicedSketch(), SlicedSketch()
+        worker_a.add(1.0, timestamp=60)
+        worker_b.add(2.0, timestamp=60)
+        worker_b.add(3.0, timestamp=0)
+
+        worker_a.merge(SlicedSketch.from_dict(worker_b.to_dict()))
+
+        assert worker_a.slices() == [0, 60]
+        assert worker_a.query().count == 3
+
+
+class TestPointSeries:
+    """Testes para PointSeries."""
+
+    def test_ring_buffer_window_queries(self):
+        """Testa sobrescrita circular e consultas por janela nos dois segmentos."""
+        series = PointSeries(capacity=5)
+        for i in range(8):
+            series.append(float(i), timestamp=100.0 + i)
+
+        assert len(series) == 5
+        assert series.values() == [3.0, 4.0, 5.0, 6.0, 7.0]
+        assert series.values(start=104.0, end=106.0) == [4.0, 5.0, 6.0]
+        assert series.aggregate(start=105.0) == (3, 18.0, 7.0)
+        assert series[0].value == 3.0 and series[-1].value == 7.0
+
+    def test_labels_are_interned(self):
+        """Testa que pontos com os mesmos labels compartilham o conjunto."""
+        metric = Metric("requests", MetricType.COUNTER, MetricUnit.COUNT, "", labels={'service': 'analyzer'})
+        for _ in range(3):
+            metric.add_point(1.0, {'endpoint': '/analyze'})
+        metric.add_point(1.0)
+
+        assert len(metric.points._label_sets) == 2  # sem extras + endpoint
+        assert metric.points[0].labels == {'service': 'analyzer', 'endpoint': '/analyze'}
+        assert metric.points[-1].labels == {'service': 'analyzer'}
+
+    def test_timestamps_stay_sorted(self):
+        """Testa que um relógio que volta não quebra a ordenação."""
+        series = PointSeries(capacity=4)
+        series.append(1.0, timestamp=200.0)
+        series.append(2.0, timestamp=150.0)
+
+        assert series.values(start=200.0) == [1.0, 2.0]
+        assert series.values(end=199.0) == []
+
+    def test_metric_average_and_rate(self):
+        """Testa média e taxa sobre a janela recente."""
+        metric = Metric("latency", MetricType.GAUGE, MetricUnit.SECONDS, "")
+        for value in (1.0, 2.0, 3.0):
+            metric.add_point(value)
+
+        assert metric.get_average(minutes=5) == pytest.approx(2.0)
+        assert metric.get_rate(minutes=1) == 3.0
+        assert metric.get_latest_value() == 3.0
+
+
+class TestMetricsCollectorHistograms:
+    """Testes para histogramas do MetricsCollector."""
+
+    def test_summary_uses_sketch(self):
+        """Testa percentis do resumo a partir do sketch."""
+        collector = MetricsCollector()
+        for i in range(1, 1001):
+            collector.observe_histogram("analysis_duration_seconds", i / 1000)
+
+        summary = collector.get_metrics_summary()['metrics']['analysis_duration_seconds']
+
+        assert summary['points_count'] == 1000
+        assert summary['p50'] == pytest.approx(0.5, rel=0.02)
+        assert summary['p99'] == pytest.approx(0.99, rel=0.02)
+        assert summary['latest_value'] == 1.0
+
+    def test_summary_respects_period(self):
+        """Testa que períodos sem fatias não entram no resumo."""
+        collector = MetricsCollector()
+        collector.observe_histogram("analysis_duration_seconds", 0.2)
+
+        past = datetime.utcnow() - timedelta(days=1)
+        summary = collector.get_metrics_summary(past - timedelta(hours=1), past)
+
+        assert 'analysis_duration_seconds' not in summary['metrics']
+
+    def test_export_and_merge_sketches(self):
+        """Testa mesclagem de histogramas exportados por outro worker."""
+        worker, aggregator = MetricsCollector(), MetricsCollector()
+        worker.observe_histogram("request_latency", 0.3)
+        aggregator.observe_histogram("request_latency", 0.1)
+
+        aggregator.merge_sketches(worker.export_sketches())
+
+        summary = aggregator.get_metrics_summary()['metrics']['request_latency']
+        assert summary['points_count'] == 2
+        assert summary['max'] == pytest.approx(0.3)
+
+
+class TestSystemMonitoring:
+    """Testes para a coleta de métricas de sistema e alertas."""
+
+    @pytest.mark.asyncio
+    async def test_collect_does_not_block_loop(self):
+        """Testa que a coleta não bloqueia o event loop e registra métricas do processo."""
+        collector = MetricsCollector()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await collector._collect_system_metrics()
+        elapsed = time.perf_counter() - started
+        ticker_task.cancel()
+
+        assert elapsed < 0.5
+        assert collector.get_metric("process_threads").get_latest_value() >= 1
+        assert collector.get_metric("asyncio_tasks").get_latest_value() >= 1
+        assert collector.get_metric("cpu_usage_percentage").get_latest_value() is not None
+
+    @pytest.mark.asyncio
+    async def test_gc_metrics_exposed_as_counters(self):
+        """Testa que as coletas do GC acumulam como counter na exposição OpenMetrics."""
+        collector = MetricsCollector()
+        await collector._collect_system_metrics()
+        gc.collect()
+        await collector._collect_system_metrics()
+
+        totals = {
+            labels['generation']: total
+            for labels, total in collector.get_metric("gc_collections_total").iter_label_state()
+        }
+        assert 1 <= totals['2'] <= gc.get_stats()[2]['collections']
+
+        exposition = collector.to_openmetrics()
+        assert "# TYPE gc_collections counter" in exposition
+        assert 'gc_collections_total{generation="2"}' in exposition
+
+    @pytest.mark.asyncio
+    async def test_lag_probe_detects_blocked_loop(self):
+        """Testa que o probe mede o atraso quando o loop é bloqueado."""
+        collector = MetricsCollector(collection_interval=60, lag_probe_interval=0.01)
+        await collector.start_monitoring()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # Bloqueia o loop de propósito
+        await asyncio.sleep(0.05)
+        await collector.stop_monitoring()
+
+        lag = collector.get_metric("event_loop_lag_seconds").get_sketch()
+        assert lag.max >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_alert_handlers_run_without_lock(self):
+        """Testa que handlers assíncronos rodam sem o lock do coletor."""
+        collector = MetricsCollector()
+        collector.set_gauge("cpu_usage_percentage", 95.0)
+        acquired = []
+
+        def try_lock():
+            got = collector._lock.acquire(timeout=0.5)
+            acquired.append(got)
+            if got:
+                collector._lock.release()
+
+        async def handler(alert_type, metric, value):
+            # Outra thread precisa conseguir usar o coletor durante o handler
+            await asyncio.to_thread(try_lock)
+
+        collector.add_alert_handler(handler)
+        await collector._check_alerts()
+
+        assert acquired == [True]
+
+
+class TestOpenMetrics:
+    """Testes para a exposição OpenMetrics."""
+
+    def test_counter_and_gauge(self):
+        """Testa totais por labels de counters e último valor de gauges."""
+        collector = MetricsCollector()
+        collector.increment("http_requests_total", labels={'route': '/analyze', 'status': '200'})
+        collector.increment("http_requests_total", labels={'route': '/analyze', 'status': '200'})
+        collector.increment("http_requests_total", labels={'route': '/health', 'status': '200'})
+        collector.set_gauge("queue_depth", 3.0)
+        collector.set_gauge("queue_depth", 5.0)
+
+        text = collector.to_openmetrics()
+
+        assert "# TYPE http_requests counter" in text
+        assert 'http_requests_total{route="/analyze",status="200"} 2.0' in text
+        assert 'http_requests_total{route="/health",status="200"} 1.0' in text
+        assert "queue_depth 5.0" in text
+        assert text.endswith("# EOF\n")
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Testa buckets cumulativos, +Inf, _count e _sum."""
+        collector = MetricsCollector()
+        for value in (0.003, 0.02, 0.02, 30.0):
+            collector.observe_histogram("request_seconds", value, {'route': '/analyze'})
+
+        lines = collector.to_openmetrics().splitlines()
+
+        assert 'request_seconds_bucket{route="/analyze",le="0.005"} 1' in lines
+        assert 'request_seconds_bucket{route="/analyze",le="0.025"} 3' in lines
+        assert 'request_seconds_bucket{route="/analyze",le="+Inf"} 4' in lines
+        assert 'request_seconds_count{route="/analyze"} 4' in lines
+        assert any(line.startswith('request_seconds_sum{route="/analyze"} 30.04') for line in lines)
+
+    def test_label_escaping(self):
+        """Testa escape de aspas, barra invertida e quebra de linha."""
+        rendered = format_labels({'path': 'a"b\\c\nd', 'bad-key': 'x'})
+
+        assert rendered == '{bad_key="x",path="a\\"b\\\\c\\nd"}'
+
+    def test_unchanged_metrics_reuse_rendered_text(self):
+        """Testa que métricas sem novas observações não são re-renderizadas."""
+        collector = MetricsCollector()
+        collector.increment("jobs_total")
+        collector.to_openmetrics()
+        renderer = collector._openmetrics
+        cached = renderer._cache["jobs_total"]
+
+        collector.to_openmetrics()
+        assert renderer._cache["jobs_total"] is cached
+
+        collector.increment("jobs_total")
+        assert "jobs_total 2.0" in collector.to_openmetrics()
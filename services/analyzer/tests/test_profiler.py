@@ -0,0 +1,82 @@
+"""
+Testes para o profiler por amostragem
+
+Testa a coleta de pilhas folded, a exclusividade da coleta e a
+verificação da chave administrativa.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.infrastructure.monitoring.profiler import ProfilerBusyError, SamplingProfiler
+from src.middleware.auth import is_admin_key
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """Função quente usada como alvo da amostragem."""
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+class TestSamplingProfiler:
+    """Testes para SamplingProfiler."""
+
+    def test_hot_function_in_folded_stacks(self):
+        """Testa que a função em execução aparece nas pilhas e no resumo."""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="hot-worker")
+        worker.start()
+        try:
+            result = SamplingProfiler().profile(duration=0.2, interval=0.002)
+        finally:
+            stop.set()
+            worker.join()
+
+        folded = result.to_folded().splitlines()
+        hot = [line for line in folded if line.startswith("hot-worker;")]
+
+        assert result.samples > 10
+        assert hot and all(line.rsplit(" ", 1)[1].isdigit() for line in hot)
+        assert any("busy_loop (test_profiler.py:" in line for line in hot)
+        assert "sampling-profiler" not in result.threads
+        assert result.to_dict()['top_functions'][0]['self_samples'] > 0
+
+    def test_single_profile_at_a_time(self):
+        """Testa que uma segunda coleta concorrente é recusada."""
+        profiler = SamplingProfiler()
+        worker = threading.Thread(target=profiler.profile, args=(0.3,))
+        worker.start()
+        while not profiler.is_running:
+            time.sleep(0.001)
+
+        with pytest.raises(ProfilerBusyError):
+            profiler.profile(duration=0.01)
+
+        worker.join()
+        assert not profiler.is_running
+
+    def test_no_sampler_thread_when_inactive(self):
+        """Testa que nenhuma thread de amostragem fica viva após a coleta."""
+        SamplingProfiler().profile(duration=0.01)
+
+        assert "sampling-profiler" not in {thread.name for thread in threading.enumerate()}
+
+
+class TestAdminKey:
+    """Testes para a chave administrativa."""
+
+    def test_disabled_without_env(self, monkeypatch):
+        """Testa que sem ADMIN_API_KEY nenhuma chave é aceita."""
+        monkeypatch.delenv("ADMIN_API_KEY", raising=False)
+
+        assert not is_admin_key("qualquer")
+
+    def test_matches_env_key(self, monkeypatch):
+        """Testa comparação com a chave configurada."""
+        monkeypatch.setenv("ADMIN_API_KEY", "segredo")
+
+        assert is_admin_key("segredo")
+        assert not is_admin_key("errado")
+        assert not is_admin_key(None)
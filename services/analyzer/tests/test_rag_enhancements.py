@@ -0,0 +1,132 @@
+"""
+Testes para RAG Enhancements
+
+Testa a deduplicação semântica vetorizada e o chunking semântico.
+"""
+
+import numpy as np
+import pytest
+
+from src.ml.rag_enhancements import SemanticDeduplicator, AdaptiveChunker, ChunkingStrategy
+from src.ml.embeddings import HashingEmbedder
+
+
+def make_embeddings(seed: int = 0) -> np.ndarray:
+    """Helper: 50 vetores base + 25 quase-duplicatas, embaralhados."""
+    rng = np.random.default_rng(seed)
+    base = rng.standard_normal((50, 32))
+    near = base[:25] + 0.01 * rng.standard_normal((25, 32))
+    return np.concatenate([base, near])[rng.permutation(75)]
+
+
+TOPICS = (
+    "O prazo de entrega é de trinta dias. A entrega deve ocorrer no almoxarifado. "
+    "O prazo pode ser prorrogado. ",
+    "A habilitação jurídica exige contrato social. A regularidade fiscal exige "
+    "certidões negativas. A habilitação técnica exige atestados. ",
+    "O valor estimado é de cem mil reais. A dotação orçamentária está prevista. "
+    "O pagamento será mensal. ",
+)
+
+
+def reference_removed(embeddings: np.ndarray, threshold: float) -> list:
+    """Implementação gulosa de referência (comparação par a par)."""
+    accepted, removed = [], []
+    for i, emb in enumerate(embeddings):
+        unit = emb / np.linalg.norm(emb)
+        if any(float(unit @ other) >= threshold for other in accepted):
+            removed.append(i)
+        else:
+            accepted.append(unit)
+    return removed
+
+
+class TestSemanticDeduplicator:
+    """Testes para SemanticDeduplicator."""
+
+    def test_exact_matches_reference(self):
+        """Testa que o modo exato em blocos reproduz a passada gulosa."""
+        embeddings = make_embeddings()
+        chunks = list(range(len(embeddings)))
+        dedup = SemanticDeduplicator(similarity_threshold=0.95, block_size=16)
+
+        unique, removed = dedup.deduplicate(chunks, embeddings.tolist(), approximate=False)
+
+        assert removed == reference_removed(embeddings, 0.95)
+        assert len(unique) == 50
+
+    def test_lsh_only_removes_true_duplicates(self):
+        """Testa que o modo LSH não remove chunks distintos."""
+        embeddings = make_embeddings(seed=1)
+        chunks = list(range(len(embeddings)))
+        dedup = SemanticDeduplicator(similarity_threshold=0.95)
+
+        _, removed = dedup.deduplicate(chunks, embeddings, approximate=True)
+
+        assert set(removed) <= set(reference_removed(embeddings, 0.95))
+
+    def test_zero_vectors_are_kept(self):
+        """Testa que vetores nulos não são considerados duplicados."""
+        dedup = SemanticDeduplicator()
+
+        unique, removed = dedup.deduplicate(['a', 'b'], [[0.0, 0.0], [0.0, 0.0]])
+
+        assert unique == ['a', 'b']
+        assert removed == []
+
+    def test_ragged_embeddings_raise(self):
+        """Testa erro para embeddings de dimensões diferentes."""
+        with pytest.raises(ValueError):
+            SemanticDeduplicator().deduplicate(['a', 'b'], [[1.0, 0.0], [1.0]])
+
+
+class TestSemanticChunking:
+    """Testes para o chunking semântico do AdaptiveChunker."""
+
+    @pytest.fixture
+    def text(self):
+        """Três blocos de assunto distintos, cada um repetido."""
+        return "".join(topic * 4 for topic in TOPICS)
+
+    def test_cuts_at_topic_boundaries(self, text):
+        """Testa que os cortes caem nas trocas de assunto e os offsets são reais."""
+        chunker = AdaptiveChunker(embedder=HashingEmbedder(dim=256))
+        chunker.chunk_sizes['default'] = 700
+
+        chunks = chunker.chunk_document(text, "doc-1", strategy=ChunkingStrategy.SEMANTIC)
+
+        assert [c.text.split('.')[0] for c in chunks] == [t.split('.')[0] for t in TOPICS]
+        for chunk in chunks:
+            start, end = chunk.metadata.start_char, chunk.metadata.end_char
+            assert text[start:end].strip() == chunk.text
+        assert 'prazo' in chunks[0].metadata.main_topics
+
+    def test_respects_chunk_size(self, text):
+        """Testa que nenhum chunk excede o tamanho configurado."""
+        chunker = AdaptiveChunker(embedder=HashingEmbedder(dim=256))
+        chunker.chunk_sizes['default'] = 300
+
+        chunks = chunker.chunk_document(text, "doc-1", strategy=ChunkingStrategy.SEMANTIC)
+
+        assert len(chunks) > 3
+        assert all(len(c.text) <= 300 for c in chunks)
+        assert "".join(c.text for c in chunks).replace(" ", "") == text.replace(" ", "")
+
+    def test_embeddings_are_batched_and_cached(self, text):
+        """Testa lotes no embedder e reuso do cache ao re-chunkar."""
+        embedder = HashingEmbedder(dim=64)
+        calls = []
+
+        def counting_embedder(texts):
+            calls.append(len(texts))
+            return embedder(texts)
+
+        chunker = AdaptiveChunker(embedder=counting_embedder, embedding_batch_size=4)
+        chunker.chunk_document(text, "doc-1", strategy=ChunkingStrategy.SEMANTIC)
+
+        # 9 sentenças distintas no texto, embedadas em lotes de até 4
+        assert calls == [4, 4, 1]
+
+        chunker.chunk_sizes['default'] = 300
+        chunker.chunk_document(text, "doc-1", strategy=ChunkingStrategy.SEMANTIC)
+        assert calls == [4, 4, 1]
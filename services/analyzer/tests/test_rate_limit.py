@@ -0,0 +1,157 @@
+"""
+Testes para o rate limiting
+
+Testa o contador de janela deslizante, o isolamento por endpoint,
+o despejo LRU da tabela de clientes e o backend Redis compartilhado.
+"""
+
+import pytest
+import fakeredis
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from src.middleware import rate_limit as rate_limit_module
+from src.middleware.rate_limit import (
+    InMemoryRateLimitBackend,
+    RedisRateLimitBackend,
+    SlidingWindowRateLimiter,
+    rate_limit
+)
+
+LIMITS = {
+    'analyze': {'requests': 3, 'window_seconds': 60},
+    'default': {'requests': 5, 'window_seconds': 60}
+}
+WINDOW_START = 1_700_000_040.0  # múltiplo de 60
+
+
+def make_request(path: str = "/analyze", ip: str = "10.0.0.1") -> Request:
+    """Request mínima do Starlette."""
+    return Request({
+        'type': 'http',
+        'method': 'POST',
+        'path': path,
+        'headers': [(b'user-agent', b'pytest')],
+        'client': (ip, 1234),
+        'query_string': b''
+    })
+
+
+class TestSlidingWindowRateLimiter:
+    """Testes para SlidingWindowRateLimiter em memória."""
+
+    @pytest.mark.asyncio
+    async def test_limit_within_window(self):
+        """Testa bloqueio ao atingir o limite e Retry-After até a virada."""
+        limiter = SlidingWindowRateLimiter(limits=LIMITS)
+        decisions = [await limiter.check("c1", "analyze", now=WINDOW_START + 10) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+        assert decisions[3].retry_after == pytest.approx(50 + 60 * (1 - 2 / 3))
+
+    @pytest.mark.asyncio
+    async def test_previous_window_is_weighted(self):
+        """Testa que a janela anterior conta proporcionalmente ao tempo restante."""
+        limiter = SlidingWindowRateLimiter(limits=LIMITS)
+        for _ in range(3):
+            await limiter.check("c1", "analyze", now=WINDOW_START + 59)
+
+        # 15s na janela seguinte: estimativa 3 * 0.75 = 2.25
+        blocked = await limiter.check("c1", "analyze", now=WINDOW_START + 75)
+        # 45s na janela seguinte: estimativa 3 * 0.25 = 0.75
+        allowed = await limiter.check("c1", "analyze", now=WINDOW_START + 105)
+
+        assert not blocked.allowed
+        assert blocked.retry_after == pytest.approx(60 * (1 - 2 / 3) - 15)
+        assert allowed.allowed
+
+    @pytest.mark.asyncio
+    async def test_state_per_client_and_endpoint(self):
+        """Testa que cada (cliente, endpoint) tem seu próprio contador."""
+        limiter = SlidingWindowRateLimiter(limits=LIMITS)
+        for _ in range(3):
+            await limiter.check("c1", "analyze", now=WINDOW_START)
+
+        assert not (await limiter.check("c1", "analyze", now=WINDOW_START)).allowed
+        assert (await limiter.check("c1", "default", now=WINDOW_START)).allowed
+        assert (await limiter.check("c2", "analyze", now=WINDOW_START)).allowed
+        assert (await limiter.check("c1", "upload", now=WINDOW_START)).limit == 5
+
+    @pytest.mark.asyncio
+    async def test_client_table_is_bounded(self):
+        """Testa despejo do cliente menos recente ao atingir a capacidade."""
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        limiter = SlidingWindowRateLimiter(backend, limits=LIMITS)
+        await limiter.check("c1", "analyze", now=WINDOW_START)
+        await limiter.check("c2", "analyze", now=WINDOW_START)
+        await limiter.check("c1", "analyze", now=WINDOW_START)
+        await limiter.check("c3", "analyze", now=WINDOW_START)
+
+        assert len(backend) == 2
+        assert await backend.peek("c2:analyze", 60, WINDOW_START) is None
+        assert await backend.peek("c1:analyze", 60, WINDOW_START) == (0, 2)
+
+    @pytest.mark.asyncio
+    async def test_dependency_raises_429(self, monkeypatch):
+        """Testa HTTPException 429 com header Retry-After na dependência."""
+        monkeypatch.setattr(rate_limit_module, "_rate_limiter", SlidingWindowRateLimiter(limits=LIMITS))
+        for _ in range(3):
+            await rate_limit(make_request())
+
+        with pytest.raises(HTTPException) as exc_info:
+            await rate_limit(make_request())
+        await rate_limit(make_request(ip="10.0.0.2"))
+
+        assert exc_info.value.status_code == 429
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+
+
+class TestRedisRateLimitBackend:
+    """Testes para o backend Redis (script Lua) com fakeredis."""
+
+    @pytest.mark.asyncio
+    async def test_limit_shared_across_instances(self):
+        """Testa que duas instâncias compartilham o mesmo contador."""
+        server = fakeredis.FakeServer()
+        first = SlidingWindowRateLimiter(
+            RedisRateLimitBackend(fakeredis.FakeAsyncRedis(server=server)), limits=LIMITS
+        )
+        second = SlidingWindowRateLimiter(
+            RedisRateLimitBackend(fakeredis.FakeAsyncRedis(server=server)), limits=LIMITS
+        )
+
+        results = []
+        for limiter in (first, second, first, second):
+            results.append(await limiter.check("c1", "analyze", now=WINDOW_START + 10))
+
+        assert [d.allowed for d in results] == [True, True, True, False]
+        assert results[3].retry_after == pytest.approx(50 + 60 * (1 - 2 / 3), abs=0.001)
+
+    @pytest.mark.asyncio
+    async def test_matches_in_memory_algorithm(self):
+        """Testa que o script Lua decide igual ao backend em memória."""
+        redis_limiter = SlidingWindowRateLimiter(
+            RedisRateLimitBackend(fakeredis.FakeAsyncRedis()), limits=LIMITS
+        )
+        memory_limiter = SlidingWindowRateLimiter(limits=LIMITS)
+
+        for offset in (0, 20, 40, 59, 65, 70, 90, 100, 110, 200):
+            now = WINDOW_START + offset
+            expected = await memory_limiter.check("c1", "analyze", now=now)
+            actual = await redis_limiter.check("c1", "analyze", now=now)
+            assert (actual.allowed, actual.remaining) == (expected.allowed, expected.remaining)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_memory_on_error(self):
+        """Testa fallback local quando o Redis está indisponível."""
+
+        class BrokenBackend:
+            async def hit(self, *args):
+                raise ConnectionError("redis down")
+
+        limiter = SlidingWindowRateLimiter(BrokenBackend(), limits=LIMITS)
+        decision = await limiter.check("c1", "analyze", now=WINDOW_START)
+
+        assert decision.allowed
+        assert len(limiter.fallback) == 1
@@ -0,0 +1,363 @@
+"""
+Testes para os repositórios em memória
+
+Testa os índices secundários: hash do conteúdo e MinHash LSH dos
+documentos, análises por organização ordenadas por data, agregados
+diários de analytics e a trie de chaves do cache.
+"""
+
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.domain.entities.analysis import (
+    Analysis,
+    ConformityScores,
+    Finding,
+    FindingCategory,
+    FindingSeverity
+)
+from src.domain.entities.document import Document, DocumentId
+from src.domain.entities.organization import OrganizationId
+from src.infrastructure.repositories.in_memory_repositories import (
+    InMemoryAnalysisRepository,
+    InMemoryCacheRepository,
+    InMemoryDocumentRepository,
+    _KeyTrie
+)
+from src.infrastructure.repositories.minhash_lsh import MinHashLSHIndex, jaccard_similarity
+
+BASE_TIME = datetime(2024, 5, 1, 12, 0)
+
+VOCABULARY = [f"termo{i}" for i in range(5000)]
+
+
+def make_text(rng: random.Random, words: int = 300) -> str:
+    return " ".join(rng.sample(VOCABULARY, words))
+
+
+def mutate(rng: random.Random, text: str, changes: int) -> str:
+    """Troca `changes` palavras do texto por palavras novas."""
+    words = text.split()
+    for position in rng.sample(range(len(words)), changes):
+        words[position] = f"novo{rng.randrange(10 ** 6)}"
+    return " ".join(words)
+
+
+def make_analysis(organization: str, minutes: int, document: str = "doc-1") -> Analysis:
+    analysis = Analysis.create(
+        document_id=document,
+        organization_id=organization,
+        conformity_scores=ConformityScores(80.0, 70.0, 90.0, 60.0, 75.0),
+        weighted_score=75.0
+    )
+    analysis.created_at = BASE_TIME + timedelta(minutes=minutes)
+    return analysis
+
+
+def make_finding(index: int, severity: FindingSeverity) -> Finding:
+    return Finding(
+        id=f"f{index}",
+        category=FindingCategory.JURIDICO,
+        severity=severity,
+        title="Prazo sem fundamento legal",
+        description="O prazo não cita a lei aplicável.",
+        suggestion="Citar a Lei 14.133/2021."
+    )
+
+
+def brute_force_analytics(analyses, organization=None, start=None, end=None) -> dict:
+    """Analytics recalculados a partir de todas as análises."""
+    selected = [
+        a for a in analyses
+        if (organization is None or str(a.organization_id) == organization)
+        and (start is None or a.created_at >= start)
+        and (end is None or a.created_at <= end)
+    ]
+    statuses, severities = {}, {}
+    for analysis in selected:
+        statuses[analysis.status.value] = statuses.get(analysis.status.value, 0) + 1
+        for finding in analysis.findings:
+            severities[finding.severity.value] = severities.get(finding.severity.value, 0) + 1
+    return {
+        'total_analyses': len(selected),
+        'average_score': round(sum(a.weighted_score for a in selected) / len(selected), 2) if selected else 0,
+        'total_findings': sum(len(a.findings) for a in selected),
+        'analyses_by_status': statuses,
+        'findings_by_severity': severities
+    }
+
+
+class TestInMemoryDocumentRepository:
+    """Testes para o índice de hash de documentos."""
+
+    async def test_find_by_content_hash(self):
+        """Testa busca por hash e reindexação ao salvar conteúdo novo."""
+        repository = InMemoryDocumentRepository()
+        document = Document.create("doc-1", "Edital", "Conteúdo original")
+        await repository.save(document)
+        original_hash = document.get_content_hash()
+
+        assert await repository.find_by_content_hash(original_hash) is document
+
+        document.update_content("Conteúdo revisado")
+        await repository.save(document)
+
+        assert await repository.find_by_content_hash(original_hash) is None
+        assert await repository.find_by_content_hash(document.get_content_hash()) is document
+
+    async def test_duplicate_content_survives_delete(self):
+        """Testa que o hash continua indexado enquanto houver documento com ele."""
+        repository = InMemoryDocumentRepository()
+        first = Document.create("doc-1", "Edital", "Mesmo conteúdo")
+        second = Document.create("doc-2", "Cópia", "Mesmo conteúdo")
+        await repository.save(first)
+        await repository.save(second)
+
+        assert await repository.find_by_content_hash(first.get_content_hash()) is first
+
+        assert await repository.delete(DocumentId("doc-1"))
+        assert await repository.find_by_content_hash(first.get_content_hash()) is second
+
+        assert await repository.delete(DocumentId("doc-2"))
+        assert await repository.find_by_content_hash(first.get_content_hash()) is None
+
+
+class TestFindSimilarDocuments:
+    """Testes para a busca de quase-duplicatas via MinHash LSH."""
+
+    async def test_matches_exact_scan(self):
+        """Testa que o LSH encontra os mesmos documentos que a varredura."""
+        rng = random.Random(3)
+        repository = InMemoryDocumentRepository()
+        originals = [make_text(rng) for _ in range(20)]
+        documents = [Document.create(f"doc-{i:03d}", "Edital", text) for i, text in enumerate(originals)]
+        # Reenvios com 0 a 20 palavras trocadas (Jaccard de ~1.0 a ~0.87)
+        for i, text in enumerate(originals):
+            documents.append(Document.create(f"dup-{i:03d}", "Reenvio", mutate(rng, text, i)))
+        for document in documents:
+            await repository.save(document)
+
+        for document in documents:
+            expected = [
+                other for other in documents
+                if other.id != document.id and document.is_content_similar_to(other.content, 0.8)
+            ]
+            found = await repository.find_similar_documents(document, threshold=0.8)
+            assert set(found) == set(expected)
+
+    async def test_most_similar_first_and_index_follows_updates(self):
+        """Testa ordenação por similaridade e reindexação no save/delete."""
+        rng = random.Random(5)
+        repository = InMemoryDocumentRepository()
+        text = make_text(rng)
+        query = Document.create("doc-query", "Edital", text)
+        close = Document.create("doc-close", "Reenvio", mutate(rng, text, 2))
+        far = Document.create("doc-far", "Reenvio", mutate(rng, text, 10))
+        for document in (query, close, far):
+            await repository.save(document)
+
+        assert await repository.find_similar_documents(query, threshold=0.9) == [close, far]
+
+        close.update_content(make_text(rng))
+        await repository.save(close)
+        await repository.delete(DocumentId("doc-far"))
+
+        assert await repository.find_similar_documents(query, threshold=0.9) == []
+
+    async def test_low_threshold_scans_everything(self):
+        """Testa que limiares abaixo do mínimo do LSH não perdem documentos."""
+        repository = InMemoryDocumentRepository()
+        first = Document.create("doc-1", "A", "pregão eletrônico objeto aquisição")
+        second = Document.create("doc-2", "B", "pregão eletrônico serviço contínuo")
+        await repository.save(first)
+        await repository.save(second)
+
+        assert await repository.find_similar_documents(first, threshold=0.3) == [second]
+
+
+class TestMinHashLSHIndex:
+    """Testes para o índice MinHash LSH."""
+
+    def test_jaccard_similarity(self):
+        """Testa Jaccard exato e conjuntos vazios."""
+        assert jaccard_similarity({"a", "b", "c"}, {"b", "c", "d"}) == 0.5
+        assert jaccard_similarity(set(), {"a"}) == 0.0
+
+    def test_shared_buckets_shrink_back(self):
+        """Testa add/remove com buckets compartilhados por vários documentos."""
+        index = MinHashLSHIndex()
+        words = frozenset(VOCABULARY[:100])
+        for key in ("a", "b", "c"):
+            index.add(key, words)
+
+        assert index.candidates(words) == {"a", "b", "c"}
+
+        index.remove("b")
+        index.add("c", frozenset(VOCABULARY[1000:1100]))
+
+        assert index.candidates(words) == {"a"}
+        assert len(index) == 2 and "b" not in index
+
+
+class TestInMemoryAnalysisRepository:
+    """Testes para o índice de análises por organização."""
+
+    async def test_recent_by_organization_in_date_order(self):
+        """Testa ordenação mesmo com inserção fora de ordem."""
+        repository = InMemoryAnalysisRepository()
+        for minutes in (5, 1, 9, 3):
+            await repository.save(make_analysis("org-a", minutes))
+        await repository.save(make_analysis("org-b", 20))
+
+        recent = await repository.find_recent_by_organization(OrganizationId("org-a"), limit=3)
+
+        assert [a.created_at.minute for a in recent] == [9, 5, 3]
+        assert await repository.find_recent_by_organization(OrganizationId("org-a"), limit=0) == []
+
+    async def test_resave_moves_index_entry(self):
+        """Testa que salvar de novo com outra data reposiciona a análise."""
+        repository = InMemoryAnalysisRepository()
+        old, new = make_analysis("org-a", 1), make_analysis("org-a", 2)
+        await repository.save(old)
+        await repository.save(new)
+
+        old.created_at = BASE_TIME + timedelta(minutes=30)
+        await repository.save(old)
+
+        recent = await repository.find_recent_by_organization(OrganizationId("org-a"))
+        assert recent == [old, new]
+
+    async def test_document_filter_and_analytics_range(self):
+        """Testa busca por documento e analytics com intervalo de datas."""
+        repository = InMemoryAnalysisRepository()
+        for minutes in range(10):
+            await repository.save(make_analysis("org-a", minutes, document=f"doc-{minutes % 2}"))
+
+        by_document = await repository.find_by_document_and_organization(
+            DocumentId("doc-1"), OrganizationId("org-a")
+        )
+        analytics = await repository.get_analytics(
+            OrganizationId("org-a"),
+            start_date=(BASE_TIME + timedelta(minutes=2)).isoformat(),
+            end_date=(BASE_TIME + timedelta(minutes=5)).isoformat()
+        )
+
+        assert [a.created_at.minute for a in by_document] == [9, 7, 5, 3, 1]
+        assert analytics['total_analyses'] == 4
+
+    async def test_analytics_match_brute_force(self):
+        """Testa agregados diários contra recálculo completo em períodos aleatórios."""
+        rng = random.Random(11)
+        repository = InMemoryAnalysisRepository()
+        analyses = []
+        for i in range(300):
+            analysis = make_analysis(f"org-{i % 3}", rng.randrange(10 * 24 * 60))
+            analysis.weighted_score = rng.uniform(0, 100)
+            analysis.findings = [make_finding(j, rng.choice(list(FindingSeverity))) for j in range(rng.randrange(4))]
+            analyses.append(analysis)
+            await repository.save(analysis)
+
+        # Atualizações depois do primeiro save: status, findings e data
+        for analysis in rng.sample(analyses, 60):
+            analysis.mark_as_completed()
+            analysis.findings = analysis.findings[:1]
+            analysis.created_at += timedelta(hours=rng.randrange(-30, 30))
+            await repository.save(analysis)
+
+        for _ in range(100):
+            organization = rng.choice([None, "org-0", "org-1", "org-2"])
+            start = rng.choice([None, BASE_TIME + timedelta(minutes=rng.randrange(-600, 15000))])
+            end = rng.choice([None, BASE_TIME + timedelta(minutes=rng.randrange(-600, 15000))])
+            analytics = await repository.get_analytics(
+                OrganizationId(organization) if organization else None,
+                start_date=start.isoformat() if start else None,
+                end_date=end.isoformat() if end else None
+            )
+            analytics.pop('period', None)
+            assert analytics == brute_force_analytics(analyses, organization, start, end)
+
+    async def test_analytics_accepts_utc_suffix(self):
+        """Testa datas com sufixo Z comparadas com created_at UTC."""
+        repository = InMemoryAnalysisRepository()
+        for minutes in (0, 60 * 24, 60 * 48):
+            await repository.save(make_analysis("org-a", minutes))
+
+        analytics = await repository.get_analytics(
+            OrganizationId("org-a"), start_date="2024-05-02T00:00:00Z", end_date="2024-05-03T11:59:59Z"
+        )
+
+        assert analytics['total_analyses'] == 1
+
+    async def test_delete_old_analyses(self):
+        """Testa remoção das análises antigas de todas as organizações."""
+        repository = InMemoryAnalysisRepository()
+        now = datetime.utcnow()
+        for organization in ("org-a", "org-b"):
+            for days in (200, 100, 1):
+                analysis = make_analysis(organization, 0)
+                analysis.created_at = now - timedelta(days=days)
+                await repository.save(analysis)
+
+        assert await repository.delete_old_analyses(days_old=90) == 4
+        for organization in ("org-a", "org-b"):
+            assert len(await repository.find_recent_by_organization(OrganizationId(organization))) == 1
+        assert (await repository.get_analytics())['total_analyses'] == 2
+
+
+class TestKeyTrie:
+    """Testes para a trie de chaves do cache."""
+
+    def test_matches_linear_scan(self):
+        """Testa with_prefix contra varredura linear após inserções e remoções."""
+        rng = random.Random(7)
+        trie = _KeyTrie()
+        keys = set()
+        for _ in range(2000):
+            key = ":".join(rng.choice(["a", "ab", "b", ""]) for _ in range(rng.randint(1, 4)))
+            if key in keys and rng.random() < 0.5:
+                keys.discard(key)
+                trie.remove(key)
+            else:
+                keys.add(key)
+                trie.add(key)
+
+        for prefix in ("", "a", "a:", "ab", "a:b", "a:ab:", ":", "b:a:a"):
+            expected = sorted(k for k in keys if k.startswith(prefix))
+            assert sorted(trie.with_prefix(prefix)) == expected
+
+        for key in list(keys):
+            trie.remove(key)
+        assert trie.with_prefix("") == []
+
+
+class TestInMemoryCacheRepository:
+    """Testes para clear_pattern sobre a trie."""
+
+    @pytest.mark.parametrize("pattern", [
+        "analysis:*", "analysis:ab*", "analysis:abc:*", "*:x1", "analysis", "an?lysis:*", "rag|analysis:a*"
+    ])
+    async def test_clear_pattern_matches_regex_semantics(self, pattern):
+        """Testa que clear_pattern remove exatamente as chaves aceitas pelo regex."""
+        keys = ["analysis:abc:x1", "analysis:abd:x2", "analysis:zzz:x1", "analysis", "rag:abc:x1", "anlysis:q"]
+        repository = InMemoryCacheRepository()
+        for key in keys:
+            await repository.set(key, {'key': key})
+
+        regex = re.compile(pattern.replace('*', '.*'))
+        expected = {key for key in keys if regex.match(key)}
+
+        assert await repository.clear_pattern(pattern) == len(expected)
+        for key in keys:
+            assert await repository.exists(key) is (key not in expected)
+
+    async def test_expired_entries_leave_index(self):
+        """Testa que entradas expiradas saem também do índice."""
+        repository = InMemoryCacheRepository()
+        await repository.set("analysis:a", {}, ttl_seconds=-1)
+        await repository.set("analysis:b", {})
+
+        assert await repository.cleanup_expired() == 1
+        assert await repository.clear_pattern("analysis:*") == 1
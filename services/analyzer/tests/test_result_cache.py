@@ -0,0 +1,137 @@
+"""
+Testes para o cache de resultados
+
+Testa a ordem LRU, os limites por entradas e bytes, a expiração por
+idade monotônica, o stale-while-revalidate e a estimativa de tamanho
+dos resultados.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.result_cache import (
+    CACHE_HIT,
+    CACHE_MISS,
+    CACHE_STALE,
+    ResultCache,
+    estimate_result_size
+)
+
+
+class FakeClock:
+    """Relógio controlado pelo teste."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestResultCache:
+    """Testes para ResultCache."""
+
+    def test_hit_and_miss(self, clock):
+        """Testa status hit e miss."""
+        cache = ResultCache(clock=clock)
+        cache.put("a", "resultado")
+
+        assert cache.get("a") == ("resultado", CACHE_HIT)
+        assert cache.get("b") == (None, CACHE_MISS)
+
+    def test_least_recently_used_is_evicted(self, clock):
+        """Testa despejo da entrada menos usada, não da mais antiga."""
+        cache = ResultCache(max_entries=2, clock=clock)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+
+    def test_byte_limit(self, clock):
+        """Testa limite por bytes estimados e contabilidade ao substituir."""
+        cache = ResultCache(max_bytes=10, sizeof=len, clock=clock)
+        cache.put("a", "xxxx")
+        cache.put("b", "yyyy")
+        cache.put("a", "zz")
+        assert cache.size_bytes == 6
+
+        cache.put("c", "wwwww")
+
+        assert "b" not in cache
+        assert cache.size_bytes == 7
+
+    def test_entry_expires_after_ttl(self, clock):
+        """Testa expiração; idades acima de 24h não voltam a parecer frescas."""
+        cache = ResultCache(ttl_seconds=3600, clock=clock)
+        cache.put("a", 1)
+
+        clock.now += 86400 + 60
+        assert cache.get("a") == (None, CACHE_MISS)
+        assert len(cache) == 0
+
+    def test_stale_while_revalidate(self, clock):
+        """Testa janela stale com uma única revalidação em andamento."""
+        cache = ResultCache(ttl_seconds=60, stale_seconds=30, clock=clock)
+        cache.put("a", "antigo")
+        clock.now += 75
+
+        assert cache.get("a") == ("antigo", CACHE_STALE)
+        assert cache.begin_revalidation("a")
+        assert not cache.begin_revalidation("a")
+
+        cache.put("a", "novo")
+        assert cache.get("a") == ("novo", CACHE_HIT)
+
+        clock.now += 100
+        assert cache.get("a") == (None, CACHE_MISS)
+
+    def test_failed_revalidation_can_retry(self, clock):
+        """Testa que end_revalidation libera nova tentativa."""
+        cache = ResultCache(ttl_seconds=60, stale_seconds=30, clock=clock)
+        cache.put("a", 1)
+        clock.now += 70
+        cache.begin_revalidation("a")
+
+        cache.end_revalidation("a")
+
+        assert cache.begin_revalidation("a")
+
+
+class TestEstimateResultSize:
+    """Testes para a estimativa de tamanho sem serialização."""
+
+    @staticmethod
+    def result(findings: int, text: str = "Prazo de impugnação ausente no edital. " * 5):
+        finding = SimpleNamespace(title="Prazo", description=text, suggestion=text, context=None, location="Seção 3")
+        return SimpleNamespace(findings=[finding] * findings, recommendations=["Revisar prazos"] * 3)
+
+    def test_grows_with_findings_and_text(self):
+        """Testa que o tamanho acompanha número de findings e textos."""
+        assert estimate_result_size(self.result(0)) < estimate_result_size(self.result(10))
+        assert estimate_result_size(self.result(5, "curto")) < estimate_result_size(self.result(5))
+
+    def test_same_order_of_magnitude_as_json(self):
+        """Testa que a estimativa fica na ordem de grandeza do JSON dos findings."""
+        result = self.result(50)
+        findings_json = len(json.dumps([vars(f) for f in result.findings]))
+
+        assert findings_json < estimate_result_size(result) < 4 * findings_json
+
+    def test_cache_uses_estimate_for_byte_limit(self):
+        """Testa o limite por bytes com a estimativa como sizeof."""
+        cache = ResultCache(max_bytes=2 * estimate_result_size(self.result(10)), sizeof=estimate_result_size)
+        for key in "abc":
+            cache.put(key, self.result(10))
+
+        assert "a" not in cache
+        assert len(cache) == 2
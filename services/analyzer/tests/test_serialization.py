@@ -0,0 +1,145 @@
+"""
+Testes para a serialização JSON
+
+Testa to_builtins (conversores por tipo), a equivalência entre orjson
+e o fallback da stdlib e os adapters de FastAPI e Flask.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+import pytest
+from pydantic import BaseModel
+
+from src.infrastructure.serialization import json_codec
+from src.infrastructure.serialization.json_codec import dumps, loads, to_builtins
+from src.infrastructure.serialization.fastapi_response import FastJSONResponse
+
+
+class Severity(str, Enum):
+    HIGH = "alta"
+
+
+@dataclass
+class Item:
+    id: str
+    severity: Severity
+    created_at: datetime
+    tags: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Report:
+    score: float
+    items: List[Item]
+    extra: Dict[str, object] = field(default_factory=dict)
+    parent: Optional["Report"] = None
+
+
+class Summary(BaseModel):
+    title: str
+    generated_at: datetime
+
+
+CREATED = datetime(2024, 5, 1, 12, 30)
+
+
+def make_report() -> Report:
+    return Report(
+        score=np.float64(87.5),
+        items=[Item("f1", Severity.HIGH, CREATED, ["lei"])],
+        extra={
+            'id': UUID("12345678-1234-5678-1234-567812345678"),
+            'counts': np.array([1, 2]),
+            'summary': Summary(title="ok", generated_at=CREATED),
+            Severity.HIGH: {1, 2}
+        }
+    )
+
+
+EXPECTED = {
+    'score': 87.5,
+    'items': [{'id': 'f1', 'severity': 'alta', 'created_at': '2024-05-01T12:30:00', 'tags': ['lei']}],
+    'extra': {
+        'id': '12345678-1234-5678-1234-567812345678',
+        'counts': [1, 2],
+        'summary': {'title': 'ok', 'generated_at': '2024-05-01T12:30:00'},
+        'alta': [1, 2]
+    },
+    'parent': None
+}
+
+
+class TestToBuiltins:
+    """Testes para to_builtins."""
+
+    def test_nested_structures(self):
+        """Testa dataclasses, enums, datetimes, UUID, numpy e Pydantic aninhados."""
+        converted = to_builtins(make_report())
+
+        assert converted == EXPECTED
+        assert type(converted['score']) is float
+        json.dumps(converted)
+
+    def test_result_is_a_copy(self):
+        """Testa que alterar o resultado não altera o objeto original."""
+        report = make_report()
+        converted = to_builtins(report)
+        converted['items'][0]['tags'].append("nova")
+
+        assert report.items[0].tags == ["lei"]
+
+    def test_unknown_types_pass_through(self):
+        """Testa que tipos desconhecidos são mantidos (como ModelConverter.to_json_safe)."""
+        marker = object()
+        assert to_builtins({'x': marker})['x'] is marker
+
+
+class TestDumps:
+    """Testes para dumps/loads."""
+
+    def test_stdlib_fallback_matches(self, monkeypatch):
+        """Testa que o fallback da stdlib gera o mesmo documento que o orjson."""
+        fast = loads(dumps(make_report()))
+        monkeypatch.setattr(json_codec, "HAS_ORJSON", False)
+        fallback = loads(dumps(make_report()))
+
+        assert fast == fallback == EXPECTED
+
+    def test_compact_utf8(self):
+        """Testa saída compacta em UTF-8 sem escapes."""
+        assert dumps({'título': "licitação"}) == '{"título":"licitação"}'.encode()
+
+    def test_unserializable_raises(self):
+        """Testa TypeError para tipos sem conversor."""
+        with pytest.raises(TypeError):
+            dumps({'x': object()})
+
+
+class TestAdapters:
+    """Testes para os adapters de framework."""
+
+    def test_fastapi_response(self):
+        """Testa FastJSONResponse com dataclass direta."""
+        response = FastJSONResponse(make_report())
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == EXPECTED
+
+    def test_flask_provider(self):
+        """Testa jsonify com o FastJSONProvider."""
+        flask = pytest.importorskip("flask")
+        from src.infrastructure.serialization.flask_provider import FastJSONProvider
+
+        app = flask.Flask(__name__)
+        app.json = FastJSONProvider(app)
+        with app.app_context():
+            response = flask.jsonify(make_report())
+
+        assert response.mimetype == "application/json"
+        assert json.loads(response.get_data()) == EXPECTED
@@ -0,0 +1,101 @@
+"""
+Testes para o cronômetro de etapas
+
+Testa o breakdown por etapa, o decorator timed_stage e a alimentação
+do histograma de duração por etapa no MetricsCollector.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.monitoring.metrics import MetricsCollector
+from src.infrastructure.monitoring.stage_timer import (
+    STAGE_METRIC,
+    StageTimer,
+    current_stage_timer,
+    timed_stage
+)
+
+
+@pytest.fixture
+def collector():
+    """Coletor isolado do coletor global."""
+    return MetricsCollector()
+
+
+class TestStageTimer:
+    """Testes para StageTimer."""
+
+    def test_breakdown_in_execution_order(self, collector):
+        """Testa etapas em ms na ordem de execução e total."""
+        timer = StageTimer("analyze", collector)
+        with timer.stage("features"):
+            time.sleep(0.01)
+        with timer.stage("rules"):
+            pass
+
+        timings = timer.timings()
+
+        assert list(timings['stages']) == ["features", "rules"]
+        assert timings['stages']['features'] >= 10.0
+        assert timings['total_ms'] >= timings['stages']['features']
+
+    def test_repeated_stage_is_summed(self, collector):
+        """Testa soma no breakdown e uma observação por execução no histograma."""
+        timer = StageTimer("analyze", collector)
+        for _ in range(3):
+            with timer.stage("rule"):
+                pass
+
+        histogram = collector.get_metric(STAGE_METRIC)
+
+        assert list(timer.timings()['stages']) == ["rule"]
+        assert histogram.get_sketch().count == 3
+        assert histogram.points[-1].labels == {'pipeline': 'analyze', 'stage': 'rule'}
+
+    def test_stage_recorded_on_error(self, collector):
+        """Testa que etapas que falham também são medidas."""
+        timer = StageTimer("analyze", collector)
+        with pytest.raises(ValueError):
+            with timer.stage("persistence"):
+                raise ValueError("falha")
+
+        assert "persistence" in timer.timings()['stages']
+
+
+class TestTimedStage:
+    """Testes para o decorator timed_stage."""
+
+    @pytest.mark.asyncio
+    async def test_decorated_functions_use_active_timer(self, collector):
+        """Testa funções síncronas e assíncronas medidas pelo cronômetro ativo."""
+
+        @timed_stage("features.text")
+        def extract(text: str) -> int:
+            return len(text)
+
+        @timed_stage("rag.legal")
+        async def retrieve() -> str:
+            await asyncio.sleep(0)
+            return "ok"
+
+        timer = StageTimer("analyze", collector)
+        with timer.activate():
+            assert current_stage_timer() is timer
+            assert extract("abc") == 3
+            assert await retrieve() == "ok"
+
+        assert current_stage_timer() is None
+        assert set(timer.timings()['stages']) == {"features.text", "rag.legal"}
+
+    def test_no_active_timer_is_noop(self, collector):
+        """Testa que sem cronômetro ativo nada é registrado."""
+
+        @timed_stage("features.text")
+        def extract() -> str:
+            return "ok"
+
+        assert extract() == "ok"
+        assert collector.get_metric(STAGE_METRIC).get_sketch().count == 0
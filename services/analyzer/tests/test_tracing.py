@@ -0,0 +1,225 @@
+"""
+Testes para o sistema de tracing
+
+Testa propagação de contexto com contextvars, IDs, sampling por trace
+e o pipeline de exportação em lotes.
+"""
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.infrastructure.monitoring.tracing import (
+    Tracer,
+    SpanStatus,
+    SpanKind,
+    BatchExportProcessor,
+    FileTraceExporter
+)
+
+
+@pytest.fixture
+def tracer():
+    """Tracer sem exportadores."""
+    return Tracer("test-service")
+
+
+class TestContextPropagation:
+    """Testes de propagação do span atual."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_do_not_share_parent(self, tracer):
+        """Testa que requisições concorrentes no mesmo thread não se misturam."""
+
+        async def request(name: str):
+            async with tracer.span(f"request-{name}") as root:
+                await asyncio.sleep(0.01)
+                async with tracer.span(f"db-{name}") as child:
+                    await asyncio.sleep(0.01)
+                return root, child
+
+        results = await asyncio.gather(*(request(str(i)) for i in range(5)))
+
+        for root, child in results:
+            assert child.parent_span_id == root.span_id
+            assert child.trace_id == root.trace_id
+        assert len({root.trace_id for root, _ in results}) == 5
+        assert tracer.get_current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_gather_children_inherit_parent(self, tracer):
+        """Testa que tasks criadas por gather herdam o span atual."""
+
+        async def step(name: str):
+            async with tracer.span(name) as span:
+                return span
+
+        async with tracer.span("root") as root:
+            children = await asyncio.gather(step("a"), step("b"))
+
+        assert all(child.parent_span_id == root.span_id for child in children)
+
+    @pytest.mark.asyncio
+    async def test_executor_offload(self, tracer):
+        """Testa propagação para to_thread e para executores via bind."""
+
+        def work(name: str):
+            with tracer.sync_span(name) as span:
+                return span
+
+        async with tracer.span("root") as root:
+            via_thread = await asyncio.to_thread(work, "to_thread")
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                loop = asyncio.get_running_loop()
+                via_executor = await loop.run_in_executor(executor, tracer.bind(work), "executor")
+
+        assert via_thread.parent_span_id == root.span_id
+        assert via_executor.parent_span_id == root.span_id
+
+
+class TestSpanRecording:
+    """Testes de IDs, sampling e finalização."""
+
+    def test_integer_ids_exported_as_hex(self, tracer):
+        """Testa IDs inteiros formatados em hex na exportação."""
+        with tracer.sync_span("root") as span:
+            pass
+
+        data = tracer.get_trace(span.trace_id).to_dict()
+        assert len(data['trace_id']) == 32
+        assert len(data['spans'][0]['span_id']) == 16
+        assert tracer.get_trace(data['trace_id']) is tracer.get_trace(span.trace_id)
+
+    def test_sampling_decided_once_per_trace(self):
+        """Testa que spans filhos herdam a decisão do span raiz."""
+        tracer = Tracer("test-service", sampling_rate=0.0)
+
+        with tracer.sync_span("root") as root:
+            with tracer.sync_span("child") as child:
+                pass
+
+        assert not root.sampled and not child.sampled
+        assert child.trace_id == root.trace_id
+        assert tracer.get_active_traces() == []
+
+    def test_trace_exported_when_last_span_finishes(self, tracer):
+        """Testa exportação única ao fechar o último span do trace."""
+        exported = []
+        tracer.add_exporter(exported.append)
+
+        with pytest.raises(ValueError):
+            with tracer.sync_span("root"):
+                with tracer.sync_span("child"):
+                    raise ValueError("falha")
+        tracer.force_flush()
+
+        assert len(exported) == 1
+        trace = exported[0]
+        assert trace.open_spans == 0
+        assert {span.status for span in trace.spans} == {SpanStatus.ERROR}
+        assert trace.root_operation == "root"
+
+
+class TestExportPipeline:
+    """Testes do pipeline de exportação em lotes."""
+
+    def test_export_happens_off_request_path(self):
+        """Testa que um exportador lento não bloqueia a finalização do span."""
+        release = threading.Event()
+        exported = []
+
+        def slow_exporter(trace):
+            release.wait(5)
+            exported.append(trace)
+
+        tracer = Tracer("test-service", export_delay=0.01)
+        tracer.add_exporter(slow_exporter)
+
+        with tracer.sync_span("request"):
+            pass
+
+        assert exported == []
+        release.set()
+        assert tracer.force_flush()
+        assert len(exported) == 1
+
+    def test_queue_overflow_drops_and_counts(self):
+        """Testa descarte contado com a fila cheia."""
+        release = threading.Event()
+        processor = BatchExportProcessor(
+            [lambda trace: release.wait(5)], max_queue_size=2, max_batch_size=1, schedule_delay=0.01
+        )
+        tracer = Tracer("test-service")
+
+        results = []
+        for i in range(10):
+            with tracer.sync_span(f"op-{i}") as span:
+                pass
+            results.append(processor.submit(tracer.get_trace(span.trace_id)))
+
+        assert results.count(False) == processor.dropped > 0
+        release.set()
+        processor.shutdown()
+        assert processor.exported + processor.dropped == 10
+
+    def test_batches_by_size(self):
+        """Testa que exportadores com export_batch recebem lotes."""
+        batches = []
+
+        class Collector:
+            def export_batch(self, traces):
+                batches.append(len(traces))
+
+        tracer = Tracer("test-service", export_batch_size=4, export_delay=5.0)
+        tracer.add_exporter(Collector())
+        for i in range(10):
+            with tracer.sync_span(f"op-{i}"):
+                pass
+        tracer.shutdown()
+
+        assert sum(batches) == 10
+        assert max(batches) <= 4
+
+    def test_completed_traces_evicted_in_order(self):
+        """Testa evicção dos traces concluídos mais antigos acima do limite."""
+        tracer = Tracer("test-service", max_traces=3)
+        open_span = tracer.start_span("open")  # trace ativo: nunca é descartado
+        spans = []
+        for i in range(5):
+            with tracer.sync_span(f"op-{i}") as span:
+                pass
+            spans.append(span)
+
+        remaining = {trace.root_operation for trace in tracer.get_active_traces()}
+        assert remaining == {"open", "op-3", "op-4"}
+        assert tracer.get_trace(spans[0].trace_id) is None
+        tracer.finish_span(open_span)
+
+
+class TestFileTraceExporter:
+    """Testes do exportador JSON lines."""
+
+    def test_otlp_lines(self, tmp_path):
+        """Testa uma linha OTLP/JSON por lote com spans e status."""
+        path = tmp_path / "traces.jsonl"
+        exporter = FileTraceExporter(str(path), service_name="analyzer")
+        tracer = Tracer("analyzer")
+        tracer.add_exporter(exporter)
+
+        with tracer.sync_span("request", kind=SpanKind.SERVER) as root:
+            with tracer.sync_span("db") as child:
+                child.add_tag("rows", 3)
+        tracer.shutdown()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        resource_spans = json.loads(lines[0])['resourceSpans'][0]
+        assert resource_spans['resource']['attributes'][0]['value'] == {'stringValue': 'analyzer'}
+        spans = {s['name']: s for s in resource_spans['scopeSpans'][0]['spans']}
+        assert spans['request']['kind'] == 2
+        assert spans['db']['parentSpanId'] == spans['request']['spanId'] == f"{root.span_id:016x}"
+        assert {'key': 'rows', 'value': {'intValue': '3'}} in spans['db']['attributes']
+        assert int(spans['db']['endTimeUnixNano']) >= int(spans['db']['startTimeUnixNano'])